@@ -6,14 +6,15 @@ CLI moderna con menús interactivos para desarrollo y administración de sistema
 
 import sys
 import os
-from typing import Dict, Any
+import argparse
+from typing import Dict, Any, List, Optional
 import colorama
 
 # Asegurar que el directorio src esté en el path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from noox_cli.menu import NooxMenu, create_main_menu
-from noox_cli.modules import ayuda, desarrollo, sistema, proyectos, config, reparar, test_utf8
+from noox_cli.utils.devservers import STOPPED, supervisor
 
 # Inicializar colorama para Windows
 colorama.init()
@@ -22,6 +23,10 @@ class NooxCLI:
     """Clase principal de la aplicación NooxCLI."""
     
     def __init__(self):
+        # Los módulos interactivos se importan solo para los menús: config necesita winreg
+        # y los subcomandos programados deben funcionar también en Linux y macOS
+        from noox_cli.modules import ayuda, desarrollo, sistema, proyectos, config, reparar, test_utf8
+        
         self.menu = NooxMenu("NooxCLI - Terminal Moderna")
         self.modules = {
             'desarrollo': desarrollo,
@@ -81,19 +86,109 @@ class NooxCLI:
     
     def exit_application(self):
         """Salir de la aplicación con mensaje de despedida."""
+        running = [s for s in supervisor.servers() if s.state != STOPPED]
+        if running:
+            self.menu.show_info(f"🛑 Deteniendo {len(running)} servidor(es) de desarrollo...")
+            supervisor.stop_all()
         self.menu.clear_screen()
         self.menu.show_success("¡Gracias por usar NooxCLI! 👋")
         self.menu.show_info("Desarrollado con ❤️ por Sebastian")
         sys.exit(0)
 
 
-def main():
+def positive_int(value: str) -> int:
+    """Tipo de argparse para enteros mayores que cero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' no es un número entero")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que cero (se indicó {number})")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser de los subcomandos no interactivos (para cron/tareas programadas)."""
+    parser = argparse.ArgumentParser(
+        prog='noox',
+        description='NooxCLI - sin argumentos abre los menús interactivos'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    cleanup = subparsers.add_parser(
+        'limpiar-temp',
+        help='Aplica las políticas de retención de archivos temporales'
+    )
+    cleanup.add_argument('--simular', '--dry-run', dest='dry_run', action='store_true',
+                         help='Mostrar lo que se eliminaría sin borrar nada')
+    cleanup.add_argument('--forzar', '--force', dest='force', action='store_true',
+                         help='Recorrer los directorios aunque no hayan cambiado')
+    
+    snapshot = subparsers.add_parser(
+        'instantanea',
+        help='Guarda una instantánea del tamaño de cada directorio'
+    )
+    snapshot.add_argument('ruta', help='Directorio a escanear')
+    
+    growth = subparsers.add_parser(
+        'diff-disco',
+        help='Muestra qué directorios y archivos crecieron entre instantáneas'
+    )
+    growth.add_argument('ruta', help='Directorio con instantáneas guardadas')
+    growth.add_argument('--ahora', action='store_true',
+                        help='Escanear ahora y comparar con la última instantánea')
+    growth.add_argument('--desde', type=int, default=1, metavar='N',
+                        help='Comparar la última con la instantánea N posiciones atrás (por defecto 1)')
+    
+    repo_backup = subparsers.add_parser(
+        'respaldo-repositorio',
+        help='Crea una instantánea deduplicada de todos los proyectos'
+    )
+    repo_backup.add_argument('ruta', nargs='?', help='Directorio de proyectos (por defecto el configurado)')
+    
+    repo_prune = subparsers.add_parser(
+        'purgar-repositorio',
+        help='Elimina instantáneas antiguas y los trozos que ya no se usan'
+    )
+    repo_prune.add_argument('--conservar', type=positive_int, default=7, metavar='N',
+                            help='Instantáneas recientes a conservar (por defecto 7)')
+    
+    subparsers.add_parser(
+        'espejo',
+        help='Sincroniza el espejo de los proyectos seleccionados'
+    )
+    
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Ejecuta un subcomando no interactivo y devuelve el código de salida."""
+    from noox_cli.modules import proyectos, sistema
+    
+    commands = {
+        'limpiar-temp': lambda: sistema.limpiar_temporales(dry_run=args.dry_run, force=args.force),
+        'instantanea': lambda: sistema.instantanea_disco(args.ruta),
+        'diff-disco': lambda: sistema.diferencia_disco(args.ruta, compare_now=args.ahora, back=args.desde),
+        'respaldo-repositorio': lambda: proyectos.respaldar_repositorio(args.ruta),
+        'purgar-repositorio': lambda: proyectos.purgar_repositorio(args.conservar),
+        'espejo': proyectos.sincronizar_espejo,
+    }
+    return commands[args.command]()
+
+
+def main(argv: Optional[List[str]] = None):
     """Función principal - punto de entrada del comando 'noox'."""
+    argv = sys.argv[1:] if argv is None else argv
     try:
         # Configurar UTF-8 en Windows
         if os.name == 'nt':
             os.system('chcp 65001 > nul')
         
+        if argv:
+            args = build_parser().parse_args(argv)
+            if args.command:
+                sys.exit(run_command(args))
+        
         app = NooxCLI()
         app.run()
         
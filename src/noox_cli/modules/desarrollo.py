@@ -5,15 +5,21 @@ Herramientas para desarrollo: Git, NPM, Python, VS Code, etc.
 """
 
 import os
-import sys
 import subprocess
 import webbrowser
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from ..menu import NooxMenu
+from ..utils.cmdbench import DEFAULT_RUNS, DEFAULT_WARMUP, benchmark_command, compare, needs_shell
+from ..utils.devcaches import GENERIC_CACHE, PurgeResult, known_caches, measure_caches, purge_caches
+from ..utils.devservers import NPM, PHP, PYTHON, STOPPED, supervisor
+from ..utils.formatting import format_bytes
+from ..utils.openfiles import OpenFilesIndex
+from ..utils.tools import tool_registry
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
+from rich.progress import Progress, BarColumn, TextColumn
 from rich import box
 
 
@@ -78,7 +84,12 @@ class DesarrolloModule:
                 {
                     'name': '🧹 Limpiar cache',
                     'value': 'clean_cache',
-                    'description': 'Limpiar cache npm/yarn/pip'
+                    'description': 'Medir y limpiar cachés npm/yarn/pip/cargo/Go...'
+                },
+                {
+                    'name': '⏱️ Benchmark de comandos',
+                    'value': 'benchmark',
+                    'description': 'Comparar tiempos de uno o varios comandos con calentamiento y N ejecuciones'
                 },
                 {
                     'name': '🔧 Herramientas adicionales',
@@ -106,6 +117,7 @@ class DesarrolloModule:
             'git_status': self._git_status,
             'git_push': self._git_push,
             'clean_cache': self._clean_cache,
+            'benchmark': self._benchmark_commands,
             'extra_tools': self._extra_tools
         }
         
@@ -282,10 +294,10 @@ class DesarrolloModule:
         self.menu.clear_screen()
         
         servers = [
-            {'name': '🐍 Python HTTP Server (puerto 8000)', 'value': 'python'},
+            {'name': '🐍 Python HTTP Server (en segundo plano)', 'value': 'python'},
             {'name': '📦 Node.js Express (crear proyecto)', 'value': 'node'},
-            {'name': '⚛️ React Development Server', 'value': 'react'},
-            {'name': '🌐 Servidor PHP (si disponible)', 'value': 'php'}
+            {'name': '⚛️ React Development Server (en segundo plano)', 'value': 'react'},
+            {'name': '🌐 Servidor PHP (en segundo plano)', 'value': 'php'}
         ]
         
         selection = self.menu.show_menu(servers, "🌐 Selecciona tipo de servidor:")
@@ -295,10 +307,7 @@ class DesarrolloModule:
         
         try:
             if selection == 'python':
-                self.menu.show_info("🐍 Iniciando servidor Python en puerto 8000...")
-                self.menu.show_info("🌐 Accede a: http://localhost:8000")
-                self.menu.show_warning("⚠️ Presiona Ctrl+C para detener el servidor")
-                subprocess.run([sys.executable, '-m', 'http.server', '8000'])
+                self._start_background_server(PYTHON)
                 
             elif selection == 'node':
                 if self._command_exists('npx'):
@@ -309,24 +318,28 @@ class DesarrolloModule:
                     self.menu.show_error("❌ npx no está disponible")
                     
             elif selection == 'react':
-                if (self.current_dir / 'package.json').exists():
-                    self.menu.show_info("⚛️ Iniciando servidor de desarrollo React...")
-                    subprocess.run(['npm', 'start'])
-                else:
-                    self.menu.show_error("❌ No se encontró un proyecto React válido")
+                self._start_background_server(NPM)
                     
             elif selection == 'php':
-                if self._command_exists('php'):
-                    self.menu.show_info("🌐 Iniciando servidor PHP en puerto 8080...")
-                    self.menu.show_info("🌐 Accede a: http://localhost:8080")
-                    subprocess.run(['php', '-S', 'localhost:8080'])
-                else:
-                    self.menu.show_error("❌ PHP no está instalado")
+                self._start_background_server(PHP)
                     
         except subprocess.CalledProcessError as e:
             self.menu.show_error(f"Error iniciando servidor: {e}")
         except KeyboardInterrupt:
-            self.menu.show_info("\n🛑 Servidor detenido")
+            self.menu.show_info("\n🛑 Operación cancelada")
+    
+    def _start_background_server(self, kind: str):
+        """Arranca un servidor supervisado en el directorio actual sin bloquear el menú."""
+        try:
+            server = supervisor.start(self.current_dir, kind)
+        except ValueError as e:
+            self.menu.show_error(f"❌ {e}")
+            return
+        self.menu.show_success(f"✅ Servidor en segundo plano: {server.url}")
+        running = sum(1 for s in supervisor.servers() if s.state != STOPPED)
+        self.menu.show_info(
+            f"🖥️ {running} servidor(es) en marcha; gestiónalos en Proyectos > Servidores de desarrollo"
+        )
     
     def _open_powershell(self):
         """Abre PowerShell en el directorio actual con opciones mejoradas."""
@@ -639,56 +652,191 @@ class DesarrolloModule:
                 self.menu.show_error(f"Error en Git: {e}")
     
     def _clean_cache(self):
-        """Limpia cache de diferentes herramientas."""
+        """Mide las cachés de las herramientas de desarrollo y purga las seleccionadas."""
         self.menu.clear_screen()
         
+        with self.menu.console.status("[cyan]📏 Midiendo cachés...[/cyan]"):
+            caches = [c for c in measure_caches(known_caches()) if c.exists]
+        
+        if not caches:
+            self.menu.show_warning("⚠️ No se encontraron cachés de herramientas de desarrollo")
+            return
+        
+        caches.sort(key=lambda c: c.size, reverse=True)
+        total_size = sum(c.size for c in caches)
+        
+        table = Table(title="🧹 Cachés de desarrollo", box=box.ROUNDED)
+        table.add_column("Caché", style="cyan")
+        table.add_column("Herramienta", justify="center")
+        table.add_column("Archivos", justify="right")
+        table.add_column("Tamaño", justify="right", style="yellow")
+        table.add_column("Ruta", style="dim")
+        
+        for cache in caches:
+            table.add_row(
+                cache.name,
+                "✅" if cache.tool_path else "—",
+                f"{cache.file_count:,}",
+                format_bytes(cache.size),
+                "\n".join(p for p in cache.paths if os.path.isdir(p))
+            )
+        table.add_row("[bold]Total[/bold]", "", "", f"[bold]{format_bytes(total_size)}[/bold]", "")
+        
+        self.menu.console.print(table)
+        self.menu.console.print()
+        
         cache_options = [
-            {'name': '📦 npm cache', 'value': 'npm'},
-            {'name': '🧶 yarn cache', 'value': 'yarn'},
-            {'name': '🐍 pip cache', 'value': 'pip'},
-            {'name': '⚡ pnpm cache', 'value': 'pnpm'},
-            {'name': '🧹 Limpiar todo', 'value': 'all'}
+            {'name': f"{cache.name} ({format_bytes(cache.size)})", 'value': cache.key}
+            for cache in caches if cache.size
         ]
+        if not cache_options:
+            self.menu.show_info("ℹ️ Todas las cachés están vacías")
+            return
+        # "Limpiar todo" se limita a las herramientas: el resto de ~/.cache solo si se elige
+        toolchain = [c for c in caches if c.size and c.key != GENERIC_CACHE]
+        if toolchain:
+            cache_options.append({
+                'name': f"🧹 Limpiar todo ({format_bytes(sum(c.size for c in toolchain))})",
+                'value': 'all',
+                'description': 'Cachés de herramientas de desarrollo (sin el resto de ~/.cache)'
+            })
         
         selection = self.menu.show_menu(cache_options, "🧹 ¿Qué cache quieres limpiar?")
         
         if not selection or selection == 'exit':
             return
         
-        try:
-            cleaned = []
-            
-            if selection in ['npm', 'all'] and self._command_exists('npm'):
-                self.menu.show_info("🧹 Limpiando cache npm...")
-                subprocess.run(['npm', 'cache', 'clean', '--force'], 
-                             check=True, capture_output=True)
-                cleaned.append('npm')
-            
-            if selection in ['yarn', 'all'] and self._command_exists('yarn'):
-                self.menu.show_info("🧹 Limpiando cache yarn...")
-                subprocess.run(['yarn', 'cache', 'clean'], 
-                             check=True, capture_output=True)
-                cleaned.append('yarn')
-            
-            if selection in ['pip', 'all'] and self._command_exists('pip'):
-                self.menu.show_info("🧹 Limpiando cache pip...")
-                subprocess.run([sys.executable, '-m', 'pip', 'cache', 'purge'], 
-                             check=True, capture_output=True)
-                cleaned.append('pip')
-            
-            if selection in ['pnpm', 'all'] and self._command_exists('pnpm'):
-                self.menu.show_info("🧹 Limpiando cache pnpm...")
-                subprocess.run(['pnpm', 'store', 'prune'], 
-                             check=True, capture_output=True)
-                cleaned.append('pnpm')
+        selected = toolchain if selection == 'all' else [c for c in caches if c.key == selection]
+        
+        with self.menu.console.status("[cyan]🔍 Buscando archivos en uso...[/cyan]"):
+            open_files = OpenFilesIndex.build()
+        
+        with self.menu.console.status("[cyan]🧹 Limpiando cachés...[/cyan]") as status:
+            def on_done(result: PurgeResult):
+                status.update(f"[cyan]🧹 {result.cache.name} lista ({format_bytes(result.freed)} liberados)[/cyan]")
             
-            if cleaned:
-                self.menu.show_success(f"✅ Cache limpiado: {', '.join(cleaned)}")
-            else:
-                self.menu.show_warning("⚠️ No se encontraron herramientas para limpiar")
+            results = purge_caches(selected, on_done=on_done, open_files=open_files)
+        
+        summary = Table(title="📊 Resultado de la limpieza", box=box.ROUNDED)
+        summary.add_column("Caché", style="cyan")
+        summary.add_column("Método")
+        summary.add_column("Antes", justify="right")
+        summary.add_column("Después", justify="right")
+        summary.add_column("Liberado", justify="right", style="green")
+        
+        for result in results:
+            summary.add_row(
+                result.cache.name,
+                result.method,
+                format_bytes(result.before),
+                format_bytes(result.after),
+                format_bytes(result.freed)
+            )
+        
+        self.menu.console.print(summary)
+        
+        freed = sum(r.freed for r in results)
+        self.menu.show_success(f"✅ Cache limpiado: {format_bytes(freed)} liberados")
+        
+        for result in results:
+            for error in result.errors[:3]:
+                self.menu.show_warning(f"{result.cache.name}: {error}")
+    
+    def _benchmark_commands(self):
+        """Mide uno o varios comandos en el directorio actual y los compara."""
+        self.menu.show_info(f"⏱️ Los comandos se ejecutan en {self.current_dir}")
+        commands = []
+        while True:
+            command = self.menu.show_input(
+                f"💻 Comando {len(commands) + 1} (vacío para empezar):" if commands else "💻 Comando a medir:"
+            )
+            if not command or not command.strip():
+                break
+            commands.append(command.strip())
+        if not commands:
+            return
+        
+        runs_str = self.menu.show_input("🔢 Ejecuciones medidas:", str(DEFAULT_RUNS))
+        warmup_str = self.menu.show_input("🔥 Ejecuciones de calentamiento:", str(DEFAULT_WARMUP))
+        try:
+            runs, warmup = int(runs_str), int(warmup_str)
+            if runs < 2 or warmup < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            self.menu.show_error("❌ Hacen falta al menos 2 ejecuciones medidas")
+            return
+        ignore_failure = self.menu.show_confirmation("¿Continuar aunque un comando termine con error?")
+        
+        results = []
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total}"),
+            TextColumn("[dim]{task.fields[last]}[/dim]"),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            for command in commands:
+                task = progress.add_task(f"⏱️ {command[:40]}", total=warmup + runs, last="")
                 
-        except subprocess.CalledProcessError as e:
-            self.menu.show_error(f"Error limpiando cache: {e}")
+                def on_run(measured, timing, task=task):
+                    label = f"{timing.wall:.3f}s" if measured else f"calentamiento {timing.wall:.3f}s"
+                    progress.update(task, advance=1, last=label)
+                
+                results.append(benchmark_command(command, runs=runs, warmup=warmup, cwd=str(self.current_dir),
+                                                 ignore_failure=ignore_failure, on_run=on_run))
+                progress.remove_task(task)
+        
+        for result in results:
+            self._show_benchmark(result)
+        
+        comparison = compare(results)
+        if len(comparison) > 1:
+            fastest = comparison[0][0]
+            self.menu.console.print(f"[bold]🏁 Resumen[/bold]: [green]{fastest.command}[/green] fue el más rápido")
+            for benchmark, ratio, error in comparison[1:]:
+                self.menu.console.print(
+                    f"   [cyan]{ratio:.2f}[/cyan] ± {error:.2f} veces más rápido que [yellow]{benchmark.command}[/yellow]"
+                )
+    
+    def _show_benchmark(self, result):
+        """Tabla con las estadísticas de un comando medido."""
+        if result.error:
+            self.menu.show_error(f"❌ {result.command}: {result.error}")
+            if not result.runs:
+                return
+        
+        table = Table(title=f"⏱️ {result.command}", box=box.ROUNDED, show_header=False)
+        table.add_column("Medida", style="cyan")
+        table.add_column("Valor", justify="right")
+        table.add_row("Media ± σ", f"{self._format_seconds(result.mean)} ± {self._format_seconds(result.stddev)}")
+        table.add_row("Mediana", self._format_seconds(result.median))
+        table.add_row("Mín … Máx", f"{self._format_seconds(result.min)} … {self._format_seconds(result.max)}")
+        if result.user is not None:
+            table.add_row("Usuario / Sistema",
+                          f"{self._format_seconds(result.user)} / {self._format_seconds(result.system)}")
+        if result.max_rss:
+            table.add_row("RSS máx.", format_bytes(result.max_rss))
+        table.add_row("Ejecuciones", f"{len(result.runs)} (+{result.warmup} de calentamiento)")
+        self.menu.console.print(table)
+        
+        outliers = result.outliers()
+        if outliers:
+            self.menu.show_warning(
+                f"⚠️ {len(outliers)} ejecución(es) atípica(s): puede haber otros procesos interfiriendo; "
+                "cierra programas pesados o aumenta el número de ejecuciones"
+            )
+        if result.cold_start:
+            self.menu.show_warning("⚠️ La primera ejecución fue mucho más lenta: usa más ejecuciones de calentamiento")
+        if needs_shell(result.command):
+            self.menu.console.print("[dim]ℹ️ Se ejecutó a través de la shell: incluye su arranque[/dim]")
+        self.menu.console.print()
+    
+    def _format_seconds(self, seconds: float) -> str:
+        """Segundos o milisegundos según la magnitud."""
+        if seconds < 1:
+            return f"{seconds * 1000:.1f} ms"
+        return f"{seconds:.3f} s"
     
     def _extra_tools(self):
         """Herramientas adicionales de desarrollo."""
@@ -806,92 +954,16 @@ class DesarrolloModule:
         return status_map.get(status, status)
     
     def _command_exists(self, command: str) -> bool:
-        """Verifica si un comando existe en el sistema."""
-        try:
-            subprocess.run([command, '--version'], 
-                         capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            # Para VS Code, intentar variaciones del comando
-            if command == 'code':
-                try:
-                    subprocess.run(['code.cmd', '--version'], capture_output=True, check=True, timeout=5)
-                    return True
-                except:
-                    return self._check_vscode_installation()
-            elif command == 'wt':
-                # Para Windows Terminal, verificar de manera diferente
-                try:
-                    subprocess.run(['wt', '--help'], capture_output=True, check=True, timeout=5)
-                    return True
-                except:
-                    return False
-            return False
+        """Verifica si un comando existe en el sistema (sin ejecutarlo)."""
+        return tool_registry.exists(command)
     
     def _check_vscode_installation(self) -> bool:
-        """Verifica si VS Code está instalado en ubicaciones comunes."""
-        import os
-        
-        # Rutas comunes donde se instala VS Code
-        common_paths = [
-            rf"C:\Users\{os.environ.get('USERNAME', '')}\AppData\Local\Programs\Microsoft VS Code\bin\code.cmd",
-            rf"C:\Users\{os.environ.get('USERNAME', '')}\AppData\Local\Programs\Microsoft VS Code\Code.exe",
-            r"C:\Program Files\Microsoft VS Code\bin\code.cmd",
-            r"C:\Program Files\Microsoft VS Code\Code.exe",
-            r"C:\Program Files (x86)\Microsoft VS Code\bin\code.cmd",
-            r"C:\Program Files (x86)\Microsoft VS Code\Code.exe"
-        ]
-        
-        for path in common_paths:
-            try:
-                if os.path.exists(path):
-                    return True
-                subprocess.run([path, '--version'], capture_output=True, check=True, timeout=5)
-                return True
-            except:
-                continue
-        
-        return False
+        """Verifica si VS Code está instalado (PATH o ubicaciones comunes)."""
+        return tool_registry.exists('code')
     
     def _find_windows_terminal(self) -> Optional[str]:
-        """Busca Windows Terminal en ubicaciones comunes y retorna la ruta si lo encuentra."""
-        # Primero intentar el comando wt
-        if self._command_exists('wt'):
-            return 'wt'
-        
-        # Buscar ejecutable en ubicaciones comunes
-        wt_paths = [
-            # Microsoft Store - usuario actual
-            os.path.expandvars(r'%LOCALAPPDATA%\Microsoft\WindowsApps\wt.exe'),
-            # Microsoft Store - sistema (con wildcard)
-            r'C:\Program Files\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe',
-            # Instalación manual
-            r'C:\Program Files\Windows Terminal\wt.exe',
-            r'C:\Program Files (x86)\Windows Terminal\wt.exe',
-            # Otras ubicaciones posibles
-            os.path.expandvars(r'%USERPROFILE%\AppData\Local\Microsoft\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe'),
-            os.path.expandvars(r'%PROGRAMFILES%\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe')
-        ]
-        
-        for wt_path in wt_paths:
-            try:
-                # Para rutas con wildcards, usar glob
-                if '*' in wt_path:
-                    import glob
-                    matching_paths = glob.glob(wt_path)
-                    if matching_paths:
-                        # Ordenar para obtener la versión más reciente
-                        matching_paths.sort(reverse=True)
-                        wt_path = matching_paths[0]
-                    else:
-                        continue
-                
-                if os.path.exists(wt_path):
-                    return wt_path
-            except Exception:
-                continue
-        
-        return None
+        """Busca Windows Terminal (PATH o ubicaciones comunes) y retorna la ruta si lo encuentra."""
+        return tool_registry.find('wt')
     
     def _install_windows_terminal(self):
         """Ayuda al usuario a instalar Windows Terminal."""
@@ -8,15 +8,43 @@ import os
 import sys
 import subprocess
 import shutil
+import statistics
+import time
+import threading
 import webbrowser
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from ..menu import NooxMenu
+from ..utils.artifacts import delete_artifacts, find_artifacts
+from ..utils.backups import (
+    ARCHIVE_FORMATS, FULL, ArchiveResult, BackupResult, backup_all, backup_project, is_inside,
+    list_archives, load_settings, restore_project, save_settings, verify_chain
+)
+from ..utils.catalog import ProjectCatalog
+from ..utils.chunkstore import ChunkRepository
+from ..utils.coldstorage import archive_projects, find_idle_projects, load_archived, restore_archived
+from ..utils.devservers import (
+    DEFAULT_PORTS, FAILED as SERVER_FAILED, HEALTHY, NPM, PHP, PYTHON, RESTARTING, STARTING, STOPPED, UNRESPONSIVE,
+    YARN, port_is_free, supervisor
+)
+from ..utils.formatting import format_bytes
+from ..utils.jobs import (
+    BUILD, CANCELLED, FAILED, PASSED, RUNNING, SKIPPED, TEST, TIMED_OUT, BatchRunner, batch_log_dir, prepare_jobs
+)
+from ..utils.mirror import load_mirror_settings, mirror_project, save_mirror_settings
+from ..utils.openfiles import OpenFilesIndex
+from ..utils.projectstatus import collect_statuses
+from ..utils.timings import (
+    DEFAULT_THRESHOLD, TimingHistory, baseline, command_label, regressions, run_measured, slowdown
+)
+from ..utils.tools import tool_registry
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
 from rich.columns import Columns
+from rich.live import Live
+from rich.progress import Progress, BarColumn, DownloadColumn, TextColumn
 from rich import box
 
 
@@ -28,6 +56,7 @@ class ProyectosModule:
         # Directorios configurables
         self.laragon_path = Path("C:/laragonzo/www")
         self.projects_path = self.laragon_path if self.laragon_path.exists() else Path.cwd()
+        self._project_catalog: Optional[ProjectCatalog] = None
         
     def main(self):
         """Función principal del módulo de proyectos."""
@@ -42,8 +71,16 @@ class ProyectosModule:
                 projects = self._get_projects()
                 if projects:
                     self.menu.show_info(f"📂 Proyectos encontrados: {len(projects)}")
+                    # Los tipos se detectan mientras el usuario elige una opción
+                    self._catalog().start_background_detection()
                 else:
                     self.menu.show_warning("⚠️ No hay proyectos en el directorio")
+                archived = self._archived_projects()
+                if archived:
+                    self.menu.show_info(f"🧊 Proyectos en archivo en frío: {len(archived)}")
+                running = [s for s in supervisor.servers() if s.state != STOPPED]
+                if running:
+                    self.menu.show_info(f"🖥️ Servidores en segundo plano: {len(running)}")
             else:
                 self.menu.show_error(f"❌ Directorio no encontrado: {self.projects_path}")
             
@@ -56,6 +93,11 @@ class ProyectosModule:
                     'value': 'list_projects',
                     'description': 'Listar y abrir proyectos existentes'
                 },
+                {
+                    'name': '📊 Panel de proyectos',
+                    'value': 'dashboard',
+                    'description': 'Rama, cambios pendientes, tamaño y actividad de cada proyecto'
+                },
                 {
                     'name': '➕ Crear proyecto nuevo',
                     'value': 'new_project',
@@ -76,6 +118,21 @@ class ProyectosModule:
                     'value': 'backup',
                     'description': 'Crear backups de proyectos'
                 },
+                {
+                    'name': '🖥️ Servidores de desarrollo',
+                    'value': 'servers',
+                    'description': 'Servidores en segundo plano: estado, logs, reinicio y parada'
+                },
+                {
+                    'name': '🧊 Archivo en frío',
+                    'value': 'cold_storage',
+                    'description': 'Archivar proyectos inactivos y restaurarlos cuando hagan falta'
+                },
+                {
+                    'name': '🧹 Limpiar artefactos',
+                    'value': 'artifacts',
+                    'description': 'node_modules, .venv, __pycache__, dist... de proyectos inactivos'
+                },
                 {
                     'name': '🚀 Deploy y testing',
                     'value': 'deploy',
@@ -104,10 +161,14 @@ class ProyectosModule:
         """Maneja la selección del usuario."""
         handlers = {
             'list_projects': self._list_projects,
+            'dashboard': self._project_dashboard,
             'new_project': self._new_project,
             'clone_repo': self._clone_repo,
             'open_folder': self._open_folder,
             'backup': self._backup_menu,
+            'artifacts': self._sweep_artifacts,
+            'servers': self._servers_menu,
+            'cold_storage': self._cold_storage_menu,
             'deploy': self._deploy_menu,
             'docker': self._docker_menu,
             'config': self._config_menu
@@ -120,62 +181,144 @@ class ProyectosModule:
                 self.menu.show_error(f"Error ejecutando {selection}: {e}")
             self.menu.pause()
     
+    def _catalog(self) -> ProjectCatalog:
+        """Catálogo del directorio de proyectos actual (se recrea si el directorio cambia)."""
+        if self._project_catalog is None or self._project_catalog.root != str(self.projects_path):
+            self._project_catalog = ProjectCatalog(self.projects_path)
+        return self._project_catalog
+    
     def _get_projects(self) -> List[Path]:
         """Obtiene lista de proyectos en el directorio."""
         if not self.projects_path.exists():
             return []
-        
-        projects = []
-        for item in self.projects_path.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                projects.append(item)
-        
-        return sorted(projects, key=lambda x: x.name.lower())
+        return [Path(entry.path) for entry in self._catalog().projects()]
     
     def _list_projects(self):
-        """Lista y permite abrir proyectos existentes."""
+        """Lista y permite abrir proyectos existentes (y restaurar los archivados)."""
         self.menu.clear_screen()
         
-        projects = self._get_projects()
+        catalog = self._catalog()
+        entries = catalog.projects() if self.projects_path.exists() else []
+        archived = self._archived_projects()
         
-        if not projects:
+        if not entries and not archived:
             self.menu.show_warning("⚠️ No hay proyectos en el directorio")
             if self.menu.show_confirmation("¿Quieres crear un nuevo proyecto?"):
                 self._new_project()
             return
         
+        # Los tipos vienen de la caché o de la detección de fondo; los que falten se completan en paralelo
+        catalog.wait(timeout=0.5)
+        catalog.describe_all(entries)
+        
         # Crear opciones para el menú
         project_choices = []
-        for i, project in enumerate(projects, 1):
-            # Detectar tipo de proyecto
-            project_type = self._detect_project_type(project)
+        for entry in entries:
+            project_choices.append({
+                'name': f'🚀 {entry.name}',
+                'value': entry.path,
+                'description': f'Tipo: {entry.type}'
+            })
+        for archived_entry in archived:
             project_choices.append({
-                'name': f'🚀 {project.name}',
-                'value': str(project),
-                'description': f'Tipo: {project_type}'
+                'name': f'🧊 {archived_entry.name}',
+                'value': f'archived:{archived_entry.archive}',
+                'description': f'Archivado el {archived_entry.label} ({format_bytes(archived_entry.size)}); '
+                               'selecciónalo para restaurarlo'
             })
         
         selection = self.menu.show_menu(project_choices, "📂 Selecciona un proyecto:")
         
-        if selection and selection != 'exit':
+        if selection and selection.startswith('archived:'):
+            archive_name = selection[len('archived:'):]
+            entry = next(e for e in archived if e.archive == archive_name)
+            self._restore_archived_project(entry)
+        elif selection and selection != 'exit':
             self._open_project(Path(selection))
     
+    def _project_dashboard(self, refresh: bool = False):
+        """Panel con el estado git, tamaño y actividad de todos los proyectos."""
+        self.menu.clear_screen()
+        
+        catalog = self._catalog()
+        entries = catalog.projects() if self.projects_path.exists() else []
+        if not entries:
+            self.menu.show_warning("⚠️ No hay proyectos en el directorio")
+            return
+        
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total}"),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            task = progress.add_task("📊 Analizando proyectos...", total=len(entries))
+            statuses = collect_statuses(
+                [entry.path for entry in entries],
+                refresh=refresh,
+                on_done=lambda status: progress.advance(task)
+            )
+            catalog.describe_all(entries)
+        
+        now = time.time()
+        table = Table(title=f"📊 Panel de proyectos: {self.projects_path}", box=box.ROUNDED)
+        table.add_column("Proyecto", style="cyan")
+        table.add_column("Tipo", style="dim")
+        table.add_column("Rama", style="magenta")
+        table.add_column("↑/↓", justify="right")
+        table.add_column("Cambios", justify="right")
+        table.add_column("Último commit", justify="right")
+        table.add_column("Tamaño", justify="right", style="yellow")
+        table.add_column("Última actividad", justify="right")
+        
+        for entry, status in zip(entries, statuses):
+            if status.is_git:
+                branch = status.branch or "(detached)"
+                sync = f"{status.ahead}/{status.behind}" if status.ahead is not None else "—"
+                if status.dirty is None:
+                    dirty = "—"
+                elif status.dirty:
+                    dirty = f"[yellow]{status.dirty}[/yellow]"
+                else:
+                    dirty = "[green]0[/green]"
+                last_commit = self._format_age(now - status.last_commit) if status.last_commit else "—"
+            else:
+                branch = sync = dirty = last_commit = "[dim]sin git[/dim]"
+            size = format_bytes(status.size)
+            if not status.complete:
+                size = f"≥ {size}"
+            table.add_row(
+                entry.name,
+                entry.type,
+                branch,
+                sync,
+                dirty,
+                last_commit,
+                size,
+                self._format_age(now - status.last_activity) if status.last_activity else "—"
+            )
+        
+        self.menu.console.print(table)
+        
+        incomplete = [s for s in statuses if not s.complete]
+        if incomplete:
+            self.menu.show_warning(
+                f"⏱️ {len(incomplete)} proyecto(s) no terminaron a tiempo; sus valores son parciales"
+            )
+        total_size = sum(s.size for s in statuses)
+        dirty_projects = sum(1 for s in statuses if s.dirty)
+        self.menu.show_info(
+            f"📦 {len(statuses)} proyectos, {format_bytes(total_size)} en total, "
+            f"{dirty_projects} con cambios sin confirmar"
+        )
+        
+        if not refresh and self.menu.show_confirmation("¿Volver a analizar todos los proyectos ignorando la caché?"):
+            self._project_dashboard(refresh=True)
+    
     def _detect_project_type(self, project_path: Path) -> str:
         """Detecta el tipo de proyecto basado en archivos existentes."""
-        if (project_path / 'package.json').exists():
-            return 'Node.js/React'
-        elif (project_path / 'requirements.txt').exists():
-            return 'Python'
-        elif (project_path / 'composer.json').exists():
-            return 'PHP/Laravel'
-        elif (project_path / 'index.html').exists():
-            return 'HTML/Web'
-        elif (project_path / 'index.php').exists():
-            return 'PHP'
-        elif (project_path / '.git').exists():
-            return 'Git Repository'
-        else:
-            return 'Desconocido'
+        return self._catalog().project_type(project_path)
     
     def _open_project(self, project_path: Path):
         """Abre un proyecto con diferentes opciones."""
@@ -268,46 +411,38 @@ class ProyectosModule:
         # Información básica
         info_table.add_row("📁 Nombre", project_path.name)
         info_table.add_row("💾 Ruta", str(project_path))
-        info_table.add_row("🏷️ Tipo", self._detect_project_type(project_path))
+        entry = self._catalog().describe(self._catalog().entry(project_path))
+        info_table.add_row("🏷️ Tipo", entry.type)
         
-        # Tamaño del proyecto
+        # Tamaño del proyecto (medida reciente en caché o recorrido completo)
         try:
-            total_size = sum(f.stat().st_size for f in project_path.rglob('*') if f.is_file())
-            size_mb = total_size / (1024 * 1024)
+            size_mb = self._catalog().measure(entry) / (1024 * 1024)
             info_table.add_row("💾 Tamaño", f"{size_mb:.1f} MB")
         except Exception:
             info_table.add_row("💾 Tamaño", "No calculable")
         
         # Fecha de modificación
-        try:
-            mod_time = datetime.fromtimestamp(project_path.stat().st_mtime)
+        if entry.mtime_ns:
+            mod_time = datetime.fromtimestamp(entry.last_modified)
             info_table.add_row("📅 Última modificación", mod_time.strftime("%Y-%m-%d %H:%M:%S"))
-        except Exception:
+        else:
             info_table.add_row("📅 Última modificación", "No disponible")
         
         # Archivos principales
-        main_files = ['index.html', 'index.php', 'package.json', 'requirements.txt', 'composer.json', 'README.md']
-        found_files = []
-        for file_name in main_files:
-            if (project_path / file_name).exists():
-                found_files.append(file_name)
-        
-        if found_files:
-            info_table.add_row("📄 Archivos principales", ', '.join(found_files))
+        if entry.main_files:
+            info_table.add_row("📄 Archivos principales", ', '.join(entry.main_files))
         
         self.menu.console.print(info_table)
     
     def _run_project_server(self, project_path: Path):
-        """Ejecuta servidor de desarrollo apropiado para el proyecto."""
+        """Lanza en segundo plano el servidor de desarrollo apropiado para el proyecto."""
         self.menu.clear_screen()
         
-        project_type = self._detect_project_type(project_path)
-        
         servers = [
-            {'name': '🐍 Python HTTP Server (puerto 8000)', 'value': 'python'},
-            {'name': '🌐 PHP Server (puerto 8080)', 'value': 'php'},
-            {'name': '📦 npm start (Node.js)', 'value': 'npm'},
-            {'name': '⚛️ yarn start (React)', 'value': 'yarn'}
+            {'name': '🐍 Python HTTP Server', 'value': PYTHON},
+            {'name': '🌐 PHP Server', 'value': PHP},
+            {'name': '📦 npm start (Node.js)', 'value': NPM},
+            {'name': '⚛️ yarn start (React)', 'value': YARN}
         ]
         
         selection = self.menu.show_menu(servers, f"🚀 Servidor para {project_path.name}:")
@@ -315,44 +450,126 @@ class ProyectosModule:
         if not selection or selection == 'exit':
             return
         
-        # Cambiar al directorio del proyecto
-        original_dir = Path.cwd()
-        os.chdir(project_path)
+        self._start_dev_server(project_path, selection)
+    
+    def _start_dev_server(self, project_path: Path, kind: str):
+        """Arranca un servidor supervisado con el puerto elegido (por defecto el primero libre)."""
+        port_str = self.menu.show_input("🔌 Puerto:", str(supervisor.assign_port(DEFAULT_PORTS[kind])))
+        if not port_str:
+            return
+        if not port_str.strip().isdigit():
+            self.menu.show_error("❌ Puerto no válido")
+            return
+        port = int(port_str)
+        if not port_is_free(port):
+            self.menu.show_error(f"❌ El puerto {port} ya está en uso")
+            return
         
         try:
-            if selection == 'python':
-                self.menu.show_info("🐍 Iniciando servidor Python...")
-                self.menu.show_info(f"🌐 Accede a: http://localhost:8000")
-                subprocess.run([sys.executable, '-m', 'http.server', '8000'])
-            
-            elif selection == 'php':
-                if self._command_exists('php'):
-                    self.menu.show_info("🌐 Iniciando servidor PHP...")
-                    self.menu.show_info(f"🌐 Accede a: http://localhost:8080")
-                    subprocess.run(['php', '-S', 'localhost:8080'])
-                else:
-                    self.menu.show_error("❌ PHP no está instalado")
+            server = supervisor.start(project_path, kind, port)
+        except ValueError as e:
+            self.menu.show_error(f"❌ {e}")
+            return
+        self.menu.show_success(f"✅ {server.name} en segundo plano: {server.url}")
+        self.menu.show_info("🖥️ Gestiónalo (logs, reinicio, parada) desde 'Servidores de desarrollo'")
+    
+    def _servers_menu(self):
+        """Lista los servidores en segundo plano y permite ver sus logs, reiniciarlos o detenerlos."""
+        while True:
+            self.menu.clear_screen()
+            servers = supervisor.servers()
+            if not servers:
+                self.menu.show_warning("⚠️ No hay servidores en marcha; lánzalos desde un proyecto")
+                return
+            for server in servers:
+                supervisor.check(server)
+            self.menu.console.print(self._servers_table(servers))
             
-            elif selection == 'npm':
-                if (project_path / 'package.json').exists():
-                    self.menu.show_info("📦 Ejecutando npm start...")
-                    subprocess.run(['npm', 'start'])
-                else:
-                    self.menu.show_error("❌ No se encontró package.json")
+            choices = [
+                {'name': f"🖥️ {server.name}", 'value': server.name, 'description': f"{server.url} ({server.state})"}
+                for server in servers
+            ]
+            choices.append({'name': '🔄 Actualizar', 'value': 'refresh'})
+            choices.append({'name': '🛑 Detener todos', 'value': 'stop_all'})
+            selection = self.menu.show_menu(choices, "🖥️ Servidores de desarrollo:")
             
-            elif selection == 'yarn':
-                if (project_path / 'package.json').exists():
-                    self.menu.show_info("⚛️ Ejecutando yarn start...")
-                    subprocess.run(['yarn', 'start'])
-                else:
-                    self.menu.show_error("❌ No se encontró package.json")
-                    
-        except KeyboardInterrupt:
-            self.menu.show_info("\n🛑 Servidor detenido")
-        except Exception as e:
-            self.menu.show_error(f"Error ejecutando servidor: {e}")
-        finally:
-            os.chdir(original_dir)
+            if not selection or selection == 'exit':
+                return
+            if selection == 'refresh':
+                continue
+            if selection == 'stop_all':
+                if self.menu.show_confirmation(f"¿Detener {len(servers)} servidor(es)?"):
+                    with self.menu.console.status("[cyan]🛑 Deteniendo servidores...[/cyan]"):
+                        for server in servers:
+                            supervisor.remove(server.name)
+                continue
+            self._server_actions(supervisor.get(selection))
+    
+    def _server_actions(self, server):
+        """Acciones sobre un servidor supervisado."""
+        if server is None:
+            return
+        actions = [
+            {'name': '📜 Ver log', 'value': 'log'},
+            {'name': '🌐 Abrir en navegador', 'value': 'open'},
+            {'name': '🔁 Reiniciar', 'value': 'restart'},
+            {'name': '🛑 Detener', 'value': 'stop'}
+        ]
+        action = self.menu.show_menu(actions, f"🖥️ {server.name} ({server.url}):")
+        
+        if action == 'log':
+            lines = server.log.tail(60)
+            self.menu.console.print(Panel(
+                Text("\n".join(lines) or "(sin salida)"),
+                title=f"📜 {server.name} — últimas {len(lines)} de {server.log.total} líneas",
+                border_style="dim"
+            ))
+            self.menu.pause()
+        elif action == 'open':
+            webbrowser.open(server.url)
+        elif action == 'restart':
+            with self.menu.console.status(f"[cyan]🔁 Reiniciando {server.name}...[/cyan]"):
+                supervisor.restart(server.name)
+        elif action == 'stop':
+            with self.menu.console.status(f"[cyan]🛑 Deteniendo {server.name}...[/cyan]"):
+                supervisor.remove(server.name)
+            self.menu.show_success(f"✅ {server.name} detenido")
+            self.menu.pause()
+    
+    def _servers_table(self, servers) -> Table:
+        """Estado, salud HTTP y consumo de cada servidor."""
+        styles = {
+            HEALTHY: "[green]● activo[/green]",
+            STARTING: "[cyan]◌ iniciando[/cyan]",
+            UNRESPONSIVE: "[yellow]● sin respuesta[/yellow]",
+            RESTARTING: "[yellow]↻ reiniciando[/yellow]",
+            SERVER_FAILED: "[red]✗ fallido[/red]",
+            STOPPED: "[dim]■ detenido[/dim]",
+        }
+        table = Table(title="🖥️ Servidores de desarrollo", box=box.ROUNDED)
+        table.add_column("Servidor", style="cyan")
+        table.add_column("URL")
+        table.add_column("Estado")
+        table.add_column("HTTP", justify="right")
+        table.add_column("PID", justify="right", style="dim")
+        table.add_column("Activo", justify="right")
+        table.add_column("Reinicios", justify="right")
+        table.add_column("CPU", justify="right")
+        table.add_column("RSS", justify="right", style="yellow")
+        for server in servers:
+            http = f"{server.http_status} ({server.latency * 1000:.0f} ms)" if server.http_status else "—"
+            table.add_row(
+                server.name,
+                server.url,
+                styles.get(server.state, server.state),
+                http,
+                str(server.pid or "—"),
+                self._format_duration(server.uptime) if server.uptime else "—",
+                str(server.total_restarts),
+                f"{server.cpu_percent:.0f}%" if server.cpu_percent is not None else "—",
+                format_bytes(server.rss) if server.rss else "—"
+            )
+        return table
     
     def _new_project(self):
         """Crea un nuevo proyecto con plantillas."""
@@ -714,10 +931,23 @@ $created_at = date('Y-m-d H:i:s');
         """Menú de backup y compresión."""
         self.menu.clear_screen()
         
+        settings = self._backup_settings()
+        self.menu.show_info(f"💾 Destino de los backups: {settings.destination_path}")
+        
         backup_options = [
-            {'name': '📦 Crear backup de proyecto', 'value': 'backup_single'},
+            {'name': '📦 Crear backup de proyecto', 'value': 'backup_single',
+             'description': 'Incremental: solo los archivos nuevos o modificados'},
             {'name': '🗜️ Comprimir proyecto', 'value': 'compress'},
-            {'name': '📦 Backup de todos los proyectos', 'value': 'backup_all'}
+            {'name': '📦 Backup de todos los proyectos', 'value': 'backup_all'},
+            {'name': '♻️ Restaurar backup', 'value': 'restore',
+             'description': 'Completo o solo algunas rutas'},
+            {'name': '🔍 Verificar backups', 'value': 'verify',
+             'description': 'Comprueba CRC y hashes de cada archivo de la cadena'},
+            {'name': '🧩 Repositorio deduplicado', 'value': 'repository',
+             'description': 'Instantáneas de todos los proyectos guardando cada trozo una sola vez'},
+            {'name': '🪞 Espejo en otra ubicación', 'value': 'mirror',
+             'description': 'Copia viva de los proyectos elegidos; solo se transfiere lo que cambió'},
+            {'name': '⚙️ Destino y exclusiones', 'value': 'settings'}
         ]
         
         selection = self.menu.show_menu(backup_options, "📦 Opciones de backup:")
@@ -728,9 +958,114 @@ $created_at = date('Y-m-d H:i:s');
             self._compress_project()
         elif selection == 'backup_all':
             self._backup_all_projects()
+        elif selection == 'restore':
+            self._restore_backup()
+        elif selection == 'verify':
+            self._verify_backups()
+        elif selection == 'repository':
+            self._repository_menu()
+        elif selection == 'mirror':
+            self._mirror_menu()
+        elif selection == 'settings':
+            self._configure_backups()
+    
+    def _backup_settings(self):
+        """Configuración de backups; el destino nunca puede quedar dentro del directorio de proyectos."""
+        settings = load_settings()
+        if is_inside(settings.destination_path, self.projects_path):
+            self.menu.show_warning(
+                f"⚠️ El destino {settings.destination_path} está dentro de {self.projects_path}; "
+                "se usará el destino por defecto"
+            )
+            settings.destination = ''
+        if is_inside(settings.cold_storage_path, self.projects_path):
+            self.menu.show_warning(
+                f"⚠️ El archivo en frío {settings.cold_storage_path} está dentro de {self.projects_path}; "
+                "se usará la ubicación por defecto"
+            )
+            settings.cold_storage = ''
+        return settings
+    
+    def _configure_backups(self):
+        """Configura el destino de los backups y los patrones excluidos."""
+        settings = self._backup_settings()
+        
+        destination = self.menu.show_input("💾 Directorio de destino de los backups:", str(settings.destination_path))
+        if destination:
+            destination_path = Path(destination).expanduser()
+            if is_inside(destination_path, self.projects_path):
+                self.menu.show_error("❌ El destino no puede estar dentro del directorio de proyectos")
+                return
+            settings.destination = str(destination_path)
+        
+        cold_storage = self.menu.show_input("🧊 Directorio del archivo en frío:", str(settings.cold_storage_path))
+        if cold_storage:
+            cold_storage_path = Path(cold_storage).expanduser()
+            if is_inside(cold_storage_path, self.projects_path):
+                self.menu.show_error("❌ El archivo en frío no puede estar dentro del directorio de proyectos")
+                return
+            settings.cold_storage = str(cold_storage_path)
+        
+        excludes = self.menu.show_input("🚫 Patrones excluidos (separados por comas):", ', '.join(settings.excludes))
+        if excludes is not None:
+            settings.excludes = [p.strip() for p in excludes.split(',') if p.strip()]
+        
+        archive_format = self.menu.show_menu(
+            [{'name': f"🗜️ {fmt}", 'value': fmt} for fmt in ARCHIVE_FORMATS],
+            f"🗜️ Formato de los archivos completos (actual: {settings.archive_format}):"
+        )
+        if archive_format and archive_format != 'exit':
+            settings.archive_format = archive_format
+        
+        levels = ARCHIVE_FORMATS[settings.archive_format][1]
+        level = self.menu.show_input(
+            f"📉 Nivel de compresión ({levels.start}-{levels.stop - 1}):",
+            str(min(max(settings.compression_level, levels.start), levels.stop - 1))
+        )
+        if level and level.strip().isdigit() and int(level) in levels:
+            settings.compression_level = int(level)
+        elif level:
+            self.menu.show_warning(f"⚠️ Nivel no válido; se mantiene {settings.compression_level}")
+        
+        save_settings(settings)
+        self.menu.show_success("✅ Configuración de backups guardada")
+    
+    def _run_backup(self, project_path: Path, settings, full: bool = False):
+        """Ejecuta el backup de un proyecto mostrando el progreso en bytes."""
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            task = progress.add_task(f"📦 {project_path.name}...", total=None)
+            result = backup_project(
+                project_path, settings, full=full,
+                progress_callback=lambda size: progress.advance(task, size)
+            )
+        
+        if result.archive is None:
+            self.menu.show_info(f"ℹ️ {project_path.name}: sin cambios desde el último backup")
+        else:
+            kind = "completo" if result.archive.kind == FULL else "incremental"
+            self.menu.show_success(
+                f"✅ {project_path.name}: backup {kind} {result.archive.path.name} "
+                f"(+{result.added} nuevos, {result.modified} modificados, {result.removed} eliminados, "
+                f"{format_bytes(result.bytes_written)})"
+            )
+        if result.skipped:
+            self.menu.show_warning(
+                f"⚠️ {len(result.skipped)} archivo(s) no se pudieron leer y no están en este backup"
+            )
+        for relative, error in result.errors[:5]:
+            self.menu.console.print(f"  [dim]• {relative}: {error}[/dim]")
+        if len(result.errors) > 5:
+            self.menu.console.print(f"  [dim]... y {len(result.errors) - 5} error(es) más[/dim]")
+        return result
     
     def _backup_single_project(self):
-        """Crea backup de un proyecto específico."""
+        """Crea un backup incremental de un proyecto específico."""
         projects = self._get_projects()
         if not projects:
             self.menu.show_warning("⚠️ No hay proyectos para respaldar")
@@ -741,17 +1076,149 @@ $created_at = date('Y-m-d H:i:s');
         
         if selection and selection != 'exit':
             project_path = Path(selection)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"backup_{project_path.name}_{timestamp}.zip"
-            backup_path = self.projects_path / backup_name
+            settings = self._backup_settings()
+            
+            mode = self.menu.show_menu([
+                {'name': '🔁 Incremental', 'value': 'delta', 'description': 'Solo lo que cambió desde el último backup'},
+                {'name': '📦 Completo', 'value': 'full', 'description': 'Inicia una cadena nueva'}
+            ], "📦 Tipo de backup:")
+            if not mode or mode == 'exit':
+                return
             
             try:
-                self.menu.show_info(f"📦 Creando backup: {backup_name}")
-                shutil.make_archive(str(backup_path.with_suffix('')), 'zip', str(project_path))
-                self.menu.show_success(f"✅ Backup creado: {backup_name}")
+                self._run_backup(project_path, settings, full=(mode == 'full'))
             except Exception as e:
                 self.menu.show_error(f"Error creando backup: {e}")
     
+    def _choose_backed_up_project(self, destination: Path, title: str) -> Optional[Path]:
+        """Elige uno de los proyectos con cadena de backups en el destino."""
+        backed_up = sorted(
+            p for p in destination.iterdir() if p.is_dir() and any(p.glob('*-full.zip'))
+        ) if destination.is_dir() else []
+        if not backed_up:
+            self.menu.show_warning(f"⚠️ No hay backups en {destination}")
+            return None
+        
+        selection = self.menu.show_menu([{'name': p.name, 'value': str(p)} for p in backed_up], title)
+        if not selection or selection == 'exit':
+            return None
+        return Path(selection)
+    
+    def _restore_backup(self):
+        """Restaura un proyecto (o algunas de sus rutas) desde su cadena de backups."""
+        settings = self._backup_settings()
+        destination = settings.destination_path
+        backup_dir = self._choose_backed_up_project(destination, "♻️ Proyecto a restaurar:")
+        if backup_dir is None:
+            return
+        
+        chain = list_archives(backup_dir)
+        if not chain:
+            self.menu.show_warning("⚠️ No hay backups válidos para este proyecto")
+            return
+        
+        point_choices = [
+            {
+                'name': f"{'📦' if a.kind == FULL else '🔁'} {a.label}",
+                'value': str(a.sequence),
+                'description': f"{len(a.files)} archivos, {len(a.changed)} guardados en este backup"
+            }
+            for a in reversed(chain)
+        ]
+        point = self.menu.show_menu(point_choices, "📅 Punto de restauración:")
+        if not point or point == 'exit':
+            return
+        files = next(a.files for a in chain if a.sequence == int(point))
+        
+        scope = self.menu.show_menu([
+            {'name': '📦 Todo el proyecto', 'value': 'all'},
+            {'name': '📄 Solo algunas rutas', 'value': 'paths',
+             'description': 'Archivos o carpetas; solo se leen esos miembros'}
+        ], "♻️ ¿Qué quieres restaurar?")
+        if not scope or scope == 'exit':
+            return
+        
+        paths = None
+        if scope == 'paths':
+            top_level = sorted({relative.split('/', 1)[0] for relative in files})
+            self.menu.show_info(f"📁 Contenido: {', '.join(top_level[:20])}{' ...' if len(top_level) > 20 else ''}")
+            answer = self.menu.show_input("📄 Rutas a restaurar (separadas por comas, p. ej. src/app.py, public):")
+            paths = [p.strip() for p in (answer or '').split(',') if p.strip()]
+            if not paths:
+                return
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        default_target = destination / 'restaurados' / f"{backup_dir.name}_{timestamp}"
+        target = self.menu.show_input("📁 Restaurar en:", str(default_target))
+        if not target:
+            return
+        target_path = Path(target).expanduser()
+        
+        overwrite = False
+        if target_path.is_dir() and any(target_path.iterdir()):
+            overwrite = self.menu.show_confirmation(
+                f"⚠️ {target_path} no está vacío. ¿Sobrescribir los archivos que ya existan?"
+            )
+        
+        try:
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                DownloadColumn(),
+                console=self.menu.console,
+                transient=True
+            ) as progress:
+                total = None if paths else sum(entry[0] for entry in files.values())
+                task = progress.add_task("♻️ Restaurando...", total=total)
+                restored = restore_project(
+                    backup_dir, target_path, upto=int(point), paths=paths, overwrite=overwrite,
+                    progress_callback=lambda size: progress.advance(task, size)
+                )
+            self.menu.show_success(f"✅ {restored:,} archivos restaurados en {target_path}")
+        except Exception as e:
+            self.menu.show_error(f"Error restaurando backup: {e}")
+    
+    def _verify_backups(self):
+        """Verifica todos los archivos de la cadena de backups de un proyecto."""
+        settings = self._backup_settings()
+        backup_dir = self._choose_backed_up_project(settings.destination_path, "🔍 Proyecto a verificar:")
+        if backup_dir is None:
+            return
+        
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            task = progress.add_task(f"🔍 Verificando {backup_dir.name}...", total=None)
+            results = verify_chain(backup_dir, progress_callback=lambda size: progress.advance(task, size))
+        
+        table = Table(title=f"🔍 Verificación: {backup_dir.name}", box=box.ROUNDED)
+        table.add_column("Archivo", style="cyan")
+        table.add_column("Miembros", justify="right")
+        table.add_column("Datos", justify="right")
+        table.add_column("Estado")
+        for result in results:
+            table.add_row(
+                result.archive.name,
+                f"{result.checked:,}",
+                format_bytes(result.bytes_checked),
+                "[green]✅ correcto[/green]" if result.ok else f"[red]❌ {len(result.corrupt)} dañado(s)[/red]"
+            )
+        self.menu.console.print(table)
+        
+        damaged = [(r.archive.name, member, error) for r in results for member, error in r.corrupt]
+        if not damaged:
+            self.menu.show_success("✅ Todos los backups se pueden restaurar")
+            return
+        self.menu.show_error(f"❌ {len(damaged)} miembro(s) dañado(s)")
+        for archive_name, member, error in damaged[:20]:
+            self.menu.console.print(f"  [dim]• {archive_name}: {member} — {error}[/dim]")
+        if len(damaged) > 20:
+            self.menu.console.print(f"  [dim]... y {len(damaged) - 20} más[/dim]")
+    
     def _compress_project(self):
         """Comprime un proyecto."""
         projects = self._get_projects()
@@ -773,29 +1240,564 @@ $created_at = date('Y-m-d H:i:s');
             except Exception as e:
                 self.menu.show_error(f"Error comprimiendo: {e}")
     
+    def _repository(self) -> ChunkRepository:
+        """Repositorio deduplicado dentro del destino de backups."""
+        settings = self._backup_settings()
+        return ChunkRepository(settings.destination_path / 'repositorio', min(max(settings.compression_level, 1), 9))
+    
+    def _repository_menu(self):
+        """Instantáneas, restauración y purga del repositorio deduplicado."""
+        repository = self._repository()
+        snapshots = repository.list_snapshots()
+        self.menu.show_info(f"🧩 Repositorio: {repository.root} ({len(snapshots)} instantánea(s))")
+        
+        options = [
+            {'name': '📸 Crear instantánea de todos los proyectos', 'value': 'backup'},
+            {'name': '♻️ Restaurar instantánea', 'value': 'restore'},
+            {'name': '🧹 Purgar instantáneas antiguas', 'value': 'prune'},
+            {'name': '📊 Estadísticas', 'value': 'stats'}
+        ]
+        selection = self.menu.show_menu(options, "🧩 Repositorio deduplicado:")
+        
+        if selection == 'backup':
+            self.run_repository_backup()
+        elif selection == 'restore':
+            self._restore_repository_snapshot(repository)
+        elif selection == 'prune':
+            keep = self.menu.show_input("🔢 ¿Cuántas instantáneas recientes conservar?", "7")
+            if keep and keep.strip().isdigit() and int(keep) >= 1:
+                self.run_repository_prune(int(keep))
+            elif keep:
+                self.menu.show_error("❌ Indica un número mayor que cero")
+        elif selection == 'stats':
+            with self.menu.console.status("[cyan]📊 Midiendo el repositorio...[/cyan]"):
+                chunk_count, stored = repository.stats()
+            logical = 0
+            if snapshots:
+                latest = repository.load_snapshot(snapshots[-1].id)['files']
+                logical = sum(entry[0] for entry in latest.values())
+            self.menu.show_info(
+                f"🧩 {chunk_count:,} trozos únicos, {format_bytes(stored)} en disco; "
+                f"la última instantánea representa {format_bytes(logical)}"
+            )
+    
+    def run_repository_backup(self, root: Optional[Path] = None) -> int:
+        """Crea una instantánea deduplicada de `root` (por defecto el directorio de proyectos)."""
+        root = Path(root) if root else self.projects_path
+        if not root.is_dir():
+            self.menu.show_error(f"❌ '{root}' no es un directorio")
+            return 1
+        repository = self._repository()
+        
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            task = progress.add_task(f"📸 {root}...", total=None)
+            try:
+                result = repository.backup(root, progress_callback=lambda size: progress.advance(task, size))
+            except RuntimeError as e:
+                self.menu.show_error(f"❌ {e}")
+                return 1
+        
+        self.menu.show_success(
+            f"✅ Instantánea {result.snapshot.id}: {result.files:,} archivos ({format_bytes(result.total_size)}), "
+            f"{result.reused:,} sin cambios, {result.new_chunks:,} trozos nuevos ({format_bytes(result.stored_bytes)})"
+        )
+        for relative, error in result.errors[:5]:
+            self.menu.console.print(f"  [dim]• {relative}: {error}[/dim]")
+        return 1 if result.errors else 0
+    
+    def run_repository_prune(self, keep_last: int) -> int:
+        """Elimina las instantáneas que sobran y los trozos huérfanos."""
+        repository = self._repository()
+        try:
+            with self.menu.console.status("[cyan]🧹 Purgando el repositorio...[/cyan]"):
+                result = repository.prune(keep_last=keep_last)
+        except (RuntimeError, ValueError) as e:
+            self.menu.show_error(f"❌ {e}")
+            return 1
+        self.menu.show_success(
+            f"✅ {len(result.removed_snapshots)} instantánea(s) y {result.removed_chunks:,} trozos eliminados, "
+            f"{format_bytes(result.freed_bytes)} liberados"
+        )
+        return 0
+    
+    def _mirror_menu(self):
+        """Configura y sincroniza el espejo de proyectos."""
+        settings = load_mirror_settings()
+        destination = settings.destination_path or "(sin configurar)"
+        self.menu.show_info(f"🪞 Espejo: {destination} — {len(settings.projects)} proyecto(s) seleccionados")
+        
+        options = [
+            {'name': '🔄 Sincronizar ahora', 'value': 'sync'},
+            {'name': '📂 Elegir proyectos', 'value': 'projects'},
+            {'name': '📁 Cambiar destino', 'value': 'destination'}
+        ]
+        selection = self.menu.show_menu(options, "🪞 Espejo de proyectos:")
+        
+        if selection == 'sync':
+            self.run_mirror_sync()
+        elif selection == 'projects':
+            self._choose_mirror_projects(settings)
+        elif selection == 'destination':
+            target = self.menu.show_input("📁 Directorio del espejo (otro disco o unidad de red):",
+                                          settings.destination)
+            if not target:
+                return
+            target_path = Path(target).expanduser()
+            if is_inside(target_path, self.projects_path) or is_inside(self.projects_path, target_path):
+                self.menu.show_error("❌ El espejo no puede solaparse con el directorio de proyectos")
+                return
+            settings.destination = str(target_path)
+            save_mirror_settings(settings)
+            self.menu.show_success(f"✅ Espejo en {target_path}")
+    
+    def _choose_mirror_projects(self, settings):
+        """Marca o desmarca los proyectos que se mantienen en el espejo."""
+        selected = set(settings.projects)
+        names = [p.name for p in self._get_projects()]
+        while True:
+            choices = [
+                {'name': f"{'✅' if name in selected else '⬜'} {name}", 'value': name}
+                for name in names
+            ]
+            choices.append({'name': '💾 Guardar selección', 'value': 'save'})
+            choice = self.menu.show_menu(choices, "📂 Proyectos del espejo (selecciona para marcar/desmarcar):")
+            if choice == 'save':
+                settings.projects = sorted(selected)
+                save_mirror_settings(settings)
+                self.menu.show_success(f"✅ {len(selected)} proyecto(s) en el espejo")
+                return
+            if not choice or choice == 'exit':
+                return
+            selected ^= {choice}
+    
+    def run_mirror_sync(self) -> int:
+        """Sincroniza el espejo de los proyectos seleccionados."""
+        settings = load_mirror_settings()
+        if not settings.destination_path:
+            self.menu.show_error("❌ No hay directorio de espejo configurado")
+            return 1
+        projects = [self.projects_path / name for name in settings.projects]
+        missing = [p.name for p in projects if not p.is_dir()]
+        projects = [p for p in projects if p.is_dir()]
+        if missing:
+            self.menu.show_warning(f"⚠️ Proyectos que ya no existen: {', '.join(missing)}")
+        if not projects:
+            self.menu.show_warning("⚠️ No hay proyectos seleccionados para el espejo")
+            return 1
+        
+        failed = False
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console,
+            transient=True
+        ) as progress:
+            for project in projects:
+                task = progress.add_task(f"🪞 {project.name}...", total=None)
+                try:
+                    result = mirror_project(
+                        project, settings.destination_path / project.name, settings.excludes,
+                        workers=settings.workers,
+                        progress_callback=lambda size: progress.advance(task, size)
+                    )
+                except (OSError, ValueError) as e:
+                    failed = True
+                    progress.console.print(f"  [red]❌ {project.name}: {e}[/red]")
+                    continue
+                finally:
+                    progress.remove_task(task)
+                
+                failed = failed or bool(result.errors)
+                progress.console.print(
+                    f"  [green]🪞 {project.name}[/green] [dim]{result.copied} copiados "
+                    f"({format_bytes(result.bytes_copied)}), {result.patched} por delta "
+                    f"({format_bytes(result.bytes_literal)} nuevos de "
+                    f"{format_bytes(result.bytes_literal + result.bytes_reused)}), "
+                    f"{result.deleted} borrados, {result.unchanged} sin cambios[/dim]"
+                )
+                for relative, error in result.errors[:5]:
+                    progress.console.print(f"    [dim]• {relative}: {error}[/dim]")
+        
+        if failed:
+            self.menu.show_warning("⚠️ El espejo terminó con errores")
+            return 1
+        self.menu.show_success(f"✅ Espejo actualizado en {settings.destination_path}")
+        return 0
+    
+    def _restore_repository_snapshot(self, repository: ChunkRepository):
+        """Restaura una instantánea completa del repositorio."""
+        snapshots = repository.list_snapshots()
+        if not snapshots:
+            self.menu.show_warning("⚠️ El repositorio no tiene instantáneas")
+            return
+        
+        selection = self.menu.show_menu(
+            [{'name': f"📸 {s.label}", 'value': s.id} for s in reversed(snapshots)],
+            "📅 Instantánea a restaurar:"
+        )
+        if not selection or selection == 'exit':
+            return
+        
+        default_target = repository.root.parent / 'restaurados' / f"repositorio_{selection}"
+        target = self.menu.show_input("📁 Restaurar en (directorio nuevo o vacío):", str(default_target))
+        if not target:
+            return
+        
+        try:
+            with self.menu.console.status("[cyan]♻️ Restaurando...[/cyan]"):
+                restored = repository.restore(selection, Path(target).expanduser())
+            self.menu.show_success(f"✅ {restored:,} archivos restaurados en {target}")
+        except Exception as e:
+            self.menu.show_error(f"Error restaurando instantánea: {e}")
+    
     def _backup_all_projects(self):
-        """Crea backup de todos los proyectos."""
+        """Crea backups de todos los proyectos en paralelo (un proceso por proyecto)."""
         projects = self._get_projects()
         if not projects:
             self.menu.show_warning("⚠️ No hay proyectos para respaldar")
             return
         
-        if not self.menu.show_confirmation(f"¿Crear backup de {len(projects)} proyecto(s)?"):
+        settings = self._backup_settings()
+        mode = self.menu.show_menu([
+            {'name': '🔁 Incremental', 'value': 'incremental',
+             'description': 'Actualiza la cadena de backups de cada proyecto'},
+            {'name': f'🗜️ Archivo completo ({settings.archive_format}, nivel {settings.compression_level})',
+             'value': 'archive', 'description': 'Un archivo independiente por proyecto'}
+        ], "📦 Tipo de backup:")
+        if not mode or mode == 'exit':
             return
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = self.projects_path / f"backup_all_{timestamp}"
-        backup_dir.mkdir()
+        archive_dir = None
+        if mode == 'archive':
+            levels = ARCHIVE_FORMATS[settings.archive_format][1]
+            if settings.compression_level not in levels:
+                self.menu.show_error(
+                    f"❌ Nivel {settings.compression_level} no válido para {settings.archive_format}; "
+                    "revisa la configuración de backups"
+                )
+                return
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            archive_dir = settings.destination_path / f"backup_all_{timestamp}"
         
-        try:
-            for project in projects:
-                self.menu.show_info(f"📦 Respaldando: {project.name}")
-                backup_path = backup_dir / f"{project.name}.zip"
-                shutil.make_archive(str(backup_path.with_suffix('')), 'zip', str(project))
+        if not self.menu.show_confirmation(
+            f"¿Crear backup de {len(projects)} proyecto(s) en {archive_dir or settings.destination_path}?"
+        ):
+            return
+        
+        failed = []
+        incomplete = []
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console
+        ) as progress:
+            # Sin total: recorrer todos los proyectos solo para la barra duplicaría la lectura del disco
+            task = progress.add_task(f"📦 Respaldando {len(projects)} proyecto(s)...", total=None)
+            
+            def report(outcome):
+                name = Path(outcome.project).name
+                if outcome.error:
+                    failed.append(name)
+                    progress.console.print(f"  [red]❌ {name}: {outcome.error}[/red]")
+                elif isinstance(outcome.result, ArchiveResult):
+                    progress.console.print(
+                        f"  [green]✅ {name}[/green] [dim]{outcome.result.file_count:,} archivos, "
+                        f"{format_bytes(outcome.result.archive_size)}[/dim]"
+                    )
+                elif outcome.result.archive is None:
+                    progress.console.print(f"  [dim]• {name}: sin cambios[/dim]")
+                else:
+                    progress.console.print(
+                        f"  [green]✅ {name}[/green] [dim]{format_bytes(outcome.result.bytes_written)} "
+                        f"en {outcome.result.archive.path.name}[/dim]"
+                    )
+                if isinstance(outcome.result, BackupResult) and outcome.result.skipped:
+                    progress.console.print(
+                        f"  [yellow]⚠️ {name}: {len(outcome.result.skipped)} archivo(s) ilegibles omitidos[/yellow]"
+                    )
             
-            self.menu.show_success(f"✅ Backup completo creado en: {backup_dir.name}")
+            backup_all(
+                projects, settings, archive_dir=archive_dir,
+                progress_callback=lambda amount: progress.advance(task, amount),
+                on_done=report
+            )
+        
+        if failed:
+            self.menu.show_warning(f"⚠️ {len(failed)} proyecto(s) no se pudieron respaldar: {', '.join(failed)}")
+        else:
+            self.menu.show_success(f"✅ Backups actualizados en: {archive_dir or settings.destination_path}")
+    
+    def _archived_projects(self):
+        """Proyectos de este directorio que están en el archivo en frío."""
+        settings = load_settings()
+        root = os.path.normcase(str(self.projects_path.resolve()))
+        return [
+            e for e in load_archived(settings.cold_storage_path)
+            if os.path.normcase(os.path.dirname(e.original_path)) == root
+        ]
+    
+    def _cold_storage_menu(self):
+        """Archiva proyectos inactivos o restaura los archivados."""
+        self.menu.clear_screen()
+        settings = self._backup_settings()
+        archived = self._archived_projects()
+        self.menu.show_info(f"🧊 Archivo en frío: {settings.cold_storage_path} ({len(archived)} proyecto(s))")
+        
+        options = [
+            {'name': '🧊 Archivar proyectos inactivos', 'value': 'archive'},
+            {'name': '♻️ Restaurar proyecto archivado', 'value': 'restore'}
+        ]
+        selection = self.menu.show_menu(options, "🧊 Archivo en frío:")
+        
+        if selection == 'archive':
+            self._archive_idle_projects(settings)
+        elif selection == 'restore':
+            if not archived:
+                self.menu.show_warning("⚠️ No hay proyectos archivados de este directorio")
+                return
+            choice = self.menu.show_menu([
+                {
+                    'name': f"🧊 {e.name}",
+                    'value': e.archive,
+                    'description': f"Archivado el {e.label}, {format_bytes(e.size)} "
+                                   f"({format_bytes(e.archive_size)} comprimido)"
+                }
+                for e in archived
+            ], "♻️ Proyecto a restaurar:")
+            if choice and choice != 'exit':
+                self._restore_archived_project(next(e for e in archived if e.archive == choice))
+    
+    def _archive_idle_projects(self, settings):
+        """Busca proyectos sin actividad, los archiva y borra los originales."""
+        days = self.menu.show_input("📅 Días sin actividad:", "365")
+        if not days or not days.strip().isdigit():
+            return
+        
+        projects = self._get_projects()
+        with self.menu.console.status(f"[cyan]🔍 Midiendo la actividad de {len(projects)} proyecto(s)...[/cyan]"):
+            idle = find_idle_projects(projects, int(days))
+        
+        if not idle:
+            self.menu.show_success(f"✅ Ningún proyecto lleva más de {days} días inactivo")
+            return
+        
+        now = time.time()
+        table = Table(title=f"💤 Proyectos sin actividad en {days} días", box=box.ROUNDED)
+        table.add_column("Proyecto", style="cyan")
+        table.add_column("Última actividad", justify="right")
+        table.add_column("Archivos", justify="right")
+        table.add_column("Tamaño", justify="right", style="yellow")
+        for project in idle[:40]:
+            table.add_row(project.name, self._format_age(now - project.last_activity),
+                          f"{project.file_count:,}", format_bytes(project.size))
+        self.menu.console.print(table)
+        if len(idle) > 40:
+            self.menu.console.print(f"[dim]... y {len(idle) - 40} proyecto(s) más[/dim]")
+        
+        total = sum(p.size for p in idle)
+        if not self.menu.show_confirmation(
+            f"¿Archivar {len(idle)} proyecto(s) ({format_bytes(total)}) en {settings.cold_storage_path} "
+            "y borrar los originales?"
+        ):
+            self.menu.show_info("ℹ️ Archivado cancelado")
+            return
+        
+        failed = []
+        incomplete = []
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            console=self.menu.console
+        ) as progress:
+            task = progress.add_task("🧊 Archivando...", total=total)
+            
+            def report(path, entry, error):
+                if error and entry:
+                    incomplete.append(entry)
+                    progress.console.print(f"  [yellow]⚠️ {entry.name}: {error}[/yellow]")
+                elif error:
+                    failed.append(os.path.basename(path))
+                    progress.console.print(f"  [red]❌ {os.path.basename(path)}: {error}[/red]")
+                else:
+                    progress.console.print(
+                        f"  [green]🧊 {entry.name}[/green] [dim]{format_bytes(entry.size)} → "
+                        f"{format_bytes(entry.archive_size)}[/dim]"
+                    )
+            
+            archived = archive_projects(
+                idle, settings.cold_storage_path, level=min(max(settings.compression_level, 0), 9),
+                progress_callback=lambda size: progress.advance(task, size),
+                on_done=report
+            )
+        
+        removed = [e for e in archived if e not in incomplete]
+        saved = sum(e.size for e in removed) - sum(e.archive_size for e in archived)
+        self.menu.show_success(
+            f"✅ {len(archived)} proyecto(s) archivados, {format_bytes(max(saved, 0))} recuperados"
+        )
+        if incomplete:
+            self.menu.show_warning(
+                "⚠️ Archivados, pero el original no se borró del todo (bórralo a mano para "
+                f"poder restaurarlo): {', '.join(e.name for e in incomplete)}"
+            )
+        if failed:
+            self.menu.show_warning(f"⚠️ No se pudieron archivar (se conservan los originales): {', '.join(failed)}")
+    
+    def _restore_archived_project(self, entry):
+        """Restaura un proyecto del archivo en frío en su ubicación original."""
+        if not self.menu.show_confirmation(
+            f"¿Restaurar {entry.name} ({format_bytes(entry.size)}) en {self.projects_path}?"
+        ):
+            return
+        settings = self._backup_settings()
+        try:
+            with self.menu.console.status(f"[cyan]♻️ Restaurando {entry.name}...[/cyan]"):
+                target = restore_archived(entry, settings.cold_storage_path, self.projects_path)
+            self.menu.show_success(f"✅ Proyecto restaurado en {target}")
         except Exception as e:
-            self.menu.show_error(f"Error en backup masivo: {e}")
+            self.menu.show_error(f"Error restaurando {entry.name}: {e}")
+    
+    def _sweep_artifacts(self):
+        """Busca artefactos de compilación en todos los proyectos y elimina los seleccionados."""
+        self.menu.clear_screen()
+        
+        projects = self._get_projects()
+        if not projects:
+            self.menu.show_warning("⚠️ No hay proyectos en el directorio")
+            return
+        
+        with self.menu.console.status(f"[cyan]🔍 Buscando artefactos en {len(projects)} proyecto(s)...[/cyan]"):
+            found = find_artifacts(str(p) for p in projects)
+        
+        if not found:
+            self.menu.show_success("✅ No se encontraron artefactos de compilación")
+            return
+        
+        now = time.time()
+        table = Table(title="🧹 Artefactos por proyecto (menos activos primero)", box=box.ROUNDED)
+        table.add_column("Proyecto", style="cyan")
+        table.add_column("Última actividad", justify="right")
+        table.add_column("Artefactos")
+        table.add_column("Tamaño", justify="right", style="yellow")
+        
+        for project in found[:30]:
+            kinds: Dict[str, int] = {}
+            for artifact in project.artifacts:
+                kinds[artifact.kind] = kinds.get(artifact.kind, 0) + 1
+            table.add_row(
+                os.path.basename(project.path),
+                self._format_age(now - project.last_activity) if project.last_activity else "—",
+                ", ".join(f"{kind} ×{count}" if count > 1 else kind for kind, count in sorted(kinds.items())),
+                format_bytes(project.total_size)
+            )
+        
+        self.menu.console.print(table)
+        if len(found) > 30:
+            self.menu.console.print(f"[dim]... y {len(found) - 30} proyecto(s) más[/dim]")
+        self.menu.console.print()
+        
+        def inactive_for(days: int):
+            return [p for p in found if now - p.last_activity >= days * 86400]
+        
+        scope_options = []
+        for days in (180, 90, 30):
+            selected = inactive_for(days)
+            if selected:
+                size = sum(p.total_size for p in selected)
+                scope_options.append({
+                    'name': f"💤 Inactivos hace más de {days} días",
+                    'value': str(days),
+                    'description': f"{len(selected)} proyecto(s), {format_bytes(size)}"
+                })
+        scope_options.append({
+            'name': '🧹 Todos los proyectos',
+            'value': '0',
+            'description': format_bytes(sum(p.total_size for p in found))
+        })
+        
+        scope = self.menu.show_menu(scope_options, "🧹 ¿Qué proyectos quieres limpiar?")
+        if not scope or scope == 'exit':
+            return
+        
+        artifacts = [a for p in inactive_for(int(scope)) for a in p.artifacts]
+        
+        kinds = sorted({a.kind for a in artifacts})
+        if len(kinds) > 1:
+            kind_options = [{'name': '📦 Todos los tipos', 'value': '*'}] + [
+                {
+                    'name': kind,
+                    'value': kind,
+                    'description': format_bytes(sum(a.size for a in artifacts if a.kind == kind))
+                }
+                for kind in kinds
+            ]
+            kind = self.menu.show_menu(kind_options, "📦 ¿Qué tipo de artefacto?")
+            if not kind or kind == 'exit':
+                return
+            if kind != '*':
+                artifacts = [a for a in artifacts if a.kind == kind]
+        
+        total_size = sum(a.size for a in artifacts)
+        total_files = sum(a.file_count for a in artifacts)
+        if not self.menu.show_confirmation(
+            f"¿Eliminar {len(artifacts)} directorio(s) ({total_files:,} archivos, {format_bytes(total_size)})?"
+        ):
+            self.menu.show_info("ℹ️ Limpieza cancelada")
+            return
+        
+        # Un servidor de desarrollo en marcha puede tener abiertos archivos de node_modules o .venv
+        with self.menu.console.status("[cyan]🔍 Buscando archivos en uso...[/cyan]"):
+            open_files = OpenFilesIndex.build()
+        
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.percentage:>3.0f}%"),
+            console=self.menu.console
+        ) as progress:
+            task = progress.add_task("🗑️ Eliminando artefactos...", total=total_size or 1)
+            result = delete_artifacts(
+                artifacts,
+                progress_callback=lambda freed: progress.advance(task, freed),
+                open_files=open_files
+            )
+        
+        self.menu.show_success(
+            f"✅ {result.deleted_files:,} archivos eliminados, {format_bytes(result.deleted_size)} liberados"
+        )
+        if result.errors.count:
+            self.menu.show_warning(f"{result.errors.count:,} elementos no se pudieron eliminar")
+            for error in result.errors.samples:
+                self.menu.console.print(f"  [dim]• {error}[/dim]")
+    
+    def _format_duration(self, seconds: float) -> str:
+        """Formatea una duración corta como '1h 05m', '3m 12s' o '42s'."""
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        if seconds >= 60:
+            return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds}s"
+    
+    def _format_age(self, seconds: float) -> str:
+        """Formatea una antigüedad como 'hace N días/meses'."""
+        days = seconds / 86400
+        if days < 1:
+            return "hoy"
+        if days < 60:
+            return f"hace {days:.0f} días"
+        if days < 730:
+            return f"hace {days / 30:.0f} meses"
+        return f"hace {days / 365:.0f} años"
     
     def _deploy_menu(self):
         """Menú de deploy y testing."""
@@ -804,7 +1806,13 @@ $created_at = date('Y-m-d H:i:s');
         deploy_options = [
             {'name': '🚀 Deploy via Git', 'value': 'git'},
             {'name': '🧪 Test del proyecto', 'value': 'test'},
-            {'name': '🛠️ Build de producción', 'value': 'build'}
+            {'name': '🛠️ Build de producción', 'value': 'build'},
+            {'name': '🧪 Tests en varios proyectos', 'value': 'batch_test',
+             'description': 'En paralelo, con un log por proyecto'},
+            {'name': '🛠️ Builds en varios proyectos', 'value': 'batch_build',
+             'description': 'En paralelo, con un log por proyecto'},
+            {'name': '⏱️ Historial de tiempos', 'value': 'timings',
+             'description': 'Tendencias de tests y builds y ejecuciones más lentas de lo normal'}
         ]
         
         selection = self.menu.show_menu(deploy_options, "🚀 Deploy y Testing:")
@@ -815,6 +1823,12 @@ $created_at = date('Y-m-d H:i:s');
             self._run_tests()
         elif selection == 'build':
             self._build_production()
+        elif selection == 'batch_test':
+            self._run_batch(TEST)
+        elif selection == 'batch_build':
+            self._run_batch(BUILD)
+        elif selection == 'timings':
+            self._timing_history()
     
     def _deploy_git(self):
         """Deploy via Git."""
@@ -845,11 +1859,11 @@ $created_at = date('Y-m-d H:i:s');
         
         try:
             if selection == 'jest' and self._command_exists('npm'):
-                subprocess.run(['npm', 'test'])
+                self._run_timed(['npm', 'test'])
             elif selection == 'pytest' and self._command_exists('pytest'):
-                subprocess.run(['pytest'])
+                self._run_timed(['pytest'])
             elif selection == 'npm' and self._command_exists('npm'):
-                subprocess.run(['npm', 'test'])
+                self._run_timed(['npm', 'test'])
         except Exception as e:
             self.menu.show_error(f"Error ejecutando tests: {e}")
     
@@ -864,14 +1878,279 @@ $created_at = date('Y-m-d H:i:s');
         
         try:
             if selection == 'npm' and self._command_exists('npm'):
-                subprocess.run(['npm', 'run', 'build'])
-                self.menu.show_success("✅ Build completado!")
+                if self._run_timed(['npm', 'run', 'build']).ok:
+                    self.menu.show_success("✅ Build completado!")
             elif selection == 'python':
-                subprocess.run([sys.executable, 'setup.py', 'build'])
-                self.menu.show_success("✅ Build Python completado!")
+                if self._run_timed([sys.executable, 'setup.py', 'build']).ok:
+                    self.menu.show_success("✅ Build Python completado!")
         except Exception as e:
             self.menu.show_error(f"Error en build: {e}")
     
+    def _run_timed(self, command: List[str]):
+        """Ejecuta un comando en el directorio actual y guarda su tiempo en el historial del proyecto."""
+        label = command_label(command)
+        executable = tool_registry.find(command[0]) if not os.path.isabs(command[0]) else command[0]
+        timing = run_measured([executable or command[0], *command[1:]], label=label)
+        
+        project = os.getcwd()
+        history = TimingHistory()
+        history.record(project, timing)
+        runs = history.commands(project).get(label, [])
+        change = slowdown(runs, len(runs) - 1) if runs else None
+        
+        self.menu.console.print()
+        self.menu.console.print(f"[dim]⏱️ {label}: {self._format_timing(timing)}[/dim]")
+        if timing.returncode:
+            self.menu.show_error(f"❌ {label} terminó con código {timing.returncode}")
+        if change is not None and change > DEFAULT_THRESHOLD:
+            self.menu.show_warning(
+                f"🐢 {change:+.0f}% respecto a la mediana de las últimas ejecuciones "
+                f"({baseline(runs, len(runs) - 1):.1f}s)"
+            )
+        return timing
+    
+    def _format_timing(self, timing) -> str:
+        """Tiempo real, CPU y memoria máxima de una ejecución."""
+        parts = [f"{timing.wall:.1f}s"]
+        if timing.cpu is not None:
+            parts.append(f"CPU {timing.cpu:.1f}s")
+        if timing.max_rss:
+            parts.append(f"RSS máx. {format_bytes(timing.max_rss)}")
+        return ", ".join(parts)
+    
+    def _timing_history(self):
+        """Tendencias de tiempo de tests y builds, con las ejecuciones lentas marcadas."""
+        self.menu.clear_screen()
+        history = TimingHistory()
+        projects = history.projects()
+        if not projects:
+            self.menu.show_warning("⚠️ Todavía no hay tiempos registrados")
+            return
+        
+        project = self.menu.show_menu(
+            [{'name': f"📁 {os.path.basename(p)}", 'value': p, 'description': p} for p in projects],
+            "📁 Proyecto:"
+        )
+        if not project or project == 'exit':
+            return
+        threshold_str = self.menu.show_input("🐢 Marcar ejecuciones más lentas que la mediana en (%):",
+                                             f"{DEFAULT_THRESHOLD:g}")
+        try:
+            threshold = float(threshold_str) if threshold_str else DEFAULT_THRESHOLD
+        except ValueError:
+            self.menu.show_error("❌ Porcentaje no válido")
+            return
+        
+        commands = history.commands(project)
+        summary = Table(title=f"⏱️ {os.path.basename(project)}: tendencia (umbral {threshold:g}%)", box=box.ROUNDED)
+        summary.add_column("Comando", style="cyan")
+        summary.add_column("Ejecuciones", justify="right")
+        summary.add_column("Última", justify="right")
+        summary.add_column("Mediana", justify="right")
+        summary.add_column("Tendencia")
+        summary.add_column("Lentas", justify="right")
+        for command, runs in sorted(commands.items()):
+            ok_walls = [run.wall for run in runs if run.ok]
+            flagged = regressions(runs, threshold)
+            last = runs[-1]
+            last_text = f"{last.wall:.1f}s" if last.ok else f"[red]{last.wall:.1f}s ✗[/red]"
+            if flagged and flagged[-1] == len(runs) - 1:
+                last_text = f"[red]{last.wall:.1f}s 🐢[/red]"
+            summary.add_row(
+                command,
+                str(len(runs)),
+                last_text,
+                f"{statistics.median(ok_walls):.1f}s" if ok_walls else "—",
+                self._sparkline(ok_walls[-20:]),
+                f"[red]{len(flagged)}[/red]" if flagged else "0"
+            )
+        self.menu.console.print(summary)
+        
+        command = self.menu.show_menu(
+            [{'name': f"⏱️ {c}", 'value': c} for c in sorted(commands)],
+            "🔍 Ver ejecuciones de:"
+        )
+        if not command or command == 'exit':
+            return
+        runs = commands[command]
+        flagged = set(regressions(runs, threshold))
+        table = Table(title=f"⏱️ {command}", box=box.SIMPLE)
+        table.add_column("Fecha", style="dim")
+        table.add_column("Real", justify="right")
+        table.add_column("CPU", justify="right")
+        table.add_column("RSS máx.", justify="right")
+        table.add_column("vs. mediana", justify="right")
+        table.add_column("Resultado")
+        for index, run in reversed(list(enumerate(runs))):
+            change = slowdown(runs, index)
+            if change is None:
+                change_text = "—"
+            elif index in flagged:
+                change_text = f"[red]{change:+.0f}% 🐢[/red]"
+            else:
+                change_text = f"{change:+.0f}%"
+            if run.interrupted:
+                outcome = "[yellow]interrumpida[/yellow]"
+            else:
+                outcome = "[green]ok[/green]" if run.ok else f"[red]código {run.returncode}[/red]"
+            table.add_row(
+                datetime.fromtimestamp(run.started).strftime('%Y-%m-%d %H:%M'),
+                f"{run.wall:.1f}s",
+                f"{run.cpu:.1f}s" if run.cpu is not None else "—",
+                format_bytes(run.max_rss) if run.max_rss else "—",
+                change_text,
+                outcome
+            )
+        self.menu.console.print(table)
+    
+    def _sparkline(self, values: List[float]) -> str:
+        """Minigráfico de barras con los valores escalados entre su mínimo y su máximo."""
+        if not values:
+            return ""
+        bars = "▁▂▃▄▅▆▇█"
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        return "".join(bars[int((value - low) / span * (len(bars) - 1))] for value in values)
+    
+    def _choose_batch_projects(self) -> List[Path]:
+        """Elige los proyectos del lote: todos los de un tipo o una selección manual."""
+        catalog = self._catalog()
+        entries = catalog.projects() if self.projects_path.exists() else []
+        if not entries:
+            self.menu.show_warning("⚠️ No hay proyectos en el directorio")
+            return []
+        catalog.describe_all(entries)
+        
+        counts: Dict[str, int] = {}
+        for entry in entries:
+            counts[entry.type] = counts.get(entry.type, 0) + 1
+        choices = [{'name': '✅ Elegir proyectos uno a uno', 'value': 'pick'}]
+        choices.extend(
+            {'name': f"📁 Todos los de tipo {project_type}", 'value': f"type:{project_type}",
+             'description': f"{count} proyecto(s)"}
+            for project_type, count in sorted(counts.items())
+        )
+        choices.append({'name': '📂 Todos los proyectos', 'value': 'all'})
+        selection = self.menu.show_menu(choices, "📂 ¿Qué proyectos?")
+        
+        if selection == 'all':
+            return [Path(entry.path) for entry in entries]
+        if selection and selection.startswith('type:'):
+            project_type = selection[len('type:'):]
+            return [Path(entry.path) for entry in entries if entry.type == project_type]
+        if selection != 'pick':
+            return []
+        
+        selected = set()
+        while True:
+            picks = [
+                {'name': f"{'✅' if entry.path in selected else '⬜'} {entry.name}", 'value': entry.path,
+                 'description': entry.type}
+                for entry in entries
+            ]
+            picks.append({'name': f"▶️ Ejecutar en {len(selected)} proyecto(s)", 'value': 'run'})
+            choice = self.menu.show_menu(picks, "📂 Selecciona para marcar/desmarcar:")
+            if choice == 'run':
+                return [Path(entry.path) for entry in entries if entry.path in selected]
+            if not choice or choice == 'exit':
+                return []
+            selected ^= {choice}
+    
+    def _run_batch(self, action: str):
+        """Ejecuta tests o builds en varios proyectos a la vez con una tabla de estado en vivo."""
+        self.menu.clear_screen()
+        projects = self._choose_batch_projects()
+        if not projects:
+            return
+        
+        workers_str = self.menu.show_input("⚙️ Trabajos simultáneos:", str(min(4, os.cpu_count() or 1)))
+        if not workers_str or not workers_str.strip().isdigit() or int(workers_str) < 1:
+            self.menu.show_error("❌ Número no válido")
+            return
+        
+        log_dir = batch_log_dir()
+        jobs = prepare_jobs(projects, action, log_dir)
+        skipped = [job.name for job in jobs if job.state == SKIPPED]
+        if skipped:
+            self.menu.show_warning(f"⚠️ Sin comando de {action} reconocido: {', '.join(skipped)}")
+        if len(skipped) == len(jobs):
+            return
+        
+        history = TimingHistory()
+        runner = BatchRunner(jobs, workers=int(workers_str), history=history)
+        worker = threading.Thread(target=runner.run, daemon=True)
+        title = "🧪 Tests" if action == TEST else "🛠️ Builds"
+        
+        self.menu.show_info(f"{title} en {len(jobs) - len(skipped)} proyecto(s) - Ctrl+C para cancelar")
+        worker.start()
+        try:
+            with Live(self._batch_table(jobs, title), console=self.menu.console, auto_refresh=False) as live:
+                while worker.is_alive():
+                    worker.join(0.5)
+                    live.update(self._batch_table(jobs, title), refresh=True)
+        except KeyboardInterrupt:
+            runner.cancel()
+            with self.menu.console.status("[yellow]⏹️ Cancelando trabajos en curso...[/yellow]"):
+                worker.join()
+        
+        self.menu.console.print()
+        self.menu.console.print(self._batch_table(jobs, f"{title}: resumen", history))
+        
+        passed = sum(1 for job in jobs if job.state == PASSED)
+        ran = [job for job in jobs if job.state != SKIPPED]
+        if passed == len(ran):
+            self.menu.show_success(f"✅ {passed}/{len(ran)} proyecto(s) correctos")
+        else:
+            self.menu.show_warning(f"⚠️ {passed}/{len(ran)} proyecto(s) correctos")
+        self.menu.show_info(f"📄 Logs en {log_dir}")
+    
+    def _batch_table(self, jobs, title: str, history=None) -> Table:
+        """Tabla de estado de un lote; con `history` es el resumen final con CPU, memoria y tendencia."""
+        styles = {
+            PASSED: "[green]✅ ok[/green]",
+            FAILED: "[red]❌ fallo[/red]",
+            TIMED_OUT: "[red]⏱️ tiempo agotado[/red]",
+            CANCELLED: "[yellow]⏹️ cancelado[/yellow]",
+            RUNNING: "[cyan]⏳ ejecutando[/cyan]",
+            SKIPPED: "[dim]— sin comando[/dim]",
+        }
+        summary = history is not None
+        table = Table(title=title, box=box.ROUNDED)
+        table.add_column("Proyecto", style="cyan", no_wrap=True)
+        table.add_column("Estado", no_wrap=True)
+        table.add_column("Duración", justify="right")
+        if summary:
+            table.add_column("CPU", justify="right")
+            table.add_column("RSS máx.", justify="right")
+            table.add_column("vs. mediana", justify="right")
+        table.add_column("Log" if summary else "Última línea", style="dim", overflow="ellipsis", no_wrap=True)
+        
+        for job in jobs:
+            duration = f"{job.duration:.1f}s" if job.duration is not None else "—"
+            row = [job.name, styles.get(job.state, "[dim]pendiente[/dim]"), duration]
+            if summary:
+                timing = job.timing
+                change = None
+                if timing and timing.ok:
+                    runs = history.commands(job.project).get(timing.command, [])
+                    change = slowdown(runs, len(runs) - 1) if runs else None
+                if change is None:
+                    change_text = "—"
+                elif change > DEFAULT_THRESHOLD:
+                    change_text = f"[red]{change:+.0f}% 🐢[/red]"
+                else:
+                    change_text = f"{change:+.0f}%"
+                row += [
+                    f"{timing.cpu:.1f}s" if timing and timing.cpu is not None else "—",
+                    format_bytes(timing.max_rss) if timing and timing.max_rss else "—",
+                    change_text
+                ]
+                detail = str(job.log_path) if job.state in (FAILED, TIMED_OUT) else ""
+            else:
+                detail = job.last_line() if job.state == RUNNING else ""
+            table.add_row(*row, detail[:100])
+        return table
+    
     def _docker_menu(self):
         """Menú de operaciones Docker."""
         self.menu.clear_screen()
@@ -936,67 +2215,23 @@ $created_at = date('Y-m-d H:i:s');
             
             config_table.add_row("Directorio de proyectos", str(self.projects_path))
             config_table.add_row("Proyectos encontrados", str(len(self._get_projects())))
-            config_table.add_row("Git disponible", "✅" if self._command_exists('git') else "❌")
-            config_table.add_row("Docker disponible", "✅" if self._command_exists('docker') else "❌")
-            config_table.add_row("Node.js disponible", "✅" if self._command_exists('npm') else "❌")
+            # Las versiones se consultan a la vez y quedan en caché para la próxima
+            versions = tool_registry.versions(['git', 'docker', 'npm'])
+            for label, tool in (("Git", 'git'), ("Docker", 'docker'), ("Node.js (npm)", 'npm')):
+                if self._command_exists(tool):
+                    config_table.add_row(f"{label} disponible", f"✅ {versions[tool] or ''}".rstrip())
+                else:
+                    config_table.add_row(f"{label} disponible", "❌")
             
             self.menu.console.print(config_table)
     
     def _command_exists(self, command: str) -> bool:
-        """Verifica si un comando existe en el sistema."""
-        try:
-            subprocess.run([command, '--version'], capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            # Para VS Code, intentar variaciones del comando
-            if command == 'code':
-                # Probar code.cmd que es lo que realmente funciona
-                try:
-                    subprocess.run(['code.cmd', '--version'], capture_output=True, check=True, timeout=5)
-                    return True
-                except:
-                    return self._check_vscode_installation()
-            return False
+        """Verifica si un comando existe en el sistema (sin ejecutarlo)."""
+        return tool_registry.exists(command)
     
     def _check_vscode_installation(self) -> bool:
-        """Verifica si VS Code está instalado en ubicaciones comunes."""
-        # Rutas comunes donde se instala VS Code
-        common_paths = [
-            # Tu ubicación específica
-            r"C:\Users\{}\AppData\Local\Programs\Microsoft VS Code\bin\code.cmd".format(os.environ.get('USERNAME', '')),
-            r"C:\Users\{}\AppData\Local\Programs\Microsoft VS Code\Code.exe".format(os.environ.get('USERNAME', '')),
-            # Instalaciones del sistema
-            r"C:\Program Files\Microsoft VS Code\bin\code.cmd",
-            r"C:\Program Files\Microsoft VS Code\Code.exe",
-            r"C:\Program Files (x86)\Microsoft VS Code\bin\code.cmd",
-            r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
-            # Comandos en PATH
-            "code.cmd",
-            "code"
-        ]
-        
-        for path in common_paths:
-            try:
-                if os.path.exists(path):
-                    return True
-                # Intentar ejecutar el comando
-                subprocess.run([path, '--version'], capture_output=True, check=True, timeout=5)
-                return True
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-        
-        # Verificar en PATH del sistema (no solo del usuario)
-        try:
-            # Obtener PATH completo del sistema
-            import winreg
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment") as key:
-                system_path = winreg.QueryValueEx(key, "Path")[0]
-                if "Microsoft VS Code" in system_path:
-                    return True
-        except Exception:
-            pass
-        
-        return False
+        """Verifica si VS Code está instalado (PATH o ubicaciones comunes)."""
+        return tool_registry.exists('code')
     
     def _open_vscode(self, project_path: Path) -> bool:
         """Abre VS Code con mejor detección de rutas."""
@@ -1210,44 +2445,8 @@ $created_at = date('Y-m-d H:i:s');
             return False
     
     def _find_windows_terminal(self) -> Optional[str]:
-        """Busca Windows Terminal en ubicaciones comunes y retorna la ruta si lo encuentra."""
-        # Primero intentar el comando wt
-        if self._command_exists('wt'):
-            return 'wt'
-        
-        # Buscar ejecutable en ubicaciones comunes
-        wt_paths = [
-            # Microsoft Store - usuario actual
-            os.path.expandvars(r'%LOCALAPPDATA%\Microsoft\WindowsApps\wt.exe'),
-            # Microsoft Store - sistema (con wildcard)
-            r'C:\Program Files\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe',
-            # Instalación manual
-            r'C:\Program Files\Windows Terminal\wt.exe',
-            r'C:\Program Files (x86)\Windows Terminal\wt.exe',
-            # Otras ubicaciones posibles
-            os.path.expandvars(r'%USERPROFILE%\AppData\Local\Microsoft\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe'),
-            os.path.expandvars(r'%PROGRAMFILES%\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe')
-        ]
-        
-        for wt_path in wt_paths:
-            try:
-                # Para rutas con wildcards, usar glob
-                if '*' in wt_path:
-                    import glob
-                    matching_paths = glob.glob(wt_path)
-                    if matching_paths:
-                        # Ordenar para obtener la versión más reciente
-                        matching_paths.sort(reverse=True)
-                        wt_path = matching_paths[0]
-                    else:
-                        continue
-                
-                if os.path.exists(wt_path):
-                    return wt_path
-            except Exception:
-                continue
-        
-        return None
+        """Busca Windows Terminal (PATH o ubicaciones comunes) y retorna la ruta si lo encuentra."""
+        return tool_registry.find('wt')
 
 
 def main():
@@ -1256,5 +2455,20 @@ def main():
     proyectos_module.main()
 
 
+def respaldar_repositorio(root: Optional[str] = None) -> int:
+    """Crea una instantánea deduplicada de los proyectos sin interfaz (para tareas nocturnas)."""
+    return ProyectosModule().run_repository_backup(Path(root) if root else None)
+
+
+def purgar_repositorio(keep_last: int) -> int:
+    """Purga el repositorio deduplicado sin interfaz."""
+    return ProyectosModule().run_repository_prune(keep_last)
+
+
+def sincronizar_espejo() -> int:
+    """Sincroniza el espejo de proyectos sin interfaz."""
+    return ProyectosModule().run_mirror_sync()
+
+
 if __name__ == "__main__":
     main()
@@ -15,6 +15,7 @@ from rich.panel import Panel
 from rich import box
 
 from ..menu import NooxMenu
+from ..utils.tools import tool_registry
 
 
 class RepararModule:
@@ -339,20 +340,10 @@ if (Get-Command oh-my-posh -ErrorAction SilentlyContinue) {
         Returns:
             Estado de la instalación como string
         """
-        try:
-            # Verificar comando oh-my-posh en PATH
-            result = subprocess.run(['oh-my-posh', '--version'], 
-                                  capture_output=True, text=True, shell=True)
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                return f"✅ Instalado (v{version})"
-        except:
-            pass
-        
-        # Verificar instalación en ubicación estándar
-        omp_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Programs" / "oh-my-posh" / "bin" / "oh-my-posh.exe"
-        if omp_path.exists():
-            return "✅ Instalado (ubicación estándar)"
+        # PATH o ubicación estándar; la versión solo se consulta una vez y queda en caché
+        if tool_registry.exists('oh-my-posh'):
+            version = tool_registry.version('oh-my-posh')
+            return f"✅ Instalado (v{version})" if version else "✅ Instalado"
         
         return "❌ No instalado"
     
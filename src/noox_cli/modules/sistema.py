@@ -12,15 +12,37 @@ import tempfile
 import shutil
 import webbrowser
 import socket
+import time
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from ..menu import NooxMenu
+from ..utils.appcaches import BROWSER, discover_app_caches, group_by_application, measure_app_caches
+from ..utils.capacity import (
+    FREE_BYTES, FREE_INODES, format_eta, project_exhaustion, record_samples, sample_mounts
+)
+from ..utils.cleanup import CleanupManifest, CleanupResult, build_manifest, execute_manifest
+from ..utils.diskbench import MB, run_disk_benchmark
+from ..utils.diskio import PeakTracker, compute_io_stats, read_disk_counters
+from ..utils.formatting import format_bytes
+from ..utils.mounts import mount_prober
+from ..utils.openfiles import OpenFilesIndex
+from ..utils.retention import (
+    RetentionPolicy, load_policies, needs_run, plan_retention, record_run, save_policy, unmanaged_policy
+)
+from ..utils.scanner import ScanResult, scan_directory
+from ..utils.snapshots import (
+    APPEARED, GREW, MAX_SNAPSHOTS, SHRANK, SNAPSHOT_SUFFIX, VANISHED, SnapshotDiff, diff_snapshots,
+    list_snapshot_paths, list_snapshot_roots, load_snapshot, save_snapshot, snapshot_from_scan, take_snapshot
+)
+from ..utils.tools import tool_registry
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+from rich.live import Live
 from rich import box
 
 try:
@@ -60,6 +82,16 @@ class DiskInfo:
     used: int
     free: int
     percent: float
+    responsive: bool = True
+    inodes_total: Optional[int] = None
+    inodes_used: Optional[int] = None
+    inodes_free: Optional[int] = None
+    
+    @property
+    def inodes_percent(self) -> Optional[float]:
+        if not self.inodes_total:
+            return None
+        return self.inodes_used / self.inodes_total * 100
 
 
 @dataclass
@@ -80,6 +112,9 @@ class SistemaModule:
         
     def main(self):
         """Función principal del módulo de sistema."""
+        # Una muestra de espacio libre por apertura del menú alimenta la tendencia de llenado
+        threading.Thread(target=self._record_capacity_sample, daemon=True).start()
+        
         while True:
             self.menu.show_banner()
             
@@ -143,6 +178,15 @@ class SistemaModule:
             
             self._handle_selection(selection)
     
+    def _record_capacity_sample(self):
+        """Registra en segundo plano el espacio libre de las unidades (sin mensajes)."""
+        if not psutil:
+            return
+        try:
+            sample_mounts([partition.mountpoint for partition in psutil.disk_partitions()])
+        except Exception:
+            pass
+    
     def _handle_selection(self, selection: str):
         """Maneja la selección del usuario."""
         handlers = {
@@ -360,18 +404,7 @@ class SistemaModule:
     
     def _format_bytes(self, bytes_value: int) -> str:
         """Formatea bytes en unidades legibles."""
-        if bytes_value == 0:
-            return "0 B"
-        
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        size = bytes_value
-        unit_index = 0
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
-        
-        return f"{size:.1f} {units[unit_index]}"
+        return format_bytes(bytes_value)
     
     def _show_processes(self):
         """Muestra y gestiona procesos del sistema."""
@@ -1099,6 +1132,16 @@ class SistemaModule:
                     'value': 'low_space',
                     'description': 'Mostrar solo unidades con poco espacio'
                 },
+                {
+                    'name': '⚡ Rendimiento de E/S',
+                    'value': 'io_stats',
+                    'description': 'IOPS, throughput, latencia y utilización en vivo'
+                },
+                {
+                    'name': '🏁 Benchmark de disco',
+                    'value': 'benchmark',
+                    'description': 'Medir MB/s, IOPS y latencia en un directorio'
+                },
                 {
                     'name': '🗂️ Archivos temporales',
                     'value': 'temp_files',
@@ -1107,7 +1150,12 @@ class SistemaModule:
                 {
                     'name': '🔍 Analizar directorio',
                     'value': 'analyze_dir',
-                    'description': 'Analizar uso de espacio en directorio'
+                    'description': 'Tamaño, tipos de archivo y antigüedad de cualquier ruta'
+                },
+                {
+                    'name': '📸 Instantáneas y crecimiento',
+                    'value': 'snapshots',
+                    'description': 'Qué directorios y archivos crecieron desde el último escaneo'
                 }
             ]
             
@@ -1123,10 +1171,16 @@ class SistemaModule:
                     self._show_detailed_disk_usage()
                 elif selection == 'low_space':
                     self._show_low_space_drives()
+                elif selection == 'io_stats':
+                    self._show_disk_io_monitor()
+                elif selection == 'benchmark':
+                    self._run_disk_benchmark()
                 elif selection == 'temp_files':
                     self._show_temp_files_size()
                 elif selection == 'analyze_dir':
                     self._analyze_directory()
+                elif selection == 'snapshots':
+                    self._disk_snapshots_menu()
             except Exception as e:
                 self.menu.show_error(f"Error en información de disco: {e}")
             
@@ -1141,22 +1195,29 @@ class SistemaModule:
                 # Usar psutil para obtener información de particiones
                 partitions = psutil.disk_partitions()
                 
+                # Consultar todas las unidades en paralelo con tiempo límite por montaje
+                usages = mount_prober.usage([partition.mountpoint for partition in partitions])
+                
                 for partition in partitions:
-                    try:
-                        usage = psutil.disk_usage(partition.mountpoint)
-                        
-                        disks.append(DiskInfo(
-                            device=partition.device,
-                            mountpoint=partition.mountpoint,
-                            fstype=partition.fstype,
-                            total=usage.total,
-                            used=usage.used,
-                            free=usage.free,
-                            percent=(usage.used / usage.total) * 100 if usage.total > 0 else 0
-                        ))
-                    except (PermissionError, OSError):
+                    usage = usages[partition.mountpoint]
+                    
+                    if usage.error:
                         # Saltar unidades no accesibles
                         continue
+                    
+                    disks.append(DiskInfo(
+                        device=partition.device,
+                        mountpoint=partition.mountpoint,
+                        fstype=partition.fstype,
+                        total=usage.total,
+                        used=usage.used,
+                        free=usage.free,
+                        percent=(usage.used / usage.total) * 100 if usage.total > 0 else 0,
+                        responsive=usage.responsive,
+                        inodes_total=usage.inodes_total,
+                        inodes_used=usage.inodes_used,
+                        inodes_free=usage.inodes_free
+                    ))
             else:
                 # Fallback usando shutil para unidad actual
                 usage = shutil.disk_usage('.')
@@ -1201,6 +1262,10 @@ class SistemaModule:
         disk_table.add_column("Estado", style="white", width=10)
         
         for disk in disks:
+            if not disk.responsive:
+                disk_table.add_row(disk.device, disk.fstype, "-", "-", "-", "-", "[red]⏳ Sin respuesta[/red]")
+                continue
+            
             # Determinar color y estado según el porcentaje usado
             if disk.percent >= 90:
                 percent_style = "red"
@@ -1228,14 +1293,27 @@ class SistemaModule:
         self.menu.console.print(disk_table)
         
         # Mostrar resumen
-        total_space = sum(disk.total for disk in disks)
-        total_used = sum(disk.used for disk in disks)
-        total_free = sum(disk.free for disk in disks)
+        responsive_disks = [disk for disk in disks if disk.responsive]
+        total_space = sum(disk.total for disk in responsive_disks)
+        total_used = sum(disk.used for disk in responsive_disks)
+        total_free = sum(disk.free for disk in responsive_disks)
         
         self.menu.console.print(f"\n[cyan]📊 Resumen Total:[/cyan]")
         self.menu.console.print(f"  💾 Espacio total: {self._format_bytes(total_space)}")
         self.menu.console.print(f"  📊 Espacio usado: {self._format_bytes(total_used)}")
         self.menu.console.print(f"  💚 Espacio libre: {self._format_bytes(total_free)}")
+        self._warn_unresponsive_drives(disks)
+    
+    def _warn_unresponsive_drives(self, disks: List[DiskInfo]):
+        """Advierte sobre unidades que no respondieron a tiempo."""
+        unresponsive = [disk for disk in disks if not disk.responsive]
+        if unresponsive:
+            self.menu.console.print()
+            self.menu.show_warning(
+                f"{len(unresponsive)} unidad(es) no respondieron a tiempo "
+                f"(montaje de red colgado o dispositivo desconectado): "
+                f"{', '.join(disk.mountpoint for disk in unresponsive)}"
+            )
     
     def _show_detailed_disk_usage(self):
         """Muestra uso detallado de disco con gráficos."""
@@ -1257,6 +1335,15 @@ class SistemaModule:
             # Crear panel para cada unidad
             self.menu.console.print(f"\n[bold cyan]💾 Unidad {disk.device}[/bold cyan]")
             
+            if not disk.responsive:
+                self.menu.console.print(Panel(
+                    f"📁 Punto de montaje: {disk.mountpoint}\n"
+                    f"⏳ La unidad no respondió a tiempo",
+                    title=f"[bold]{disk.device}[/bold]",
+                    border_style="red"
+                ))
+                continue
+            
             # Crear barra de progreso visual
             bar_length = 40
             used_blocks = int((disk.percent / 100) * bar_length)
@@ -1286,7 +1373,7 @@ class SistemaModule:
             self.menu.console.print(info_panel)
     
     def _show_low_space_drives(self):
-        """Muestra solo unidades con poco espacio libre."""
+        """Muestra unidades con poco espacio o inodos libres y proyecta cuándo se llenarán."""
         self.menu.clear_screen()
         
         with Progress(
@@ -1295,52 +1382,237 @@ class SistemaModule:
             console=self.menu.console
         ) as progress:
             task = progress.add_task("Buscando unidades con poco espacio...", total=None)
-            disks = self._get_disk_info()
+            all_disks = self._get_disk_info()
+            disks = [disk for disk in all_disks if disk.responsive]
+            
+            # Registrar una muestra de espacio e inodos libres para estimar la tendencia
+            samples = record_samples([(disk.mountpoint, disk.free, disk.inodes_free) for disk in disks])
+        
+        week = 7 * 24 * 60 * 60
+        candidates = []
+        for disk in disks:
+            history = samples.get(disk.mountpoint, [])
+            bytes_eta = project_exhaustion(history, FREE_BYTES)
+            inodes_eta = project_exhaustion(history, FREE_INODES)
+            inodes_percent = disk.inodes_percent or 0
+            
+            # Poco espacio, pocos inodos o se llenará en menos de una semana
+            if (disk.percent >= 70 or inodes_percent >= 70
+                    or (bytes_eta is not None and bytes_eta < week)
+                    or (inodes_eta is not None and inodes_eta < week)):
+                candidates.append((disk, bytes_eta, inodes_eta))
         
-        # Filtrar unidades con más del 70% de uso
-        low_space_disks = [disk for disk in disks if disk.percent >= 70]
+        self._warn_unresponsive_drives(all_disks)
         
-        if not low_space_disks:
-            self.menu.show_success("✅ Todas las unidades tienen espacio suficiente")
+        if not candidates:
+            self.menu.show_success("✅ Todas las unidades tienen espacio e inodos suficientes")
             return
         
         # Mostrar advertencia
-        self.menu.show_warning(f"⚠️ Se encontraron {len(low_space_disks)} unidades con poco espacio")
+        self.menu.show_warning(f"⚠️ Se encontraron {len(candidates)} unidades con poco espacio")
         
         # Crear tabla de unidades con poco espacio
         disk_table = Table(title="⚠️ Unidades con Poco Espacio", box=box.DOUBLE)
         disk_table.add_column("Unidad", style="cyan", no_wrap=True)
         disk_table.add_column("% Usado", style="red", justify="right")
         disk_table.add_column("Espacio Libre", style="green", justify="right")
+        disk_table.add_column("% Inodos", style="red", justify="right")
+        disk_table.add_column("Inodos Libres", style="green", justify="right")
+        disk_table.add_column("Lleno en", style="yellow", justify="right")
         disk_table.add_column("Prioridad", style="white")
         
-        for disk in sorted(low_space_disks, key=lambda x: x.percent, reverse=True):
-            if disk.percent >= 90:
+        def usage_key(item):
+            return max(item[0].percent, item[0].inodes_percent or 0)
+        
+        for disk, bytes_eta, inodes_eta in sorted(candidates, key=usage_key, reverse=True):
+            usage_percent = max(disk.percent, disk.inodes_percent or 0)
+            etas = [eta for eta in (bytes_eta, inodes_eta) if eta is not None]
+            eta = min(etas) if etas else None
+            
+            if usage_percent >= 90 or (eta is not None and eta < 24 * 60 * 60):
                 priority = "🔴 CRÍTICO"
                 priority_style = "red"
-            elif disk.percent >= 80:
+            elif usage_percent >= 80 or (eta is not None and eta < 3 * 24 * 60 * 60):
                 priority = "🟡 ALTO"
                 priority_style = "yellow"
             else:
                 priority = "🟠 MEDIO"
                 priority_style = "orange"
             
+            if eta is None:
+                eta_text = format_eta(None)
+            else:
+                resource = "inodos" if inodes_eta is not None and eta == inodes_eta else "espacio"
+                eta_text = f"{format_eta(eta)} ({resource})"
+            
             disk_table.add_row(
                 disk.device,
                 f"{disk.percent:.1f}%",
                 self._format_bytes(disk.free),
+                f"{disk.inodes_percent:.1f}%" if disk.inodes_percent is not None else "N/D",
+                f"{disk.inodes_free:,}" if disk.inodes_free is not None else "N/D",
+                eta_text,
                 f"[{priority_style}]{priority}[/{priority_style}]"
             )
         
         self.menu.console.print(disk_table)
+        self.menu.console.print("[dim]La proyección se calcula con las muestras tomadas al abrir el menú de sistema y esta vista (máx. una cada 5 minutos).[/dim]")
         
         # Sugerencias
         self.menu.console.print("\n[bold cyan]💡 Sugerencias:[/bold cyan]")
         self.menu.console.print("  🧹 Ejecuta 'Limpiar temporales' para liberar espacio")
+        if any((disk.inodes_percent or 0) >= 70 for disk, _, _ in candidates):
+            self.menu.console.print("  🗂️ Muchos archivos pequeños agotan los inodos: revisa cachés y node_modules")
         self.menu.console.print("  📁 Revisa la carpeta de Descargas y Documentos")
         self.menu.console.print("  🗑️ Vacía la Papelera de reciclaje")
         self.menu.console.print("  💿 Considera mover archivos grandes a otra unidad")
     
+    def _show_disk_io_monitor(self):
+        """Muestra en vivo el rendimiento de E/S por dispositivo (estilo iostat)."""
+        interval_str = self.menu.show_input("⏱️ Intervalo de actualización en segundos:", "1")
+        if interval_str is None:
+            return
+        
+        try:
+            interval = max(float(interval_str), 0.2)
+        except ValueError:
+            self.menu.show_error("❌ Intervalo no válido")
+            return
+        
+        previous = read_disk_counters()
+        if not previous:
+            self.menu.show_error("❌ No se pudieron leer contadores de E/S de disco")
+            return
+        
+        self.menu.clear_screen()
+        self.menu.show_info("⚡ Monitor de E/S - presiona Ctrl+C para detener")
+        
+        peaks = PeakTracker()
+        previous_time = time.monotonic()
+        
+        try:
+            with Live(self._build_io_table([], interval), console=self.menu.console, auto_refresh=False) as live:
+                while True:
+                    time.sleep(interval)
+                    current = read_disk_counters()
+                    current_time = time.monotonic()
+                    
+                    stats = compute_io_stats(previous, current, current_time - previous_time)
+                    peaks.update(stats)
+                    live.update(self._build_io_table(stats, interval), refresh=True)
+                    
+                    previous, previous_time = current, current_time
+        except KeyboardInterrupt:
+            pass
+        
+        if peaks.samples:
+            self.menu.console.print()
+            self.menu.console.print(self._build_io_table(
+                list(peaks.peaks.values()),
+                interval,
+                title=f"📈 Picos de la sesión ({peaks.samples} muestras)"
+            ))
+    
+    def _build_io_table(self, stats: list, interval: float, title: Optional[str] = None) -> Table:
+        """Construye la tabla de rendimiento de E/S por dispositivo."""
+        io_table = Table(title=title or f"⚡ Rendimiento de E/S (cada {interval:g}s)", box=box.DOUBLE)
+        io_table.add_column("Dispositivo", style="cyan", no_wrap=True)
+        io_table.add_column("r/s", style="green", justify="right")
+        io_table.add_column("w/s", style="yellow", justify="right")
+        io_table.add_column("Lectura/s", style="green", justify="right")
+        io_table.add_column("Escritura/s", style="yellow", justify="right")
+        io_table.add_column("await ms", style="magenta", justify="right")
+        io_table.add_column("Cola", style="blue", justify="right")
+        io_table.add_column("% Util", style="white", justify="right")
+        
+        for stat in stats:
+            if stat.util_percent is None:
+                util = "N/D"
+            else:
+                util_style = "red" if stat.util_percent >= 90 else "yellow" if stat.util_percent >= 60 else "green"
+                util = f"[{util_style}]{stat.util_percent:.1f}%[/{util_style}]"
+            
+            io_table.add_row(
+                stat.device,
+                f"{stat.read_iops:.1f}",
+                f"{stat.write_iops:.1f}",
+                self._format_bytes(int(stat.read_bps)),
+                self._format_bytes(int(stat.write_bps)),
+                f"{stat.await_ms:.2f}",
+                f"{stat.queue_depth:.2f}",
+                util
+            )
+        
+        return io_table
+    
+    def _run_disk_benchmark(self):
+        """Mide rendimiento y latencia de disco escribiendo y leyendo un archivo temporal."""
+        directory = self.menu.show_input("📁 Directorio donde ejecutar la prueba:", tempfile.gettempdir())
+        if not directory:
+            return
+        
+        if not os.path.isdir(directory):
+            self.menu.show_error(f"❌ '{directory}' no es un directorio")
+            return
+        
+        size_str = self.menu.show_input("💾 Tamaño del archivo de prueba en MB:", "256")
+        try:
+            file_size = int(size_str) * MB
+        except (TypeError, ValueError):
+            self.menu.show_error("❌ Tamaño no válido")
+            return
+        
+        free = shutil.disk_usage(directory).free
+        if file_size <= 0 or file_size > free // 2:
+            self.menu.show_error(f"❌ El tamaño debe ser positivo y menor que la mitad del espacio libre ({self._format_bytes(free)})")
+            return
+        
+        fsync = self.menu.show_confirmation("🔒 ¿Sincronizar (fsync) después de cada escritura?")
+        direct = self.menu.show_confirmation("🚫 ¿Evitar la caché del sistema cuando sea posible?")
+        
+        self.menu.clear_screen()
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.menu.console
+        ) as progress:
+            task = progress.add_task("Preparando benchmark...", total=None)
+            report = run_disk_benchmark(
+                directory,
+                file_size=file_size,
+                fsync=fsync,
+                direct=direct,
+                progress_callback=lambda description: progress.update(task, description=f"{description}...")
+            )
+        
+        bench_table = Table(title=f"🏁 Benchmark de disco: {directory}", box=box.DOUBLE)
+        bench_table.add_column("Prueba", style="cyan", no_wrap=True)
+        bench_table.add_column("Bloque", style="blue", justify="right")
+        bench_table.add_column("MB/s", style="green", justify="right")
+        bench_table.add_column("IOPS", style="yellow", justify="right")
+        bench_table.add_column("p50 ms", style="white", justify="right")
+        bench_table.add_column("p95 ms", style="white", justify="right")
+        bench_table.add_column("p99 ms", style="magenta", justify="right")
+        
+        for result in report.results:
+            bench_table.add_row(
+                result.name,
+                self._format_bytes(result.block_size),
+                f"{result.mb_per_second:,.1f}",
+                f"{result.iops:,.0f}",
+                f"{result.percentile(50):.3f}",
+                f"{result.percentile(95):.3f}",
+                f"{result.percentile(99):.3f}"
+            )
+        
+        self.menu.console.print(bench_table)
+        self.menu.console.print(f"\n[cyan]💾 Archivo de prueba: {self._format_bytes(report.file_size)} (eliminado)[/cyan]")
+        self.menu.console.print(f"[cyan]🔒 fsync por escritura: {'Sí' if report.fsync else 'No'}[/cyan]")
+        self.menu.console.print(f"[cyan]🚫 Evitar caché: {report.cache_mode}[/cyan]")
+        if not direct:
+            self.menu.console.print("[yellow]💡 Sin evitar la caché, las lecturas pueden reflejar memoria RAM y no el disco[/yellow]")
+    
     def _show_temp_files_size(self):
         """Muestra el tamaño de archivos temporales."""
         self.menu.clear_screen()
@@ -1423,7 +1695,7 @@ class SistemaModule:
     
     def _analyze_directory(self):
         """Analiza el uso de espacio en un directorio específico."""
-        directory = self.menu.get_input("📁 Ingresa la ruta del directorio a analizar")
+        directory = self.menu.show_input("📁 Ingresa la ruta del directorio a analizar:")
         if not directory:
             return
         
@@ -1445,64 +1717,248 @@ class SistemaModule:
             task = progress.add_task(f"Analizando {directory}...", total=None)
             
             try:
-                # Analizar subdirectorios
-                subdirs = []
-                total_size = 0
-                
-                for item in os.listdir(directory):
-                    item_path = os.path.join(directory, item)
-                    if os.path.isdir(item_path):
-                        try:
-                            size, file_count = self._calculate_directory_size(item_path)
-                            subdirs.append((item, size, file_count))
-                            total_size += size
-                        except:
-                            continue
-                
-                # Ordenar por tamaño
-                subdirs.sort(key=lambda x: x[1], reverse=True)
-                
-                # Mostrar resultados
-                dir_table = Table(title=f"📁 Análisis de {directory}", box=box.DOUBLE)
-                dir_table.add_column("Subdirectorio", style="cyan", width=30)
-                dir_table.add_column("Archivos", style="yellow", justify="right")
-                dir_table.add_column("Tamaño", style="green", justify="right")
-                dir_table.add_column("% del Total", style="blue", justify="right")
-                
-                for name, size, file_count in subdirs[:20]:  # Top 20
-                    percentage = (size / total_size) * 100 if total_size > 0 else 0
-                    
-                    dir_table.add_row(
-                        name,
-                        f"{file_count:,}",
-                        self._format_bytes(size),
-                        f"{percentage:.1f}%"
-                    )
-                
-                self.menu.console.print(dir_table)
-                self.menu.console.print(f"\n[cyan]📊 Tamaño total analizado: {self._format_bytes(total_size)}[/cyan]")
-                
+                # Un solo recorrido: subdirectorios, extensiones, antigüedad, propietarios
+                # y tamaños por directorio para la instantánea
+                result = scan_directory(directory, by_owner=os.name != 'nt', by_child=True, by_directory=True)
             except Exception as e:
                 self.menu.show_error(f"Error analizando directorio: {e}")
-    
-    def _calculate_directory_size(self, directory: str) -> tuple:
-        """Calcula el tamaño total y número de archivos en un directorio."""
-        total_size = 0
-        file_count = 0
+                return
+        
+        total_size = result.total_size
+        
+        # Mostrar resultados
+        dir_table = Table(title=f"📁 Análisis de {directory}", box=box.DOUBLE)
+        dir_table.add_column("Subdirectorio", style="cyan", width=30)
+        dir_table.add_column("Archivos", style="yellow", justify="right")
+        dir_table.add_column("Tamaño", style="green", justify="right")
+        dir_table.add_column("% del Total", style="blue", justify="right")
+        
+        for name, data in result.top(result.children, 20):  # Top 20
+            percentage = (data.size / total_size) * 100 if total_size > 0 else 0
+            
+            dir_table.add_row(
+                name,
+                f"{data.count:,}",
+                self._format_bytes(data.size),
+                f"{percentage:.1f}%"
+            )
+        
+        self.menu.console.print(dir_table)
+        self._print_scan_breakdown(result)
+        self.menu.console.print(f"\n[cyan]📊 Tamaño total analizado: {self._format_bytes(total_size)}[/cyan]")
+        self.menu.console.print(f"[cyan]📄 Archivos: {result.file_count:,}  📁 Directorios: {result.dir_count:,}[/cyan]")
+        if result.error_count:
+            self.menu.console.print(f"[red]❌ Entradas sin acceso: {result.error_count:,}[/red]")
         
+        # Guardar el escaneo como instantánea para poder ver después qué creció
+        if not self.menu.show_confirmation("📸 ¿Guardar el análisis como instantánea para compararlo después?"):
+            return
+        snapshot = snapshot_from_scan(result)
+        previous = list_snapshot_paths(snapshot.root)
         try:
-            for dirpath, dirnames, filenames in os.walk(directory):
-                for filename in filenames:
-                    try:
-                        filepath = os.path.join(dirpath, filename)
-                        total_size += os.path.getsize(filepath)
-                        file_count += 1
-                    except (OSError, IOError):
-                        continue
-        except (OSError, IOError):
-            pass
+            save_snapshot(snapshot)
+        except OSError as e:
+            self.menu.show_warning(f"No se pudo guardar la instantánea: {e}")
+            return
+        
+        if previous:
+            older = load_snapshot(previous[-1])
+            delta = snapshot.total_size - older.total_size
+            self.menu.console.print(
+                f"[cyan]📸 Instantánea guardada. Desde la anterior ({older.label}): "
+                f"{'+' if delta >= 0 else '-'}{self._format_bytes(abs(delta))}[/cyan]"
+            )
+        else:
+            self.menu.console.print("[cyan]📸 Instantánea guardada para futuras comparaciones[/cyan]")
+    
+    def _disk_snapshots_menu(self):
+        """Toma instantáneas de uso de disco y compara dos de ellas."""
+        self.menu.clear_screen()
+        
+        roots = list_snapshot_roots()
+        if roots:
+            table = Table(title="📸 Instantáneas guardadas", box=box.ROUNDED)
+            table.add_column("Directorio", style="cyan")
+            table.add_column("Instantáneas", justify="right")
+            table.add_column("Última", justify="right")
+            for root, count in sorted(roots.items()):
+                paths = list_snapshot_paths(root)
+                table.add_row(root, str(count), load_snapshot(paths[-1]).label if paths else "—")
+            self.menu.console.print(table)
+            self.menu.console.print()
+        
+        choices = [
+            {'name': '📸 Tomar instantánea', 'value': 'take', 'description': 'Escanear un directorio y guardar sus tamaños'},
+            {'name': '📈 Comparar con ahora', 'value': 'now', 'description': 'Escanear y comparar con la última instantánea'},
+            {'name': '🔀 Comparar dos instantáneas', 'value': 'pick', 'description': 'Elegir dos instantáneas guardadas'},
+            {'name': '⏰ Programar instantánea diaria', 'value': 'schedule', 'description': 'Mostrar cómo automatizarla'}
+        ]
+        selection = self.menu.show_menu(choices, "📸 ¿Qué quieres hacer?")
+        if not selection or selection == 'exit':
+            return
         
-        return total_size, file_count
+        default_root = sorted(roots)[0] if roots else os.path.expanduser('~')
+        
+        if selection == 'take':
+            root = self.menu.show_input("📁 Directorio:", default_root)
+            if root:
+                self.run_disk_snapshot(root)
+        elif selection == 'now':
+            root = self.menu.show_input("📁 Directorio:", default_root)
+            if root:
+                self.run_disk_diff(root, compare_now=True)
+        elif selection == 'pick':
+            if not roots:
+                self.menu.show_warning("⚠️ No hay instantáneas guardadas")
+                return
+            root = self.menu.show_menu([{'name': r, 'value': r} for r in sorted(roots)], "📁 Directorio:")
+            if not root or root == 'exit':
+                return
+            paths = list_snapshot_paths(root)
+            if len(paths) < 2:
+                self.menu.show_warning("⚠️ Se necesitan al menos dos instantáneas")
+                return
+            options = [{'name': p.name[:-len(SNAPSHOT_SUFFIX)], 'value': str(p)} for p in reversed(paths)]
+            newer = self.menu.show_menu(options, "📸 Instantánea más reciente:")
+            if not newer or newer == 'exit':
+                return
+            older = self.menu.show_menu([o for o in options if o['value'] < newer], "📸 Instantánea anterior:")
+            if not older or older == 'exit':
+                return
+            self._show_snapshot_diff(diff_snapshots(load_snapshot(Path(older)), load_snapshot(Path(newer))))
+        elif selection == 'schedule':
+            command = f'"{sys.executable}" -m noox_cli.main instantanea "{default_root}"'
+            self.menu.console.print("[bold cyan]⏰ Instantánea diaria[/bold cyan]")
+            if os.name == 'nt':
+                self.menu.console.print(f'  schtasks /Create /SC DAILY /ST 03:00 /TN "NooxCLI instantanea" /TR "{command}"')
+            else:
+                self.menu.console.print(f"  0 3 * * * {command} >/dev/null 2>&1")
+            self.menu.console.print(f"  Se conservan las últimas {MAX_SNAPSHOTS} instantáneas de cada directorio")
+    
+    def run_disk_snapshot(self, root: str) -> int:
+        """Escanea `root` y guarda una instantánea. Devuelve el código de salida."""
+        if not os.path.isdir(root):
+            self.menu.show_error(f"❌ '{root}' no es un directorio")
+            return 1
+        
+        with self.menu.console.status(f"[cyan]📸 Escaneando {root}...[/cyan]"):
+            snapshot = take_snapshot(root)
+            path = save_snapshot(snapshot)
+        
+        self.menu.console.print(
+            f"📸 {snapshot.root}: {snapshot.file_count:,} archivos, {self._format_bytes(snapshot.total_size)} "
+            f"→ {path.name}"
+        )
+        return 0
+    
+    def run_disk_diff(self, root: str, compare_now: bool = False, back: int = 1) -> int:
+        """
+        Compara instantáneas de `root`.
+        
+        Args:
+            root: Directorio comparado
+            compare_now: Escanear ahora y comparar con la última instantánea guardada
+            back: Cuántas instantáneas hacia atrás está la anterior (1 = la penúltima)
+        """
+        paths = list_snapshot_paths(os.path.abspath(root))
+        needed = 1 if compare_now else back + 1
+        if len(paths) < needed:
+            self.menu.show_warning(f"⚠️ No hay suficientes instantáneas de {root}")
+            return 1
+        
+        if compare_now:
+            with self.menu.console.status(f"[cyan]📸 Escaneando {root}...[/cyan]"):
+                newer = take_snapshot(root)
+            older = load_snapshot(paths[-1])
+        else:
+            newer = load_snapshot(paths[-1])
+            older = load_snapshot(paths[-1 - back])
+        
+        self._show_snapshot_diff(diff_snapshots(older, newer))
+        return 0
+    
+    def _show_snapshot_diff(self, diff: SnapshotDiff):
+        """Muestra los directorios y archivos que más cambiaron entre dos instantáneas."""
+        sign = '+' if diff.delta >= 0 else '-'
+        self.menu.console.print(
+            f"[bold cyan]📈 {diff.new.root}: {diff.old.label} → {diff.new.label} "
+            f"({sign}{self._format_bytes(abs(diff.delta))})[/bold cyan]"
+        )
+        styles = {GREW: 'red', APPEARED: 'red', SHRANK: 'green', VANISHED: 'green'}
+        
+        for title, entries in (("📁 Directorios", diff.dirs), ("📄 Archivos grandes", diff.files)):
+            if not entries:
+                continue
+            table = Table(title=title, box=box.SIMPLE)
+            table.add_column("Ruta", style="cyan")
+            table.add_column("Estado")
+            table.add_column("Antes", justify="right")
+            table.add_column("Ahora", justify="right")
+            table.add_column("Cambio", justify="right")
+            for entry in entries:
+                style = styles[entry.status]
+                table.add_row(
+                    entry.path or '.',
+                    f"[{style}]{entry.status}[/{style}]",
+                    self._format_bytes(entry.old_size),
+                    self._format_bytes(entry.new_size),
+                    f"[{style}]{'+' if entry.delta >= 0 else '-'}{self._format_bytes(abs(entry.delta))}[/{style}]"
+                )
+            self.menu.console.print(table)
+        
+        if diff.counts:
+            summary = ", ".join(f"{count:,} {status}" for status, count in diff.counts.items())
+            self.menu.console.print(f"[dim]Directorios: {summary}[/dim]")
+        elif not diff.files:
+            self.menu.show_success("✅ Sin cambios entre las dos instantáneas")
+    
+    def _print_scan_breakdown(self, result: ScanResult, limit: int = 10):
+        """Muestra los desgloses por extensión, antigüedad y propietario de un escaneo."""
+        total_size = result.total_size
+        
+        def percentage(size: int) -> str:
+            return f"{(size / total_size * 100) if total_size > 0 else 0:.1f}%"
+        
+        if result.extensions:
+            ext_table = Table(title="📑 Por tipo de archivo", box=box.SIMPLE)
+            ext_table.add_column("Extensión", style="cyan", width=15)
+            ext_table.add_column("Archivos", style="green", justify="right", width=10)
+            ext_table.add_column("Tamaño", style="yellow", justify="right", width=12)
+            ext_table.add_column("%", style="magenta", justify="right", width=8)
+            
+            for ext, data in result.top(result.extensions, limit):
+                ext_table.add_row(ext, f"{data.count:,}", self._format_bytes(data.size), percentage(data.size))
+            
+            self.menu.console.print(ext_table)
+        
+        if result.age_buckets:
+            age_table = Table(title="🕒 Por antigüedad (última modificación)", box=box.SIMPLE)
+            age_table.add_column("Antigüedad", style="cyan", width=15)
+            age_table.add_column("Archivos", style="green", justify="right", width=10)
+            age_table.add_column("Tamaño", style="yellow", justify="right", width=12)
+            age_table.add_column("%", style="magenta", justify="right", width=8)
+            
+            for label, data in result.sorted_age_buckets():
+                age_table.add_row(label, f"{data.count:,}", self._format_bytes(data.size), percentage(data.size))
+            
+            self.menu.console.print(age_table)
+        
+        if result.owners:
+            owner_table = Table(title="👤 Por propietario", box=box.SIMPLE)
+            owner_table.add_column("Propietario", style="cyan", width=15)
+            owner_table.add_column("Archivos", style="green", justify="right", width=10)
+            owner_table.add_column("Tamaño", style="yellow", justify="right", width=12)
+            owner_table.add_column("%", style="magenta", justify="right", width=8)
+            
+            for owner, data in result.top(result.owners, limit):
+                owner_table.add_row(owner, f"{data.count:,}", self._format_bytes(data.size), percentage(data.size))
+            
+            self.menu.console.print(owner_table)
+    
+    def _calculate_directory_size(self, directory: str) -> tuple:
+        """Calcula el tamaño total y número de archivos en un directorio."""
+        result = scan_directory(directory, by_extension=False, by_age=False)
+        return result.total_size, result.file_count
 
     def _show_services(self):
         """Muestra y gestiona servicios de Windows."""
@@ -1982,14 +2438,9 @@ class SistemaModule:
             return 'UNKNOWN'
 
     def _command_exists(self, command: str) -> bool:
-        """Verifica si un comando existe en el sistema."""
-        try:
-            subprocess.run([command, '--version'], 
-                         capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
-
+        """Verifica si un comando existe en el sistema (sin ejecutarlo)."""
+        return tool_registry.exists(command)
+    
     def _show_env_vars(self):
         """Muestra y gestiona variables de entorno del sistema."""
         while True:
@@ -2276,6 +2727,16 @@ class SistemaModule:
                     'name': '⚡ Limpieza completa',
                     'value': 'full_cleanup',
                     'description': 'Limpiar todos los archivos temporales posibles'
+                },
+                {
+                    'name': '🗂️ Cachés de aplicaciones',
+                    'value': 'app_caches',
+                    'description': 'Navegadores, IDEs y ~/.cache desglosados por aplicación'
+                },
+                {
+                    'name': '📜 Políticas de retención',
+                    'value': 'policies',
+                    'description': 'Antigüedad mínima, patrones, tamaño máximo y ejecución programada'
                 }
             ]
             
@@ -2295,6 +2756,10 @@ class SistemaModule:
                     self._detailed_temp_analysis()
                 elif selection == 'full_cleanup':
                     self._full_temp_cleanup()
+                elif selection == 'app_caches':
+                    self._clean_application_caches()
+                elif selection == 'policies':
+                    self._retention_policies_menu()
             except Exception as e:
                 self.menu.show_error(f"Error en limpieza de temporales: {e}")
             
@@ -2328,25 +2793,8 @@ class SistemaModule:
 
     def _calculate_temp_size(self, directory: str) -> tuple:
         """Calcula el tamaño total de archivos temporales en un directorio."""
-        total_size = 0
-        file_count = 0
-        error_count = 0
-        
-        try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        if os.path.isfile(file_path):
-                            total_size += os.path.getsize(file_path)
-                            file_count += 1
-                    except (OSError, PermissionError):
-                        error_count += 1
-                        continue
-        except (OSError, PermissionError):
-            pass
-        
-        return total_size, file_count, error_count
+        result = scan_directory(directory, by_extension=False, by_age=False)
+        return result.total_size, result.file_count, result.error_count
 
     def _show_temp_size(self):
         """Muestra el tamaño actual de archivos temporales."""
@@ -2416,69 +2864,19 @@ class SistemaModule:
             self.menu.show_error("❌ No se encontró directorio temporal del usuario")
             return
         
-        # Mostrar tamaño antes de limpiar
-        size_before, files_before, _ = self._calculate_temp_size(user_temp)
-        
-        self.menu.console.print(f"📊 Directorio: [cyan]{user_temp}[/cyan]")
-        self.menu.console.print(f"📊 Tamaño actual: [yellow]{self._format_bytes(size_before)}[/yellow]")
-        self.menu.console.print(f"📊 Archivos: [green]{files_before:,}[/green]")
+        # Un único recorrido: el manifiesto sirve de vista previa y de lista de borrado
+        open_files = self._build_open_files_index()
+        manifests = self._build_cleanup_manifests([user_temp], open_files)
         
-        if not self.menu.get_confirmation("¿Proceder con la limpieza de archivos temporales del usuario?"):
-            self.menu.show_info("ℹ️ Limpieza cancelada")
+        if not self._preview_cleanup(manifests, open_files=open_files):
             return
         
-        # Realizar limpieza
-        deleted_files = 0
-        deleted_size = 0
-        errors = []
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.menu.console
-        ) as progress:
-            task = progress.add_task("Limpiando archivos temporales...", total=None)
-            
-            try:
-                for root, dirs, files in os.walk(user_temp):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            if os.path.isfile(file_path):
-                                file_size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                deleted_files += 1
-                                deleted_size += file_size
-                        except (OSError, PermissionError) as e:
-                            errors.append(f"{file}: {str(e)}")
-                            continue
-                    
-                    # Intentar eliminar directorios vacíos
-                    for dir_name in dirs:
-                        try:
-                            dir_path = os.path.join(root, dir_name)
-                            if os.path.isdir(dir_path) and not os.listdir(dir_path):
-                                os.rmdir(dir_path)
-                        except (OSError, PermissionError):
-                            continue
-            except Exception as e:
-                self.menu.show_error(f"❌ Error durante la limpieza: {e}")
-                return
+        if not self.menu.show_confirmation("¿Proceder con la limpieza de archivos temporales del usuario?"):
+            self.menu.show_info("ℹ️ Limpieza cancelada (simulación)")
+            return
         
-        # Mostrar resultados
-        self.menu.console.print(f"\n[bold green]✅ Limpieza Completada:[/bold green]")
-        self.menu.console.print(f"  🗑️ Archivos eliminados: [green]{deleted_files:,}[/green]")
-        self.menu.console.print(f"  💾 Espacio liberado: [yellow]{self._format_bytes(deleted_size)}[/yellow]")
-        
-        if errors:
-            self.menu.console.print(f"  ❌ Archivos no eliminados: [red]{len(errors)}[/red]")
-            if len(errors) <= 10:
-                for error in errors:
-                    self.menu.console.print(f"    • {error}")
-            else:
-                for error in errors[:5]:
-                    self.menu.console.print(f"    • {error}")
-                self.menu.console.print(f"    ... y {len(errors) - 5} errores más")
+        result = self._execute_cleanup(manifests)
+        self._show_cleanup_result(result, "Limpieza Completada")
 
     def _clean_system_temp(self):
         """Limpia archivos temporales del sistema (requiere permisos administrativos)."""
@@ -2496,54 +2894,163 @@ class SistemaModule:
         self.menu.show_warning("⚠️ Esta operación requiere permisos administrativos")
         self.menu.show_warning("⚠️ Algunos archivos pueden estar en uso y no se podrán eliminar")
         
-        # Mostrar tamaño antes de limpiar
-        size_before, files_before, _ = self._calculate_temp_size(system_temp)
+        open_files = self._build_open_files_index()
+        manifests = self._build_cleanup_manifests([system_temp], open_files)
         
-        self.menu.console.print(f"📊 Directorio: [cyan]{system_temp}[/cyan]")
-        self.menu.console.print(f"📊 Tamaño actual: [yellow]{self._format_bytes(size_before)}[/yellow]")
-        self.menu.console.print(f"📊 Archivos: [green]{files_before:,}[/green]")
+        if not self._preview_cleanup(manifests, open_files=open_files):
+            return
         
-        if not self.menu.get_confirmation("¿Proceder con la limpieza de archivos temporales del sistema?"):
-            self.menu.show_info("ℹ️ Limpieza cancelada")
+        if not self.menu.show_confirmation("¿Proceder con la limpieza de archivos temporales del sistema?"):
+            self.menu.show_info("ℹ️ Limpieza cancelada (simulación)")
             return
         
-        # Realizar limpieza
-        deleted_files = 0
-        deleted_size = 0
-        errors = []
+        result = self._execute_cleanup(manifests)
+        self._show_cleanup_result(result, "Limpieza del Sistema Completada")
+
+    def _dedupe_directories(self, directories: List[str]) -> List[str]:
+        """Elimina directorios repetidos o anidados (TEMP y TMP suelen coincidir o anidarse)."""
+        unique_dirs = []
+        keys = []
+        for directory in sorted({os.path.realpath(d) for d in directories}, key=os.path.normcase):
+            key = os.path.normcase(directory).rstrip(os.sep) + os.sep
+            if not any(key.startswith(parent) for parent in keys):
+                keys.append(key)
+                unique_dirs.append(directory)
+        return unique_dirs
+
+    def _build_open_files_index(self) -> OpenFilesIndex:
+        """Construye el índice de archivos abiertos por los procesos en ejecución."""
+        with self.menu.console.status("[cyan]Buscando archivos en uso...[/cyan]"):
+            return OpenFilesIndex.build()
+
+    def _build_cleanup_manifests(self, directories: List[str],
+                                 open_files: Optional[OpenFilesIndex] = None) -> List[CleanupManifest]:
+        """
+        Construye los manifiestos de borrado aplicando la política de retención de cada
+        directorio; los que no tienen una configurada se limpian por completo, como siempre.
+        """
+        policies = load_policies(self._dedupe_directories(directories), default=unmanaged_policy)
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.menu.console
         ) as progress:
-            task = progress.add_task("Limpiando archivos del sistema...", total=None)
+            task = progress.add_task("Analizando archivos a eliminar...", total=len(policies))
+            plans = []
+            for policy in policies:
+                progress.update(task, description=f"Analizando {policy.directory}...")
+                plans.append(plan_retention(policy, open_files))
+                progress.advance(task)
+        
+        for plan in plans:
+            if plan.skipped_young or plan.skipped_open:
+                self.menu.console.print(
+                    f"[dim]🛡️ {plan.policy.directory}: {plan.skipped_young:,} archivos con menos de "
+                    f"{plan.policy.min_age_hours:g} h y {plan.skipped_open:,} en uso se conservan[/dim]"
+                )
+        
+        return [plan.manifest for plan in plans]
+
+    def _preview_cleanup(self, manifests: List[CleanupManifest], limit: int = 15,
+                         open_files: Optional[OpenFilesIndex] = None) -> bool:
+        """Muestra la vista previa (simulación) de lo que se eliminará. Devuelve False si no hay nada."""
+        total_files = sum(m.file_count for m in manifests)
+        total_dirs = sum(len(m.dirs) for m in manifests)
+        total_size = sum(m.total_size for m in manifests)
+        
+        for manifest in manifests:
+            if not manifest.files and not manifest.dirs:
+                continue
             
-            try:
-                for root, dirs, files in os.walk(system_temp):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            if os.path.isfile(file_path):
-                                file_size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                deleted_files += 1
-                                deleted_size += file_size
-                        except (OSError, PermissionError) as e:
-                            errors.append(f"{file}: {str(e)}")
-                            continue
-            except Exception as e:
-                self.menu.show_error(f"❌ Error durante la limpieza: {e}")
-                return
+            preview_table = Table(title=f"🔍 Vista previa: {manifest.root}", box=box.SIMPLE)
+            preview_table.add_column("Elemento", style="cyan", width=40)
+            preview_table.add_column("Archivos", style="green", justify="right", width=10)
+            preview_table.add_column("Tamaño", style="yellow", justify="right", width=12)
+            
+            ordered = sorted(manifest.children.items(), key=lambda item: item[1].size, reverse=True)
+            for name, data in ordered[:limit]:
+                preview_table.add_row(name, f"{data.count:,}", self._format_bytes(data.size))
+            if len(ordered) > limit:
+                rest = ordered[limit:]
+                preview_table.add_row(
+                    f"... y {len(rest)} elementos más",
+                    f"{sum(d.count for _, d in rest):,}",
+                    self._format_bytes(sum(d.size for _, d in rest))
+                )
+            
+            self.menu.console.print(preview_table)
+        
+        self.menu.console.print(f"[bold cyan]📋 Manifiesto de borrado:[/bold cyan]")
+        self.menu.console.print(f"  📄 Archivos: [green]{total_files:,}[/green]")
+        self.menu.console.print(f"  📁 Directorios: [green]{total_dirs:,}[/green]")
+        self.menu.console.print(f"  💾 Espacio a liberar: [yellow]{self._format_bytes(total_size)}[/yellow]")
+        
+        skipped = sum(m.skipped_files for m in manifests)
+        if skipped:
+            skipped_size = sum(m.skipped_size for m in manifests)
+            self.menu.console.print(f"  🛡️ Archivos conservados: [cyan]{skipped:,}[/cyan] ({self._format_bytes(skipped_size)})")
+        
+        skipped_open = sum(m.skipped_open for m in manifests)
+        if skipped_open:
+            self.menu.console.print(f"  🔒 En uso por procesos activos: [cyan]{skipped_open:,}[/cyan] (se conservan)")
+        
+        if open_files is not None:
+            pinned = open_files.pinned_files([m.root for m in manifests])
+            if pinned:
+                self.menu.console.print(
+                    f"  📌 Espacio retenido por archivos borrados aún abiertos: "
+                    f"[yellow]{self._format_bytes(sum(f.size for f in pinned))}[/yellow] "
+                    f"({len(pinned):,} archivos; se libera al cerrar los procesos)"
+                )
         
-        # Mostrar resultados
-        self.menu.console.print(f"\n[bold green]✅ Limpieza del Sistema Completada:[/bold green]")
-        self.menu.console.print(f"  🗑️ Archivos eliminados: [green]{deleted_files:,}[/green]")
-        self.menu.console.print(f"  💾 Espacio liberado: [yellow]{self._format_bytes(deleted_size)}[/yellow]")
+        scan_errors = sum(m.scan_errors.count for m in manifests)
+        if scan_errors:
+            self.menu.console.print(f"  ❌ Entradas sin acceso: [red]{scan_errors:,}[/red]")
         
-        if errors:
-            self.menu.console.print(f"  ❌ Archivos no eliminados: [red]{len(errors)}[/red]")
-            self.menu.console.print("  💡 Algunos archivos pueden estar en uso por el sistema")
+        if not total_files and not total_dirs:
+            self.menu.show_success("✅ No hay archivos temporales que eliminar")
+            return False
+        
+        return True
+
+    def _execute_cleanup(self, manifests: List[CleanupManifest]) -> CleanupResult:
+        """Ejecuta los manifiestos de borrado mostrando el progreso en bytes."""
+        result = CleanupResult()
+        total_size = sum(m.total_size for m in manifests)
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            console=self.menu.console
+        ) as progress:
+            task = progress.add_task("Eliminando archivos...", total=total_size or None)
+            
+            for manifest in manifests:
+                progress.update(task, description=f"Limpiando {os.path.basename(manifest.root) or manifest.root}...")
+                result.merge(execute_manifest(
+                    manifest,
+                    progress_callback=lambda freed: progress.advance(task, freed)
+                ))
+        
+        return result
+
+    def _show_cleanup_result(self, result: CleanupResult, title: str):
+        """Muestra el resultado de una limpieza con una muestra acotada de errores."""
+        self.menu.console.print(f"\n[bold green]✅ {title}:[/bold green]")
+        self.menu.console.print(f"  🗑️ Archivos eliminados: [green]{result.deleted_files:,}[/green]")
+        self.menu.console.print(f"  📁 Directorios eliminados: [green]{result.deleted_dirs:,}[/green]")
+        self.menu.console.print(f"  💾 Espacio liberado: [yellow]{self._format_bytes(result.deleted_size)}[/yellow]")
+        
+        if result.errors.count:
+            self.menu.console.print(f"  ❌ Elementos no eliminados: [red]{result.errors.count:,}[/red]")
+            for error in result.errors.samples:
+                self.menu.console.print(f"    • {error}")
+            if result.errors.count > len(result.errors.samples):
+                self.menu.console.print(f"    ... y {result.errors.count - len(result.errors.samples):,} errores más")
+            self.menu.console.print("  💡 Algunos archivos pueden estar en uso por aplicaciones activas")
 
     def _detailed_temp_analysis(self):
         """Realiza un análisis detallado de archivos temporales."""
@@ -2561,56 +3068,260 @@ class SistemaModule:
             self.menu.console.print(f"[bold yellow]📁 Analizando: {temp_dir}[/bold yellow]")
             
             try:
-                # Análisis por extensión
-                extensions = {}
-                total_size = 0
-                total_files = 0
+                # Extensiones y antigüedad en la misma pasada que los totales
+                result = scan_directory(temp_dir)
                 
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            if os.path.isfile(file_path):
-                                size = os.path.getsize(file_path)
-                                ext = os.path.splitext(file)[1].lower() or 'sin_extension'
-                                
-                                if ext not in extensions:
-                                    extensions[ext] = {'count': 0, 'size': 0}
-                                
-                                extensions[ext]['count'] += 1
-                                extensions[ext]['size'] += size
-                                total_size += size
-                                total_files += 1
-                        except (OSError, PermissionError):
-                            continue
-                
-                if extensions:
-                    # Mostrar top 10 extensiones por tamaño
-                    sorted_ext = sorted(extensions.items(), key=lambda x: x[1]['size'], reverse=True)
-                    
-                    ext_table = Table(box=box.SIMPLE)
-                    ext_table.add_column("Extensión", style="cyan", width=15)
-                    ext_table.add_column("Archivos", style="green", justify="right", width=10)
-                    ext_table.add_column("Tamaño", style="yellow", justify="right", width=12)
-                    ext_table.add_column("%", style="magenta", justify="right", width=8)
-                    
-                    for ext, data in sorted_ext[:10]:
-                        percentage = (data['size'] / total_size * 100) if total_size > 0 else 0
-                        ext_table.add_row(
-                            ext,
-                            f"{data['count']:,}",
-                            self._format_bytes(data['size']),
-                            f"{percentage:.1f}%"
-                        )
-                    
-                    self.menu.console.print(ext_table)
-                    self.menu.console.print(f"  📊 Total: {total_files:,} archivos, {self._format_bytes(total_size)}\n")
+                if result.file_count:
+                    self._print_scan_breakdown(result)
+                    self.menu.console.print(f"  📊 Total: {result.file_count:,} archivos, {self._format_bytes(result.total_size)}\n")
                 else:
                     self.menu.console.print("  📭 Directorio vacío o sin acceso\n")
                     
             except Exception as e:
                 self.menu.console.print(f"  ❌ Error analizando directorio: {e}\n")
 
+    def _clean_application_caches(self):
+        """Muestra las cachés de aplicaciones por tamaño y limpia las seleccionadas."""
+        self.menu.clear_screen()
+        
+        with self.menu.console.status("[cyan]🗂️ Midiendo cachés de aplicaciones...[/cyan]"):
+            caches = measure_app_caches(discover_app_caches())
+        
+        caches = [c for c in caches if c.size]
+        if not caches:
+            self.menu.show_success("✅ No se encontraron cachés de aplicaciones")
+            return
+        
+        groups = group_by_application(caches)
+        
+        table = Table(title="🗂️ Cachés por aplicación", box=box.ROUNDED)
+        table.add_column("Aplicación", style="cyan")
+        table.add_column("Categoría")
+        table.add_column("Directorios", justify="right")
+        table.add_column("Archivos", justify="right")
+        table.add_column("Tamaño", justify="right", style="yellow")
+        
+        for application, category, entries in groups[:25]:
+            partial = not all(c.complete for c in entries)
+            table.add_row(
+                application,
+                category,
+                str(len(entries)),
+                f"{sum(c.file_count for c in entries):,}",
+                ("≥ " if partial else "") + self._format_bytes(sum(c.size for c in entries))
+            )
+        
+        self.menu.console.print(table)
+        if any(not c.complete for c in caches):
+            self.menu.console.print("[dim]≥ medición interrumpida por tiempo límite: el tamaño real es mayor[/dim]")
+        self.menu.console.print()
+        
+        options = []
+        for application, category, entries in groups[:15]:
+            options.append({
+                'name': f"{application} ({self._format_bytes(sum(c.size for c in entries))})",
+                'value': f"app:{application}"
+            })
+        for category in sorted({c.category for c in caches}):
+            size = sum(c.size for c in caches if c.category == category)
+            options.append({'name': f"📂 Todas las de {category} ({self._format_bytes(size)})", 'value': f"cat:{category}"})
+        options.append({'name': f"🧹 Todas ({self._format_bytes(sum(c.size for c in caches))})", 'value': 'all'})
+        
+        selection = self.menu.show_menu(options, "🗂️ ¿Qué cachés quieres limpiar?")
+        if not selection or selection == 'exit':
+            return
+        
+        kind, _, name = selection.partition(':')
+        selected = [
+            c for c in caches
+            if kind == 'all' or (kind == 'app' and c.application == name) or (kind == 'cat' and c.category == name)
+        ]
+        
+        if any(c.category == BROWSER for c in selected):
+            self.menu.show_warning("⚠️ Cierra los navegadores antes de limpiar su caché")
+        
+        open_files = self._build_open_files_index()
+        
+        # Los archivos en uso se conservan: la aplicación los volvería a crear o fallaría
+        with self.menu.console.status("[cyan]Analizando archivos a eliminar...[/cyan]"):
+            manifests = [build_manifest(c.path, open_files=open_files) for c in selected]
+        
+        if not self._preview_cleanup(manifests, limit=5, open_files=open_files):
+            return
+        
+        if not self.menu.show_confirmation("¿Eliminar el contenido de las cachés seleccionadas?"):
+            self.menu.show_info("ℹ️ Limpieza cancelada (simulación)")
+            return
+        
+        result = self._execute_cleanup(manifests)
+        self._show_cleanup_result(result, "Cachés Limpiadas")
+    
+    def _retention_policies_menu(self):
+        """Gestiona las políticas de retención de los directorios temporales."""
+        while True:
+            self.menu.clear_screen()
+            
+            policies = load_policies(self._dedupe_directories(self._get_temp_directories()))
+            self._show_retention_policies(policies)
+            
+            choices = [
+                {'name': '✏️ Editar política', 'value': 'edit'},
+                {'name': '▶️ Ejecutar políticas ahora', 'value': 'run'},
+                {'name': '⏰ Programar ejecución', 'value': 'schedule'}
+            ]
+            
+            selection = self.menu.show_menu(choices, "📜 Políticas de retención:")
+            
+            if not selection or selection == 'exit':
+                break
+            
+            if selection == 'edit':
+                self._edit_retention_policy(policies)
+            elif selection == 'run':
+                self.run_retention_policies(interactive=True)
+            elif selection == 'schedule':
+                self._show_retention_schedule_help()
+            
+            self.menu.pause()
+    
+    def _show_retention_policies(self, policies: List[RetentionPolicy]):
+        """Muestra la tabla de políticas de retención."""
+        policy_table = Table(title="📜 Políticas de Retención", box=box.DOUBLE)
+        policy_table.add_column("Directorio", style="cyan")
+        policy_table.add_column("Antigüedad mín.", style="yellow", justify="right")
+        policy_table.add_column("Incluir", style="green")
+        policy_table.add_column("Excluir", style="red")
+        policy_table.add_column("Tamaño máx.", style="magenta", justify="right")
+        policy_table.add_column("En uso", style="white")
+        
+        for policy in policies:
+            policy_table.add_row(
+                policy.directory,
+                f"{policy.min_age_hours:g} h",
+                ', '.join(policy.include) or '*',
+                ', '.join(policy.exclude) or '-',
+                self._format_bytes(policy.max_total_size) if policy.max_total_size is not None else 'Sin límite',
+                "Respetar" if policy.skip_open_files else "Ignorar"
+            )
+        
+        self.menu.console.print(policy_table)
+    
+    def _edit_retention_policy(self, policies: List[RetentionPolicy]):
+        """Edita la política de un directorio temporal."""
+        choices = [{'name': policy.directory, 'value': str(i)} for i, policy in enumerate(policies)]
+        selection = self.menu.show_menu(choices, "📁 Directorio a configurar:")
+        
+        if not selection or selection == 'exit':
+            return
+        
+        policy = policies[int(selection)]
+        
+        try:
+            min_age = float(self.menu.show_input("🕒 Antigüedad mínima en horas:", f"{policy.min_age_hours:g}"))
+        except (TypeError, ValueError):
+            self.menu.show_error("❌ Antigüedad no válida")
+            return
+        
+        include = self.menu.show_input("✅ Patrones a incluir (separados por comas):", ', '.join(policy.include))
+        exclude = self.menu.show_input("🚫 Patrones a excluir (separados por comas):", ', '.join(policy.exclude))
+        
+        current_max = str(policy.max_total_size // (1024 * 1024)) if policy.max_total_size is not None else ""
+        max_mb = self.menu.show_input("💾 Tamaño máximo en MB (vacío = sin límite):", current_max)
+        try:
+            max_total_size = int(max_mb) * 1024 * 1024 if max_mb and max_mb.strip() else None
+        except ValueError:
+            self.menu.show_error("❌ Tamaño no válido")
+            return
+        
+        policy.min_age_hours = max(min_age, 0)
+        policy.include = [p.strip() for p in (include or '').split(',') if p.strip()] or ['*']
+        policy.exclude = [p.strip() for p in (exclude or '').split(',') if p.strip()]
+        policy.max_total_size = max_total_size
+        policy.skip_open_files = self.menu.show_confirmation("🔒 ¿Conservar archivos abiertos por otros procesos?")
+        
+        save_policy(policy)
+        self.menu.show_success(f"✅ Política guardada para {policy.directory}")
+    
+    def _show_retention_schedule_help(self):
+        """Explica cómo programar la ejecución desatendida de las políticas."""
+        command = "noox limpiar-temp"
+        
+        self.menu.console.print("\n[bold cyan]⏰ Ejecución programada de políticas[/bold cyan]")
+        self.menu.console.print(f"  Comando: [green]{command}[/green]  (añade [yellow]--simular[/yellow] para una simulación)")
+        self.menu.console.print("  Si nada cambió desde la última ejecución, el comando termina sin recorrer los directorios.\n")
+        
+        if os.name == 'nt':
+            self.menu.console.print("  [cyan]Programador de tareas (cada hora):[/cyan]")
+            self.menu.console.print(f'  schtasks /Create /SC HOURLY /TN "NooxCLI limpiar-temp" /TR "{command}"')
+        else:
+            self.menu.console.print("  [cyan]crontab -e (cada hora):[/cyan]")
+            self.menu.console.print(f"  0 * * * * {command} >/dev/null 2>&1")
+    
+    def run_retention_policies(self, interactive: bool = False, dry_run: bool = False, force: bool = False) -> int:
+        """
+        Aplica las políticas de retención a todos los directorios temporales.
+        
+        Args:
+            interactive: Mostrar vista previa y pedir confirmación
+            dry_run: Solo mostrar lo que se eliminaría
+            force: Ignorar la comprobación previa de cambios
+            
+        Returns:
+            Código de salida: 0 si todo fue bien, 1 si hubo errores
+        """
+        policies = load_policies(self._dedupe_directories(self._get_temp_directories()))
+        
+        # Comprobación previa: no recorrer directorios sin cambios
+        pending = policies if (force or interactive) else [p for p in policies if needs_run(p)]
+        for policy in policies:
+            if policy not in pending:
+                self.menu.console.print(f"⏭️ {policy.directory}: sin cambios desde la última ejecución")
+        
+        if not pending:
+            return 0
+        
+        open_files = OpenFilesIndex.build() if any(p.skip_open_files for p in pending) else None
+        plans = [plan_retention(policy, open_files) for policy in pending]
+        
+        if interactive:
+            if not self._preview_cleanup([plan.manifest for plan in plans], open_files=open_files):
+                return 0
+            if dry_run or not self.menu.show_confirmation("¿Aplicar las políticas de retención?"):
+                self.menu.show_info("ℹ️ Limpieza cancelada (simulación)")
+                return 0
+        
+        exit_code = 0
+        for plan in plans:
+            manifest = plan.manifest
+            if dry_run:
+                self.menu.console.print(
+                    f"🔍 {plan.policy.directory}: se eliminarían {manifest.file_count:,} archivos "
+                    f"({self._format_bytes(manifest.total_size)})"
+                )
+                continue
+            
+            result = execute_manifest(manifest)
+            record_run(plan)
+            
+            self.menu.console.print(
+                f"🧹 {plan.policy.directory}: {result.deleted_files:,} archivos eliminados, "
+                f"{self._format_bytes(result.deleted_size)} liberados"
+                + (f", {result.errors.count:,} errores" if result.errors.count else "")
+            )
+            for error in result.errors.samples:
+                self.menu.console.print(f"    • {error}")
+            if result.errors.count:
+                exit_code = 1
+        
+        if open_files is not None:
+            pinned = open_files.pinned_size([plan.policy.directory for plan in plans])
+            if pinned:
+                self.menu.console.print(
+                    f"📌 {self._format_bytes(pinned)} retenidos por archivos borrados que siguen abiertos"
+                )
+        
+        return exit_code
+    
     def _full_temp_cleanup(self):
         """Realiza una limpieza completa de todos los archivos temporales posibles."""
         self.menu.clear_screen()
@@ -2619,78 +3330,30 @@ class SistemaModule:
         self.menu.show_warning("⚠️ Algunos archivos pueden estar en uso y no se podrán eliminar")
         self.menu.show_warning("⚠️ Se recomienda cerrar otras aplicaciones antes de continuar")
         
-        if not self.menu.get_confirmation("¿Estás seguro de realizar una limpieza completa?"):
-            self.menu.show_info("ℹ️ Limpieza cancelada")
-            return
-        
         temp_dirs = self._get_temp_directories()
         
         if not temp_dirs:
             self.menu.show_error("❌ No se encontraron directorios temporales")
             return
         
-        total_deleted_files = 0
-        total_deleted_size = 0
-        total_errors = 0
+        open_files = self._build_open_files_index()
+        manifests = self._build_cleanup_manifests(temp_dirs, open_files)
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.menu.console
-        ) as progress:
-            main_task = progress.add_task("Limpieza completa en progreso...", total=len(temp_dirs))
-            
-            for temp_dir in temp_dirs:
-                progress.update(main_task, description=f"Limpiando {os.path.basename(temp_dir)}...")
-                
-                deleted_files = 0
-                deleted_size = 0
-                errors = 0
-                
-                try:
-                    for root, dirs, files in os.walk(temp_dir):
-                        for file in files:
-                            try:
-                                file_path = os.path.join(root, file)
-                                if os.path.isfile(file_path):
-                                    file_size = os.path.getsize(file_path)
-                                    os.remove(file_path)
-                                    deleted_files += 1
-                                    deleted_size += file_size
-                            except (OSError, PermissionError):
-                                errors += 1
-                                continue
-                        
-                        # Intentar eliminar directorios vacíos
-                        for dir_name in dirs:
-                            try:
-                                dir_path = os.path.join(root, dir_name)
-                                if os.path.isdir(dir_path) and not os.listdir(dir_path):
-                                    os.rmdir(dir_path)
-                            except (OSError, PermissionError):
-                                continue
-                
-                except Exception:
-                    errors += 1
-                
-                total_deleted_files += deleted_files
-                total_deleted_size += deleted_size
-                total_errors += errors
-                
-                progress.advance(main_task)
+        if not self._preview_cleanup(manifests, limit=5, open_files=open_files):
+            return
         
-        # Mostrar resultados finales
-        self.menu.console.print(f"\n[bold green]✅ Limpieza Completa Finalizada:[/bold green]")
-        self.menu.console.print(f"  📁 Directorios procesados: [cyan]{len(temp_dirs)}[/cyan]")
-        self.menu.console.print(f"  🗑️ Total de archivos eliminados: [green]{total_deleted_files:,}[/green]")
-        self.menu.console.print(f"  💾 Total de espacio liberado: [yellow]{self._format_bytes(total_deleted_size)}[/yellow]")
+        if not self.menu.show_confirmation("¿Estás seguro de realizar una limpieza completa?"):
+            self.menu.show_info("ℹ️ Limpieza cancelada (simulación)")
+            return
         
-        if total_errors > 0:
-            self.menu.console.print(f"  ❌ Archivos no eliminados: [red]{total_errors:,}[/red]")
-            self.menu.console.print("  💡 Algunos archivos pueden estar en uso por aplicaciones activas")
+        result = self._execute_cleanup(manifests)
+        
+        # Mostrar resultados finales
+        self._show_cleanup_result(result, "Limpieza Completa Finalizada")
+        self.menu.console.print(f"  📁 Directorios procesados: [cyan]{len(manifests)}[/cyan]")
         
-        if total_deleted_size > 1024*1024*100:  # Más de 100MB liberados
-            self.menu.console.print(f"\n[bold green]🎉 ¡Excelente! Se liberaron {self._format_bytes(total_deleted_size)} de espacio en disco[/bold green]")
+        if result.deleted_size > 1024*1024*100:  # Más de 100MB liberados
+            self.menu.console.print(f"\n[bold green]🎉 ¡Excelente! Se liberaron {self._format_bytes(result.deleted_size)} de espacio en disco[/bold green]")
 
     def _open_system_tools(self):
         """Abre herramientas del sistema como Task Manager y Registry Editor."""
@@ -2907,23 +3570,7 @@ class SistemaModule:
 
     def _tool_exists(self, tool_name: str) -> bool:
         """Verifica si una herramienta del sistema existe."""
-        try:
-            if os.name == 'nt':
-                # En Windows, verificar en PATH y directorios del sistema
-                result = subprocess.run(['where', tool_name], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      check=False)
-                return result.returncode == 0
-            else:
-                # En sistemas Unix-like, usar which
-                result = subprocess.run(['which', tool_name], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      check=False)
-                return result.returncode == 0
-        except Exception:
-            return False
+        return tool_registry.exists(tool_name)
 
     def _network_diagnostics(self):
         """Herramientas de diagnóstico de red."""
@@ -3550,5 +4197,20 @@ def main():
     sistema_module.main()
 
 
+def limpiar_temporales(dry_run: bool = False, force: bool = False) -> int:
+    """Aplica las políticas de retención sin interfaz (para cron o el Programador de tareas)."""
+    return SistemaModule().run_retention_policies(dry_run=dry_run, force=force)
+
+
+def instantanea_disco(root: str) -> int:
+    """Guarda una instantánea del uso de disco de `root` sin interfaz."""
+    return SistemaModule().run_disk_snapshot(root)
+
+
+def diferencia_disco(root: str, compare_now: bool = False, back: int = 1) -> int:
+    """Muestra qué creció en `root` entre instantáneas sin interfaz."""
+    return SistemaModule().run_disk_diff(root, compare_now=compare_now, back=back)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
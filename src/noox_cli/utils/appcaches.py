@@ -0,0 +1,236 @@
+"""
+Inventario de cachés de aplicaciones del usuario.
+Enumera las raíces de caché de la plataforma (~/.cache, ~/Library/Caches, /var/tmp)
+y las cachés conocidas de navegadores e IDEs que viven fuera de ellas (sobre todo en
+Windows), atribuye cada directorio a una aplicación y los mide en paralelo con un
+tiempo límite por directorio para que un árbol enorme no bloquee el inventario.
+"""
+
+import os
+import sys
+import glob
+import time
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .storage import user_cache_dir
+
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_WORKERS = 8
+SHARED_TEMP_ROOT = '/var/tmp'
+
+BROWSER = 'Navegador'
+EDITOR = 'IDE/Editor'
+DEVELOPMENT = 'Desarrollo'
+SYSTEM = 'Sistema'
+OTHER = 'Otro'
+
+# (patrón del nombre del directorio en minúsculas, aplicación, categoría)
+ATTRIBUTION_RULES: List[Tuple[str, str, str]] = [
+    ('google-chrome*', 'Google Chrome', BROWSER),
+    ('com.google.chrome*', 'Google Chrome', BROWSER),
+    ('chromium', 'Chromium', BROWSER),
+    ('mozilla', 'Firefox', BROWSER),
+    ('firefox', 'Firefox', BROWSER),
+    ('bravesoftware', 'Brave', BROWSER),
+    ('microsoft-edge*', 'Microsoft Edge', BROWSER),
+    ('com.microsoft.edgemac*', 'Microsoft Edge', BROWSER),
+    ('opera*', 'Opera', BROWSER),
+    ('vivaldi', 'Vivaldi', BROWSER),
+    ('com.apple.safari*', 'Safari', BROWSER),
+    ('jetbrains', 'JetBrains', EDITOR),
+    ('code', 'VS Code', EDITOR),
+    ('code - insiders', 'VS Code', EDITOR),
+    ('com.microsoft.vscode*', 'VS Code', EDITOR),
+    ('vscode*', 'VS Code', EDITOR),
+    ('vscodium', 'VSCodium', EDITOR),
+    ('cursor', 'Cursor', EDITOR),
+    ('sublime-text*', 'Sublime Text', EDITOR),
+    ('zed', 'Zed', EDITOR),
+    ('pip', 'pip', DEVELOPMENT),
+    ('pypoetry', 'Poetry', DEVELOPMENT),
+    ('pre-commit', 'pre-commit', DEVELOPMENT),
+    ('yarn', 'yarn', DEVELOPMENT),
+    ('node-gyp', 'node-gyp', DEVELOPMENT),
+    ('go-build', 'Go', DEVELOPMENT),
+    ('composer', 'composer', DEVELOPMENT),
+    ('ms-playwright*', 'Playwright', DEVELOPMENT),
+    ('puppeteer', 'Puppeteer', DEVELOPMENT),
+    ('cypress', 'Cypress', DEVELOPMENT),
+    ('electron*', 'Electron', DEVELOPMENT),
+    ('typescript', 'TypeScript', DEVELOPMENT),
+    ('deno', 'Deno', DEVELOPMENT),
+    ('huggingface', 'Hugging Face', DEVELOPMENT),
+    ('torch', 'PyTorch', DEVELOPMENT),
+    ('bazel', 'Bazel', DEVELOPMENT),
+    ('ccache', 'ccache', DEVELOPMENT),
+    ('sccache', 'sccache', DEVELOPMENT),
+    ('homebrew', 'Homebrew', DEVELOPMENT),
+    ('thumbnails', 'Miniaturas', SYSTEM),
+    ('fontconfig', 'Fuentes', SYSTEM),
+    ('mesa_shader_cache*', 'Shaders GPU', SYSTEM),
+    ('nvidia', 'Shaders GPU', SYSTEM),
+    ('d3dscache', 'Shaders GPU', SYSTEM),
+    ('inetcache', 'Internet Explorer/Edge', SYSTEM),
+    ('tracker*', 'Indexador', SYSTEM),
+    ('gstreamer-*', 'GStreamer', SYSTEM),
+    ('com.apple.*', 'macOS', SYSTEM),
+]
+
+# Cachés conocidas fuera de las raíces: (base, patrón glob, nombre para atribuir)
+_APPDATA = os.environ.get('APPDATA', '')
+_LOCALAPPDATA = os.environ.get('LOCALAPPDATA', '')
+_CHROMIUM_CACHES = ('Cache', 'Code Cache', 'GPUCache')
+
+if os.name == 'nt':
+    EXTRA_LOCATIONS: List[Tuple[str, str, Optional[str]]] = [
+        *[(_LOCALAPPDATA, f'Google/Chrome/User Data/*/{c}', 'google-chrome') for c in _CHROMIUM_CACHES],
+        *[(_LOCALAPPDATA, f'Microsoft/Edge/User Data/*/{c}', 'microsoft-edge') for c in _CHROMIUM_CACHES],
+        *[(_LOCALAPPDATA, f'BraveSoftware/Brave-Browser/User Data/*/{c}', 'bravesoftware') for c in _CHROMIUM_CACHES],
+        (_LOCALAPPDATA, 'Mozilla/Firefox/Profiles/*/cache2', 'firefox'),
+        *[(_APPDATA, f'Code/{c}', 'code') for c in ('Cache', 'CachedData', 'CachedExtensionVSIXs', 'Code Cache')],
+        (_LOCALAPPDATA, 'JetBrains/*/caches', 'jetbrains'),
+        (_LOCALAPPDATA, 'Microsoft/Windows/INetCache', 'inetcache'),
+        (_LOCALAPPDATA, 'D3DSCache', 'd3dscache'),
+        (_LOCALAPPDATA, 'NVIDIA/DXCache', 'nvidia'),
+    ]
+elif sys.platform == 'darwin':
+    EXTRA_LOCATIONS = [
+        (str(Path.home() / 'Library' / 'Application Support'), f'Code/{c}', 'code')
+        for c in ('Cache', 'CachedData', 'CachedExtensionVSIXs', 'Code Cache')
+    ]
+else:
+    EXTRA_LOCATIONS = [
+        *[(str(Path.home() / '.config'), f'Code/{c}', 'code')
+          for c in ('Cache', 'CachedData', 'CachedExtensionVSIXs', 'Code Cache')],
+        (str(Path.home() / '.config'), 'google-chrome/*/GPUCache', 'google-chrome'),
+        # Aplicaciones Flatpak: cada una tiene su propia caché
+        (str(Path.home() / '.var' / 'app'), '*/cache', None),
+    ]
+
+
+@dataclass
+class AppCache:
+    path: str
+    application: str
+    category: str
+    size: int = 0
+    file_count: int = 0
+    complete: bool = True
+    error: Optional[str] = None
+
+
+def attribute_cache(name: str) -> Tuple[str, str]:
+    """Atribuye un directorio de caché a (aplicación, categoría) por su nombre."""
+    lowered = name.lower()
+    for pattern, application, category in ATTRIBUTION_RULES:
+        if fnmatch.fnmatchcase(lowered, pattern):
+            return application, category
+    return name, OTHER
+
+
+def cache_roots() -> List[str]:
+    """
+    Raíces cuyos subdirectorios se inventarían como cachés.
+    En Windows no hay ninguna: LOCALAPPDATA mezcla cachés con datos reales. En POSIX
+    se añade /var/tmp, donde algunas aplicaciones dejan cachés que sobreviven a los
+    reinicios; la limpieza completa de temporales no lo incluye.
+    """
+    if os.name == 'nt':
+        return []
+    roots = [str(user_cache_dir()), SHARED_TEMP_ROOT]
+    return [root for root in roots if os.path.isdir(root)]
+
+
+def discover_app_caches() -> List[AppCache]:
+    """Enumera los directorios de caché y los atribuye a una aplicación (sin medirlos)."""
+    found: Dict[str, AppCache] = {}
+
+    for root in cache_roots():
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        application, category = attribute_cache(entry.name)
+                        found[entry.path] = AppCache(entry.path, application, category)
+        except OSError:
+            continue
+
+    for base, pattern, name in EXTRA_LOCATIONS:
+        if not base:
+            continue
+        for path in glob.glob(os.path.join(base, pattern)):
+            if path in found or not os.path.isdir(path):
+                continue
+            if name is None:
+                # Flatpak: el identificador de la aplicación es el directorio padre
+                app_id = os.path.basename(os.path.dirname(path))
+                application, category = attribute_cache(app_id.rsplit('.', 1)[-1])
+                if category == OTHER:
+                    application = app_id
+            else:
+                application, category = attribute_cache(name)
+            found[path] = AppCache(path, application, category)
+
+    return list(found.values())
+
+
+def size_with_deadline(path: str, timeout: float) -> Tuple[int, int, bool]:
+    """
+    Suma el tamaño de un árbol deteniéndose al agotar el tiempo.
+
+    Returns:
+        (bytes, archivos, completo); si no se completó, los valores son un mínimo
+    """
+    deadline = time.monotonic() + timeout
+    size = files = 0
+    stack = [path]
+
+    while stack:
+        if time.monotonic() > deadline:
+            return size, files, False
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            size += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return size, files, True
+
+
+def _measure(cache: AppCache, timeout: float) -> AppCache:
+    try:
+        cache.size, cache.file_count, cache.complete = size_with_deadline(cache.path, timeout)
+    except OSError as e:
+        cache.error = str(e)
+    return cache
+
+
+def measure_app_caches(caches: List[AppCache], timeout: float = DEFAULT_TIMEOUT,
+                       workers: int = DEFAULT_WORKERS) -> List[AppCache]:
+    """Mide las cachés en paralelo; devuelve la lista ordenada por tamaño descendente."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        measured = list(executor.map(lambda c: _measure(c, timeout), caches))
+    return sorted(measured, key=lambda c: c.size, reverse=True)
+
+
+def group_by_application(caches: List[AppCache]) -> List[Tuple[str, str, List[AppCache]]]:
+    """Agrupa las cachés por aplicación, de mayor a menor tamaño total."""
+    groups: Dict[str, Tuple[str, List[AppCache]]] = {}
+    for cache in caches:
+        groups.setdefault(cache.application, (cache.category, []))[1].append(cache)
+    ordered = sorted(groups.items(), key=lambda item: sum(c.size for c in item[1][1]), reverse=True)
+    return [(application, category, entries) for application, (category, entries) in ordered]
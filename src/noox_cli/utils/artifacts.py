@@ -0,0 +1,152 @@
+"""
+Barrido de artefactos de compilación en un directorio de proyectos.
+Cada proyecto se recorre en paralelo con una poda: al encontrar un directorio de
+artefactos (node_modules, .venv, dist...) se registra y no se desciende en él. En el
+mismo recorrido se obtiene la última actividad del proyecto (mtime más reciente de
+sus archivos fuente) para ordenar primero los proyectos abandonados.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cleanup import CleanupResult, build_manifest, execute_manifest
+from .openfiles import OpenFilesIndex
+from .scanner import scan_directory
+
+
+DEFAULT_WORKERS = 8
+
+# Directorios de control de versiones: no contienen artefactos y son grandes
+SKIP_DIRS = {'.git', '.hg', '.svn'}
+
+# Nombre del directorio -> archivos que deben existir junto a él (None: siempre es un artefacto)
+ARTIFACT_MARKERS: Dict[str, Optional[Tuple[str, ...]]] = {
+    'node_modules': None,
+    '__pycache__': None,
+    'vendor': ('composer.json', 'go.mod', 'Gemfile'),
+    'dist': ('package.json', 'pyproject.toml', 'setup.py', 'setup.cfg'),
+    'build': ('package.json', 'pyproject.toml', 'setup.py', 'setup.cfg',
+              'build.gradle', 'build.gradle.kts', 'CMakeLists.txt'),
+}
+
+# Entornos virtuales: se reconocen por su pyvenv.cfg, se llamen como se llamen
+VENV_MARKER = 'pyvenv.cfg'
+
+
+@dataclass
+class ArtifactDir:
+    path: str
+    kind: str
+    project: str
+    size: int = 0
+    file_count: int = 0
+
+
+@dataclass
+class ProjectArtifacts:
+    path: str
+    last_activity: float = 0.0
+    artifacts: List[ArtifactDir] = field(default_factory=list)
+
+    @property
+    def total_size(self) -> int:
+        return sum(a.size for a in self.artifacts)
+
+
+def _artifact_kind(entry: os.DirEntry, sibling_names: set) -> Optional[str]:
+    """Indica el tipo de artefacto de un directorio o None si no lo es."""
+    if entry.name in ARTIFACT_MARKERS:
+        markers = ARTIFACT_MARKERS[entry.name]
+        if markers is None or sibling_names.intersection(markers):
+            return entry.name
+    if os.path.isfile(os.path.join(entry.path, VENV_MARKER)):
+        return '.venv'
+    return None
+
+
+def scan_project(project: str) -> ProjectArtifacts:
+    """Recorre un proyecto sin descender en sus artefactos."""
+    result = ProjectArtifacts(path=project)
+    stack = [project]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+
+        sibling_names = {entry.name for entry in entries}
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SKIP_DIRS:
+                        # El mtime de .git cambia con cada commit o checkout
+                        result.last_activity = max(result.last_activity, entry.stat(follow_symlinks=False).st_mtime)
+                        continue
+                    kind = _artifact_kind(entry, sibling_names)
+                    if kind:
+                        result.artifacts.append(ArtifactDir(entry.path, kind, project))
+                    else:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    result.last_activity = max(result.last_activity, entry.stat(follow_symlinks=False).st_mtime)
+            except OSError:
+                continue
+
+    return result
+
+
+def _measure(artifact: ArtifactDir) -> ArtifactDir:
+    scan = scan_directory(artifact.path, by_extension=False, by_age=False)
+    artifact.size = scan.total_size
+    artifact.file_count = scan.file_count
+    return artifact
+
+
+def find_artifacts(projects: Iterable[str], workers: int = DEFAULT_WORKERS) -> List[ProjectArtifacts]:
+    """
+    Busca y mide los artefactos de varios proyectos en paralelo.
+
+    Returns:
+        Proyectos con algún artefacto, del menos activo al más reciente
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        found = [p for p in executor.map(scan_project, projects) if p.artifacts]
+        list(executor.map(_measure, [a for p in found for a in p.artifacts]))
+
+    return sorted(found, key=lambda p: p.last_activity)
+
+
+def delete_artifacts(artifacts: List[ArtifactDir], workers: int = DEFAULT_WORKERS,
+                     progress_callback: Optional[Callable[[int], None]] = None,
+                     open_files: Optional[OpenFilesIndex] = None) -> CleanupResult:
+    """
+    Elimina los directorios de artefactos por completo, de abajo hacia arriba.
+
+    Los manifiestos se construyen en paralelo y después se ejecutan uno a uno, cada
+    uno con su propio grupo de hilos de borrado. Los archivos que estén en
+    `open_files` se conservan junto con los directorios que los contienen.
+    """
+    total = CleanupResult()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        manifests = list(executor.map(lambda a: build_manifest(a.path, open_files=open_files), artifacts))
+
+    for manifest in manifests:
+        result = execute_manifest(manifest, workers=workers, progress_callback=progress_callback)
+        total.merge(result)
+        total.errors.merge(manifest.scan_errors)
+        if manifest.skipped_files:
+            continue
+        try:
+            os.rmdir(manifest.root)
+            total.deleted_dirs += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            total.errors.add(manifest.root, e)
+
+    return total
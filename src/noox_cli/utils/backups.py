@@ -0,0 +1,721 @@
+"""
+Backups incrementales de proyectos guiados por un manifiesto de archivos.
+Cada archivo zip de la cadena lleva dentro el manifiesto completo del proyecto en
+ese momento (ruta -> tamaño, mtime y SHA-256). El siguiente backup lo compara con el
+árbol actual: si tamaño y mtime coinciden el archivo no se lee; si no, se calcula su
+hash y solo los que cambiaron de verdad entran en el zip delta. La restauración
+reproduce el backup completo y sus deltas hasta el punto elegido. Los backups se
+guardan fuera de los proyectos, en un destino configurable.
+
+El backup de todos los proyectos reparte el trabajo en un grupo de procesos (la
+compresión usa CPU) y puede generar, en lugar de la cadena incremental, un archivo
+completo por proyecto en tar.gz, tar.xz o zip. Los archivos se copian por bloques
+sin copias intermedias y cada archivo se escribe con un nombre temporal que se
+renombra al terminar.
+
+La verificación y la restauración reparten los miembros de cada zip entre varios
+hilos, cada uno con su propio ZipFile, y acceden a ellos por el directorio central:
+restaurar unas pocas rutas no obliga a leer el archivo entero.
+"""
+
+import os
+import json
+import time
+import fnmatch
+import hashlib
+import tarfile
+import zipfile
+import zlib
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .storage import get_data_dir, load_json, save_json
+
+
+SETTINGS_FILE = 'backup_settings.json'
+METADATA_NAME = '.noox-backup.json'
+FULL = 'full'
+DELTA = 'delta'
+MAX_DELTAS = 10
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 8
+DEFAULT_LEVEL = 6
+DEFAULT_FORMAT = 'tar.gz'
+
+# Formato -> (extensión, niveles de compresión admitidos)
+ARCHIVE_FORMATS: Dict[str, Tuple[str, range]] = {
+    'tar.gz': ('.tar.gz', range(1, 10)),
+    'tar.xz': ('.tar.xz', range(0, 10)),
+    'zip': ('.zip', range(0, 10)),
+}
+
+# Los procesos hijos agrupan el progreso para no saturar la cola compartida
+PROGRESS_BATCH = 4 * 1024 * 1024
+
+DEFAULT_EXCLUDES = ['.git', 'node_modules', 'vendor', '__pycache__', '.venv', '*.pyc']
+
+# Ruta relativa ('/' como separador) -> [tamaño, mtime_ns, sha256]
+Manifest = Dict[str, List]
+
+
+@dataclass
+class BackupSettings:
+    destination: str = ''
+    excludes: List[str] = field(default_factory=lambda: list(DEFAULT_EXCLUDES))
+    max_deltas: int = MAX_DELTAS
+    archive_format: str = DEFAULT_FORMAT
+    compression_level: int = DEFAULT_LEVEL
+    cold_storage: str = ''
+
+    @property
+    def destination_path(self) -> Path:
+        return Path(self.destination) if self.destination else get_data_dir() / 'backups'
+
+    @property
+    def cold_storage_path(self) -> Path:
+        return Path(self.cold_storage) if self.cold_storage else self.destination_path / 'archivo_frio'
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BackupSettings':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class BackupArchive:
+    path: Path
+    sequence: int
+    kind: str
+    created: float
+    files: Manifest = field(default_factory=dict)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return datetime.fromtimestamp(self.created).strftime('%Y-%m-%d %H:%M:%S')
+
+
+@dataclass
+class BackupResult:
+    archive: Optional[BackupArchive] = None
+    added: int = 0
+    modified: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    # Archivos que no se pudieron leer: este punto de la cadena no tiene su versión actual
+    skipped: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ArchiveResult:
+    path: Path
+    file_count: int = 0
+    bytes_read: int = 0
+    archive_size: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class ProjectBackup:
+    project: str
+    result: Union[BackupResult, ArchiveResult, None] = None
+    error: Optional[str] = None
+
+
+def load_settings() -> BackupSettings:
+    settings = BackupSettings.from_dict(load_json(SETTINGS_FILE, {}) or {})
+    if settings.archive_format not in ARCHIVE_FORMATS:
+        # Un archivo de configuración editado a mano no debe romper los backups
+        settings.archive_format = DEFAULT_FORMAT
+    return settings
+
+
+def save_settings(settings: BackupSettings):
+    save_json(SETTINGS_FILE, asdict(settings))
+
+
+def is_inside(path: Path, root: Path) -> bool:
+    """Indica si `path` es `root` o está dentro de él."""
+    path = os.path.normcase(os.path.abspath(str(path)))
+    root = os.path.normcase(os.path.abspath(str(root)))
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def project_backup_dir(destination: Path, project: Path) -> Path:
+    return Path(destination) / Path(project).name
+
+
+def _excluded(name: str, relative: str, excludes: List[str]) -> bool:
+    return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(relative, p) for p in excludes)
+
+
+def scan_tree(root: Path, excludes: List[str],
+              skip: Optional[Path] = None) -> Dict[str, Tuple[int, int]]:
+    """Archivos del proyecto (ruta relativa -> tamaño, mtime_ns) sin los excluidos."""
+    files: Dict[str, Tuple[int, int]] = {}
+    stack = [(str(root), '')]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    relative = prefix + entry.name
+                    if entry.name == METADATA_NAME or _excluded(entry.name, relative, excludes):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if skip is None or not is_inside(Path(entry.path), skip):
+                                stack.append((entry.path, relative + '/'))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files[relative] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return files
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _add_file(archive: zipfile.ZipFile, source: str, relative: str,
+              on_chunk: Optional[Callable[[int], None]] = None) -> str:
+    """
+    Copia un archivo al zip por bloques y devuelve su SHA-256 (una sola lectura). El
+    miembro usa la compresión y el nivel del ZipFile; su fecha es la del backup y el
+    mtime exacto va en el manifiesto.
+    """
+    digest = hashlib.sha256()
+    with open(source, 'rb') as src, archive.open(relative, 'w', force_zip64=True) as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            dst.write(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+    return digest.hexdigest()
+
+
+def read_archive(path: Path) -> BackupArchive:
+    """Lee los metadatos (manifiesto incluido) de un archivo de la cadena."""
+    with zipfile.ZipFile(path) as archive:
+        metadata = json.loads(archive.read(METADATA_NAME).decode('utf-8'))
+    return BackupArchive(
+        path=Path(path),
+        sequence=metadata['sequence'],
+        kind=metadata['kind'],
+        created=metadata['created'],
+        files=metadata['files'],
+        changed=metadata.get('changed', [])
+    )
+
+
+def list_archives(backup_dir: Path) -> List[BackupArchive]:
+    """Archivos válidos de la cadena de un proyecto, del más antiguo al más reciente."""
+    archives = []
+    for path in sorted(Path(backup_dir).glob('*.zip')):
+        try:
+            archives.append(read_archive(path))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            continue
+    return sorted(archives, key=lambda a: a.sequence)
+
+
+def backup_project(project: Path, settings: BackupSettings, full: bool = False,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> BackupResult:
+    """
+    Respalda un proyecto: completo si no hay cadena, si se pide o si ya tiene
+    `max_deltas` deltas; si no, un delta con los archivos nuevos o modificados.
+
+    Returns:
+        BackupResult; `archive` es None si no había cambios
+    """
+    project = Path(project)
+    destination = settings.destination_path
+    if is_inside(destination, project):
+        raise ValueError(f"El destino de los backups no puede estar dentro del proyecto: {destination}")
+
+    backup_dir = project_backup_dir(destination, project)
+    chain = list_archives(backup_dir)
+    previous: Manifest = chain[-1].files if chain else {}
+    deltas_since_full = 0
+    for archive in reversed(chain):
+        if archive.kind == FULL:
+            break
+        deltas_since_full += 1
+
+    kind = FULL if full or not chain or chain[0].kind != FULL or deltas_since_full >= settings.max_deltas else DELTA
+    current = scan_tree(project, settings.excludes, skip=destination)
+    result = BackupResult()
+
+    manifest: Manifest = {}
+    to_write: List[str] = []
+    for relative, (size, mtime_ns) in current.items():
+        old = previous.get(relative)
+        if kind == FULL:
+            to_write.append(relative)
+        elif old is not None and old[0] == size and old[1] == mtime_ns:
+            manifest[relative] = old
+            result.unchanged += 1
+        else:
+            try:
+                digest = hash_file(str(project / relative))
+            except OSError as e:
+                result.errors.append((relative, str(e)))
+                result.skipped.append(relative)
+                if old is not None:
+                    # La versión anterior sigue en la cadena y se puede restaurar
+                    manifest[relative] = old
+                continue
+            if old is not None and old[2] == digest:
+                # Solo cambió el mtime (checkout, touch): no hace falta guardarlo otra vez
+                manifest[relative] = [size, mtime_ns, digest]
+                result.unchanged += 1
+            else:
+                to_write.append(relative)
+    result.removed = len(set(previous) - set(current))
+
+    if kind == DELTA and not to_write and not result.removed and manifest == previous:
+        return result
+
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    sequence = chain[-1].sequence + 1 if chain else 1
+    created = time.time()
+    name = f"{sequence:05d}-{datetime.fromtimestamp(created).strftime('%Y%m%d-%H%M%S')}-{kind}.zip"
+    final_path = backup_dir / name
+    tmp_path = backup_dir / f".{name}.tmp"
+
+    written: List[str] = []
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=settings.compression_level) as archive:
+            for relative in sorted(to_write):
+                size, mtime_ns = current[relative]
+                try:
+                    digest = _add_file(archive, str(project / relative), relative, progress_callback)
+                except OSError as e:
+                    result.errors.append((relative, str(e)))
+                    result.skipped.append(relative)
+                    if kind == DELTA and relative in previous:
+                        # Sin copia nueva, la restauración usará la versión anterior. Un backup
+                        # completo empieza una cadena nueva que no la contiene: se omite.
+                        manifest[relative] = previous[relative]
+                    continue
+                manifest[relative] = [size, mtime_ns, digest]
+                written.append(relative)
+                result.bytes_written += size
+                if relative in previous:
+                    result.modified += 1
+                else:
+                    result.added += 1
+            metadata = {
+                'sequence': sequence,
+                'kind': kind,
+                'created': created,
+                'project': str(project),
+                'files': manifest,
+                'changed': written,
+            }
+            archive.writestr(METADATA_NAME, json.dumps(metadata, ensure_ascii=False, separators=(',', ':')))
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    result.archive = BackupArchive(final_path, sequence, kind, created, manifest, written)
+    return result
+
+
+def restore_chain(chain: List[BackupArchive], upto: Optional[int] = None) -> List[BackupArchive]:
+    """Archivos necesarios para restaurar el punto `upto`: su backup completo y los deltas posteriores."""
+    selected = [a for a in chain if upto is None or a.sequence <= upto]
+    for index in range(len(selected) - 1, -1, -1):
+        if selected[index].kind == FULL:
+            return selected[index:]
+    raise ValueError("No hay un backup completo en el que basar la restauración")
+
+
+def _partition(members: List[str], sizes: Dict[str, int], parts: int) -> List[List[str]]:
+    """Reparte miembros en `parts` grupos de tamaño parecido (el mayor al grupo más ligero)."""
+    groups: List[List[str]] = [[] for _ in range(max(1, min(parts, len(members))))]
+    loads = [0] * len(groups)
+    for member in sorted(members, key=lambda m: sizes.get(m, 0), reverse=True):
+        index = loads.index(min(loads))
+        groups[index].append(member)
+        loads[index] += sizes.get(member, 0)
+    return [g for g in groups if g]
+
+
+def _run_partitioned(work: List[Tuple[Path, List[str]]], task: Callable, workers: int) -> list:
+    """Ejecuta `task(ruta_zip, miembros)` en paralelo; cada tarea abre su propio ZipFile."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [item for chunk in executor.map(lambda unit: task(*unit), work) for item in chunk]
+
+
+def _member_destination(target: Path, relative: str) -> Path:
+    parts = relative.split('/')
+    if any(part in ('', '.', '..') for part in parts) or os.path.isabs(relative):
+        raise ValueError(f"Ruta no válida en el backup: {relative}")
+    return target.joinpath(*parts)
+
+
+def _matches(relative: str, paths: List[str]) -> bool:
+    for path in paths:
+        path = path.replace('\\', '/').strip('/')
+        if relative == path or relative.startswith(path + '/'):
+            return True
+    return False
+
+
+@dataclass
+class VerifyResult:
+    archive: Path
+    checked: int = 0
+    bytes_checked: int = 0
+    corrupt: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.corrupt
+
+
+def verify_archive(path: Path, workers: int = DEFAULT_WORKERS,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> VerifyResult:
+    """
+    Comprueba un archivo de la cadena: lee cada miembro por bloques (zipfile valida el
+    CRC al llegar al final) y compara su SHA-256 con el del manifiesto, en paralelo.
+    """
+    result = VerifyResult(archive=Path(path))
+    try:
+        archive = read_archive(path)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        result.corrupt.append((METADATA_NAME, f"metadatos ilegibles: {e}"))
+        return result
+
+    sizes = {relative: archive.files[relative][0] for relative in archive.changed if relative in archive.files}
+
+    def check(zip_path: Path, members: List[str]) -> List[Tuple[str, int, Optional[str]]]:
+        outcomes = []
+        with zipfile.ZipFile(zip_path) as zf:
+            for member in members:
+                digest = hashlib.sha256()
+                size = 0
+                try:
+                    with zf.open(member) as src:
+                        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                            digest.update(chunk)
+                            size += len(chunk)
+                except KeyError:
+                    outcomes.append((member, 0, 'falta en el archivo'))
+                    continue
+                except (OSError, EOFError, zlib.error, zipfile.BadZipFile) as e:
+                    outcomes.append((member, size, str(e)))
+                    continue
+                if progress_callback:
+                    progress_callback(size)
+                expected = archive.files[member][2]
+                error = None if digest.hexdigest() == expected else 'el hash no coincide con el manifiesto'
+                outcomes.append((member, size, error))
+        return outcomes
+
+    work = [(archive.path, group) for group in _partition(list(sizes), sizes, workers)]
+    for member, size, error in _run_partitioned(work, check, workers):
+        result.checked += 1
+        result.bytes_checked += size
+        if error:
+            result.corrupt.append((member, error))
+    return result
+
+
+def verify_chain(backup_dir: Path, workers: int = DEFAULT_WORKERS,
+                 progress_callback: Optional[Callable[[int], None]] = None) -> List[VerifyResult]:
+    """Verifica todos los archivos de la cadena de un proyecto (incluidos los ilegibles)."""
+    return [
+        verify_archive(path, workers, progress_callback)
+        for path in sorted(Path(backup_dir).glob('*.zip'))
+    ]
+
+
+def restore_project(backup_dir: Path, target: Path, upto: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    paths: Optional[List[str]] = None, overwrite: bool = False,
+                    workers: int = DEFAULT_WORKERS) -> int:
+    """
+    Restaura un proyecto en `target` tal como estaba en el punto `upto` (por defecto
+    el último), conservando los mtimes.
+
+    Con `paths` solo se restauran esas rutas (archivos o directorios relativos al
+    proyecto); gracias al directorio central del zip solo se leen esos miembros. Los
+    archivos se escriben en paralelo. Sin `overwrite`, falla si alguno ya existe.
+
+    Returns:
+        Número de archivos restaurados
+    """
+    target = Path(target)
+    chain = restore_chain(list_archives(backup_dir), upto)
+    final = chain[-1].files
+    wanted = [r for r in final if _matches(r, paths)] if paths else list(final)
+    if paths and not wanted:
+        raise ValueError("Ninguna de las rutas indicadas está en el backup")
+
+    # Cada archivo sale del archivo más reciente de la cadena que lo contenga
+    wanted_set = set(wanted)
+    sources: Dict[str, BackupArchive] = {}
+    for archive in reversed(chain):
+        for relative in archive.changed:
+            if relative in wanted_set and relative not in sources:
+                sources[relative] = archive
+    missing = wanted_set - set(sources)
+    if missing:
+        raise ValueError(f"La cadena de backups está incompleta: faltan {len(missing)} archivo(s)")
+
+    destinations = {relative: _member_destination(target, relative) for relative in wanted}
+    if not overwrite:
+        existing = [r for r, destination in destinations.items() if os.path.lexists(destination)]
+        if existing:
+            raise ValueError(f"{len(existing)} archivo(s) ya existen en {target} (p. ej. {existing[0]})")
+    for directory in {destination.parent for destination in destinations.values()}:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def extract(zip_path: Path, members: List[str]) -> List[str]:
+        with zipfile.ZipFile(zip_path) as zf:
+            for relative in members:
+                destination = destinations[relative]
+                with zf.open(relative) as src, open(destination, 'wb') as dst:
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                        dst.write(chunk)
+                mtime_ns = final[relative][1]
+                os.utime(destination, ns=(mtime_ns, mtime_ns))
+                if progress_callback:
+                    progress_callback(final[relative][0])
+        return members
+
+    sizes = {relative: final[relative][0] for relative in wanted}
+    work = []
+    for archive in chain:
+        members = [r for r, source in sources.items() if source is archive]
+        work.extend((archive.path, group) for group in _partition(members, sizes, workers))
+    return len(_run_partitioned(work, extract, workers))
+
+
+class _SizedReader:
+    """
+    Lector de exactamente `size` bytes para tarfile, que exige que el tamaño declarado
+    coincida: si el archivo encoge mientras se lee, completa con ceros.
+    """
+
+    def __init__(self, f, size: int, on_chunk: Optional[Callable[[int], None]] = None):
+        self.f = f
+        self.remaining = size
+        self.on_chunk = on_chunk
+        self.truncated = False
+
+    def read(self, n: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        n = self.remaining if n is None or n < 0 else min(n, self.remaining)
+        data = self.f.read(n)
+        if len(data) < n:
+            self.truncated = True
+            data += b'\0' * (n - len(data))
+        self.remaining -= len(data)
+        if self.on_chunk:
+            self.on_chunk(len(data))
+        return data
+
+
+def write_archive(project: Path, target: Path, archive_format: str, level: int, excludes: List[str],
+                  progress_callback: Optional[Callable[[int], None]] = None) -> ArchiveResult:
+    """
+    Escribe un archivo completo del proyecto (carpeta raíz incluida) en `target`,
+    copiando cada archivo por bloques. Se escribe en un nombre temporal y se renombra.
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Formato no soportado: {archive_format}")
+    if level not in ARCHIVE_FORMATS[archive_format][1]:
+        raise ValueError(f"Nivel de compresión no válido para {archive_format}: {level}")
+
+    project = Path(project)
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    result = ArchiveResult(path=target)
+    files = scan_tree(project, excludes, skip=target.parent)
+
+    try:
+        if archive_format == 'zip':
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=level,
+                                 strict_timestamps=False) as archive:
+                for relative in sorted(files):
+                    # Abrir y hacer stat antes de escribir la cabecera: esos fallos solo omiten el archivo
+                    try:
+                        src = open(project / relative, 'rb')
+                    except OSError as e:
+                        result.errors.append((relative, str(e)))
+                        continue
+                    with src:
+                        try:
+                            # Conserva la fecha del archivo, como hace ZipFile.write()
+                            info = zipfile.ZipInfo.from_file(project / relative, f"{project.name}/{relative}",
+                                                             strict_timestamps=False)
+                        except OSError as e:
+                            result.errors.append((relative, str(e)))
+                            continue
+                        # Lo mismo que hace write(): el nivel solo se lee de este atributo
+                        # (3.13 lo renombra a compress_level y conserva este nombre)
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        info._compresslevel = level
+                        size = 0
+                        try:
+                            with archive.open(info, 'w', force_zip64=True) as dst:
+                                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                                    dst.write(chunk)
+                                    size += len(chunk)
+                                    if progress_callback:
+                                        progress_callback(len(chunk))
+                        except OSError as e:
+                            # La cabecera ya está escrita y el miembro se cierra igualmente: quedaría truncado
+                            raise OSError(f"Error a mitad de {relative}; se descarta el archivo: {e}") from e
+                    result.bytes_read += size
+                    result.file_count += 1
+        else:
+            options = {'compresslevel': level} if archive_format == 'tar.gz' else {'preset': level}
+            with tarfile.open(tmp_path, 'w:gz' if archive_format == 'tar.gz' else 'w:xz', **options) as archive:
+                for relative in sorted(files):
+                    # Abrir y hacer stat antes de escribir la cabecera: esos fallos solo omiten el archivo
+                    try:
+                        src = open(project / relative, 'rb')
+                    except OSError as e:
+                        result.errors.append((relative, str(e)))
+                        continue
+                    with src:
+                        try:
+                            info = archive.gettarinfo(arcname=f"{project.name}/{relative}", fileobj=src)
+                        except OSError as e:
+                            result.errors.append((relative, str(e)))
+                            continue
+                        reader = _SizedReader(src, info.size, progress_callback)
+                        try:
+                            archive.addfile(info, reader)
+                        except OSError as e:
+                            # La cabecera ya está escrita: seguir dejaría un miembro truncado
+                            raise OSError(f"Error a mitad de {relative}; se descarta el archivo: {e}") from e
+                    if reader.truncated:
+                        result.errors.append((relative, 'el archivo cambió de tamaño durante la copia'))
+                    result.bytes_read += info.size
+                    result.file_count += 1
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    result.archive_size = target.stat().st_size
+    return result
+
+
+class _ProgressReporter:
+    """Acumula el progreso de un proceso hijo y lo envía a la cola por lotes."""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.pending = 0
+
+    def __call__(self, amount: int):
+        self.pending += amount
+        if self.pending >= PROGRESS_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.queue.put(self.pending)
+            self.pending = 0
+
+
+def _backup_worker(project: str, settings: BackupSettings, archive_dir: Optional[str], queue) -> ProjectBackup:
+    """Trabajo de un proceso hijo: cadena incremental o archivo completo de un proyecto."""
+    reporter = _ProgressReporter(queue)
+    outcome = ProjectBackup(project=project)
+    try:
+        if archive_dir is None:
+            outcome.result = backup_project(Path(project), settings, progress_callback=reporter)
+            if outcome.result.archive:
+                # El manifiesto puede ser grande y el proceso principal no lo necesita
+                outcome.result.archive.files = {}
+        else:
+            extension = ARCHIVE_FORMATS[settings.archive_format][0]
+            target = Path(archive_dir) / (Path(project).name + extension)
+            outcome.result = write_archive(Path(project), target, settings.archive_format,
+                                           settings.compression_level, settings.excludes, reporter)
+    except Exception as e:
+        outcome.error = str(e)
+    reporter.flush()
+    return outcome
+
+
+def _drain(queue, progress_callback: Optional[Callable[[int], None]]):
+    while True:
+        try:
+            amount = queue.get_nowait()
+        except Exception:
+            return
+        if progress_callback:
+            progress_callback(amount)
+
+
+def backup_all(projects: List[Path], settings: BackupSettings, archive_dir: Optional[Path] = None,
+               workers: Optional[int] = None,
+               progress_callback: Optional[Callable[[int], None]] = None,
+               on_done: Optional[Callable[[ProjectBackup], None]] = None) -> List[ProjectBackup]:
+    """
+    Respalda varios proyectos en paralelo, cada uno en su propio proceso.
+
+    Con `archive_dir` se genera un archivo completo por proyecto en ese directorio
+    (formato y nivel de `settings`); sin él, cada proyecto actualiza su cadena incremental.
+    `progress_callback` recibe los bytes leídos de todos los procesos.
+
+    Returns:
+        Un ProjectBackup por proyecto, en el orden recibido
+    """
+    projects = [str(p) for p in projects]
+    if not projects:
+        return []
+    if archive_dir is not None:
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    workers = workers or min(len(projects), os.cpu_count() or 1)
+    outcomes: Dict[str, ProjectBackup] = {}
+
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        queue = manager.Queue()
+        pending = {
+            executor.submit(_backup_worker, project, settings,
+                            str(archive_dir) if archive_dir is not None else None, queue)
+            for project in projects
+        }
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            _drain(queue, progress_callback)
+            for future in done:
+                outcome = future.result()
+                outcomes[outcome.project] = outcome
+                if on_done:
+                    on_done(outcome)
+        _drain(queue, progress_callback)
+
+    return [outcomes[p] for p in projects]
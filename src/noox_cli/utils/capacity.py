@@ -0,0 +1,129 @@
+"""
+Muestreo de espacio e inodos libres por sistema de archivos y proyección de llenado.
+Las muestras se toman al abrir el menú de sistema (sample_mounts, en segundo plano) y
+al consultar las unidades con poco espacio; se guardan en el directorio de datos y se
+ajusta una recta por mínimos cuadrados para estimar cuándo se agotará el espacio o
+los inodos.
+"""
+
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .mounts import mount_prober
+from .storage import load_json, save_json
+
+
+SAMPLES_FILE = 'disk_samples.json'
+MIN_SAMPLE_INTERVAL = 5 * 60
+MAX_SAMPLE_AGE = 30 * 24 * 60 * 60
+MIN_SAMPLES = 3
+MIN_SPAN = 10 * 60
+
+# Índices de cada muestra: [timestamp, bytes libres, inodos libres (o None)]
+FREE_BYTES = 1
+FREE_INODES = 2
+
+# El muestreo de fondo y el de la vista pueden coincidir: leer y guardar va en exclusiva
+_lock = threading.Lock()
+
+
+def record_samples(usages: Sequence[Tuple[str, int, Optional[int]]], now: Optional[float] = None,
+                   min_interval: float = MIN_SAMPLE_INTERVAL) -> Dict[str, List[list]]:
+    """
+    Registra una muestra por punto de montaje si ha pasado el intervalo mínimo.
+
+    Args:
+        usages: Tuplas (punto de montaje, bytes libres, inodos libres)
+        now: Momento de la muestra
+        min_interval: Segundos mínimos entre muestras del mismo montaje
+
+    Returns:
+        Todas las muestras almacenadas, por punto de montaje
+    """
+    now = time.time() if now is None else now
+
+    with _lock:
+        samples: Dict[str, List[list]] = load_json(SAMPLES_FILE, {}) or {}
+        changed = False
+
+        for mountpoint, free_bytes, free_inodes in usages:
+            history = samples.setdefault(mountpoint, [])
+            if history and now - history[-1][0] < min_interval:
+                continue
+            history.append([now, free_bytes, free_inodes])
+            changed = True
+
+        for mountpoint in list(samples):
+            kept = [s for s in samples[mountpoint] if now - s[0] <= MAX_SAMPLE_AGE]
+            if len(kept) != len(samples[mountpoint]):
+                changed = True
+            if kept:
+                samples[mountpoint] = kept
+            else:
+                del samples[mountpoint]
+
+        if changed:
+            try:
+                save_json(SAMPLES_FILE, samples)
+            except OSError:
+                pass
+
+    return samples
+
+
+def sample_mounts(mountpoints: Iterable[str]) -> Dict[str, List[list]]:
+    """Mide los montajes con el sondeo compartido y registra una muestra de los que respondieron."""
+    usages = mount_prober.usage(mountpoints)
+    return record_samples([
+        (mountpoint, usage.free, usage.inodes_free)
+        for mountpoint, usage in usages.items()
+        if usage.responsive and usage.error is None
+    ])
+
+
+def linear_fit(points: Sequence[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Ajuste por mínimos cuadrados; devuelve (pendiente, ordenada) o None."""
+    n = len(points)
+    if n < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+def project_exhaustion(history: Sequence[Sequence], index: int = FREE_BYTES,
+                       now: Optional[float] = None) -> Optional[float]:
+    """
+    Estima los segundos que faltan para que el recurso libre llegue a cero.
+
+    Devuelve None si no hay suficientes muestras o si el recurso no disminuye.
+    """
+    points = [(s[0], float(s[index])) for s in history if len(s) > index and s[index] is not None]
+    if len(points) < MIN_SAMPLES or points[-1][0] - points[0][0] < MIN_SPAN:
+        return None
+
+    fit = linear_fit(points)
+    if not fit or fit[0] >= 0:
+        return None
+
+    slope, intercept = fit
+    now = points[-1][0] if now is None else now
+    exhausted_at = -intercept / slope
+    return max(exhausted_at - now, 0.0)
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formatea una proyección como 'N horas' o 'N días'."""
+    if seconds is None:
+        return "Estable"
+    hours = seconds / 3600
+    if hours < 1:
+        return "< 1 hora"
+    if hours < 48:
+        return f"{hours:.0f} horas"
+    return f"{hours / 24:.0f} días"
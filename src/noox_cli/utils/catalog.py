@@ -0,0 +1,262 @@
+"""
+Catálogo en caché de los proyectos de un directorio.
+La lista de proyectos sale de un solo scandir de la raíz y se reutiliza mientras no
+cambie su mtime. Los detalles de cada proyecto (tipo, archivos principales) salen de
+un solo scandir del proyecto y se guardan en disco junto a su mtime: crear, borrar o
+renombrar algo en el primer nivel del proyecto cambia ese mtime y los invalida. La
+detección puede hacerse en un hilo de fondo mientras el menú ya está disponible; el
+tamaño, que exige recorrer todo el árbol, solo se calcula cuando se pide.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .scanner import scan_directory
+from .storage import load_json, save_json
+
+
+CACHE_FILE = 'project_catalog.json'
+DEFAULT_WORKERS = 8
+SIZE_MAX_AGE = 600
+
+UNKNOWN = 'Desconocido'
+
+# (archivo o directorio en el primer nivel, tipo); gana el primero que aparezca
+TYPE_MARKERS = [
+    ('package.json', 'Node.js/React'),
+    ('requirements.txt', 'Python'),
+    ('composer.json', 'PHP/Laravel'),
+    ('index.html', 'HTML/Web'),
+    ('index.php', 'PHP'),
+    ('.git', 'Git Repository'),
+]
+
+MAIN_FILES = ('index.html', 'index.php', 'package.json', 'requirements.txt', 'composer.json', 'README.md')
+
+# Referencia propia del módulo: las pruebas cuentan los recorridos sin tocar os.scandir
+_scandir = os.scandir
+
+
+@dataclass
+class ProjectEntry:
+    path: str
+    name: str
+    mtime_ns: int
+    type: Optional[str] = None
+    main_files: List[str] = field(default_factory=list)
+    size: Optional[int] = None
+    size_measured: Optional[float] = None
+
+    @property
+    def last_modified(self) -> float:
+        return self.mtime_ns / 1e9
+
+
+def detect_type(names: Iterable[str]) -> str:
+    """Tipo de proyecto a partir de los nombres de su primer nivel."""
+    names = set(names)
+    for marker, project_type in TYPE_MARKERS:
+        if marker in names:
+            return project_type
+    return UNKNOWN
+
+
+def _cache_key(root: Union[str, Path]) -> str:
+    return os.path.normcase(os.path.abspath(str(root)))
+
+
+class ProjectCatalog:
+    """Proyectos de un directorio con sus detalles en caché (memoria y disco)."""
+
+    def __init__(self, root: Union[str, Path], cache_file: str = CACHE_FILE):
+        self.root = str(root)
+        self.cache_file = cache_file
+        self._key = _cache_key(root)
+        self._lock = threading.Lock()
+        self._root_mtime: Optional[int] = None
+        self._entries: Dict[str, ProjectEntry] = {}
+        self._disk: Optional[Dict] = None
+        self._dirty = False
+        self._worker: Optional[threading.Thread] = None
+
+    # -- Caché de disco --------------------------------------------------------
+
+    def _disk_entries(self) -> Dict[str, Dict]:
+        if self._disk is None:
+            cache = load_json(self.cache_file, {}) or {}
+            self._disk = cache.get('roots', {})
+        return self._disk.setdefault(self._key, {})
+
+    def _remember(self, entry: ProjectEntry):
+        """Copia la entrada a la caché de disco; se llama con el bloqueo tomado."""
+        self._disk_entries()[entry.name] = {
+            'mtime_ns': entry.mtime_ns,
+            'type': entry.type,
+            'main_files': entry.main_files,
+            'size': entry.size,
+            'size_measured': entry.size_measured,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Escribe la caché en disco si hubo cambios."""
+        with self._lock:
+            if not self._dirty or self._disk is None:
+                return
+            # Otra raíz pudo guardarse desde otra instancia: se conservan sus entradas
+            cache = load_json(self.cache_file, {}) or {}
+            roots = cache.get('roots', {})
+            roots[self._key] = self._disk.get(self._key, {})
+            try:
+                save_json(self.cache_file, {'roots': roots})
+                self._dirty = False
+            except OSError:
+                pass
+
+    # -- Lista de proyectos ----------------------------------------------------
+
+    def projects(self) -> List[ProjectEntry]:
+        """Proyectos (directorios no ocultos) ordenados por nombre; no detecta su tipo."""
+        try:
+            root_mtime = os.stat(self.root).st_mtime_ns
+        except OSError:
+            return []
+
+        with self._lock:
+            if root_mtime == self._root_mtime:
+                return sorted(self._entries.values(), key=lambda e: e.name.lower())
+
+        entries: Dict[str, ProjectEntry] = {}
+        try:
+            with _scandir(self.root) as iterator:
+                for item in iterator:
+                    if item.name.startswith('.'):
+                        continue
+                    try:
+                        if not item.is_dir():
+                            continue
+                        mtime_ns = item.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    entries[item.name] = ProjectEntry(item.path, item.name, mtime_ns)
+        except OSError:
+            return []
+
+        with self._lock:
+            disk = self._disk_entries()
+            for name, entry in entries.items():
+                known = self._entries.get(name)
+                cached = disk.get(name)
+                if known is not None and known.mtime_ns == entry.mtime_ns:
+                    entries[name] = known
+                elif cached and cached.get('mtime_ns') == entry.mtime_ns:
+                    entry.type = cached.get('type')
+                    entry.main_files = cached.get('main_files') or []
+                if cached:
+                    # El tamaño no depende del mtime del primer nivel: se conserva con su antigüedad
+                    entries[name].size = cached.get('size')
+                    entries[name].size_measured = cached.get('size_measured')
+            for name in set(disk) - set(entries):
+                del disk[name]
+                self._dirty = True
+            self._entries = entries
+            self._root_mtime = root_mtime
+
+        return sorted(entries.values(), key=lambda e: e.name.lower())
+
+    def entry(self, path: Union[str, Path]) -> ProjectEntry:
+        """Entrada de un proyecto; si no pertenece al catálogo se crea una suelta."""
+        path = str(path)
+        if _cache_key(os.path.dirname(path)) == self._key:
+            self.projects()
+            with self._lock:
+                known = self._entries.get(os.path.basename(path))
+            if known is not None:
+                return known
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        return ProjectEntry(path, os.path.basename(path), mtime_ns)
+
+    # -- Detalles --------------------------------------------------------------
+
+    def describe(self, entry: ProjectEntry) -> ProjectEntry:
+        """Completa tipo y archivos principales con un scandir, salvo que sigan vigentes."""
+        try:
+            mtime_ns = os.stat(entry.path).st_mtime_ns
+        except OSError:
+            entry.type = entry.type or UNKNOWN
+            return entry
+        if entry.type is not None and mtime_ns == entry.mtime_ns:
+            return entry
+
+        try:
+            with _scandir(entry.path) as iterator:
+                names = {item.name for item in iterator}
+        except OSError:
+            names = set()
+
+        # El hilo de fondo y los del grupo pueden describir la misma entrada a la vez
+        with self._lock:
+            entry.mtime_ns = mtime_ns
+            entry.type = detect_type(names)
+            entry.main_files = [name for name in MAIN_FILES if name in names]
+            if self._entries.get(entry.name) is entry:
+                self._remember(entry)
+        return entry
+
+    def describe_all(self, entries: Optional[List[ProjectEntry]] = None,
+                     workers: int = DEFAULT_WORKERS) -> List[ProjectEntry]:
+        """Describe varios proyectos en paralelo y guarda la caché."""
+        entries = self.projects() if entries is None else entries
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.describe, entries))
+        self.save()
+        return entries
+
+    def project_type(self, path: Union[str, Path]) -> str:
+        return self.describe(self.entry(path)).type
+
+    def start_background_detection(self, workers: int = DEFAULT_WORKERS) -> bool:
+        """
+        Describe los proyectos pendientes en un hilo de fondo.
+
+        Returns:
+            True si se lanzó el hilo (False si ya estaba en marcha o no hay pendientes)
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return False
+        pending = [e for e in self.projects() if e.type is None]
+        if not pending:
+            return False
+        self._worker = threading.Thread(target=self.describe_all, args=(pending, workers), daemon=True)
+        self._worker.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a la detección de fondo; True si terminó."""
+        if self._worker is None:
+            return True
+        self._worker.join(timeout)
+        return not self._worker.is_alive()
+
+    def measure(self, entry: ProjectEntry, max_age: float = SIZE_MAX_AGE) -> int:
+        """Tamaño total del proyecto, recalculado si la medida es más antigua que `max_age`."""
+        now = time.time()
+        if entry.size is not None and entry.size_measured and now - entry.size_measured < max_age:
+            return entry.size
+        size = scan_directory(entry.path, by_extension=False, by_age=False).total_size
+        with self._lock:
+            entry.size, entry.size_measured = size, now
+            tracked = self._entries.get(entry.name) is entry
+            if tracked:
+                self._remember(entry)
+        if tracked:
+            self.save()
+        return size
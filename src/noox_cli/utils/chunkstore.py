@@ -0,0 +1,408 @@
+"""
+Repositorio de backups deduplicado por contenido.
+Los archivos se trocean con cortes definidos por el contenido (hash rodante tipo
+"gear"): insertar o borrar bytes solo mueve los cortes cercanos, así que las
+versiones de un archivo y las copias de una misma librería en varios proyectos
+comparten casi todos sus trozos. Cada trozo único se guarda una sola vez bajo su
+SHA-256 y cada instantánea es un índice pequeño (ruta -> tamaño, mtime y trozos).
+Los archivos con el mismo tamaño y mtime que en la instantánea anterior reutilizan
+sus trozos sin leerse, de modo que un backup diario solo procesa lo que cambió.
+"""
+
+import os
+import gzip
+import json
+import time
+import zlib
+import random
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .backups import scan_tree
+from .storage import atomic_write_bytes
+
+
+# El hash rodante se calcula byte a byte en Python: los primeros MIN_CHUNK bytes de cada
+# trozo no se recorren, así que un mínimo alto (media ~256 KiB) reduce el trabajo a la mitad
+MIN_CHUNK = 128 * 1024
+AVG_CHUNK_BITS = 17
+MAX_CHUNK = 1024 * 1024
+READ_SIZE = 4 * MAX_CHUNK
+
+# Tabla fija de 256 valores pseudoaleatorios de 64 bits: los cortes deben ser estables
+_GEAR = [random.Random(0x6E6F6F78 + i).getrandbits(64) for i in range(256)]
+_MASK64 = (1 << 64) - 1
+# Bits altos: en el hash gear los bajos solo dependen de los últimos pocos bytes
+_CUT_MASK = ((1 << AVG_CHUNK_BITS) - 1) << (64 - AVG_CHUNK_BITS)
+
+CHUNKS_DIR = 'chunks'
+SNAPSHOTS_DIR = 'snapshots'
+LOCK_FILE = 'lock'
+SNAPSHOT_SUFFIX = '.json.gz'
+STALE_LOCK_SECONDS = 12 * 3600
+
+# Los proyectos reutilizan librerías en vendor/ y assets: solo se excluye lo regenerable
+REPOSITORY_EXCLUDES = ['node_modules', '__pycache__', '.venv', '*.pyc']
+
+# Lotes de archivos por tarea del grupo de procesos (muchos archivos pequeños)
+BATCH_FILES = 64
+BATCH_BYTES = 32 * 1024 * 1024
+
+_RAW = b'r'
+_ZLIB = b'z'
+
+
+@dataclass
+class SnapshotInfo:
+    id: str
+    path: Path
+    created: float
+    file_count: int = 0
+    total_size: int = 0
+
+    @property
+    def label(self) -> str:
+        return datetime.fromtimestamp(self.created).strftime('%Y-%m-%d %H:%M:%S')
+
+
+@dataclass
+class RepositoryBackupResult:
+    snapshot: Optional[SnapshotInfo] = None
+    files: int = 0
+    reused: int = 0
+    chunked: int = 0
+    total_size: int = 0
+    new_chunks: int = 0
+    stored_bytes: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class PruneResult:
+    removed_snapshots: List[str] = field(default_factory=list)
+    removed_chunks: int = 0
+    freed_bytes: int = 0
+
+
+def find_cut(data, start: int, end: int) -> int:
+    """Posición del siguiente corte en data[start:end] (end si no hay corte antes de MAX_CHUNK)."""
+    if end - start <= MIN_CHUNK:
+        return end
+    limit = min(end, start + MAX_CHUNK)
+    gear = _GEAR
+    mask = _CUT_MASK
+    h = 0
+    pos = start + MIN_CHUNK
+    for byte in memoryview(data)[pos:limit]:
+        h = ((h << 1) + gear[byte]) & _MASK64
+        pos += 1
+        if not h & mask:
+            return pos
+    return limit
+
+
+def iter_chunks(f) -> Iterator[bytes]:
+    """Trocea un archivo abierto en binario en trozos definidos por el contenido."""
+    buffer = b''
+    offset = 0
+    eof = False
+    while True:
+        if not eof and len(buffer) - offset < MAX_CHUNK:
+            data = f.read(READ_SIZE)
+            eof = not data
+            buffer = buffer[offset:] + data
+            offset = 0
+        if offset >= len(buffer):
+            return
+        if not eof and len(buffer) - offset < MAX_CHUNK:
+            continue
+        cut = find_cut(buffer, offset, len(buffer))
+        yield buffer[offset:cut]
+        offset = cut
+
+
+class ChunkRepository:
+    """Repositorio en disco: trozos únicos por hash e índices de instantáneas."""
+
+    def __init__(self, root, level: int = 6):
+        self.root = Path(root)
+        self.level = level
+
+    # -- Trozos ----------------------------------------------------------------
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.root / CHUNKS_DIR / digest[:2] / digest
+
+    def put_chunk(self, data: bytes) -> Tuple[str, int]:
+        """
+        Guarda un trozo si no existe.
+
+        Returns:
+            (hash, bytes escritos en disco; 0 si ya estaba)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(digest)
+        if path.exists():
+            return digest, 0
+        compressed = zlib.compress(data, self.level)
+        # Los datos ya comprimidos (imágenes, zips) se guardan tal cual
+        payload = _ZLIB + compressed if len(compressed) < len(data) else _RAW + data
+        # Escritura atómica: otro proceso puede estar guardando el mismo trozo a la vez
+        atomic_write_bytes(path, payload)
+        return digest, len(payload)
+
+    def get_chunk(self, digest: str) -> bytes:
+        with open(self.chunk_path(digest), 'rb') as f:
+            payload = f.read()
+        data = zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Trozo dañado: {digest}")
+        return data
+
+    def iter_chunk_paths(self) -> Iterator[Path]:
+        base = self.root / CHUNKS_DIR
+        if not base.is_dir():
+            return
+        for bucket in base.iterdir():
+            if bucket.is_dir():
+                for path in bucket.iterdir():
+                    if not path.name.startswith('.'):
+                        yield path
+
+    # -- Instantáneas ----------------------------------------------------------
+
+    def list_snapshots(self) -> List[SnapshotInfo]:
+        """Instantáneas de la más antigua a la más reciente (sin cargar su índice)."""
+        base = self.root / SNAPSHOTS_DIR
+        if not base.is_dir():
+            return []
+        snapshots = []
+        for path in base.glob('*' + SNAPSHOT_SUFFIX):
+            snapshot_id = path.name[:-len(SNAPSHOT_SUFFIX)]
+            try:
+                created = datetime.strptime(snapshot_id[:15], '%Y%m%d-%H%M%S').timestamp()
+                order = (snapshot_id[:15], int(snapshot_id[16:] or 1))
+            except ValueError:
+                continue
+            snapshots.append((order, SnapshotInfo(snapshot_id, path, created)))
+        # Varias instantáneas en el mismo segundo llevan un contador: '...-2' va después
+        return [snapshot for _, snapshot in sorted(snapshots, key=lambda item: item[0])]
+
+    def load_snapshot(self, snapshot_id: str) -> Dict:
+        with open(self.root / SNAPSHOTS_DIR / (snapshot_id + SNAPSHOT_SUFFIX), 'rb') as f:
+            return json.loads(gzip.decompress(f.read()).decode('utf-8'))
+
+    def _write_snapshot(self, index: Dict) -> SnapshotInfo:
+        base = self.root / SNAPSHOTS_DIR
+        stamp = datetime.fromtimestamp(index['created']).strftime('%Y%m%d-%H%M%S')
+        snapshot_id = stamp
+        counter = 1
+        while (base / (snapshot_id + SNAPSHOT_SUFFIX)).exists():
+            counter += 1
+            snapshot_id = f"{stamp}-{counter}"
+        data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        path = base / (snapshot_id + SNAPSHOT_SUFFIX)
+        atomic_write_bytes(path, gzip.compress(data, compresslevel=6))
+        return SnapshotInfo(snapshot_id, path, index['created'], len(index['files']),
+                            sum(entry[0] for entry in index['files'].values()))
+
+    # -- Bloqueo ---------------------------------------------------------------
+
+    def _acquire(self):
+        """Evita que un backup y una purga trabajen a la vez sobre el repositorio."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock = self.root / LOCK_FILE
+        try:
+            if time.time() - lock.stat().st_mtime > STALE_LOCK_SECONDS:
+                lock.unlink()
+        except OSError:
+            pass
+        try:
+            fd = os.open(str(lock), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            raise RuntimeError(f"El repositorio está en uso (bloqueo: {lock})")
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+
+    def _release(self):
+        try:
+            (self.root / LOCK_FILE).unlink()
+        except OSError:
+            pass
+
+    # -- Operaciones -----------------------------------------------------------
+
+    def backup(self, source, excludes: Optional[List[str]] = None, workers: Optional[int] = None,
+               progress_callback: Optional[Callable[[int], None]] = None) -> RepositoryBackupResult:
+        """
+        Crea una instantánea de `source`. Los archivos nuevos o modificados se trocean en
+        paralelo (un grupo de procesos, ya que el hash rodante usa CPU); el resto reutiliza
+        los trozos de la instantánea anterior.
+        """
+        source = Path(source)
+        excludes = REPOSITORY_EXCLUDES if excludes is None else excludes
+        result = RepositoryBackupResult()
+
+        self._acquire()
+        try:
+            snapshots = self.list_snapshots()
+            previous = self.load_snapshot(snapshots[-1].id)['files'] if snapshots else {}
+            current = scan_tree(source, excludes, skip=self.root)
+
+            files: Dict[str, List] = {}
+            pending: List[Tuple[str, int, int]] = []
+            for relative, (size, mtime_ns) in current.items():
+                old = previous.get(relative)
+                if old is not None and old[0] == size and old[1] == mtime_ns:
+                    files[relative] = old
+                    result.reused += 1
+                    if progress_callback:
+                        progress_callback(size)
+                else:
+                    pending.append((relative, size, mtime_ns))
+            result.files = len(current)
+            result.total_size = sum(size for size, _ in current.values())
+
+            batches = _make_batches(pending)
+            if batches:
+                with ProcessPoolExecutor(max_workers=workers or min(len(batches), os.cpu_count() or 1)) as executor:
+                    futures = [
+                        executor.submit(_store_batch, str(self.root), self.level, str(source), batch)
+                        for batch in batches
+                    ]
+                    for future in as_completed(futures):
+                        for relative, size, mtime_ns, digests, new_chunks, stored, error in future.result():
+                            if progress_callback:
+                                progress_callback(size)
+                            if error:
+                                result.errors.append((relative, error))
+                                if relative in previous:
+                                    files[relative] = previous[relative]
+                                continue
+                            files[relative] = [size, mtime_ns, digests]
+                            result.chunked += 1
+                            result.new_chunks += new_chunks
+                            result.stored_bytes += stored
+
+            index = {'root': str(source), 'created': time.time(), 'files': files}
+            result.snapshot = self._write_snapshot(index)
+        finally:
+            self._release()
+        return result
+
+    def restore(self, snapshot_id: str, target,
+                progress_callback: Optional[Callable[[int], None]] = None) -> int:
+        """Restaura una instantánea completa en `target` (nuevo o vacío), conservando los mtimes."""
+        target = Path(target)
+        if target.exists() and any(target.iterdir()):
+            raise ValueError(f"El directorio de destino no está vacío: {target}")
+
+        files = self.load_snapshot(snapshot_id)['files']
+        for relative, (size, mtime_ns, digests) in files.items():
+            destination = target.joinpath(*relative.split('/'))
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            with open(destination, 'wb') as f:
+                for digest in digests:
+                    f.write(self.get_chunk(digest))
+            os.utime(destination, ns=(mtime_ns, mtime_ns))
+            if progress_callback:
+                progress_callback(size)
+        return len(files)
+
+    def prune(self, keep_last: int = 7, keep_days: int = 0, now: Optional[float] = None) -> PruneResult:
+        """
+        Elimina instantáneas antiguas y después los trozos que ya no usa ninguna.
+
+        Se conservan las `keep_last` más recientes y, además, las de los últimos
+        `keep_days` días. Siempre se conserva al menos la última.
+
+        Raises:
+            ValueError: si `keep_last` es menor que 1
+        """
+        if keep_last < 1:
+            raise ValueError(f"Hay que conservar al menos una instantánea (se pidió {keep_last})")
+        now = time.time() if now is None else now
+        result = PruneResult()
+
+        self._acquire()
+        try:
+            snapshots = self.list_snapshots()
+            keep = {s.id for s in snapshots[-keep_last:]}
+            keep |= {s.id for s in snapshots if now - s.created <= keep_days * 86400}
+
+            for snapshot in snapshots:
+                if snapshot.id not in keep:
+                    snapshot.path.unlink()
+                    result.removed_snapshots.append(snapshot.id)
+
+            # Marcar: trozos referenciados por las instantáneas que quedan
+            referenced: Set[str] = set()
+            for snapshot_id in keep:
+                for entry in self.load_snapshot(snapshot_id)['files'].values():
+                    referenced.update(entry[2])
+
+            # Barrer: el resto
+            for path in self.iter_chunk_paths():
+                if path.name not in referenced:
+                    try:
+                        size = path.stat().st_size
+                        path.unlink()
+                    except OSError:
+                        continue
+                    result.removed_chunks += 1
+                    result.freed_bytes += size
+        finally:
+            self._release()
+        return result
+
+    def stats(self) -> Tuple[int, int]:
+        """(número de trozos, bytes que ocupan en disco)."""
+        count = size = 0
+        for path in self.iter_chunk_paths():
+            try:
+                size += path.stat().st_size
+            except OSError:
+                continue
+            count += 1
+        return count, size
+
+
+def _make_batches(pending: List[Tuple[str, int, int]]) -> List[List[Tuple[str, int, int]]]:
+    batches: List[List[Tuple[str, int, int]]] = []
+    current: List[Tuple[str, int, int]] = []
+    current_bytes = 0
+    for item in pending:
+        current.append(item)
+        current_bytes += item[1]
+        if len(current) >= BATCH_FILES or current_bytes >= BATCH_BYTES:
+            batches.append(current)
+            current, current_bytes = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _store_batch(root: str, level: int, source: str, batch: List[Tuple[str, int, int]]) -> List[Tuple]:
+    """Trabajo de un proceso hijo: trocea y guarda un lote de archivos."""
+    repository = ChunkRepository(root, level)
+    results = []
+    for relative, size, mtime_ns in batch:
+        digests: List[str] = []
+        new_chunks = stored = 0
+        try:
+            with open(os.path.join(source, *relative.split('/')), 'rb') as f:
+                for chunk in iter_chunks(f):
+                    digest, written = repository.put_chunk(chunk)
+                    digests.append(digest)
+                    if written:
+                        new_chunks += 1
+                        stored += written
+        except OSError as e:
+            results.append((relative, size, mtime_ns, None, 0, 0, str(e)))
+            continue
+        results.append((relative, size, mtime_ns, digests, new_chunks, stored, None))
+    return results
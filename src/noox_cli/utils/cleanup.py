@@ -0,0 +1,254 @@
+"""
+Motor de limpieza de archivos en dos fases.
+Primero se recorre el árbol una sola vez para construir un manifiesto de borrado con
+los tamaños ya conocidos (sirve como vista previa o simulación); después se eliminan
+los archivos en paralelo y los directorios de abajo hacia arriba.
+"""
+
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .openfiles import OpenFilesIndex
+from .scanner import BreakdownEntry
+
+
+DEFAULT_WORKERS = 8
+CHUNK_SIZE = 256
+MAX_ERROR_SAMPLES = 10
+
+# (ruta, tamaño, mtime)
+FileEntry = Tuple[str, int, float]
+FileFilter = Callable[[str, os.stat_result], bool]
+
+
+class ErrorSample:
+    """Cuenta errores y conserva solo una muestra acotada de mensajes."""
+
+    def __init__(self, limit: int = MAX_ERROR_SAMPLES):
+        self.limit = limit
+        self.count = 0
+        self.samples: List[str] = []
+
+    def add(self, path: str, error: Exception):
+        self.count += 1
+        if len(self.samples) < self.limit:
+            self.samples.append(f"{os.path.basename(path) or path}: {error}")
+
+    def merge(self, other: 'ErrorSample'):
+        self.count += other.count
+        for sample in other.samples:
+            if len(self.samples) >= self.limit:
+                break
+            self.samples.append(sample)
+
+
+@dataclass
+class CleanupManifest:
+    root: str
+    files: List[FileEntry] = field(default_factory=list)
+    dirs: List[Tuple[int, str]] = field(default_factory=list)
+    total_size: int = 0
+    children: Dict[str, BreakdownEntry] = field(default_factory=dict)
+    skipped_files: int = 0
+    skipped_size: int = 0
+    skipped_open: int = 0
+    scan_errors: ErrorSample = field(default_factory=ErrorSample)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+
+@dataclass
+class CleanupResult:
+    deleted_files: int = 0
+    deleted_size: int = 0
+    deleted_dirs: int = 0
+    errors: ErrorSample = field(default_factory=ErrorSample)
+
+    def merge(self, other: 'CleanupResult'):
+        self.deleted_files += other.deleted_files
+        self.deleted_size += other.deleted_size
+        self.deleted_dirs += other.deleted_dirs
+        self.errors.merge(other.errors)
+
+
+def build_manifest(root: str, file_filter: Optional[FileFilter] = None,
+                   dir_filter: Optional[FileFilter] = None,
+                   open_files: Optional[OpenFilesIndex] = None) -> CleanupManifest:
+    """
+    Recorre `root` una sola vez y construye el manifiesto de borrado.
+
+    Args:
+        root: Directorio cuyo contenido se eliminará (la raíz se conserva)
+        file_filter: Función opcional (ruta, stat) -> bool; los archivos para los que
+            devuelva False se conservan
+        dir_filter: Función opcional (ruta, stat) -> bool; los directorios para los que
+            devuelva False no se eliminan aunque queden vacíos (su contenido sí se recorre)
+        open_files: Índice opcional de archivos abiertos; los que estén en uso se conservan
+            (borrarlos no liberaría espacio mientras el proceso los mantenga abiertos)
+
+    Returns:
+        CleanupManifest con archivos, tamaños y subdirectorios a eliminar
+    """
+    manifest = CleanupManifest(root=root)
+    stack: List[Tuple[str, int, Optional[str]]] = [(root, 0, None)]
+
+    while stack:
+        current, depth, child = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            entry_child = child if child is not None else entry.name
+                            if dir_filter is None or dir_filter(entry.path, entry.stat(follow_symlinks=False)):
+                                manifest.dirs.append((depth + 1, entry.path))
+                            stack.append((entry.path, depth + 1, entry_child))
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError as e:
+                        manifest.scan_errors.add(entry.path, e)
+                        continue
+
+                    # Sockets, FIFOs y dispositivos pueden estar vivos (X11, tmux, ssh-agent)
+                    # y el índice de archivos abiertos no los ve: solo se borran archivos y enlaces
+                    if not (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+                        manifest.skipped_files += 1
+                        continue
+
+                    if file_filter is not None and not file_filter(entry.path, st):
+                        manifest.skipped_files += 1
+                        manifest.skipped_size += st.st_size
+                        continue
+
+                    if open_files is not None and entry.path in open_files:
+                        manifest.skipped_files += 1
+                        manifest.skipped_size += st.st_size
+                        manifest.skipped_open += 1
+                        continue
+
+                    manifest.files.append((entry.path, st.st_size, st.st_mtime))
+                    manifest.total_size += st.st_size
+
+                    key = child if child is not None else entry.name
+                    item = manifest.children.get(key)
+                    if item is None:
+                        item = manifest.children[key] = BreakdownEntry()
+                    item.count += 1
+                    item.size += st.st_size
+        except OSError as e:
+            manifest.scan_errors.add(current, e)
+
+    # Los más profundos primero para poder borrar de abajo hacia arriba
+    manifest.dirs.sort(key=lambda d: d[0], reverse=True)
+    return manifest
+
+
+def select_files(manifest: CleanupManifest, files: List[FileEntry]) -> CleanupManifest:
+    """
+    Crea un manifiesto con solo una parte de los archivos de otro.
+
+    Los archivos descartados pasan a contarse como conservados.
+    """
+    selected = CleanupManifest(
+        root=manifest.root,
+        files=list(files),
+        dirs=manifest.dirs,
+        skipped_files=manifest.skipped_files + manifest.file_count - len(files),
+        skipped_open=manifest.skipped_open,
+        scan_errors=manifest.scan_errors
+    )
+    selected.total_size = sum(size for _, size, _ in selected.files)
+    selected.skipped_size = manifest.skipped_size + manifest.total_size - selected.total_size
+
+    for path, size, _ in selected.files:
+        key = os.path.relpath(path, manifest.root).split(os.sep, 1)[0]
+        item = selected.children.get(key)
+        if item is None:
+            item = selected.children[key] = BreakdownEntry()
+        item.count += 1
+        item.size += size
+
+    return selected
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except PermissionError:
+        if os.name != 'nt':
+            raise
+        # En Windows los archivos de solo lectura no pueden borrarse directamente
+        os.chmod(path, stat.S_IWRITE)
+        os.remove(path)
+
+
+def _delete_chunk(chunk: List[FileEntry]) -> CleanupResult:
+    result = CleanupResult()
+    for path, size, _ in chunk:
+        try:
+            _remove_file(path)
+            result.deleted_files += 1
+            result.deleted_size += size
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            result.errors.add(path, e)
+    return result
+
+
+def _remove_dirs(paths: List[str]) -> CleanupResult:
+    result = CleanupResult()
+    for path in paths:
+        try:
+            os.rmdir(path)
+            result.deleted_dirs += 1
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            # Un directorio que aún contiene archivos conservados no es un error
+            try:
+                if os.listdir(path):
+                    continue
+            except OSError:
+                pass
+            result.errors.add(path, e)
+    return result
+
+
+def execute_manifest(manifest: CleanupManifest, workers: int = DEFAULT_WORKERS,
+                     progress_callback: Optional[Callable[[int], None]] = None) -> CleanupResult:
+    """
+    Elimina el contenido del manifiesto: archivos en paralelo y luego directorios
+    nivel por nivel, del más profundo al más superficial.
+
+    Args:
+        manifest: Manifiesto construido con build_manifest
+        workers: Número de hilos de borrado
+        progress_callback: Función opcional que recibe los bytes liberados por bloque
+    """
+    result = CleanupResult()
+    chunks = [manifest.files[i:i + CHUNK_SIZE] for i in range(0, len(manifest.files), CHUNK_SIZE)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_result in executor.map(_delete_chunk, chunks):
+            result.merge(chunk_result)
+            if progress_callback:
+                progress_callback(chunk_result.deleted_size)
+
+        # Los directorios del mismo nivel son independientes entre sí
+        levels: Dict[int, List[str]] = {}
+        for depth, path in manifest.dirs:
+            levels.setdefault(depth, []).append(path)
+
+        for depth in sorted(levels, reverse=True):
+            paths = levels[depth]
+            groups = [paths[i:i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+            for dir_result in executor.map(_remove_dirs, groups):
+                result.merge(dir_result)
+
+    return result
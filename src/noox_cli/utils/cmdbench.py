@@ -0,0 +1,201 @@
+"""
+Benchmark de comandos al estilo de hyperfine.
+Cada comando se ejecuta unas veces de calentamiento (se descartan) y después N veces
+medidas, con la salida descartada para no medir la terminal. De cada ejecución se
+guarda el tiempo real, el de CPU de usuario y de sistema y la memoria residente
+máxima (os.wait4 en POSIX). Los resultados incluyen media, desviación típica,
+mediana, mínimo y máximo, las ejecuciones atípicas (puntuación z modificada con la
+desviación absoluta mediana) y la comparación relativa entre comandos.
+"""
+
+import os
+import math
+import shlex
+import statistics
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from .timings import RunTiming, run_measured
+from .tools import tool_registry
+
+
+DEFAULT_RUNS = 10
+DEFAULT_WARMUP = 1
+# Umbral de Iglewicz y Hoaglin para la puntuación z modificada
+OUTLIER_THRESHOLD = 3.5
+# Si la primera ejecución tarda esto más que la mediana, probablemente faltó calentamiento
+COLD_START_FACTOR = 2.0
+SHELL_CHARACTERS = set('|&;<>()$`*?~')
+DOUBLE_QUOTE_EXPANSIONS = set('$`')
+
+
+@dataclass
+class CommandBenchmark:
+    command: str
+    runs: List[RunTiming] = field(default_factory=list)
+    warmup: int = 0
+    error: Optional[str] = None
+
+    @property
+    def walls(self) -> List[float]:
+        return [run.wall for run in self.runs]
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.walls)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.walls) if len(self.runs) > 1 else 0.0
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.walls)
+
+    @property
+    def min(self) -> float:
+        return min(self.walls)
+
+    @property
+    def max(self) -> float:
+        return max(self.walls)
+
+    @property
+    def user(self) -> Optional[float]:
+        values = [run.user for run in self.runs if run.user is not None]
+        return statistics.mean(values) if values else None
+
+    @property
+    def system(self) -> Optional[float]:
+        values = [run.system for run in self.runs if run.system is not None]
+        return statistics.mean(values) if values else None
+
+    @property
+    def max_rss(self) -> Optional[int]:
+        values = [run.max_rss for run in self.runs if run.max_rss]
+        return max(values) if values else None
+
+    def outliers(self) -> List[int]:
+        """Índices de las ejecuciones atípicas (|z modificada| > 3.5)."""
+        return outlier_indices(self.walls)
+
+    @property
+    def cold_start(self) -> bool:
+        """La primera ejecución medida fue mucho más lenta que el resto (cachés frías)."""
+        return len(self.runs) > 2 and self.walls[0] > COLD_START_FACTOR * statistics.median(self.walls[1:])
+
+
+def outlier_indices(values: List[float]) -> List[int]:
+    """Puntuación z modificada: 0.6745 · (x - mediana) / MAD."""
+    if len(values) < 3:
+        return []
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    if mad == 0:
+        return []
+    return [i for i, v in enumerate(values) if abs(0.6745 * (v - median) / mad) > OUTLIER_THRESHOLD]
+
+
+def needs_shell(command: str) -> bool:
+    """
+    True si el comando usa sintaxis de shell fuera de comillas. Dentro de comillas
+    dobles solo cuentan `$` y la comilla invertida, que la shell sigue expandiendo.
+    """
+    # En modo no POSIX cada token conserva sus comillas y se sabe qué estaba citado
+    lexer = shlex.shlex(command, posix=False, punctuation_chars=True)
+    lexer.whitespace_split = False
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        # Comillas sin cerrar: que sea la shell quien informe del error
+        return True
+    for token in tokens:
+        if token[0] == "'":
+            continue
+        special = DOUBLE_QUOTE_EXPANSIONS if token[0] == '"' else SHELL_CHARACTERS
+        if any(char in special for char in token):
+            return True
+    return False
+
+
+def _unquote(token: str) -> str:
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in '"\'':
+        return token[1:-1]
+    return token
+
+
+def parse_command(command: str, windows: bool = os.name == 'nt') -> List[str]:
+    """
+    Argumentos del comando. Los comandos sencillos se lanzan directamente (sin contar
+    el arranque de una shell); los que usan tuberías, redirecciones o comodines pasan
+    por la shell del sistema.
+    """
+    if needs_shell(command):
+        if windows:
+            return [os.environ.get('COMSPEC', 'cmd.exe'), '/d', '/c', command]
+        return ['/bin/sh', '-c', command]
+    if windows:
+        # Sin modo POSIX las barras invertidas de las rutas se respetan, pero los tokens
+        # conservan sus comillas: list2cmdline las escaparía y llegarían al programa
+        args = [_unquote(token) for token in shlex.split(command, posix=False)]
+    else:
+        args = shlex.split(command)
+    if not args:
+        raise ValueError("Comando vacío")
+    executable = tool_registry.find(args[0]) if not os.path.dirname(args[0]) else args[0]
+    if not executable:
+        raise ValueError(f"No se encontró '{args[0]}'")
+    return [executable, *args[1:]]
+
+
+def benchmark_command(command: str, runs: int = DEFAULT_RUNS, warmup: int = DEFAULT_WARMUP,
+                      cwd: Optional[str] = None, ignore_failure: bool = False,
+                      on_run: Optional[Callable[[bool, RunTiming], None]] = None) -> CommandBenchmark:
+    """
+    Ejecuta `warmup` veces sin medir y `runs` veces midiendo. `on_run(medida, timing)`
+    se llama tras cada ejecución. Un código de salida distinto de cero detiene el
+    benchmark de ese comando salvo con `ignore_failure`.
+    """
+    result = CommandBenchmark(command=command, warmup=warmup)
+    try:
+        args = parse_command(command)
+    except ValueError as e:
+        result.error = str(e)
+        return result
+
+    for index in range(warmup + runs):
+        measured = index >= warmup
+        try:
+            timing = run_measured(args, cwd=cwd, stdin=subprocess.DEVNULL,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, label=command)
+        except OSError as e:
+            result.error = str(e)
+            return result
+        if timing.returncode != 0 and not ignore_failure:
+            result.error = f"terminó con código {timing.returncode}"
+            return result
+        if measured:
+            result.runs.append(timing)
+        if on_run:
+            on_run(measured, timing)
+    return result
+
+
+def compare(benchmarks: List[CommandBenchmark]) -> List[Tuple[CommandBenchmark, float, float]]:
+    """
+    (benchmark, veces más lento que el más rápido, error de esa relación) ordenados
+    del más rápido al más lento. El error propaga las desviaciones relativas de ambos.
+    """
+    valid = sorted((b for b in benchmarks if b.runs and not b.error), key=lambda b: b.mean)
+    if not valid:
+        return []
+    fastest = valid[0]
+    comparison = []
+    for benchmark in valid:
+        ratio = benchmark.mean / fastest.mean if fastest.mean else math.inf
+        error = ratio * math.sqrt(
+            (benchmark.stddev / benchmark.mean) ** 2 + (fastest.stddev / fastest.mean) ** 2
+        ) if benchmark is not fastest and benchmark.mean and fastest.mean else 0.0
+        comparison.append((benchmark, ratio, error))
+    return comparison
@@ -0,0 +1,270 @@
+"""
+Archivo en frío de proyectos inactivos.
+La inactividad se mide con el mtime más reciente de todo el árbol del proyecto. Los
+proyectos elegidos se guardan completos (enlaces simbólicos y directorios vacíos
+incluidos) en un tar.xz dentro del directorio de archivo en frío, se comprueba que
+el archivo se lee entero y coincide con lo que se añadió, se anota en un manifiesto
+JSON de ese directorio y solo entonces se borra el original. El manifiesto permite
+listar los proyectos archivados y restaurarlos cuando hagan falta.
+"""
+
+import os
+import stat
+import json
+import time
+import shutil
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .storage import atomic_write_bytes
+
+
+MANIFEST_FILE = 'manifest.json'
+COLD_FORMAT = 'tar.xz'
+DEFAULT_WORKERS = 8
+# lzma libera el GIL al comprimir: unos pocos hilos aprovechan varios núcleos
+ARCHIVE_WORKERS = 4
+
+
+@dataclass
+class IdleProject:
+    path: str
+    last_activity: float = 0.0
+    size: int = 0
+    file_count: int = 0
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+@dataclass
+class ArchivedProject:
+    name: str
+    original_path: str
+    archive: str
+    archived_at: float
+    last_activity: float
+    size: int
+    file_count: int
+    archive_size: int
+
+    @property
+    def label(self) -> str:
+        return datetime.fromtimestamp(self.archived_at).strftime('%Y-%m-%d')
+
+
+def tree_activity(path: str) -> IdleProject:
+    """Recorre el proyecto completo: mtime más reciente (archivos y directorios), tamaño y archivos."""
+    result = IdleProject(path=path)
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    result.last_activity = max(result.last_activity, st.st_mtime)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        result.size += st.st_size
+                        result.file_count += 1
+        except OSError:
+            continue
+    return result
+
+
+def find_idle_projects(projects: Iterable[str], min_idle_days: float, now: Optional[float] = None,
+                       workers: int = DEFAULT_WORKERS) -> List[IdleProject]:
+    """Proyectos sin actividad en `min_idle_days` días, del más antiguo al más reciente."""
+    now = time.time() if now is None else now
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        measured = list(executor.map(tree_activity, [str(p) for p in projects]))
+    idle = [p for p in measured if now - p.last_activity >= min_idle_days * 86400]
+    return sorted(idle, key=lambda p: p.last_activity)
+
+
+def load_archived(cold_dir: Path) -> List[ArchivedProject]:
+    """Proyectos archivados según el manifiesto, del archivado más reciente al más antiguo."""
+    try:
+        with open(Path(cold_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    entries = []
+    for item in data.get('projects', []):
+        try:
+            entries.append(ArchivedProject(**item))
+        except TypeError:
+            continue
+    return sorted(entries, key=lambda e: e.archived_at, reverse=True)
+
+
+def _save_archived(cold_dir: Path, entries: List[ArchivedProject]):
+    payload = json.dumps({'projects': [asdict(e) for e in entries]}, ensure_ascii=False, indent=2)
+    atomic_write_bytes(Path(cold_dir) / MANIFEST_FILE, payload.encode('utf-8'))
+
+
+def _verify_tar(path: Path, expected: Dict[str, int]):
+    """Lee el archivo completo y comprueba que contiene lo que se añadió."""
+    found: Dict[str, int] = {}
+    with tarfile.open(path, 'r:*') as archive:
+        for member in archive:
+            if member.isfile():
+                extracted = archive.extractfile(member)
+                size = 0
+                for chunk in iter(lambda: extracted.read(1024 * 1024), b''):
+                    size += len(chunk)
+                found[member.name] = size
+            else:
+                found[member.name] = member.size
+    if found != expected:
+        missing = set(expected) - set(found)
+        raise ValueError(f"El archivo no coincide con el proyecto ({len(missing)} entrada(s) faltan o difieren)")
+
+
+def _remove_tree(path: str):
+    def make_writable(function, target, _):
+        # Windows no deja borrar archivos de solo lectura (p. ej. objetos de .git)
+        os.chmod(target, stat.S_IWRITE)
+        function(target)
+    shutil.rmtree(path, onerror=make_writable)
+
+
+def archive_project(project: str, cold_dir: Path, level: int = 6, activity: Optional[IdleProject] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None) -> ArchivedProject:
+    """
+    Archiva un proyecto en `cold_dir` y verifica el archivo. No borra el original ni
+    actualiza el manifiesto (lo hace `archive_projects`, en ese orden).
+    """
+    project = str(Path(project).resolve())
+    name = os.path.basename(project)
+    cold_dir = Path(cold_dir)
+    cold_dir.mkdir(parents=True, exist_ok=True)
+    activity = activity or tree_activity(project)
+
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    target = cold_dir / f"{name}-{stamp}.{COLD_FORMAT}"
+    tmp_path = cold_dir / f".{target.name}.tmp"
+    expected: Dict[str, int] = {}
+
+    def track(info: tarfile.TarInfo) -> tarfile.TarInfo:
+        expected[info.name] = info.size
+        if progress_callback and info.isfile():
+            progress_callback(info.size)
+        return info
+
+    try:
+        with tarfile.open(tmp_path, 'w:xz', preset=level) as archive:
+            archive.add(project, arcname=name, recursive=True, filter=track)
+        _verify_tar(tmp_path, expected)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    entry = ArchivedProject(
+        name=name,
+        original_path=project,
+        archive=target.name,
+        archived_at=time.time(),
+        last_activity=activity.last_activity,
+        size=activity.size,
+        file_count=activity.file_count,
+        archive_size=target.stat().st_size
+    )
+    return entry
+
+
+def archive_projects(projects: List[IdleProject], cold_dir: Path, level: int = 6,
+                     workers: int = ARCHIVE_WORKERS,
+                     progress_callback: Optional[Callable[[int], None]] = None,
+                     on_done: Optional[Callable[[str, Optional[ArchivedProject], Optional[str]], None]] = None
+                     ) -> List[ArchivedProject]:
+    """
+    Archiva varios proyectos en paralelo. Cada archivo se anota en el manifiesto antes
+    de borrar su original, para que un borrado a medias no deje un archivo huérfano.
+
+    `on_done(ruta, entrada, error)` recibe la entrada y el error a la vez cuando el
+    proyecto quedó archivado pero su original no pudo borrarse del todo.
+    """
+    cold_dir = Path(cold_dir)
+    entries = load_archived(cold_dir)
+    archived: List[ArchivedProject] = []
+    lock = threading.Lock()
+
+    def archive_and_remove(project: IdleProject):
+        entry = archive_project(project.path, cold_dir, level, project, progress_callback)
+        with lock:
+            entries.append(entry)
+            _save_archived(cold_dir, entries)
+        try:
+            _remove_tree(entry.original_path)
+        except OSError as e:
+            return entry, f"archivado, original no borrado del todo: {e}"
+        return entry, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(archive_and_remove, p): p for p in projects}
+        for future in as_completed(futures):
+            project = futures[future]
+            try:
+                entry, error = future.result()
+            except Exception as e:
+                if on_done:
+                    on_done(project.path, None, str(e))
+                continue
+            archived.append(entry)
+            if on_done:
+                on_done(project.path, entry, error)
+
+    return archived
+
+
+def restore_archived(entry: ArchivedProject, cold_dir: Path, destination_root: Optional[Path] = None) -> Path:
+    """
+    Restaura un proyecto archivado en su ubicación original (o en `destination_root`),
+    lo quita del manifiesto y borra su archivo.
+
+    Returns:
+        Ruta del proyecto restaurado
+    """
+    cold_dir = Path(cold_dir)
+    root = Path(destination_root) if destination_root else Path(entry.original_path).parent
+    target = root / entry.name
+    if target.exists():
+        raise ValueError(f"Ya existe {target}")
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Se extrae en un directorio temporal junto al destino y se renombra al final
+    staging = Path(tempfile.mkdtemp(prefix=f'.{entry.name}.', dir=str(root)))
+    try:
+        with tarfile.open(cold_dir / entry.archive, 'r:*') as archive:
+            if hasattr(tarfile, 'tar_filter'):
+                archive.extractall(staging, filter='tar')
+            else:
+                archive.extractall(staging)
+        os.replace(staging / entry.name, target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    remaining = [e for e in load_archived(cold_dir) if e.archive != entry.archive]
+    _save_archived(cold_dir, remaining)
+    try:
+        (cold_dir / entry.archive).unlink()
+    except OSError:
+        pass
+    return target
@@ -0,0 +1,245 @@
+"""
+Localización, medición y purga de las cachés de herramientas de desarrollo.
+Los directorios se calculan directamente (respetando las variables de entorno de cada
+herramienta) sin lanzar ningún proceso; las herramientas se detectan con el registro
+compartido de herramientas.
+Todas las cachés se miden y se purgan en paralelo.
+"""
+
+import os
+import sys
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .cleanup import build_manifest, execute_manifest
+from .openfiles import OpenFilesIndex
+from .scanner import scan_directory
+from .storage import user_cache_dir
+from .tools import tool_registry
+
+
+MEASURE_WORKERS = 8
+PURGE_WORKERS = 4
+PURGE_TIMEOUT = 600
+# Resto de ~/.cache: no es de ninguna herramienta de desarrollo y solo se purga a petición
+GENERIC_CACHE = 'user_cache'
+
+
+@dataclass
+class DevCache:
+    key: str
+    name: str
+    paths: List[str]
+    tool: Optional[str] = None
+    purge_command: Optional[List[str]] = None
+    tool_path: Optional[str] = None
+    size: int = 0
+    file_count: int = 0
+    errors: int = 0
+
+    @property
+    def exists(self) -> bool:
+        return any(os.path.isdir(p) for p in self.paths)
+
+
+@dataclass
+class PurgeResult:
+    cache: DevCache
+    before: int
+    after: int = 0
+    method: str = ''
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def freed(self) -> int:
+        return max(self.before - self.after, 0)
+
+
+def _home() -> Path:
+    return Path.home()
+
+
+def _env_path(variable: str, default: Path) -> str:
+    value = os.environ.get(variable)
+    return str(Path(value) if value else default)
+
+
+def _npm_cache() -> List[str]:
+    if os.name == 'nt':
+        default = user_cache_dir() / 'npm-cache'
+    else:
+        default = _home() / '.npm'
+    return [_env_path('npm_config_cache', default)]
+
+
+def _yarn_cache() -> List[str]:
+    base = user_cache_dir()
+    if os.name == 'nt':
+        default = base / 'Yarn' / 'Cache'
+    elif sys.platform == 'darwin':
+        default = base / 'Yarn'
+    else:
+        default = base / 'yarn'
+    return [_env_path('YARN_CACHE_FOLDER', default)]
+
+
+def _pip_cache() -> List[str]:
+    base = user_cache_dir()
+    default = base / 'pip' / 'Cache' if os.name == 'nt' else base / 'pip'
+    return [_env_path('PIP_CACHE_DIR', default)]
+
+
+def _pnpm_store() -> List[str]:
+    if os.name == 'nt':
+        default = user_cache_dir() / 'pnpm' / 'store'
+    elif sys.platform == 'darwin':
+        default = _home() / 'Library' / 'pnpm' / 'store'
+    else:
+        default = Path(os.environ.get('XDG_DATA_HOME', _home() / '.local' / 'share')) / 'pnpm' / 'store'
+    return [str(default)]
+
+
+def _composer_cache() -> List[str]:
+    base = user_cache_dir()
+    default = base / 'Composer' if os.name == 'nt' else base / 'composer'
+    return [_env_path('COMPOSER_CACHE_DIR', default)]
+
+
+def _cargo_cache() -> List[str]:
+    cargo_home = Path(_env_path('CARGO_HOME', _home() / '.cargo'))
+    return [
+        str(cargo_home / 'registry' / 'cache'),
+        str(cargo_home / 'registry' / 'src'),
+        str(cargo_home / 'git' / 'checkouts'),
+    ]
+
+
+def _go_caches() -> List[str]:
+    gopath = os.environ.get('GOPATH', '').split(os.pathsep)[0] or str(_home() / 'go')
+    return [
+        _env_path('GOMODCACHE', Path(gopath) / 'pkg' / 'mod'),
+        _env_path('GOCACHE', user_cache_dir() / 'go-build'),
+    ]
+
+
+def _gradle_cache() -> List[str]:
+    return [str(Path(_env_path('GRADLE_USER_HOME', _home() / '.gradle')) / 'caches')]
+
+
+def known_caches() -> List[DevCache]:
+    """
+    Devuelve las cachés conocidas con sus rutas y comandos de purga nativos.
+
+    La caché genérica del usuario (~/.cache en Linux) se incluye al final con sus
+    subdirectorios, excluyendo los que ya pertenecen a otra caché de la lista.
+    """
+    caches = [
+        DevCache('npm', '📦 npm', _npm_cache(), 'npm', ['npm', 'cache', 'clean', '--force']),
+        DevCache('yarn', '🧶 yarn', _yarn_cache(), 'yarn', ['yarn', 'cache', 'clean']),
+        DevCache('pip', '🐍 pip', _pip_cache(), 'pip', [sys.executable, '-m', 'pip', 'cache', 'purge']),
+        DevCache('pnpm', '⚡ pnpm', _pnpm_store(), 'pnpm', ['pnpm', 'store', 'prune']),
+        DevCache('composer', '🎼 composer', _composer_cache(), 'composer', ['composer', 'clear-cache']),
+        DevCache('cargo', '🦀 cargo', _cargo_cache(), 'cargo'),
+        DevCache('go', '🐹 Go', _go_caches(), 'go', ['go', 'clean', '-cache', '-modcache']),
+        DevCache('gradle', '🐘 Gradle', _gradle_cache(), 'gradle'),
+    ]
+
+    for cache in caches:
+        if cache.key == 'pip':
+            # pip se ejecuta como módulo del intérprete actual
+            cache.tool_path = sys.executable
+        elif cache.tool:
+            cache.tool_path = tool_registry.find(cache.tool)
+        if cache.purge_command and cache.tool_path and cache.key != 'pip':
+            cache.purge_command = [cache.tool_path] + cache.purge_command[1:]
+
+    if os.name != 'nt' and sys.platform != 'darwin':
+        generic_root = user_cache_dir()
+        claimed = {os.path.normcase(os.path.abspath(p)) for cache in caches for p in cache.paths}
+        generic_paths = []
+        try:
+            with os.scandir(generic_root) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    path = os.path.normcase(os.path.abspath(entry.path))
+                    if any(path == c or c.startswith(path + os.sep) for c in claimed):
+                        continue
+                    generic_paths.append(entry.path)
+        except OSError:
+            pass
+        caches.append(DevCache(GENERIC_CACHE, '🗂️ ~/.cache (resto)', sorted(generic_paths)))
+
+    return caches
+
+
+def _measure(cache: DevCache) -> DevCache:
+    size = files = errors = 0
+    for path in cache.paths:
+        if not os.path.isdir(path):
+            continue
+        result = scan_directory(path, by_extension=False, by_age=False)
+        size += result.total_size
+        files += result.file_count
+        errors += result.error_count
+    cache.size, cache.file_count, cache.errors = size, files, errors
+    return cache
+
+
+def measure_caches(caches: List[DevCache], workers: int = MEASURE_WORKERS) -> List[DevCache]:
+    """Mide todas las cachés en paralelo (actualiza size/file_count en cada una)."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_measure, caches))
+
+
+def _purge_with_engine(cache: DevCache, result: PurgeResult, open_files: Optional[OpenFilesIndex]):
+    for path in cache.paths:
+        if not os.path.isdir(path):
+            continue
+        cleanup = execute_manifest(build_manifest(path, open_files=open_files), workers=2)
+        result.errors.extend(cleanup.errors.samples)
+
+
+def purge_cache(cache: DevCache, open_files: Optional[OpenFilesIndex] = None) -> PurgeResult:
+    """
+    Purga una caché con el comando nativo de su herramienta si está instalada; si
+    no lo está, se vacían sus directorios directamente (conservando los archivos de
+    `open_files`). Si el comando nativo falla solo se informa del error: borrar a mano
+    lo que la herramienta protege (la caché de módulos de Go es de solo lectura)
+    fallaría o la dejaría a medias.
+    """
+    result = PurgeResult(cache=cache, before=cache.size)
+
+    if cache.purge_command and cache.tool_path:
+        result.method = 'nativo'
+        try:
+            completed = subprocess.run(
+                cache.purge_command, capture_output=True, text=True, timeout=PURGE_TIMEOUT
+            )
+            if completed.returncode != 0:
+                message = (completed.stderr or completed.stdout).strip().splitlines()
+                result.errors.append(message[-1] if message else f"código {completed.returncode}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            result.errors.append(str(e))
+    else:
+        result.method = 'directo'
+        _purge_with_engine(cache, result, open_files)
+
+    result.after = _measure(cache).size
+    return result
+
+
+def purge_caches(caches: List[DevCache], workers: int = PURGE_WORKERS,
+                 on_done: Optional[Callable[[PurgeResult], None]] = None,
+                 open_files: Optional[OpenFilesIndex] = None) -> List[PurgeResult]:
+    """Purga varias cachés en paralelo y devuelve los resultados en el mismo orden."""
+    results: Dict[str, PurgeResult] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(lambda cache: purge_cache(cache, open_files), caches):
+            results[result.cache.key] = result
+            if on_done:
+                on_done(result)
+    return [results[cache.key] for cache in caches]
@@ -0,0 +1,420 @@
+"""
+Supervisor de servidores de desarrollo en segundo plano.
+Cada servidor (http.server, php -S, npm/yarn start) se lanza en su propio grupo de
+procesos con un puerto asignado y sin bloquear los menús. Un hilo por servidor lee
+su salida a un log circular en memoria (las últimas líneas) y un hilo de vigilancia
+comprueba periódicamente que responda por HTTP, lo reinicia si se cae (con esperas
+crecientes y un límite de reinicios) y mide su CPU y memoria con psutil. Detener un
+servidor termina su grupo de procesos completo. Los servidores viven mientras dure
+la sesión de NooxCLI: al salir se detienen todos.
+"""
+
+import os
+import sys
+import time
+import atexit
+import signal
+import socket
+import subprocess
+import threading
+import http.client
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .tools import tool_registry
+
+
+LOG_LINES = 1000
+HEALTH_INTERVAL = 2.0
+HEALTH_TIMEOUT = 1.0
+# npm/yarn pueden tardar en compilar antes de abrir el puerto
+STARTUP_GRACE = 90.0
+STOP_GRACE = 5.0
+MAX_RESTARTS = 5
+# Tras este tiempo funcionando sin caerse, el contador de reinicios vuelve a cero
+STABLE_AFTER = 60.0
+MAX_BACKOFF = 30.0
+
+PYTHON = 'python'
+PHP = 'php'
+NPM = 'npm'
+YARN = 'yarn'
+DEFAULT_PORTS = {PYTHON: 8000, PHP: 8080, NPM: 3000, YARN: 3000}
+
+STARTING = 'iniciando'
+HEALTHY = 'activo'
+UNRESPONSIVE = 'sin respuesta'
+RESTARTING = 'reiniciando'
+FAILED = 'fallido'
+STOPPED = 'detenido'
+
+
+class RingLog:
+    """Últimas líneas de salida de un servidor (seguro entre hilos)."""
+
+    def __init__(self, max_lines: int = LOG_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, line: str):
+        with self._lock:
+            self._lines.append(line)
+            self.total += 1
+
+    def tail(self, count: Optional[int] = None) -> List[str]:
+        with self._lock:
+            lines = list(self._lines)
+        return lines if count is None else lines[-count:]
+
+
+@dataclass
+class ManagedServer:
+    name: str
+    project: Path
+    kind: str
+    port: int
+    command: List[str]
+    env: Dict[str, str] = field(default_factory=dict)
+    log: RingLog = field(default_factory=RingLog)
+    state: str = STARTING
+    process: Optional[subprocess.Popen] = None
+    started: float = 0.0
+    restarts: int = 0
+    total_restarts: int = 0
+    next_restart: float = 0.0
+    http_status: Optional[int] = None
+    latency: Optional[float] = None
+    cpu_percent: Optional[float] = None
+    rss: Optional[int] = None
+    _processes: Dict[int, object] = field(default_factory=dict, repr=False)
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self.started if self.started and self.state != STOPPED else 0.0
+
+
+def server_command(kind: str, project: Path, port: int) -> List[str]:
+    """
+    Comando del servidor para el tipo elegido.
+
+    Raises:
+        ValueError: si la herramienta no está instalada o el proyecto no sirve
+    """
+    if kind == PYTHON:
+        return [sys.executable, '-m', 'http.server', str(port)]
+    if kind == PHP:
+        php = tool_registry.find('php')
+        if not php:
+            raise ValueError("PHP no está instalado")
+        command = [php, '-S', f'localhost:{port}']
+        # Laravel y similares sirven desde public/
+        if (Path(project) / 'public' / 'index.php').is_file() and not (Path(project) / 'index.php').is_file():
+            command += ['-t', 'public']
+        return command
+    if kind in (NPM, YARN):
+        if not (Path(project) / 'package.json').is_file():
+            raise ValueError("No se encontró package.json")
+        executable = tool_registry.find(kind)
+        if not executable:
+            raise ValueError(f"{kind} no está instalado")
+        return [executable, 'start']
+    raise ValueError(f"Tipo de servidor desconocido: {kind}")
+
+
+def port_is_free(port: int) -> bool:
+    """Nadie escucha en el puerto (las conexiones en TIME_WAIT de un servidor ya parado no cuentan)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        if os.name != 'nt':
+            # Igual que los propios servidores; en Windows SO_REUSEADDR permitiría robar un puerto en uso
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(('127.0.0.1', port))
+        except OSError:
+            return False
+    return True
+
+
+def check_http(port: int, timeout: float = HEALTH_TIMEOUT):
+    """(código HTTP, latencia) o (None, None) si no responde. Cualquier respuesta HTTP cuenta como viva."""
+    start = time.monotonic()
+    connection = http.client.HTTPConnection('localhost', port, timeout=timeout)
+    try:
+        connection.request('GET', '/', headers={'User-Agent': 'noox-healthcheck'})
+        status = connection.getresponse().status
+    except (OSError, http.client.HTTPException):
+        return None, None
+    finally:
+        connection.close()
+    return status, time.monotonic() - start
+
+
+def _terminate_group(process: subprocess.Popen, grace: float = STOP_GRACE):
+    """Pide al grupo de procesos que termine y lo mata si no lo hace a tiempo."""
+    if process.poll() is not None and os.name == 'nt':
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # Aunque el líder ya haya salido, sus hijos pueden seguir en el grupo
+            os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        pass
+    try:
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    process.wait()
+
+
+class ServerSupervisor:
+    """Servidores de desarrollo de la sesión, vigilados desde un hilo de fondo."""
+
+    def __init__(self, health_interval: float = HEALTH_INTERVAL, startup_grace: float = STARTUP_GRACE):
+        self.health_interval = health_interval
+        self.startup_grace = startup_grace
+        self._servers: Dict[str, ManagedServer] = {}
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._closing = False
+
+    def servers(self) -> List[ManagedServer]:
+        with self._lock:
+            return list(self._servers.values())
+
+    def get(self, name: str) -> Optional[ManagedServer]:
+        with self._lock:
+            return self._servers.get(name)
+
+    def assign_port(self, preferred: int) -> int:
+        """El primer puerto libre desde `preferred` que no use ya otro servidor de la sesión."""
+        with self._lock:
+            taken = {s.port for s in self._servers.values() if s.state != STOPPED}
+        port = preferred
+        while port in taken or not port_is_free(port):
+            port += 1
+        return port
+
+    def start(self, project: Path, kind: str, port: Optional[int] = None,
+              command: Optional[List[str]] = None) -> ManagedServer:
+        """
+        Lanza un servidor para el proyecto. Un servidor detenido o fallido con el
+        mismo nombre se sustituye.
+
+        Raises:
+            ValueError: si ya hay uno activo para ese proyecto y tipo o no se puede lanzar
+        """
+        project = Path(project)
+        name = f"{project.name}:{kind}"
+        with self._lock:
+            existing = self._servers.get(name)
+            if existing and existing.state not in (STOPPED, FAILED):
+                raise ValueError(f"{name} ya está en marcha en {existing.url}")
+            port = port or self.assign_port(DEFAULT_PORTS.get(kind, 8000))
+            server = ManagedServer(
+                name=name, project=project, kind=kind, port=port,
+                command=command or server_command(kind, project, port),
+                # npm/yarn: puerto por variable de entorno y sin abrir el navegador en cada reinicio
+                env={'PORT': str(port), 'BROWSER': 'none'}
+            )
+            self._launch(server)
+            self._servers[name] = server
+        self._ensure_monitor()
+        return server
+
+    def _launch(self, server: ManagedServer):
+        env = dict(os.environ)
+        env.update(server.env)
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        try:
+            server.process = subprocess.Popen(
+                server.command, cwd=str(server.project), env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                **kwargs
+            )
+        except OSError as e:
+            server.state = FAILED
+            raise ValueError(f"No se pudo lanzar {server.name}: {e}")
+        server.started = time.monotonic()
+        server.state = STARTING
+        server.http_status = server.latency = None
+        server._processes = {}
+        server.log.append(f"[noox] $ {' '.join(server.command)} (puerto {server.port})")
+        threading.Thread(target=self._pump, args=(server, server.process), daemon=True).start()
+
+    @staticmethod
+    def _pump(server: ManagedServer, process: subprocess.Popen):
+        """Copia la salida del proceso al log circular hasta que se cierre."""
+        for raw in iter(process.stdout.readline, b''):
+            server.log.append(raw.decode('utf-8', errors='replace').rstrip())
+        process.stdout.close()
+
+    def stop(self, name: str) -> bool:
+        with self._lock:
+            server = self._servers.get(name)
+            if not server or server.state == STOPPED:
+                return False
+            server.state = STOPPED
+        if server.process:
+            _terminate_group(server.process)
+        server.log.append("[noox] servidor detenido")
+        server.cpu_percent = server.rss = None
+        return True
+
+    def restart(self, name: str):
+        """Reinicio manual: detiene el grupo de procesos y vuelve a lanzarlo en el mismo puerto."""
+        server = self.get(name)
+        if not server:
+            return
+        self.stop(name)
+        with self._lock:
+            server.restarts = 0
+            self._launch(server)
+        self._ensure_monitor()
+
+    def remove(self, name: str):
+        self.stop(name)
+        with self._lock:
+            self._servers.pop(name, None)
+
+    def stop_all(self):
+        self._closing = True
+        self._wake.set()
+        for server in self.servers():
+            self.stop(server.name)
+
+    def _ensure_monitor(self):
+        with self._lock:
+            if self._monitor is None or not self._monitor.is_alive():
+                self._closing = False
+                self._monitor = threading.Thread(target=self._watch, daemon=True)
+                self._monitor.start()
+
+    def _watch(self):
+        while not self._closing:
+            for server in self.servers():
+                try:
+                    self.check(server)
+                except Exception as e:
+                    server.log.append(f"[noox] error en la comprobación: {e}")
+            if not any(s.state != STOPPED for s in self.servers()):
+                # Nada que vigilar: el hilo se vuelve a crear al lanzar otro servidor
+                with self._lock:
+                    if not any(s.state != STOPPED for s in self._servers.values()):
+                        self._monitor = None
+                        return
+            self._wake.wait(self.health_interval)
+            self._wake.clear()
+
+    def check(self, server: ManagedServer):
+        """Una ronda de vigilancia: caída y reinicio, salud HTTP y uso de recursos."""
+        if server.state in (STOPPED, FAILED):
+            return
+        now = time.monotonic()
+        process = server.process
+
+        if server.state == RESTARTING:
+            if now >= server.next_restart:
+                with self._lock:
+                    if server.state == RESTARTING:
+                        try:
+                            self._launch(server)
+                        except ValueError as e:
+                            server.log.append(f"[noox] {e}")
+                            server.state = FAILED
+            return
+
+        if process.poll() is not None:
+            with self._lock:
+                # Solo un hilo atiende cada caída (el menú y el vigilante pueden verla a la vez);
+                # un stop() o restart() manual mientras tanto tiene prioridad
+                if server.state in (STOPPED, FAILED, RESTARTING) or server.process is not process:
+                    return
+                server.cpu_percent = server.rss = None
+                if now - server.started > STABLE_AFTER:
+                    server.restarts = 0
+                if server.restarts >= MAX_RESTARTS:
+                    server.state = FAILED
+                    server.log.append(f"[noox] terminó con código {process.returncode}; "
+                                      f"{MAX_RESTARTS} reinicios seguidos, no se vuelve a intentar")
+                else:
+                    delay = min(MAX_BACKOFF, 2 ** server.restarts)
+                    server.restarts += 1
+                    server.total_restarts += 1
+                    server.next_restart = now + delay
+                    server.state = RESTARTING
+                    server.log.append(f"[noox] terminó con código {process.returncode}; reinicio en {delay:g}s")
+            # Se limpia lo que quede del grupo antes de que llegue la hora del reinicio
+            _terminate_group(process, grace=0)
+            return
+
+        status, latency = check_http(server.port)
+        with self._lock:
+            if server.state in (STOPPED, FAILED, RESTARTING) or server.process is not process:
+                return
+            server.http_status, server.latency = status, latency
+            if status is not None:
+                server.state = HEALTHY
+            elif server.state != STARTING or now - server.started >= self.startup_grace:
+                server.state = UNRESPONSIVE
+        self._sample_usage(server)
+
+    @staticmethod
+    def _sample_usage(server: ManagedServer):
+        """CPU (% de un núcleo) y RSS sumados de todo el árbol del servidor."""
+        if not psutil or not server.process:
+            return
+        try:
+            root = server._processes.get(server.pid) or psutil.Process(server.pid)
+            tree = [root, *root.children(recursive=True)]
+        except Exception:
+            return
+        cpu = 0.0
+        rss = 0
+        known = {}
+        for process in tree:
+            # Se reutilizan los objetos para que cpu_percent mida desde la ronda anterior
+            process = server._processes.get(process.pid, process)
+            try:
+                cpu += process.cpu_percent(None)
+                rss += process.memory_info().rss
+            except Exception:
+                continue
+            known[process.pid] = process
+        server._processes = known
+        server.cpu_percent, server.rss = cpu, rss
+
+
+# Instancia compartida por todos los módulos
+supervisor = ServerSupervisor()
+atexit.register(supervisor.stop_all)
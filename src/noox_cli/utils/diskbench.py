@@ -0,0 +1,242 @@
+"""
+Benchmark de rendimiento y latencia de disco.
+Escribe y lee un archivo temporal en el directorio elegido con patrones secuenciales
+y aleatorios a varios tamaños de bloque, y elimina el archivo al terminar.
+"""
+
+import os
+import sys
+import math
+import mmap
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+MB = 1024 * 1024
+DEFAULT_BLOCK_SIZES = (4 * 1024, 64 * 1024, 1024 * 1024)
+PATTERNS = ('seq', 'rand')
+PATTERN_NAMES = {'seq': 'Secuencial', 'rand': 'Aleatorio'}
+OPERATION_NAMES = {'write': 'escritura', 'read': 'lectura'}
+
+# Alineación requerida por O_DIRECT (páginas de 4 KB cubren la mayoría de discos)
+DIRECT_ALIGNMENT = 4096
+F_NOCACHE = 48  # macOS: desactiva la caché de páginas para el descriptor
+
+
+@dataclass
+class BenchmarkResult:
+    pattern: str
+    operation: str
+    block_size: int
+    bytes_total: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"{PATTERN_NAMES[self.pattern]} {OPERATION_NAMES[self.operation]}"
+
+    @property
+    def ops(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_total / MB / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def iops(self) -> float:
+        return self.ops / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Latencia en milisegundos para el percentil indicado (rango más cercano)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(max(math.ceil(pct / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+        return ordered[index] * 1000
+
+
+@dataclass
+class BenchmarkReport:
+    directory: str
+    file_size: int
+    cache_mode: str
+    fsync: bool
+    results: List[BenchmarkResult] = field(default_factory=list)
+
+
+def _open_flags(direct: bool) -> int:
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    if direct and hasattr(os, 'O_DIRECT'):
+        flags |= os.O_DIRECT
+    return flags
+
+
+def cache_bypass_mode(direct: bool) -> str:
+    """Describe cómo se evitará la caché de páginas en esta plataforma."""
+    if not direct:
+        return 'ninguno'
+    if hasattr(os, 'O_DIRECT'):
+        return 'O_DIRECT'
+    if sys.platform == 'darwin' and fcntl:
+        return 'F_NOCACHE'
+    if hasattr(os, 'posix_fadvise'):
+        return 'posix_fadvise'
+    return 'no disponible'
+
+
+def _pwrite(fd: int, buf, offset: int):
+    if hasattr(os, 'pwrite'):
+        return os.pwrite(fd, buf, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, buf)
+
+
+def _pread(fd: int, buf, offset: int):
+    if hasattr(os, 'preadv'):
+        return os.preadv(fd, [buf], offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    data = os.read(fd, len(buf))
+    buf[:len(data)] = data
+    return len(data)
+
+
+def _drop_cache(fd: int):
+    """Descarta las páginas cacheadas del archivo cuando es posible."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _prefill(fd: int, file_size: int):
+    """Llena el archivo con datos reales para que las lecturas no toquen huecos."""
+    chunk = mmap.mmap(-1, MB)
+    try:
+        chunk.write(os.urandom(MB))
+        written = 0
+        while written < file_size:
+            written += os.write(fd, chunk)
+        os.fsync(fd)
+    finally:
+        chunk.close()
+
+
+def _run_pass(fd: int, buffer, result: BenchmarkResult, offsets: Sequence[int],
+              fsync: bool, max_seconds: float):
+    block = result.block_size
+    started = time.perf_counter()
+    deadline = started + max_seconds
+
+    for offset in offsets:
+        op_start = time.perf_counter()
+        if result.operation == 'write':
+            _pwrite(fd, buffer, offset)
+            if fsync:
+                os.fsync(fd)
+        else:
+            _pread(fd, buffer, offset)
+        op_end = time.perf_counter()
+
+        result.latencies.append(op_end - op_start)
+        result.bytes_total += block
+        if op_end >= deadline:
+            break
+
+    if result.operation == 'write' and not fsync:
+        # Incluir el vaciado final para no medir solo la caché
+        os.fsync(fd)
+    result.seconds = time.perf_counter() - started
+
+
+def run_disk_benchmark(directory: str, file_size: int = 256 * MB,
+                       block_sizes: Sequence[int] = DEFAULT_BLOCK_SIZES,
+                       patterns: Sequence[str] = PATTERNS, fsync: bool = False,
+                       direct: bool = False, max_seconds: float = 5.0,
+                       progress_callback: Optional[Callable[[str], None]] = None) -> BenchmarkReport:
+    """
+    Ejecuta el benchmark de disco en el directorio indicado.
+
+    Args:
+        directory: Directorio donde crear el archivo temporal de prueba
+        file_size: Tamaño del archivo de prueba en bytes
+        block_sizes: Tamaños de bloque a probar
+        patterns: Patrones de acceso ('seq' y/o 'rand')
+        fsync: Sincronizar con el disco tras cada escritura
+        direct: Intentar evitar la caché de páginas del sistema
+        max_seconds: Tiempo máximo por prueba
+        progress_callback: Función opcional que recibe la descripción de cada prueba
+
+    Returns:
+        BenchmarkReport con un resultado por patrón, operación y tamaño de bloque
+    """
+    file_size = max(file_size - file_size % MB, MB)
+    report = BenchmarkReport(directory, file_size, cache_bypass_mode(direct), fsync)
+    fd_handle, path = tempfile.mkstemp(prefix='noox-bench-', suffix='.tmp', dir=directory)
+    os.close(fd_handle)
+
+    fd = None
+    try:
+        use_o_direct = report.cache_mode == 'O_DIRECT'
+        try:
+            fd = os.open(path, _open_flags(use_o_direct))
+        except OSError:
+            # Sistemas de archivos como tmpfs no admiten O_DIRECT
+            use_o_direct = False
+            report.cache_mode = 'posix_fadvise' if hasattr(os, 'posix_fadvise') else 'no disponible'
+            fd = os.open(path, _open_flags(False))
+
+        if report.cache_mode == 'F_NOCACHE':
+            fcntl.fcntl(fd, F_NOCACHE, 1)
+
+        if progress_callback:
+            progress_callback("Preparando archivo de prueba")
+        _prefill(fd, file_size)
+
+        for block_size in block_sizes:
+            if use_o_direct and block_size % DIRECT_ALIGNMENT:
+                continue
+            blocks = max(file_size // block_size, 1)
+
+            # mmap anónimo: memoria alineada a página, válida también para O_DIRECT
+            buffer = mmap.mmap(-1, block_size)
+            buffer.write(os.urandom(block_size))
+
+            try:
+                for pattern in patterns:
+                    offsets = [i * block_size for i in range(blocks)]
+                    if pattern == 'rand':
+                        random.shuffle(offsets)
+
+                    for operation in ('write', 'read'):
+                        result = BenchmarkResult(pattern, operation, block_size)
+                        if progress_callback:
+                            progress_callback(f"{result.name} - bloque {block_size // 1024} KB")
+
+                        if operation == 'read' and report.cache_mode == 'posix_fadvise':
+                            _drop_cache(fd)
+
+                        _run_pass(fd, buffer, result, offsets, fsync, max_seconds)
+                        report.results.append(result)
+            finally:
+                buffer.close()
+    finally:
+        if fd is not None:
+            os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    return report
@@ -0,0 +1,182 @@
+"""
+Estadísticas de rendimiento de dispositivos de bloque al estilo iostat.
+Las métricas se calculan a partir de diferencias entre dos lecturas de contadores,
+tomadas de /proc/diskstats en Linux o de psutil.disk_io_counters(perdisk=True).
+"""
+
+import os
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+PROC_DISKSTATS = '/proc/diskstats'
+SECTOR_SIZE = 512
+
+# Dispositivos virtuales que no aportan información útil
+IGNORED_PREFIXES = ('loop', 'ram')
+
+
+@dataclass
+class DiskCounters:
+    reads: int
+    writes: int
+    read_bytes: int
+    write_bytes: int
+    read_ms: int
+    write_ms: int
+    busy_ms: Optional[int] = None
+    weighted_ms: Optional[int] = None
+    in_flight: Optional[int] = None
+
+
+@dataclass
+class DeviceIOStats:
+    device: str
+    read_iops: float
+    write_iops: float
+    read_bps: float
+    write_bps: float
+    await_ms: float
+    queue_depth: float
+    util_percent: Optional[float] = None
+
+
+def read_proc_diskstats(path: str = PROC_DISKSTATS) -> Dict[str, DiskCounters]:
+    """Lee los contadores por dispositivo desde /proc/diskstats."""
+    counters = {}
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 14:
+                continue
+            name = parts[2]
+            if name.startswith(IGNORED_PREFIXES):
+                continue
+            values = [int(v) for v in parts[3:14]]
+            counters[name] = DiskCounters(
+                reads=values[0],
+                writes=values[4],
+                read_bytes=values[2] * SECTOR_SIZE,
+                write_bytes=values[6] * SECTOR_SIZE,
+                read_ms=values[3],
+                write_ms=values[7],
+                in_flight=values[8],
+                busy_ms=values[9],
+                weighted_ms=values[10]
+            )
+    return counters
+
+
+def read_psutil_counters() -> Dict[str, DiskCounters]:
+    """Lee los contadores por dispositivo usando psutil."""
+    if not psutil:
+        return {}
+    raw = psutil.disk_io_counters(perdisk=True) or {}
+    counters = {}
+    for name, c in raw.items():
+        if name.startswith(IGNORED_PREFIXES):
+            continue
+        counters[name] = DiskCounters(
+            reads=c.read_count,
+            writes=c.write_count,
+            read_bytes=c.read_bytes,
+            write_bytes=c.write_bytes,
+            read_ms=c.read_time,
+            write_ms=c.write_time,
+            busy_ms=getattr(c, 'busy_time', None)
+        )
+    return counters
+
+
+def read_disk_counters() -> Dict[str, DiskCounters]:
+    """Obtiene contadores de E/S, prefiriendo /proc/diskstats en Linux."""
+    if os.path.exists(PROC_DISKSTATS):
+        try:
+            return read_proc_diskstats()
+        except (OSError, ValueError):
+            pass
+    return read_psutil_counters()
+
+
+def _delta(current: Optional[int], previous: Optional[int]) -> int:
+    # Los contadores pueden reiniciarse o desbordarse; se ignoran retrocesos
+    if current is None or previous is None:
+        return 0
+    return max(current - previous, 0)
+
+
+def compute_io_stats(previous: Dict[str, DiskCounters], current: Dict[str, DiskCounters],
+                     interval: float) -> List[DeviceIOStats]:
+    """
+    Calcula IOPS, rendimiento, latencia media, profundidad de cola y utilización.
+
+    Args:
+        previous: Contadores de la lectura anterior
+        current: Contadores de la lectura actual
+        interval: Segundos transcurridos entre ambas lecturas
+    """
+    stats = []
+    if interval <= 0:
+        return stats
+
+    interval_ms = interval * 1000
+
+    for name, cur in current.items():
+        prev = previous.get(name)
+        if prev is None:
+            continue
+
+        reads = _delta(cur.reads, prev.reads)
+        writes = _delta(cur.writes, prev.writes)
+        io_ms = _delta(cur.read_ms, prev.read_ms) + _delta(cur.write_ms, prev.write_ms)
+        ios = reads + writes
+
+        if cur.weighted_ms is not None:
+            queue_depth = _delta(cur.weighted_ms, prev.weighted_ms) / interval_ms
+        else:
+            # Ley de Little: tiempo total de servicio / tiempo transcurrido
+            queue_depth = io_ms / interval_ms
+
+        util = None
+        if cur.busy_ms is not None:
+            util = min(_delta(cur.busy_ms, prev.busy_ms) / interval_ms * 100, 100.0)
+
+        stats.append(DeviceIOStats(
+            device=name,
+            read_iops=reads / interval,
+            write_iops=writes / interval,
+            read_bps=_delta(cur.read_bytes, prev.read_bytes) / interval,
+            write_bps=_delta(cur.write_bytes, prev.write_bytes) / interval,
+            await_ms=io_ms / ios if ios else 0.0,
+            queue_depth=queue_depth,
+            util_percent=util
+        ))
+
+    return sorted(stats, key=lambda s: s.device)
+
+
+class PeakTracker:
+    """Registra el valor máximo de cada métrica por dispositivo durante una sesión."""
+
+    def __init__(self):
+        self.peaks: Dict[str, DeviceIOStats] = {}
+        self.samples = 0
+
+    def update(self, stats: List[DeviceIOStats]):
+        self.samples += 1
+        for stat in stats:
+            peak = self.peaks.get(stat.device)
+            if peak is None:
+                self.peaks[stat.device] = DeviceIOStats(**{f.name: getattr(stat, f.name) for f in fields(stat)})
+                continue
+            for f in fields(stat):
+                if f.name == 'device':
+                    continue
+                value = getattr(stat, f.name)
+                if value is not None and (getattr(peak, f.name) is None or value > getattr(peak, f.name)):
+                    setattr(peak, f.name, value)
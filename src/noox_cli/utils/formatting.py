@@ -0,0 +1,19 @@
+"""
+Formato legible de magnitudes compartido por los módulos.
+"""
+
+
+def format_bytes(bytes_value: int) -> str:
+    """Formatea bytes en unidades legibles."""
+    if bytes_value == 0:
+        return "0 B"
+
+    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    size = bytes_value
+    unit_index = 0
+
+    while size >= 1024 and unit_index < len(units) - 1:
+        size /= 1024
+        unit_index += 1
+
+    return f"{size:.1f} {units[unit_index]}"
@@ -0,0 +1,233 @@
+"""
+Ejecución en lote de tests y builds sobre varios proyectos a la vez.
+El comando de cada proyecto se deduce de sus archivos (scripts de package.json,
+composer.json, pytest, go, cargo...) y los ejecutables se resuelven con el registro
+de herramientas. Los trabajos corren en un grupo acotado de hilos, cada uno con su
+propio proceso y su salida volcada a un log propio; nada se lee por tuberías, así
+que un proyecto muy verboso no bloquea a los demás. Un trabajo que supera el tiempo
+límite o se cancela se termina junto con sus procesos hijos; los que terminan solos
+quedan en el historial de tiempos del proyecto.
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .storage import get_data_dir
+from .timings import CANCELLED as INTERRUPT_CANCELLED, RunTiming, TimingHistory, run_measured
+from .tools import tool_registry
+
+
+TEST = 'test'
+BUILD = 'build'
+
+PENDING = 'pendiente'
+RUNNING = 'ejecutando'
+PASSED = 'ok'
+FAILED = 'fallo'
+TIMED_OUT = 'tiempo agotado'
+CANCELLED = 'cancelado'
+SKIPPED = 'sin comando'
+
+DEFAULT_TIMEOUT = 30 * 60
+PYTHON_MARKERS = ('requirements.txt', 'pyproject.toml', 'setup.py', 'setup.cfg')
+VENV_DIRS = ('.venv', 'venv')
+TAIL_BYTES = 4096
+
+
+@dataclass
+class BatchJob:
+    project: Path
+    action: str
+    command: Optional[List[str]] = None
+    log_path: Optional[Path] = None
+    state: str = PENDING
+    returncode: Optional[int] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    timing: Optional[RunTiming] = None
+
+    @property
+    def name(self) -> str:
+        return self.project.name
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def done(self) -> bool:
+        return self.state not in (PENDING, RUNNING)
+
+    def last_line(self) -> str:
+        """Última línea no vacía del log (solo se leen sus últimos bytes)."""
+        if not self.log_path:
+            return ''
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - TAIL_BYTES))
+                tail = f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return ''
+        lines = [line.strip() for line in tail.replace('\r', '\n').splitlines() if line.strip()]
+        return lines[-1] if lines else ''
+
+
+def _package_scripts(path: Path, manifest: str) -> Dict[str, str]:
+    try:
+        with open(path / manifest, 'r', encoding='utf-8') as f:
+            scripts = json.load(f).get('scripts') or {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return scripts if isinstance(scripts, dict) else {}
+
+
+def _tool(name: str, *args: str) -> Optional[List[str]]:
+    executable = tool_registry.find(name)
+    return [executable, *args] if executable else None
+
+
+def project_python(project: Path) -> str:
+    """El intérprete del entorno virtual del proyecto (.venv o venv) o, si no tiene, el actual."""
+    relative = Path('Scripts') / 'python.exe' if os.name == 'nt' else Path('bin') / 'python'
+    for name in VENV_DIRS:
+        candidate = Path(project) / name / relative
+        if candidate.is_file():
+            return str(candidate)
+    return sys.executable
+
+
+def detect_command(project: Path, action: str) -> Optional[List[str]]:
+    """Comando de test o build del proyecto, o None si no se reconoce ninguno."""
+    project = Path(project)
+    if (project / 'package.json').is_file():
+        scripts = _package_scripts(project, 'package.json')
+        if action in scripts and 'no test specified' not in scripts[action]:
+            return _tool('npm', 'test') if action == TEST else _tool('npm', 'run', action)
+    if (project / 'composer.json').is_file():
+        if action in _package_scripts(project, 'composer.json'):
+            return _tool('composer', action)
+        if action == TEST and (project / 'vendor' / 'bin' / 'phpunit').is_file():
+            return _tool('php', str(Path('vendor') / 'bin' / 'phpunit'))
+    if (project / 'go.mod').is_file():
+        return _tool('go', action, './...')
+    if (project / 'Cargo.toml').is_file():
+        return _tool('cargo', action) if action == TEST else _tool('cargo', 'build', '--release')
+    if action == TEST:
+        python_project = any((project / name).exists() for name in PYTHON_MARKERS)
+        has_tests = any((project / name).is_dir() for name in ('tests', 'test'))
+        if (project / 'pytest.ini').is_file() or (project / 'conftest.py').is_file() or (python_project and has_tests):
+            return [project_python(project), '-m', 'pytest']
+    if action == BUILD:
+        if (project / 'pyproject.toml').is_file():
+            return [project_python(project), '-m', 'build']
+        if (project / 'setup.py').is_file():
+            return [project_python(project), 'setup.py', 'build']
+    return None
+
+
+def batch_log_dir() -> Path:
+    """Directorio nuevo para los logs de un lote."""
+    path = get_data_dir() / 'logs' / 'lotes' / datetime.now().strftime('%Y%m%d-%H%M%S')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def prepare_jobs(projects: List[Path], action: str, log_dir: Path) -> List[BatchJob]:
+    jobs = []
+    for project in projects:
+        project = Path(project)
+        command = detect_command(project, action)
+        job = BatchJob(project=project, action=action, command=command,
+                       log_path=Path(log_dir) / f"{project.name}-{action}.log")
+        if command is None:
+            job.state = SKIPPED
+        jobs.append(job)
+    return jobs
+
+
+class BatchRunner:
+    """Ejecuta trabajos con paralelismo acotado; `cancel()` detiene los que quedan."""
+
+    def __init__(self, jobs: List[BatchJob], workers: int = 4, timeout: float = DEFAULT_TIMEOUT,
+                 env: Optional[Dict[str, str]] = None, history: Optional[TimingHistory] = None):
+        self.jobs = jobs
+        self.history = history
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.env = dict(os.environ if env is None else env)
+        # Sin terminal interactiva: evita modos watch y colores que ensucian el log
+        self.env.setdefault('CI', '1')
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run_job(self, job: BatchJob, on_update: Optional[Callable[[BatchJob], None]]):
+        if self._cancelled.is_set():
+            job.state = CANCELLED
+            return
+        job.state = RUNNING
+        job.started = time.monotonic()
+        if on_update:
+            on_update(job)
+
+        job.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(job.log_path, 'wb') as log:
+            log.write(f"$ {' '.join(job.command)}\n(en {job.project})\n\n".encode('utf-8'))
+            log.flush()
+            try:
+                timing = run_measured(
+                    job.command, cwd=str(job.project), env=self.env,
+                    stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                    timeout=self.timeout, should_stop=self._cancelled.is_set
+                )
+            except OSError as e:
+                log.write(f"No se pudo ejecutar: {e}\n".encode('utf-8'))
+                job.state = FAILED
+                job.finished = time.monotonic()
+                return
+
+        job.finished = time.monotonic()
+        job.timing = timing
+        job.returncode = timing.returncode
+        if timing.interrupted:
+            job.state = CANCELLED if timing.interrupted == INTERRUPT_CANCELLED else TIMED_OUT
+        else:
+            job.state = PASSED if timing.returncode == 0 else FAILED
+            # Las ejecuciones cortadas no sirven como referencia de tiempos
+            if self.history:
+                self.history.record(job.project, timing)
+
+    def run(self, on_update: Optional[Callable[[BatchJob], None]] = None) -> List[BatchJob]:
+        """Ejecuta todos los trabajos con comando y devuelve la lista (en el orden original)."""
+        runnable = [job for job in self.jobs if job.state == PENDING]
+
+        def worker(job: BatchJob):
+            try:
+                self._run_job(job, on_update)
+            finally:
+                if on_update:
+                    on_update(job)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(worker, job) for job in runnable]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Ctrl+C: los trabajos en curso terminan sus procesos y los pendientes no arrancan
+                self.cancel()
+                raise
+        return self.jobs
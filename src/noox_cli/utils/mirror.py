@@ -0,0 +1,367 @@
+"""
+Espejo de proyectos en otra ubicación (otro disco, una unidad de red...).
+Origen y destino se recorren con stat y se comparan por tamaño y mtime: solo se
+copian los archivos nuevos o modificados y se borran del espejo los que ya no
+existen en el origen. Los archivos grandes que cambiaron se transfieren como un
+delta al estilo rsync: se calculan firmas por bloques del archivo del espejo
+(suma rápida enrollable + hash fuerte), se recorre el origen buscando esos bloques
+y el archivo nuevo se reconstruye con los bloques que ya estaban y los bytes
+literales que faltan. Los archivos se procesan en un grupo acotado de hilos.
+"""
+
+import os
+import json
+import math
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .backups import DEFAULT_EXCLUDES, is_inside, scan_tree
+from .storage import load_json, save_json
+
+
+SETTINGS_FILE = 'mirror_settings.json'
+# Marca del directorio espejo: sin ella no se borra nada en un directorio que ya tenía datos
+MARKER_NAME = '.noox-mirror.json'
+DEFAULT_WORKERS = 8
+# Por debajo de este tamaño copiar entero es más rápido que calcular el delta
+DELTA_MIN_SIZE = 1024 * 1024
+MIN_BLOCK = 2 * 1024
+MAX_BLOCK = 64 * 1024
+READ_SIZE = 1024 * 1024
+# Si tras este volumen de literales más de la mitad del archivo es nuevo, se copia entero
+LITERAL_PROBE = 1024 * 1024
+
+COPY = 'copy'
+LITERAL = 'literal'
+
+
+@dataclass
+class MirrorSettings:
+    destination: str = ''
+    projects: List[str] = field(default_factory=list)
+    excludes: List[str] = field(default_factory=lambda: list(DEFAULT_EXCLUDES))
+    workers: int = DEFAULT_WORKERS
+
+    @property
+    def destination_path(self) -> Optional[Path]:
+        return Path(self.destination) if self.destination else None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MirrorSettings':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class MirrorResult:
+    source: Path
+    target: Path
+    copied: int = 0
+    patched: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    bytes_copied: int = 0
+    bytes_literal: int = 0
+    bytes_reused: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def load_mirror_settings() -> MirrorSettings:
+    return MirrorSettings.from_dict(load_json(SETTINGS_FILE, {}) or {})
+
+
+def save_mirror_settings(settings: MirrorSettings):
+    save_json(SETTINGS_FILE, asdict(settings))
+
+
+def block_size_for(size: int) -> int:
+    """Tamaño de bloque proporcional a la raíz del tamaño del archivo, como rsync."""
+    return min(MAX_BLOCK, max(MIN_BLOCK, 1 << int(math.sqrt(size)).bit_length()))
+
+
+def weak_checksum(block: bytes) -> Tuple[int, int]:
+    """Suma enrollable de rsync: a = Σ x_i, b = Σ (L - i) · x_i (ambas módulo 2^16)."""
+    return sum(block) & 0xffff, sum(accumulate(block)) & 0xffff
+
+
+def strong_checksum(block: bytes) -> bytes:
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+class BlockSignature:
+    """
+    Firma por bloques del archivo del espejo. Los hashes fuertes se calculan siempre
+    (blake2b es rápido); las sumas débiles, que en Python puro son mucho más caras,
+    solo cuando el origen deja de coincidir con los bloques alineados y hay que
+    buscar con la ventana enrollable.
+    """
+
+    def __init__(self, f: BinaryIO, block_size: int):
+        self.f = f
+        self.block_size = block_size
+        self.strong: Dict[bytes, int] = {}
+        self._weak: Optional[Dict[int, Dict[bytes, int]]] = None
+        index = 0
+        for block in iter(lambda: f.read(block_size), b''):
+            self.strong.setdefault(strong_checksum(block), index)
+            index += 1
+
+    @property
+    def weak(self) -> Dict[int, Dict[bytes, int]]:
+        """Suma débil -> {hash fuerte: índice del bloque}."""
+        if self._weak is None:
+            self._weak = {}
+            self.f.seek(0)
+            for block in iter(lambda: self.f.read(self.block_size), b''):
+                a, b = weak_checksum(block)
+                strong = strong_checksum(block)
+                self._weak.setdefault((b << 16) | a, {})[strong] = self.strong[strong]
+        return self._weak
+
+
+class DeltaNotWorthIt(Exception):
+    """El origen casi no comparte bloques con el espejo: conviene copiarlo entero."""
+
+
+def iter_delta(f: BinaryIO, signature: BlockSignature,
+               on_read: Optional[Callable[[bytes], None]] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Recorre `f` con una ventana enrollable y produce (COPY, índice de bloque) o
+    (LITERAL, bytes). Cuando una ventana coincide se salta el bloque entero, así que
+    las zonas sin cambios se recorren a la velocidad del hash y solo las
+    modificadas avanzan byte a byte.
+    """
+    block_size = signature.block_size
+    buf = bytearray()
+    pos = literal_start = 0
+    consumed = literal_total = 0
+    eof = False
+    a = b = None
+    while True:
+        # Siempre debe haber un byte entrante tras la ventana, salvo al final del archivo
+        if len(buf) - pos <= block_size and not eof:
+            if pos > literal_start:
+                literal_total += pos - literal_start
+                yield LITERAL, bytes(buf[literal_start:pos])
+            consumed += pos
+            if literal_total > LITERAL_PROBE and literal_total * 2 > consumed:
+                raise DeltaNotWorthIt()
+            del buf[:pos]
+            pos = literal_start = 0
+            chunk = f.read(READ_SIZE)
+            if chunk:
+                if on_read:
+                    on_read(chunk)
+                buf += chunk
+            else:
+                eof = True
+            continue
+
+        remaining = len(buf) - pos
+        if remaining == 0:
+            break
+        n = min(block_size, remaining)
+        if a is None:
+            # Ventana nueva: lo habitual es que el bloque siga igual en el espejo
+            window = bytes(buf[pos:pos + n])
+            index = signature.strong.get(strong_checksum(window))
+            if index is not None:
+                if pos > literal_start:
+                    literal_total += pos - literal_start
+                    yield LITERAL, bytes(buf[literal_start:pos])
+                yield COPY, index
+                pos += n
+                literal_start = pos
+                continue
+            a, b = weak_checksum(window)
+
+        candidates = signature.weak.get((b << 16) | a)
+        if candidates:
+            index = candidates.get(strong_checksum(bytes(buf[pos:pos + n])))
+            if index is not None:
+                if pos > literal_start:
+                    literal_total += pos - literal_start
+                    yield LITERAL, bytes(buf[literal_start:pos])
+                yield COPY, index
+                pos += n
+                literal_start = pos
+                a = None
+                continue
+
+        out = buf[pos]
+        if remaining > n:
+            a = (a - out + buf[pos + n]) & 0xffff
+            b = (b - n * out + a) & 0xffff
+        else:
+            # Final del archivo: la ventana se encoge
+            a = (a - out) & 0xffff
+            b = (b - n * out) & 0xffff
+        pos += 1
+
+    if pos > literal_start:
+        yield LITERAL, bytes(buf[literal_start:pos])
+
+
+def _temp_path(target: Path) -> Path:
+    fd, tmp = tempfile.mkstemp(prefix=f'.{target.name}.', suffix='.tmp', dir=str(target.parent))
+    os.close(fd)
+    return Path(tmp)
+
+
+def copy_file(source: Path, target: Path) -> int:
+    """Copia el archivo completo con un nombre temporal y conserva su mtime."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(target)
+    try:
+        shutil.copyfile(source, tmp)
+        shutil.copystat(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return target.stat().st_size
+
+
+def patch_file(source: Path, target: Path) -> Tuple[int, int]:
+    """
+    Reconstruye `target` a partir de sus propios bloques y los literales de `source`.
+
+    Returns:
+        (bytes literales, bytes reutilizados del espejo)
+
+    Raises:
+        DeltaNotWorthIt: si el archivo cambió casi entero
+    """
+    block_size = block_size_for(target.stat().st_size)
+    source_digest = hashlib.blake2b()
+    result_digest = hashlib.blake2b()
+    literal = reused = 0
+    tmp = _temp_path(target)
+    try:
+        with open(source, 'rb') as src, open(target, 'rb') as old, open(tmp, 'wb') as out:
+            signature = BlockSignature(old, block_size)
+            for op, value in iter_delta(src, signature, on_read=source_digest.update):
+                if op == COPY:
+                    old.seek(value * block_size)
+                    data = old.read(block_size)
+                    reused += len(data)
+                else:
+                    data = value
+                    literal += len(data)
+                out.write(data)
+                result_digest.update(data)
+        # Comprobación final del archivo completo, como hace rsync
+        if source_digest.digest() != result_digest.digest():
+            raise DeltaNotWorthIt()
+        shutil.copystat(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return literal, reused
+
+
+def _sync_file(source: Path, target: Path, size: int, delta_min_size: int) -> Tuple[str, int, int]:
+    if target.is_file() and size >= delta_min_size:
+        try:
+            literal, reused = patch_file(source, target)
+            return 'patched', literal, reused
+        except DeltaNotWorthIt:
+            pass
+    return 'copied', copy_file(source, target), 0
+
+
+def _check_target(source: Path, target: Path):
+    if is_inside(target, source) or is_inside(source, target):
+        raise ValueError(f"El espejo {target} no puede estar dentro del proyecto (ni al revés)")
+    if target.exists() and not (target / MARKER_NAME).exists() and any(target.iterdir()):
+        raise ValueError(f"{target} ya contiene archivos que no son de un espejo de NooxCLI")
+
+
+def _remove_empty_dirs(target: Path, removed: List[str], source: Path):
+    """Borra los directorios que quedaron vacíos y ya no existen en el origen."""
+    parents = {str(Path(r).parent) for r in removed}
+    candidates = set()
+    for parent in parents:
+        while parent not in ('', '.'):
+            candidates.add(parent)
+            parent = str(Path(parent).parent)
+    for relative in sorted(candidates, key=lambda p: p.count(os.sep) + p.count('/'), reverse=True):
+        if (source / relative).is_dir():
+            continue
+        try:
+            (target / relative).rmdir()
+        except OSError:
+            pass
+
+
+def mirror_project(source: Path, target: Path, excludes: Optional[List[str]] = None,
+                   workers: int = DEFAULT_WORKERS, delete: bool = True,
+                   delta_min_size: int = DELTA_MIN_SIZE,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> MirrorResult:
+    """
+    Sincroniza `target` con `source`: copia lo nuevo, aplica deltas a lo modificado y
+    borra lo que ya no existe en el origen.
+
+    Raises:
+        ValueError: si el destino se solapa con el origen o no es un espejo
+    """
+    source = Path(source).resolve()
+    target = Path(target).resolve()
+    excludes = DEFAULT_EXCLUDES if excludes is None else excludes
+    _check_target(source, target)
+    target.mkdir(parents=True, exist_ok=True)
+    (target / MARKER_NAME).write_text(json.dumps({'source': str(source)}, ensure_ascii=False), encoding='utf-8')
+
+    result = MirrorResult(source=source, target=target)
+    source_files = scan_tree(source, excludes)
+    target_files = scan_tree(target, list(excludes) + [MARKER_NAME])
+
+    pending = []
+    for relative, (size, mtime_ns) in source_files.items():
+        if target_files.get(relative) == (size, mtime_ns):
+            result.unchanged += 1
+        else:
+            pending.append((relative, size))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(_sync_file, source / relative, target / relative, size, delta_min_size):
+                (relative, size)
+            for relative, size in pending
+        }
+        for future in as_completed(futures):
+            relative, size = futures[future]
+            try:
+                action, written, reused = future.result()
+            except OSError as e:
+                result.errors.append((relative, str(e)))
+                continue
+            if action == 'patched':
+                result.patched += 1
+                result.bytes_literal += written
+                result.bytes_reused += reused
+            else:
+                result.copied += 1
+                result.bytes_copied += written
+            if progress_callback:
+                progress_callback(size)
+
+    if delete:
+        removed = []
+        for relative in target_files.keys() - source_files.keys():
+            try:
+                (target / relative).unlink()
+                removed.append(relative)
+            except OSError as e:
+                result.errors.append((relative, str(e)))
+        result.deleted = len(removed)
+        _remove_empty_dirs(target, removed, source)
+
+    return result
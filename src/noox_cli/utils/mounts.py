@@ -0,0 +1,149 @@
+"""
+Consulta de uso de puntos de montaje en paralelo con tiempo límite.
+Un montaje NFS/SMB colgado o un USB desconectado no bloquea la consulta:
+se marca como sin respuesta y el resto de unidades se devuelven igualmente.
+"""
+
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_TTL = 30.0
+
+
+@dataclass
+class MountUsage:
+    mountpoint: str
+    total: int = 0
+    used: int = 0
+    free: int = 0
+    inodes_total: Optional[int] = None
+    inodes_used: Optional[int] = None
+    inodes_free: Optional[int] = None
+    responsive: bool = True
+    error: Optional[str] = None
+
+    @property
+    def inodes_percent(self) -> Optional[float]:
+        if not self.inodes_total:
+            return None
+        return self.inodes_used / self.inodes_total * 100
+
+
+def stat_mount(mountpoint: str) -> MountUsage:
+    """Obtiene el uso de un punto de montaje (puede bloquearse en montajes colgados)."""
+    if psutil:
+        usage = psutil.disk_usage(mountpoint)
+        result = MountUsage(mountpoint, usage.total, usage.used, usage.free)
+    else:
+        usage = shutil.disk_usage(mountpoint)
+        result = MountUsage(mountpoint, usage.total, usage.total - usage.free, usage.free)
+
+    # Inodos (solo POSIX); algunos sistemas de archivos como btrfs informan 0
+    if hasattr(os, 'statvfs'):
+        vfs = os.statvfs(mountpoint)
+        if vfs.f_files:
+            result.inodes_total = vfs.f_files
+            # Libres según f_ffree, como `df -i`: usados + libres = total
+            result.inodes_free = vfs.f_ffree
+            result.inodes_used = vfs.f_files - vfs.f_ffree
+
+    return result
+
+
+class _Probe:
+    """Consulta en curso de un punto de montaje."""
+
+    def __init__(self, mountpoint: str):
+        self.mountpoint = mountpoint
+        self.done = threading.Event()
+        self.result: Optional[MountUsage] = None
+
+    def run(self):
+        try:
+            self.result = stat_mount(self.mountpoint)
+        except Exception as e:
+            # Cualquier fallo debe dejar un resultado: el hilo no tiene a quién propagarlo
+            self.result = MountUsage(self.mountpoint, error=str(e))
+        finally:
+            self.done.set()
+
+
+class MountProber:
+    """
+    Obtiene el uso de varios puntos de montaje en paralelo.
+
+    Cada consulta corre en un hilo daemon: un hilo bloqueado en el kernel no puede
+    cancelarse, y un ThreadPoolExecutor lo esperaría al cerrar el intérprete. Las
+    consultas colgadas se recuerdan para no lanzar otra sobre el mismo montaje, y los
+    resultados sanos se guardan en caché durante `ttl` segundos.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, ttl: float = DEFAULT_TTL):
+        self.timeout = timeout
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Probe] = {}
+        self._cache: Dict[str, Tuple[float, MountUsage]] = {}
+
+    def _start(self, mountpoint: str) -> _Probe:
+        with self._lock:
+            probe = self._pending.get(mountpoint)
+            if probe is None:
+                probe = _Probe(mountpoint)
+                self._pending[mountpoint] = probe
+                threading.Thread(target=probe.run, name=f"noox-mount-{mountpoint}", daemon=True).start()
+            return probe
+
+    def usage(self, mountpoints: Iterable[str]) -> Dict[str, MountUsage]:
+        """
+        Devuelve el uso de cada punto de montaje sin esperar más de `timeout` en total.
+
+        Los montajes que no responden a tiempo se devuelven con responsive=False;
+        los que fallan con un error de acceso se devuelven con `error`.
+        """
+        now = time.monotonic()
+        results: Dict[str, MountUsage] = {}
+        probes = []
+
+        for mountpoint in mountpoints:
+            cached = self._cache.get(mountpoint)
+            if cached and now - cached[0] < self.ttl:
+                results[mountpoint] = cached[1]
+            else:
+                probes.append(self._start(mountpoint))
+
+        deadline = now + self.timeout
+        for probe in probes:
+            probe.done.wait(max(deadline - time.monotonic(), 0))
+
+        finished = time.monotonic()
+        with self._lock:
+            for probe in probes:
+                if not probe.done.is_set():
+                    results[probe.mountpoint] = MountUsage(probe.mountpoint, responsive=False)
+                    continue
+                self._pending.pop(probe.mountpoint, None)
+                results[probe.mountpoint] = probe.result
+                if probe.result.error is None:
+                    self._cache[probe.mountpoint] = (finished, probe.result)
+
+        return results
+
+    def invalidate(self):
+        """Descarta los resultados en caché."""
+        self._cache.clear()
+
+
+# Instancia compartida para conservar la caché entre aperturas del menú
+mount_prober = MountProber()
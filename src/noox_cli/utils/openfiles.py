@@ -0,0 +1,125 @@
+"""
+Índice de archivos abiertos por los procesos en ejecución.
+Se construye una sola vez leyendo /proc/*/fd en paralelo (o psutil en otras
+plataformas) y permite a los motores de limpieza saltarse archivos en uso con una
+consulta O(1). También registra los archivos ya borrados que algún proceso mantiene
+abiertos: su espacio no se libera hasta que el proceso los cierra.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+DEFAULT_WORKERS = 8
+PROC_DIR = '/proc'
+DELETED_SUFFIX = ' (deleted)'
+
+# Clave de inodo para no contar dos veces un archivo abierto por varios procesos
+InodeKey = Tuple[int, int]
+
+
+@dataclass
+class PinnedFile:
+    path: str
+    size: int
+    pid: int
+
+
+def normalize_path(path: str) -> str:
+    """Normaliza una ruta para compararla con las del índice."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _scan_proc_pid(pid: str) -> Tuple[Set[str], Dict[InodeKey, PinnedFile]]:
+    """Lee los descriptores de un proceso; los procesos ajenos sin permiso se ignoran."""
+    paths: Set[str] = set()
+    deleted: Dict[InodeKey, PinnedFile] = {}
+    fd_dir = os.path.join(PROC_DIR, pid, 'fd')
+
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return paths, deleted
+
+    for fd in fds:
+        fd_path = os.path.join(fd_dir, fd)
+        try:
+            target = os.readlink(fd_path)
+        except OSError:
+            continue
+        # Sockets, pipes, anon_inode... no son rutas; memfd ocupa memoria, no disco
+        if not target.startswith('/') or target.startswith('/memfd:'):
+            continue
+
+        if target.endswith(DELETED_SUFFIX):
+            try:
+                st = os.stat(fd_path)
+            except OSError:
+                continue
+            deleted[(st.st_dev, st.st_ino)] = PinnedFile(target[:-len(DELETED_SUFFIX)], st.st_size, int(pid))
+        else:
+            paths.add(normalize_path(target))
+
+    return paths, deleted
+
+
+def _scan_psutil_process(proc) -> Set[str]:
+    try:
+        return {normalize_path(f.path) for f in proc.open_files()}
+    except (psutil.Error, OSError):
+        return set()
+
+
+class OpenFilesIndex:
+    """Conjunto de rutas abiertas por algún proceso en el momento de construirlo."""
+
+    def __init__(self, paths: Set[str], deleted: Optional[List[PinnedFile]] = None):
+        self.paths = paths
+        self.deleted = deleted or []
+
+    def __contains__(self, path: str) -> bool:
+        return normalize_path(path) in self.paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def pinned_files(self, roots: Optional[Iterable[str]] = None) -> List[PinnedFile]:
+        """Archivos borrados pero abiertos, opcionalmente solo los que estaban bajo `roots`."""
+        if roots is None:
+            return list(self.deleted)
+        prefixes = tuple(normalize_path(r).rstrip(os.sep) + os.sep for r in roots)
+        return [f for f in self.deleted if normalize_path(f.path).startswith(prefixes)]
+
+    def pinned_size(self, roots: Optional[Iterable[str]] = None) -> int:
+        """Espacio retenido por archivos borrados que siguen abiertos."""
+        return sum(f.size for f in self.pinned_files(roots))
+
+    @classmethod
+    def build(cls, workers: int = DEFAULT_WORKERS) -> 'OpenFilesIndex':
+        """Recorre todos los procesos una vez, en paralelo, y recopila sus archivos abiertos."""
+        paths: Set[str] = set()
+
+        if os.path.isdir(os.path.join(PROC_DIR, 'self', 'fd')):
+            pids = [entry for entry in os.listdir(PROC_DIR) if entry.isdigit()]
+            deleted: Dict[InodeKey, PinnedFile] = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for proc_paths, proc_deleted in executor.map(_scan_proc_pid, pids):
+                    paths |= proc_paths
+                    deleted.update(proc_deleted)
+            return cls(paths, list(deleted.values()))
+
+        if not psutil:
+            return cls(paths)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for proc_paths in executor.map(_scan_psutil_process, psutil.process_iter()):
+                paths |= proc_paths
+
+        return cls(paths)
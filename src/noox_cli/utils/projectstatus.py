@@ -0,0 +1,251 @@
+"""
+Estado enriquecido de los proyectos para el panel: git, tamaño y actividad.
+Cada proyecto se analiza en un grupo acotado de hilos con un tiempo límite propio
+(las llamadas a git y el recorrido del árbol comparten ese presupuesto). El resultado
+se guarda en disco con una huella formada por el mtime del proyecto y el de
+.git/HEAD, .git/index y .git/FETCH_HEAD, y solo se recalcula cuando la huella cambia
+o la entrada supera una antigüedad máxima.
+"""
+
+import os
+import time
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .storage import load_json, save_json
+from .tools import tool_registry
+
+
+CACHE_FILE = 'project_status.json'
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10.0
+MAX_AGE = 3600
+
+# Directorios que no cuentan como actividad del proyecto (sí cuentan para el tamaño)
+ACTIVITY_SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+# Archivos de .git cuyo mtime cambia con commits, checkouts, staging y fetch
+GIT_STATE_FILES = ('HEAD', 'index', 'FETCH_HEAD')
+
+
+@dataclass
+class ProjectStatus:
+    path: str
+    is_git: bool = False
+    branch: Optional[str] = None
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    dirty: Optional[int] = None
+    last_commit: Optional[float] = None
+    size: int = 0
+    file_count: int = 0
+    last_activity: float = 0.0
+    complete: bool = True
+    error: Optional[str] = None
+    collected: float = 0.0
+    fingerprint: Optional[List[Optional[int]]] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+def git_dir(project: str) -> Optional[str]:
+    """Directorio .git del proyecto; resuelve el archivo `gitdir:` de worktrees y submódulos."""
+    dot_git = os.path.join(project, '.git')
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, 'r', encoding='utf-8') as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if line.startswith('gitdir:'):
+        target = line[len('gitdir:'):].strip()
+        return os.path.normpath(os.path.join(project, target))
+    return None
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def fingerprint(project: str) -> List[Optional[int]]:
+    """Huella barata (unos pocos stat) que cambia cuando el estado del proyecto cambia."""
+    marks = [_mtime_ns(project)]
+    directory = git_dir(project)
+    for name in GIT_STATE_FILES:
+        marks.append(_mtime_ns(os.path.join(directory, name)) if directory else None)
+    return marks
+
+
+def parse_porcelain_v2(output: str, status: ProjectStatus):
+    """Interpreta `git status --porcelain=v2 --branch`: rama, adelantos/atrasos y cambios."""
+    dirty = 0
+    for line in output.splitlines():
+        if line.startswith('# branch.head '):
+            head = line[len('# branch.head '):]
+            status.branch = None if head == '(detached)' else head
+        elif line.startswith('# branch.ab '):
+            ahead, behind = line[len('# branch.ab '):].split()
+            status.ahead = int(ahead.lstrip('+'))
+            status.behind = int(behind.lstrip('-'))
+        elif line and not line.startswith('#'):
+            dirty += 1
+    status.dirty = dirty
+
+
+def _run_git(git: str, project: str, args: List[str], deadline: float) -> Optional[str]:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise subprocess.TimeoutExpired(args, 0)
+    # --no-optional-locks: `status` no debe reescribir el índice (cambiaría la huella)
+    result = subprocess.run(
+        [git, '--no-optional-locks', '-C', project] + args,
+        capture_output=True, text=True, timeout=remaining
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+def _walk(project: str, status: ProjectStatus, deadline: float):
+    """Suma el tamaño y busca la modificación más reciente hasta agotar el tiempo."""
+    stack = [(project, True)]
+    while stack:
+        if time.monotonic() > deadline:
+            status.complete = False
+            return
+        current, counts_activity = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, counts_activity and entry.name not in ACTIVITY_SKIP_DIRS))
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    status.size += st.st_size
+                    status.file_count += 1
+                    if counts_activity and st.st_mtime > status.last_activity:
+                        status.last_activity = st.st_mtime
+        except OSError:
+            continue
+
+
+def collect_status(project: str, timeout: float = DEFAULT_TIMEOUT) -> ProjectStatus:
+    """Analiza un proyecto con un tiempo límite total de `timeout` segundos."""
+    deadline = time.monotonic() + timeout
+    status = ProjectStatus(path=project, collected=time.time(), fingerprint=fingerprint(project))
+
+    git = tool_registry.find('git')
+    if git and git_dir(project):
+        status.is_git = True
+        try:
+            output = _run_git(git, project, ['status', '--porcelain=v2', '--branch'], deadline)
+            if output is not None:
+                parse_porcelain_v2(output, status)
+            output = _run_git(git, project, ['log', '-1', '--format=%ct'], deadline)
+            if output and output.strip().isdigit():
+                status.last_commit = float(output.strip())
+        except subprocess.TimeoutExpired:
+            status.complete = False
+            status.error = 'git no respondió a tiempo'
+        except OSError as e:
+            status.error = str(e)
+
+    _walk(project, status, deadline)
+    return status
+
+
+class ProjectStatusCache:
+    """Estados de proyectos guardados en disco y validados por su huella."""
+
+    def __init__(self, cache_file: str = CACHE_FILE, max_age: float = MAX_AGE):
+        self.cache_file = cache_file
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._statuses: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._statuses is None:
+            self._statuses = (load_json(self.cache_file, {}) or {}).get('projects', {})
+        return self._statuses
+
+    def get(self, project: str) -> Optional[ProjectStatus]:
+        """Estado en caché si sigue vigente (misma huella, completo y no demasiado antiguo)."""
+        with self._lock:
+            data = self._load().get(project)
+        if not data:
+            return None
+        try:
+            status = ProjectStatus(**data)
+        except TypeError:
+            return None
+        if not status.complete or time.time() - status.collected > self.max_age:
+            return None
+        if status.fingerprint != fingerprint(project):
+            return None
+        return status
+
+    def put(self, status: ProjectStatus):
+        with self._lock:
+            self._load()[status.path] = asdict(status)
+
+    def save(self):
+        """Guarda la caché descartando los proyectos que ya no existen."""
+        with self._lock:
+            statuses = self._load()
+            for path in [p for p in statuses if not os.path.isdir(p)]:
+                del statuses[path]
+            try:
+                save_json(self.cache_file, {'projects': statuses})
+            except OSError:
+                pass
+
+
+def collect_statuses(projects: Iterable[str], workers: int = DEFAULT_WORKERS,
+                     timeout: float = DEFAULT_TIMEOUT, refresh: bool = False,
+                     cache: Optional[ProjectStatusCache] = None,
+                     on_done: Optional[Callable[[ProjectStatus], None]] = None) -> List[ProjectStatus]:
+    """
+    Obtiene el estado de varios proyectos: los vigentes salen de la caché y el resto se
+    analiza en paralelo (como mucho `workers` a la vez, cada uno con su tiempo límite).
+
+    Returns:
+        Estados en el mismo orden que `projects`
+    """
+    projects = list(projects)
+    cache = cache or ProjectStatusCache()
+    statuses: Dict[str, ProjectStatus] = {}
+
+    pending = []
+    for project in projects:
+        cached = None if refresh else cache.get(project)
+        if cached is not None:
+            statuses[project] = cached
+            if on_done:
+                on_done(cached)
+        else:
+            pending.append(project)
+
+    def analyze(project: str) -> ProjectStatus:
+        status = collect_status(project, timeout)
+        cache.put(status)
+        if on_done:
+            on_done(status)
+        return status
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            for status in executor.map(analyze, pending):
+                statuses[status.path] = status
+        cache.save()
+
+    return [statuses[p] for p in projects]
@@ -0,0 +1,219 @@
+"""
+Políticas de retención para directorios temporales.
+Cada directorio puede definir una antigüedad mínima, patrones de inclusión/exclusión,
+un tamaño máximo con desalojo de los archivos más antiguos y si se respetan los
+archivos abiertos. Las ejecuciones desatendidas usan una comprobación previa barata
+(mtimes de directorios y, con tamaño máximo, tamaños de los archivos conservados)
+para evitar recorrer el árbol cuando nada ha cambiado.
+
+Los directorios sin política guardada usan la predeterminada en las ejecuciones de
+políticas; las limpiezas manuales de siempre usan `unmanaged_policy` y siguen
+eliminando todo lo que pueden (salvo los archivos abiertos).
+"""
+
+import os
+import time
+import fnmatch
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .cleanup import CleanupManifest, build_manifest, select_files
+from .openfiles import OpenFilesIndex
+from .storage import load_json, save_json
+
+
+POLICIES_FILE = 'retention_policies.json'
+STATE_FILE = 'retention_state.json'
+DEFAULT_MIN_AGE_HOURS = 24.0
+
+# Los archivos saltados por estar abiertos pueden cerrarse en cualquier momento
+OPEN_FILE_RECHECK = 60 * 60
+
+
+@dataclass
+class RetentionPolicy:
+    directory: str
+    min_age_hours: float = DEFAULT_MIN_AGE_HOURS
+    include: List[str] = field(default_factory=lambda: ['*'])
+    exclude: List[str] = field(default_factory=list)
+    max_total_size: Optional[int] = None
+    skip_open_files: bool = True
+
+    @property
+    def min_age_seconds(self) -> float:
+        return self.min_age_hours * 3600
+
+    def matches(self, path: str) -> bool:
+        """Indica si un archivo cumple los patrones de inclusión y no los de exclusión."""
+        name = os.path.basename(path)
+        relative = os.path.relpath(path, self.directory).replace(os.sep, '/')
+
+        def hit(patterns: Iterable[str]) -> bool:
+            return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(relative, p) for p in patterns)
+
+        return hit(self.include or ['*']) and not hit(self.exclude)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RetentionPolicy':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class RetentionPlan:
+    policy: RetentionPolicy
+    manifest: CleanupManifest
+    next_due: Optional[float] = None
+    skipped_open: int = 0
+    skipped_young: int = 0
+    dir_mtimes: Dict[str, float] = field(default_factory=dict)
+    # Con tamaño máximo: archivos que quedan tras aplicar el plan (ruta -> tamaño)
+    kept_sizes: Dict[str, int] = field(default_factory=dict)
+
+
+def unmanaged_policy(directory: str) -> RetentionPolicy:
+    """Comportamiento de las limpiezas manuales sin política: todo, sin antigüedad mínima."""
+    return RetentionPolicy(directory=directory, min_age_hours=0)
+
+
+def load_policies(directories: Iterable[str],
+                  default: Callable[[str], RetentionPolicy] = RetentionPolicy) -> List[RetentionPolicy]:
+    """Devuelve la política guardada de cada directorio o `default(directorio)`."""
+    saved = load_json(POLICIES_FILE, {}) or {}
+    return [
+        RetentionPolicy.from_dict(saved[d]) if d in saved else default(d)
+        for d in directories
+    ]
+
+
+def save_policy(policy: RetentionPolicy):
+    """Guarda o reemplaza la política de un directorio."""
+    saved = load_json(POLICIES_FILE, {}) or {}
+    saved[policy.directory] = policy.to_dict()
+    save_json(POLICIES_FILE, saved)
+
+
+def plan_retention(policy: RetentionPolicy, open_files: Optional[OpenFilesIndex] = None,
+                   now: Optional[float] = None) -> RetentionPlan:
+    """
+    Recorre el directorio una vez y decide qué archivos elimina la política.
+
+    Args:
+        policy: Política a aplicar
+        open_files: Índice de archivos abiertos (se ignora si la política no lo usa)
+        now: Momento de referencia para calcular antigüedades
+    """
+    now = time.time() if now is None else now
+    min_age = policy.min_age_seconds
+    dir_mtimes: Dict[str, float] = {}
+    sizes: Dict[str, int] = {}
+
+    def file_filter(path: str, st: os.stat_result) -> bool:
+        if policy.max_total_size is not None:
+            # Todos los archivos cuentan para el límite, cumplan o no los patrones
+            sizes[path] = st.st_size
+        return policy.matches(path)
+
+    def dir_filter(path: str, st: os.stat_result) -> bool:
+        # Se aprovecha el mismo stat para la comprobación previa de la próxima ejecución
+        dir_mtimes[path] = st.st_mtime
+        return now - st.st_mtime >= min_age
+
+    manifest = build_manifest(
+        policy.directory, file_filter, dir_filter,
+        open_files if policy.skip_open_files else None
+    )
+    skipped_open = manifest.skipped_open
+
+    eligible = [f for f in manifest.files if now - f[2] >= min_age]
+    young = [f for f in manifest.files if now - f[2] < min_age]
+
+    if policy.max_total_size is not None:
+        # Desalojar los más antiguos solo hasta volver a estar por debajo del límite
+        remaining = manifest.total_size + manifest.skipped_size
+        selected = []
+        for entry in sorted(eligible, key=lambda f: f[2]):
+            if remaining <= policy.max_total_size:
+                break
+            selected.append(entry)
+            remaining -= entry[1]
+    else:
+        selected = eligible
+
+    evicted = {f[0] for f in selected}
+    next_due = min((f[2] + min_age for f in young), default=None)
+    if skipped_open:
+        recheck = now + OPEN_FILE_RECHECK
+        next_due = recheck if next_due is None else min(next_due, recheck)
+
+    return RetentionPlan(
+        policy=policy,
+        manifest=select_files(manifest, selected),
+        next_due=next_due,
+        skipped_open=skipped_open,
+        skipped_young=len(young),
+        dir_mtimes=dir_mtimes,
+        kept_sizes={path: size for path, size in sizes.items() if path not in evicted}
+    )
+
+
+def needs_run(policy: RetentionPolicy, now: Optional[float] = None) -> bool:
+    """
+    Comprobación previa barata: solo hace stat de los directorios vistos en la última
+    ejecución. Si ninguno cambió (no se añadieron ni quitaron entradas), la política no
+    cambió y ningún archivo ha alcanzado aún la antigüedad mínima, no hace falta recorrer.
+
+    Un archivo que crece sin que se creen otros no cambia el mtime de su directorio:
+    con tamaño máximo también se suman los tamaños actuales de los archivos conservados.
+    """
+    now = time.time() if now is None else now
+    state = (load_json(STATE_FILE, {}) or {}).get(policy.directory)
+    if not state or state.get('policy') != policy.to_dict():
+        return True
+
+    next_due = state.get('next_due')
+    if next_due is not None and now >= next_due:
+        return True
+
+    for path, mtime in state.get('dirs', {}).items():
+        try:
+            if os.stat(path).st_mtime != mtime:
+                return True
+        except OSError:
+            return True
+
+    if policy.max_total_size is not None:
+        total = 0
+        for path in state.get('files', {}):
+            try:
+                total += os.stat(path).st_size
+            except OSError:
+                continue
+        if total > policy.max_total_size:
+            return True
+
+    return False
+
+
+def record_run(plan: RetentionPlan):
+    """Guarda los mtimes de directorios (y tamaños) tras una ejecución para la próxima comprobación previa."""
+    root = plan.policy.directory
+    dirs: Dict[str, float] = {}
+    for path in [root, *plan.dir_mtimes]:
+        try:
+            dirs[path] = os.stat(path).st_mtime
+        except OSError:
+            continue
+
+    state = load_json(STATE_FILE, {}) or {}
+    state[root] = {
+        'policy': plan.policy.to_dict(),
+        'next_due': plan.next_due,
+        'dirs': dirs,
+        'files': plan.kept_sizes,
+        'checked_at': time.time()
+    }
+    save_json(STATE_FILE, state)
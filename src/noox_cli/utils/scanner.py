@@ -0,0 +1,187 @@
+"""
+Escáner de directorios de una sola pasada.
+Recorre un árbol con os.scandir y acumula en el mismo recorrido el tamaño total,
+el desglose por extensión, por antigüedad (mtime) y por propietario.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pwd
+except ImportError:
+    pwd = None
+
+
+DAY = 24 * 60 * 60
+
+# Límite superior (en segundos de antigüedad) de cada rango del histograma
+AGE_BUCKETS: List[Tuple[str, float]] = [
+    ('< 1 día', DAY),
+    ('1-7 días', 7 * DAY),
+    ('7-30 días', 30 * DAY),
+    ('1-3 meses', 90 * DAY),
+    ('3-12 meses', 365 * DAY),
+    ('> 1 año', float('inf')),
+]
+
+NO_EXTENSION = 'sin_extension'
+
+# Los archivos a partir de este tamaño se registran individualmente con by_directory
+LARGE_FILE_THRESHOLD = 1024 * 1024
+
+
+@dataclass
+class BreakdownEntry:
+    count: int = 0
+    size: int = 0
+
+
+@dataclass
+class ScanResult:
+    path: str
+    total_size: int = 0
+    file_count: int = 0
+    dir_count: int = 0
+    error_count: int = 0
+    newest_mtime: float = 0.0
+    oldest_mtime: float = 0.0
+    extensions: Dict[str, BreakdownEntry] = field(default_factory=dict)
+    age_buckets: Dict[str, BreakdownEntry] = field(default_factory=dict)
+    owners: Dict[str, BreakdownEntry] = field(default_factory=dict)
+    children: Dict[str, BreakdownEntry] = field(default_factory=dict)
+    directories: Dict[str, int] = field(default_factory=dict)
+    large_files: Dict[str, int] = field(default_factory=dict)
+
+    def top(self, breakdown: Dict[str, BreakdownEntry], limit: int = 10) -> List[Tuple[str, BreakdownEntry]]:
+        """Devuelve las entradas de un desglose ordenadas por tamaño descendente."""
+        return sorted(breakdown.items(), key=lambda item: item[1].size, reverse=True)[:limit]
+
+    def sorted_age_buckets(self) -> List[Tuple[str, BreakdownEntry]]:
+        """Devuelve el histograma de antigüedad en el orden de AGE_BUCKETS."""
+        return [(label, self.age_buckets[label]) for label, _ in AGE_BUCKETS if label in self.age_buckets]
+
+
+def age_bucket(age_seconds: float) -> str:
+    """Obtiene la etiqueta del rango de antigüedad correspondiente."""
+    for label, limit in AGE_BUCKETS:
+        if age_seconds < limit:
+            return label
+    return AGE_BUCKETS[-1][0]
+
+
+def _add(breakdown: Dict[str, BreakdownEntry], key: str, size: int):
+    entry = breakdown.get(key)
+    if entry is None:
+        entry = breakdown[key] = BreakdownEntry()
+    entry.count += 1
+    entry.size += size
+
+
+def scan_directory(directory: str, by_extension: bool = True, by_age: bool = True,
+                   by_owner: bool = False, by_child: bool = False,
+                   by_directory: bool = False, large_file_threshold: int = LARGE_FILE_THRESHOLD,
+                   now: Optional[float] = None) -> ScanResult:
+    """
+    Recorre un directorio una sola vez y calcula totales y desgloses.
+
+    Args:
+        directory: Directorio raíz a analizar
+        by_extension: Acumular número de archivos y tamaño por extensión
+        by_age: Acumular histograma de antigüedad según mtime
+        by_owner: Acumular por propietario (solo sistemas POSIX)
+        by_child: Acumular tamaño por subdirectorio directo de la raíz
+        by_directory: Acumular el tamaño total (recursivo) de cada directorio y
+            registrar los archivos de al menos `large_file_threshold` bytes; las claves
+            son rutas relativas a la raíz con '/' como separador ('' es la raíz)
+        large_file_threshold: Tamaño mínimo de los archivos registrados con by_directory
+        now: Momento de referencia para calcular antigüedades
+
+    Returns:
+        ScanResult con los totales y los desgloses solicitados
+    """
+    result = ScanResult(path=directory)
+    now = time.time() if now is None else now
+    owner_names: Dict[int, str] = {}
+    by_owner = by_owner and pwd is not None
+
+    # Pila de (directorio, hijo directo de la raíz al que pertenece, ruta relativa)
+    stack: List[Tuple[str, Optional[str], str]] = [(directory, None, '')]
+    # Tamaño de los archivos que cuelgan directamente de cada directorio
+    own_sizes: Dict[str, int] = {}
+
+    while stack:
+        current, child, relative = stack.pop()
+        own_size = 0
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            result.dir_count += 1
+                            entry_child = child if child is not None else entry.name
+                            if by_child and child is None:
+                                result.children.setdefault(entry.name, BreakdownEntry())
+                            entry_relative = f"{relative}/{entry.name}" if relative else entry.name
+                            stack.append((entry.path, entry_child, entry_relative))
+                            continue
+
+                        # Una única llamada a stat por archivo (gratuita en Windows)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        result.error_count += 1
+                        continue
+
+                    size = st.st_size
+                    mtime = st.st_mtime
+                    result.total_size += size
+                    result.file_count += 1
+
+                    if mtime > result.newest_mtime:
+                        result.newest_mtime = mtime
+                    if not result.oldest_mtime or mtime < result.oldest_mtime:
+                        result.oldest_mtime = mtime
+
+                    if by_extension:
+                        ext = os.path.splitext(entry.name)[1].lower() or NO_EXTENSION
+                        _add(result.extensions, ext, size)
+
+                    if by_age:
+                        _add(result.age_buckets, age_bucket(now - mtime), size)
+
+                    if by_owner:
+                        uid = st.st_uid
+                        name = owner_names.get(uid)
+                        if name is None:
+                            try:
+                                name = pwd.getpwuid(uid).pw_name
+                            except KeyError:
+                                name = str(uid)
+                            owner_names[uid] = name
+                        _add(result.owners, name, size)
+
+                    if by_child and child is not None:
+                        _add(result.children, child, size)
+
+                    if by_directory:
+                        own_size += size
+                        if size >= large_file_threshold:
+                            result.large_files[f"{relative}/{entry.name}" if relative else entry.name] = size
+        except OSError:
+            result.error_count += 1
+
+        if by_directory:
+            own_sizes[relative] = own_size
+
+    if by_directory:
+        # Propagar de los más profundos a la raíz: cada directorio suma a su padre
+        totals = dict(own_sizes)
+        for relative in sorted(totals, key=lambda r: r.count('/') if r else -1, reverse=True):
+            if relative:
+                parent = relative.rpartition('/')[0]
+                totals[parent] = totals.get(parent, 0) + totals[relative]
+        result.directories = totals
+
+    return result
@@ -0,0 +1,208 @@
+"""
+Instantáneas del uso de disco y comparación entre ellas.
+Cada instantánea guarda el tamaño total de cada directorio y los archivos grandes de
+un escaneo hasta una profundidad limitada, como JSON comprimido con gzip y rutas
+relativas a la raíz, de modo que una semana de instantáneas diarias ocupa poco
+incluso para '/'. La comparación recorre ambas una sola
+vez (tiempo lineal) y solo ordena los N cambios más grandes.
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .scanner import ScanResult, scan_directory
+from .storage import atomic_write_bytes, get_data_dir
+
+
+SNAPSHOTS_DIR = 'snapshots'
+ROOT_FILE = 'root.txt'
+SNAPSHOT_SUFFIX = '.json.gz'
+MAX_SNAPSHOTS = 14
+# Los tamaños son acumulados: los niveles más profundos solo añaden detalle
+MAX_DEPTH = 6
+
+GREW = 'creció'
+SHRANK = 'disminuyó'
+APPEARED = 'nuevo'
+VANISHED = 'eliminado'
+
+
+@dataclass
+class Snapshot:
+    root: str
+    created: float
+    total_size: int = 0
+    file_count: int = 0
+    dirs: Dict[str, int] = field(default_factory=dict)
+    files: Dict[str, int] = field(default_factory=dict)
+    path: Optional[Path] = None
+
+    @property
+    def label(self) -> str:
+        return datetime.fromtimestamp(self.created).strftime('%Y-%m-%d %H:%M')
+
+
+@dataclass
+class DiffEntry:
+    path: str
+    old_size: int
+    new_size: int
+    status: str
+
+    @property
+    def delta(self) -> int:
+        return self.new_size - self.old_size
+
+
+@dataclass
+class SnapshotDiff:
+    old: Snapshot
+    new: Snapshot
+    dirs: List[DiffEntry] = field(default_factory=list)
+    files: List[DiffEntry] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def delta(self) -> int:
+        return self.new.total_size - self.old.total_size
+
+
+def _root_dir(root: str) -> Path:
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode('utf-8')).hexdigest()[:16]
+    return get_data_dir() / SNAPSHOTS_DIR / digest
+
+
+def snapshot_from_scan(result: ScanResult, created: Optional[float] = None,
+                       max_depth: int = MAX_DEPTH) -> Snapshot:
+    """
+    Convierte un escaneo hecho con by_directory=True en una instantánea, con los
+    directorios de hasta `max_depth` niveles bajo la raíz.
+    """
+    return Snapshot(
+        root=os.path.abspath(result.path),
+        created=time.time() if created is None else created,
+        total_size=result.total_size,
+        file_count=result.file_count,
+        dirs={path: size for path, size in result.directories.items()
+              if not path or path.count('/') < max_depth},
+        files=result.large_files
+    )
+
+
+def take_snapshot(root: str) -> Snapshot:
+    """Escanea un directorio y devuelve su instantánea (sin guardarla)."""
+    result = scan_directory(root, by_extension=False, by_age=False, by_directory=True)
+    return snapshot_from_scan(result)
+
+
+def save_snapshot(snapshot: Snapshot, keep: int = MAX_SNAPSHOTS) -> Path:
+    """Guarda la instantánea y elimina las más antiguas de la misma raíz."""
+    directory = _root_dir(snapshot.root)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / ROOT_FILE).write_text(snapshot.root, encoding='utf-8')
+
+    payload = {
+        'root': snapshot.root,
+        'created': snapshot.created,
+        'total_size': snapshot.total_size,
+        'file_count': snapshot.file_count,
+        'dirs': snapshot.dirs,
+        'files': snapshot.files,
+    }
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # Con microsegundos: dos instantáneas del mismo segundo no se sobrescriben y el nombre sigue ordenando
+    name = datetime.fromtimestamp(snapshot.created).strftime('%Y%m%d-%H%M%S-%f') + SNAPSHOT_SUFFIX
+    path = directory / name
+    atomic_write_bytes(path, gzip.compress(data, compresslevel=6))
+    snapshot.path = path
+
+    for old in sorted(directory.glob('*' + SNAPSHOT_SUFFIX))[:-keep]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+    return path
+
+
+def load_snapshot(path: Path) -> Snapshot:
+    """Carga una instantánea guardada."""
+    with open(path, 'rb') as f:
+        payload = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+    return Snapshot(
+        root=payload['root'],
+        created=payload['created'],
+        total_size=payload.get('total_size', 0),
+        file_count=payload.get('file_count', 0),
+        dirs=payload.get('dirs', {}),
+        files=payload.get('files', {}),
+        path=Path(path)
+    )
+
+
+def list_snapshot_paths(root: str) -> List[Path]:
+    """Rutas de las instantáneas de una raíz, de la más antigua a la más reciente."""
+    directory = _root_dir(root)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob('*' + SNAPSHOT_SUFFIX))
+
+
+def list_snapshot_roots() -> Dict[str, int]:
+    """Raíces con instantáneas guardadas y cuántas tiene cada una."""
+    base = get_data_dir() / SNAPSHOTS_DIR
+    roots: Dict[str, int] = {}
+    if not base.is_dir():
+        return roots
+    for directory in base.iterdir():
+        try:
+            root = (directory / ROOT_FILE).read_text(encoding='utf-8')
+        except OSError:
+            continue
+        count = len(list(directory.glob('*' + SNAPSHOT_SUFFIX)))
+        if count:
+            roots[root] = count
+    return roots
+
+
+def _diff_maps(old: Dict[str, int], new: Dict[str, int], limit: int,
+               counts: Dict[str, int]) -> List[DiffEntry]:
+    changes: List[DiffEntry] = []
+    for path, new_size in new.items():
+        old_size = old.get(path)
+        if old_size is None:
+            changes.append(DiffEntry(path, 0, new_size, APPEARED))
+        elif new_size != old_size:
+            changes.append(DiffEntry(path, old_size, new_size, GREW if new_size > old_size else SHRANK))
+    for path, old_size in old.items():
+        if path not in new:
+            changes.append(DiffEntry(path, old_size, 0, VANISHED))
+
+    for entry in changes:
+        counts[entry.status] = counts.get(entry.status, 0) + 1
+
+    return heapq.nlargest(limit, changes, key=lambda e: abs(e.delta))
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot, limit: int = 20) -> SnapshotDiff:
+    """
+    Compara dos instantáneas de la misma raíz.
+
+    Solo se registran los archivos grandes, así que uno que baja del umbral entre
+    ambas instantáneas aparece como eliminado.
+
+    Returns:
+        SnapshotDiff con los `limit` directorios y archivos con mayor cambio absoluto
+    """
+    diff = SnapshotDiff(old=old, new=new)
+    diff.dirs = _diff_maps(old.dirs, new.dirs, limit, diff.counts)
+    diff.files = _diff_maps(old.files, new.files, limit, {})
+    return diff
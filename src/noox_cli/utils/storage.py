@@ -0,0 +1,76 @@
+"""
+Almacenamiento persistente de datos de NooxCLI (cachés, historiales, configuración).
+Los archivos JSON se escriben de forma atómica para no dejar datos a medias.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def get_data_dir() -> Path:
+    """
+    Obtiene el directorio de datos de NooxCLI, creándolo si no existe y se puede.
+
+    Puede sobrescribirse con la variable de entorno NOOX_DATA_DIR.
+    """
+    override = os.environ.get('NOOX_DATA_DIR')
+    if override:
+        data_dir = Path(override)
+    elif os.name == 'nt':
+        data_dir = Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local')) / 'NooxCLI'
+    elif sys.platform == 'darwin':
+        data_dir = Path.home() / 'Library' / 'Application Support' / 'NooxCLI'
+    else:
+        data_dir = Path(os.environ.get('XDG_DATA_HOME', Path.home() / '.local' / 'share')) / 'noox-cli'
+
+    try:
+        data_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # Un HOME de solo lectura no impide leer; la escritura fallará al guardar
+        pass
+    return data_dir
+
+
+def user_cache_dir() -> Path:
+    """Directorio raíz de cachés del usuario según la plataforma (no se crea)."""
+    if os.name == 'nt':
+        return Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches'
+    return Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache'))
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Escribe un archivo en un nombre temporal y lo renombra al terminar."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_json(name: str, default: Any = None) -> Any:
+    """Carga un archivo JSON del directorio de datos o devuelve `default`."""
+    path = get_data_dir() / name
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(name: str, data: Any):
+    """Guarda un objeto como JSON en el directorio de datos."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    atomic_write_bytes(get_data_dir() / name, payload)
@@ -0,0 +1,284 @@
+"""
+Historial de tiempos de tests y builds por proyecto.
+Cada ejecución lanzada desde NooxCLI registra el tiempo real, el tiempo de CPU y la
+memoria residente máxima de su árbol de procesos. En POSIX el proceso se recoge con
+os.wait4, que devuelve el uso de recursos del hijo y de los descendientes que este
+esperó, sin muestrear nada mientras corre; en Windows se muestrea el árbol con
+psutil si está instalado (si no, solo se mide el tiempo real). El historial guarda
+las últimas ejecuciones de cada comando y marca las que fueron bastante más lentas
+que la mediana de las anteriores.
+"""
+
+import os
+import re
+import sys
+import time
+import signal
+import statistics
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .storage import load_json, save_json
+
+
+HISTORY_FILE = 'run_timings.json'
+MAX_RUNS = 50
+ROLLING_WINDOW = 5
+# Ejecuciones correctas previas necesarias para tener una mediana de referencia
+MIN_BASELINE = 3
+DEFAULT_THRESHOLD = 20.0
+POLL_INTERVAL = 0.2
+
+TIMEOUT = 'timeout'
+CANCELLED = 'cancel'
+
+HAS_WAIT4 = hasattr(os, 'wait4')
+# ru_maxrss viene en KiB en Linux y en bytes en macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+@dataclass
+class RunTiming:
+    command: str
+    started: float
+    wall: float = 0.0
+    user: Optional[float] = None
+    system: Optional[float] = None
+    max_rss: Optional[int] = None
+    returncode: Optional[int] = None
+    interrupted: Optional[str] = None
+
+    @property
+    def cpu(self) -> Optional[float]:
+        if self.user is None or self.system is None:
+            return None
+        return self.user + self.system
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.interrupted
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunTiming':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+def command_label(command: List[str]) -> str:
+    """Nombre estable del comando: 'npm test', 'python -m pytest'..."""
+    executable = re.split(r'[\\/]', command[0])[-1].lower()
+    for suffix in ('.exe', '.cmd', '.bat'):
+        if executable.endswith(suffix):
+            executable = executable[:-len(suffix)]
+    if executable.startswith('python'):
+        executable = 'python'
+    return ' '.join([executable, *command[1:]])
+
+
+def kill_tree(process: subprocess.Popen):
+    """Termina el proceso y sus hijos (npm, jest y compañía lanzan varios)."""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # El proceso se lanzó en su propia sesión: su pid es el del grupo
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _TreeSampler:
+    """Sin wait4: suma la CPU de cada proceso del árbol y el pico del RSS total."""
+
+    def __init__(self, pid: int):
+        self.cpu: Dict[int, Tuple[float, float]] = {}
+        self.max_rss = 0
+        try:
+            self.root = psutil.Process(pid) if psutil else None
+        except Exception:
+            self.root = None
+
+    def sample(self):
+        if not self.root:
+            return
+        try:
+            processes = [self.root, *self.root.children(recursive=True)]
+        except Exception:
+            return
+        rss = 0
+        for process in processes:
+            try:
+                with process.oneshot():
+                    times = process.cpu_times()
+                    rss += process.memory_info().rss
+                self.cpu[process.pid] = (times.user, times.system)
+            except Exception:
+                continue
+        self.max_rss = max(self.max_rss, rss)
+
+    def apply(self, timing: RunTiming):
+        if self.root and self.cpu:
+            timing.user = sum(user for user, _ in self.cpu.values())
+            timing.system = sum(system for _, system in self.cpu.values())
+            timing.max_rss = self.max_rss or None
+
+
+def run_measured(command: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+                 stdout=None, stderr=None, stdin=None, timeout: Optional[float] = None,
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 label: Optional[str] = None) -> RunTiming:
+    """
+    Ejecuta `command` y mide su árbol de procesos. Un tiempo límite o `should_stop`
+    terminan el árbol completo y quedan anotados en `interrupted`.
+
+    Raises:
+        OSError: si el comando no se puede lanzar
+    """
+    timing = RunTiming(command=label or command_label(command), started=time.time())
+    start = time.monotonic()
+    process = subprocess.Popen(
+        command, cwd=cwd, env=env, stdin=stdin, stdout=stdout, stderr=stderr,
+        start_new_session=(os.name != 'nt')
+    )
+
+    def interrupt_reason() -> Optional[str]:
+        if should_stop and should_stop():
+            return CANCELLED
+        if timeout is not None and time.monotonic() - start > timeout:
+            return TIMEOUT
+        return None
+
+    if HAS_WAIT4:
+        # Un hilo se queda bloqueado en wait4 para tomar el instante exacto de salida
+        reaped: Dict[str, object] = {}
+
+        def reap():
+            _, status, usage = os.wait4(process.pid, 0)
+            reaped.update(end=time.monotonic(), status=status, usage=usage)
+
+        reaper = threading.Thread(target=reap, daemon=True)
+        reaper.start()
+        try:
+            while reaper.is_alive():
+                reaper.join(POLL_INTERVAL)
+                reason = reaper.is_alive() and interrupt_reason()
+                if reason:
+                    timing.interrupted = reason
+                    kill_tree(process)
+                    reaper.join()
+        except BaseException:
+            kill_tree(process)
+            reaper.join()
+            raise
+        process.returncode = _exit_code(reaped['status'])
+        usage = reaped['usage']
+        timing.wall = reaped['end'] - start
+        timing.user, timing.system = usage.ru_utime, usage.ru_stime
+        timing.max_rss = usage.ru_maxrss * RSS_UNIT
+    else:
+        sampler = _TreeSampler(process.pid)
+        try:
+            while True:
+                sampler.sample()
+                try:
+                    process.wait(POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                reason = interrupt_reason()
+                if reason:
+                    timing.interrupted = reason
+                    kill_tree(process)
+                    process.wait()
+                    break
+        except BaseException:
+            kill_tree(process)
+            process.wait()
+            raise
+        timing.wall = time.monotonic() - start
+        sampler.apply(timing)
+
+    timing.returncode = process.returncode
+    return timing
+
+
+class TimingHistory:
+    """Ejecuciones por proyecto y comando, en disco; seguro entre hilos."""
+
+    def __init__(self, history_file: str = HISTORY_FILE):
+        self.history_file = history_file
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(project) -> str:
+        return os.path.normcase(os.path.abspath(str(project)))
+
+    def _load(self) -> Dict[str, Dict[str, List[Dict]]]:
+        data = load_json(self.history_file, {})
+        return data if isinstance(data, dict) else {}
+
+    def record(self, project, timing: RunTiming):
+        """Añade una ejecución; se relee el archivo para no pisar las de otras sesiones."""
+        with self._lock:
+            data = self._load()
+            runs = data.setdefault(self._key(project), {}).setdefault(timing.command, [])
+            runs.append(asdict(timing))
+            del runs[:-MAX_RUNS]
+            save_json(self.history_file, data)
+
+    def projects(self) -> List[str]:
+        return sorted(self._load())
+
+    def commands(self, project) -> Dict[str, List[RunTiming]]:
+        """Comando -> ejecuciones (de la más antigua a la más reciente)."""
+        stored = self._load().get(self._key(project), {})
+        return {
+            command: [RunTiming.from_dict(run) for run in runs]
+            for command, runs in stored.items()
+        }
+
+
+def baseline(runs: List[RunTiming], index: int, window: int = ROLLING_WINDOW) -> Optional[float]:
+    """Mediana del tiempo real de las últimas ejecuciones correctas anteriores a `index`."""
+    previous = [run.wall for run in runs[:index] if run.ok][-window:]
+    if len(previous) < MIN_BASELINE:
+        return None
+    return statistics.median(previous)
+
+
+def slowdown(runs: List[RunTiming], index: int, window: int = ROLLING_WINDOW) -> Optional[float]:
+    """Porcentaje de más que tardó la ejecución `index` respecto a su mediana de referencia."""
+    reference = baseline(runs, index, window)
+    if not reference or not runs[index].ok:
+        return None
+    return (runs[index].wall / reference - 1) * 100
+
+
+def regressions(runs: List[RunTiming], threshold: float = DEFAULT_THRESHOLD,
+                window: int = ROLLING_WINDOW) -> List[int]:
+    """Índices de las ejecuciones más de `threshold`% lentas que su mediana de referencia."""
+    flagged = []
+    for index in range(len(runs)):
+        change = slowdown(runs, index, window)
+        if change is not None and change > threshold:
+            flagged.append(index)
+    return flagged
@@ -0,0 +1,205 @@
+"""
+Registro compartido de herramientas externas (git, npm, code, wt...).
+Los ejecutables se resuelven dentro del proceso con una búsqueda en PATH, sin lanzar
+`--version` ni `which`; las versiones solo se consultan cuando se piden, varias a la
+vez en paralelo. Los resultados se guardan en disco y siguen siendo válidos mientras
+no cambien el PATH, el contenido de sus directorios ni el mtime de cada binario; una
+herramienta no encontrada se vuelve a buscar pasado NEGATIVE_TTL, porque puede
+instalarse fuera del PATH (ubicaciones adicionales) sin que este cambie.
+"""
+
+import os
+import glob
+import hashlib
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .storage import load_json, save_json
+
+
+CACHE_FILE = 'tools_cache.json'
+VERSION_TIMEOUT = 5
+MAX_PROBE_WORKERS = 8
+NEGATIVE_TTL = 60
+
+_LOCALAPPDATA = os.environ.get('LOCALAPPDATA', '')
+_USER_PROGRAMS = os.path.join(_LOCALAPPDATA, 'Programs')
+
+# Ubicaciones habituales para herramientas que a menudo no están en el PATH (Windows)
+EXTRA_LOCATIONS: Dict[str, List[str]] = {
+    'code': [
+        os.path.join(_USER_PROGRAMS, 'Microsoft VS Code', 'bin', 'code.cmd'),
+        os.path.join(_USER_PROGRAMS, 'Microsoft VS Code', 'Code.exe'),
+        r'C:\Program Files\Microsoft VS Code\bin\code.cmd',
+        r'C:\Program Files\Microsoft VS Code\Code.exe',
+        r'C:\Program Files (x86)\Microsoft VS Code\bin\code.cmd',
+        r'C:\Program Files (x86)\Microsoft VS Code\Code.exe',
+    ],
+    'wt': [
+        os.path.join(_LOCALAPPDATA, 'Microsoft', 'WindowsApps', 'wt.exe'),
+        r'C:\Program Files\WindowsApps\Microsoft.WindowsTerminal_*\wt.exe',
+        r'C:\Program Files\Windows Terminal\wt.exe',
+        r'C:\Program Files (x86)\Windows Terminal\wt.exe',
+        os.path.join(_LOCALAPPDATA, 'Microsoft', 'WindowsApps', 'Microsoft.WindowsTerminal_*', 'wt.exe'),
+    ],
+    'oh-my-posh': [
+        os.path.join(_USER_PROGRAMS, 'oh-my-posh', 'bin', 'oh-my-posh.exe'),
+    ],
+}
+
+# Referencia propia del módulo: las pruebas simulan el PATH sin tocar shutil.which
+_which = shutil.which
+
+# Argumentos para obtener la versión cuando no es `--version`
+VERSION_ARGS: Dict[str, List[str]] = {
+    'go': ['version'],
+    'java': ['-version'],
+    'php': ['-v'],
+}
+
+
+def _path_key() -> str:
+    """Huella del PATH: sus entradas y el mtime de cada directorio (cambia al instalar algo)."""
+    digest = hashlib.sha1()
+    for entry in (os.environ.get('PATH', '') + os.pathsep + os.environ.get('PATHEXT', '')).split(os.pathsep):
+        digest.update(entry.encode('utf-8', 'replace'))
+        try:
+            digest.update(str(os.stat(entry).st_mtime_ns).encode())
+        except OSError:
+            digest.update(b'-')
+    return digest.hexdigest()
+
+
+def _binary_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _search_extra_locations(name: str) -> Optional[str]:
+    for candidate in EXTRA_LOCATIONS.get(name, []):
+        if '*' in candidate:
+            # Con varias versiones instaladas, la más reciente queda la última
+            matches = sorted(glob.glob(candidate), reverse=True)
+            if matches:
+                return matches[0]
+        elif os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def probe_version(path: str, name: str) -> Optional[str]:
+    """Ejecuta la herramienta para obtener su versión (primera línea de la salida)."""
+    try:
+        result = subprocess.run(
+            [path] + VERSION_ARGS.get(name, ['--version']),
+            capture_output=True, text=True, timeout=VERSION_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for line in (result.stdout or result.stderr or '').splitlines():
+        if line.strip():
+            return line.strip()
+    return None
+
+
+class ToolRegistry:
+    """Resuelve y recuerda rutas y versiones de herramientas externas."""
+
+    def __init__(self, cache_file: str = CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._path_key: Optional[str] = None
+        self._tools: Dict[str, Dict] = {}
+        self._dirty = False
+
+    def _load(self):
+        """Carga la caché de disco, descartándola si el PATH cambió."""
+        key = _path_key()
+        if key == self._path_key:
+            return
+        cache = load_json(self.cache_file, {}) or {}
+        self._tools = cache.get('tools', {}) if cache.get('path_key') == key else {}
+        self._path_key = key
+
+    def _save(self):
+        if not self._dirty:
+            return
+        try:
+            save_json(self.cache_file, {'path_key': self._path_key, 'tools': self._tools})
+            self._dirty = False
+        except OSError:
+            pass
+
+    def _entry(self, name: str) -> Dict:
+        """Devuelve la entrada de una herramienta, resolviéndola si no está o ya no es válida."""
+        now = time.time()
+        entry = self._tools.get(name)
+        if entry is not None:
+            path = entry.get('path')
+            if path is None:
+                if now - entry.get('checked', 0) < NEGATIVE_TTL:
+                    return entry
+            elif _binary_mtime(path) == entry.get('mtime'):
+                return entry
+
+        path = _which(name) or _search_extra_locations(name)
+        entry = {'path': path, 'mtime': _binary_mtime(path) if path else None, 'checked': now}
+        self._tools[name] = entry
+        self._dirty = True
+        return entry
+
+    def find(self, name: str) -> Optional[str]:
+        """Ruta completa del ejecutable o None si no está instalado."""
+        with self._lock:
+            self._load()
+            path = self._entry(name)['path']
+            self._save()
+        return path
+
+    def exists(self, name: str) -> bool:
+        return self.find(name) is not None
+
+    def versions(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Versiones de varias herramientas; las que no están en caché se consultan en paralelo."""
+        names = list(names)
+        with self._lock:
+            self._load()
+            entries = {name: self._entry(name) for name in names}
+        pending = [name for name, entry in entries.items() if entry['path'] and 'version' not in entry]
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(len(pending), MAX_PROBE_WORKERS)) as executor:
+                probed = dict(zip(pending, executor.map(
+                    lambda name: probe_version(entries[name]['path'], name), pending
+                )))
+            with self._lock:
+                for name, version in probed.items():
+                    entries[name]['version'] = version
+                self._dirty = True
+
+        with self._lock:
+            self._save()
+        return {name: entry.get('version') for name, entry in entries.items()}
+
+    def version(self, name: str) -> Optional[str]:
+        return self.versions([name])[name]
+
+    def invalidate(self):
+        """Olvida todo lo resuelto (p. ej. tras instalar una herramienta)."""
+        with self._lock:
+            self._tools = {}
+            self._path_key = None
+            try:
+                save_json(self.cache_file, {})
+            except OSError:
+                pass
+
+
+# Instancia compartida por todos los módulos
+tool_registry = ToolRegistry()
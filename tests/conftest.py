@@ -0,0 +1,14 @@
+"""
+Utilidades compartidas por las pruebas.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Directorio de datos de NooxCLI aislado (NOOX_DATA_DIR) para una prueba."""
+    path = tmp_path / 'datos'
+    path.mkdir()
+    monkeypatch.setenv('NOOX_DATA_DIR', str(path))
+    return str(path)
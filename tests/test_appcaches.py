@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pruebas del inventario de cachés de aplicaciones.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.appcaches import (
+    BROWSER, OTHER, attribute_cache, discover_app_caches, group_by_application,
+    measure_app_caches, size_with_deadline
+)
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def test_attribution():
+    """Los directorios se atribuyen a su aplicación por nombre."""
+    assert attribute_cache('google-chrome-beta') == ('Google Chrome', BROWSER)
+    assert attribute_cache('JetBrains')[0] == 'JetBrains'
+    assert attribute_cache('mi-app') == ('mi-app', OTHER)
+    # Un directorio 'Google' genérico puede ser de cualquier producto de Google
+    assert attribute_cache('Google') == ('Google', OTHER)
+
+
+def test_inventory_grouped_by_application(monkeypatch):
+    """Cada subdirectorio de la raíz de cachés se mide y se agrupa por aplicación."""
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as root:
+        monkeypatch.setenv('XDG_CACHE_HOME', root)
+        _write(os.path.join(root, 'mozilla', 'firefox', 'cache2', 'a'), 300)
+        _write(os.path.join(root, 'chromium', 'Default', 'b'), 100)
+        _write(os.path.join(root, 'mi-app', 'c'), 200)
+
+        caches = measure_app_caches(
+            [c for c in discover_app_caches() if c.path.startswith(root)]
+        )
+        groups = group_by_application(caches)
+
+        assert [application for application, _, _ in groups] == ['Firefox', 'mi-app', 'Chromium']
+        assert all(c.complete for c in caches)
+
+
+def test_size_stops_at_deadline():
+    """Al agotarse el tiempo se devuelve un tamaño parcial marcado como incompleto."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'a', 'x'), 10)
+
+        assert size_with_deadline(root, 5) == (10, 1, True)
+        assert size_with_deadline(root, -1)[2] is False
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pruebas del barrido de artefactos de compilación.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.artifacts import delete_artifacts, find_artifacts, scan_project
+
+
+def _write(path, size=1, mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_scan_is_pruned_and_uses_sibling_markers():
+    """Los artefactos se detectan sin descender en ellos y según su contexto."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'package.json'))
+        _write(os.path.join(root, 'node_modules', 'lib', 'node_modules', 'x.js'))
+        _write(os.path.join(root, 'dist', 'bundle.js'))
+        _write(os.path.join(root, 'src', '__pycache__', 'a.pyc'))
+        _write(os.path.join(root, 'src', 'build', 'codigo.py'))
+        _write(os.path.join(root, 'entorno', 'pyvenv.cfg'))
+
+        project = scan_project(root)
+        found = sorted((os.path.relpath(a.path, root), a.kind) for a in project.artifacts)
+
+        assert found == [
+            ('dist', 'dist'),
+            ('entorno', '.venv'),
+            ('node_modules', 'node_modules'),
+            (os.path.join('src', '__pycache__'), '__pycache__'),
+        ]
+
+
+def test_ranked_by_activity_and_deleted():
+    """Los proyectos abandonados salen primero y sus artefactos se eliminan por completo."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        old = os.path.join(root, 'viejo')
+        new = os.path.join(root, 'nuevo')
+        _write(os.path.join(old, 'main.py'), mtime=now - 400 * 86400)
+        _write(os.path.join(old, '__pycache__', 'main.pyc'), 10, mtime=now)
+        _write(os.path.join(new, 'main.py'), mtime=now)
+        _write(os.path.join(new, '__pycache__', 'main.pyc'), 20)
+
+        found = find_artifacts([new, old, os.path.join(root, 'vacio')])
+
+        assert [p.path for p in found] == [old, new]
+        assert found[0].total_size == 10
+
+        result = delete_artifacts(found[0].artifacts)
+
+        assert result.deleted_size == 10
+        assert result.errors.count == 0
+        assert os.listdir(old) == ['main.py']
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los backups de proyectos (cadena incremental y archivos completos).
+"""
+
+import os
+import sys
+import tarfile
+import zipfile
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import backups
+from noox_cli.utils.backups import (
+    DELTA, FULL, BackupSettings, backup_all, backup_project, list_archives, load_settings,
+    project_backup_dir, restore_project, save_settings, verify_chain, write_archive
+)
+
+
+def _write(path: Path, content: str, mtime: float = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _tree(root: Path):
+    return {
+        p.relative_to(root).as_posix(): (p.read_text(), p.stat().st_mtime_ns)
+        for p in root.rglob('*') if p.is_file()
+    }
+
+
+def test_incremental_chain_and_restore():
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'proyectos' / 'web'
+        settings = BackupSettings(destination=str(Path(tmp) / 'backups'))
+
+        _write(project / 'index.html', '<h1>hola</h1>', 1_600_000_000)
+        _write(project / 'src' / 'app.js', 'console.log(1)', 1_600_000_000)
+        _write(project / 'node_modules' / 'lib' / 'index.js', 'x' * 1000)
+        _write(project / '.git' / 'HEAD', 'ref: refs/heads/main')
+
+        first = backup_project(project, settings)
+        assert first.archive.kind == FULL
+        assert sorted(first.archive.files) == ['index.html', 'src/app.js']
+        state_one = _tree(project)
+        del state_one['node_modules/lib/index.js'], state_one['.git/HEAD']
+
+        # Sin cambios no se crea ningún archivo
+        assert backup_project(project, settings).archive is None
+
+        # Solo el mtime cambia: se actualiza el manifiesto sin volver a guardar el archivo
+        os.utime(project / 'index.html', (1_700_000_000, 1_700_000_000))
+        touched = backup_project(project, settings)
+        assert touched.archive.kind == DELTA and touched.archive.changed == []
+
+        _write(project / 'src' / 'app.js', 'console.log(2)')
+        _write(project / 'README.md', 'docs')
+        (project / 'index.html').unlink()
+        delta = backup_project(project, settings)
+        assert delta.archive.kind == DELTA
+        assert sorted(delta.archive.changed) == ['README.md', 'src/app.js']
+        assert (delta.added, delta.modified, delta.removed) == (1, 1, 1)
+
+        backup_dir = project_backup_dir(settings.destination_path, project)
+        chain = list_archives(backup_dir)
+        assert [a.kind for a in chain] == [FULL, DELTA, DELTA]
+
+        # Restaurar el último punto reproduce el árbol actual, con sus mtimes
+        latest = Path(tmp) / 'restaurado'
+        assert restore_project(backup_dir, latest) == 2
+        expected = _tree(project)
+        del expected['node_modules/lib/index.js'], expected['.git/HEAD']
+        assert _tree(latest) == expected
+
+        # Restaurar el primer punto devuelve el estado original
+        original = Path(tmp) / 'original'
+        restore_project(backup_dir, original, upto=chain[0].sequence)
+        assert _tree(original) == state_one
+
+
+def test_unreadable_file_in_full_backup_keeps_chain_restorable():
+    """Un archivo ilegible en un backup completo se omite en vez de apuntar a la cadena anterior."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'web'
+        settings = BackupSettings(destination=str(Path(tmp) / 'backups'))
+        _write(project / 'a.txt', 'a')
+        _write(project / 'bloqueado.txt', 'b')
+        backup_project(project, settings)
+
+        original_add = backups._add_file
+
+        def failing_add(archive, source, relative, *args, **kwargs):
+            if relative == 'bloqueado.txt':
+                raise PermissionError('acceso denegado')
+            return original_add(archive, source, relative, *args, **kwargs)
+
+        backups._add_file = failing_add
+        try:
+            full = backup_project(project, settings, full=True)
+        finally:
+            backups._add_file = original_add
+        assert full.skipped == ['bloqueado.txt']
+        assert sorted(full.archive.files) == ['a.txt']
+
+        # El delta siguiente vuelve a recoger el archivo omitido y la cadena se restaura entera
+        _write(project / 'a.txt', 'a2')
+        assert sorted(backup_project(project, settings).archive.changed) == ['a.txt', 'bloqueado.txt']
+        backup_dir = project_backup_dir(settings.destination_path, project)
+        assert restore_project(backup_dir, Path(tmp) / 'restaurado') == 2
+
+        # En un delta el error de lectura se informa y se conserva la versión anterior
+        _write(project / 'bloqueado.txt', 'b2')
+        original_hash = backups.hash_file
+        backups.hash_file = lambda path: (_ for _ in ()).throw(PermissionError('acceso denegado'))
+        try:
+            delta = backup_project(project, settings)
+        finally:
+            backups.hash_file = original_hash
+        assert delta.skipped == ['bloqueado.txt']
+
+
+def test_destination_inside_project_is_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'web'
+        _write(project / 'index.html', 'x')
+        try:
+            backup_project(project, BackupSettings(destination=str(project / 'backups')))
+        except ValueError:
+            pass
+        else:
+            assert False, "debería rechazar un destino dentro del proyecto"
+
+
+def test_backup_all_archives_in_parallel():
+    """Cada proyecto se archiva en su proceso; el progreso suma los bytes de todos."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'proyectos'
+        _write(root / 'api' / 'main.py', 'print(1)\n' * 1000)
+        _write(root / 'api' / 'node_modules' / 'x.js', 'ignorado')
+        _write(root / 'web' / 'index.html', '<p>web</p>')
+        projects = [root / 'api', root / 'web']
+
+        for archive_format, extension in (('tar.xz', '.tar.xz'), ('zip', '.zip')):
+            settings = BackupSettings(destination=str(Path(tmp) / 'backups'),
+                                      archive_format=archive_format, compression_level=1)
+            archive_dir = Path(tmp) / 'backups' / archive_format
+            progress = []
+            outcomes = backup_all(projects, settings, archive_dir=archive_dir, workers=2,
+                                  progress_callback=progress.append)
+
+            assert [o.error for o in outcomes] == [None, None]
+            assert sum(progress) == len('print(1)\n' * 1000) + len('<p>web</p>')
+            assert sorted(p.name for p in archive_dir.iterdir()) == ['api' + extension, 'web' + extension]
+
+            archive = archive_dir / ('api' + extension)
+            if archive_format == 'zip':
+                with zipfile.ZipFile(archive) as zf:
+                    assert zf.namelist() == ['api/main.py']
+            else:
+                with tarfile.open(archive) as tf:
+                    assert tf.getnames() == ['api/main.py']
+                    assert tf.extractfile('api/main.py').read() == b'print(1)\n' * 1000
+
+
+def test_read_error_mid_file_discards_the_tar_archive():
+    """Un error a mitad de un miembro no deja un tar truncado con apariencia de válido."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'api'
+        _write(project / 'main.py', 'x' * 1000)
+        target = Path(tmp) / 'api.tar.gz'
+
+        class FailingReader(backups._SizedReader):
+            def read(self, n=-1):
+                raise OSError('error de E/S')
+
+        original = backups._SizedReader
+        backups._SizedReader = FailingReader
+        try:
+            write_archive(project, target, 'tar.gz', 1, [])
+        except OSError:
+            pass
+        else:
+            assert False, "el archivo debería descartarse"
+        finally:
+            backups._SizedReader = original
+        assert list(Path(tmp).glob('*.tar.gz*')) == []
+
+
+def test_read_error_mid_file_discards_the_zip_archive():
+    """En zip un error a mitad de un miembro también descarta el archivo entero."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'api'
+        _write(project / 'main.py', 'x' * 1000)
+        _write(project / 'bloqueado.py', 'y')
+        target = Path(tmp) / 'api.zip'
+
+        class FailingFile:
+            def __init__(self, f):
+                self.f = f
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.f.close()
+
+            def read(self, n=-1):
+                raise OSError('error de E/S')
+
+        failing_reads = []
+
+        def fake_open(path, mode='r'):
+            if Path(path).name == 'bloqueado.py':
+                raise PermissionError('sin acceso')
+            f = open(path, mode)
+            return FailingFile(f) if failing_reads else f
+
+        backups.open = fake_open
+        try:
+            # Un fallo al abrir solo omite el archivo
+            result = write_archive(project, target, 'zip', 1, [])
+            assert [relative for relative, _ in result.errors] == ['bloqueado.py']
+            with zipfile.ZipFile(target) as zf:
+                assert zf.namelist() == ['api/main.py']
+
+            # Un fallo de lectura tras la cabecera descarta el archivo
+            failing_reads.append(True)
+            try:
+                write_archive(project, target.with_name('otro.zip'), 'zip', 1, [])
+            except OSError:
+                pass
+            else:
+                assert False, "el archivo debería descartarse"
+        finally:
+            del backups.open
+        assert not target.with_name('otro.zip').exists()
+        assert not list(Path(tmp).glob('.*.tmp'))
+
+
+def test_invalid_saved_archive_format_falls_back_to_default(data_dir):
+    save_settings(BackupSettings(archive_format='rar'))
+    assert load_settings().archive_format == 'tar.gz'
+
+
+def test_verify_detects_corruption_and_selective_restore():
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'api'
+        settings = BackupSettings(destination=str(Path(tmp) / 'backups'))
+        _write(project / 'src' / 'app.py', 'print("hola")', 1_600_000_000)
+        _write(project / 'src' / 'util.py', 'def f(): pass', 1_600_000_000)
+        _write(project / 'README.md', 'docs', 1_600_000_000)
+        archive = backup_project(project, settings).archive
+        backup_dir = project_backup_dir(settings.destination_path, project)
+
+        assert all(result.ok for result in verify_chain(backup_dir, workers=2))
+
+        # Solo se restaura la carpeta pedida, con su mtime original
+        partial = Path(tmp) / 'parcial'
+        assert restore_project(backup_dir, partial, paths=['src'], workers=2) == 2
+        assert sorted(p.name for p in (partial / 'src').iterdir()) == ['app.py', 'util.py']
+        assert not (partial / 'README.md').exists()
+        assert (partial / 'src' / 'app.py').stat().st_mtime_ns == 1_600_000_000 * 10 ** 9
+
+        # Sin permiso para sobrescribir, un archivo existente detiene la restauración
+        try:
+            restore_project(backup_dir, partial, paths=['src/app.py'])
+        except ValueError:
+            pass
+        else:
+            assert False, "debería negarse a sobrescribir"
+        assert restore_project(backup_dir, partial, paths=['src/app.py'], overwrite=True) == 1
+
+        # Reescribir el zip con un miembro alterado y otro ausente
+        tampered = archive.path.with_name('alterado.zip')
+        with zipfile.ZipFile(archive.path) as src, zipfile.ZipFile(tampered, 'w') as dst:
+            for info in src.infolist():
+                if info.filename == 'README.md':
+                    continue
+                data = src.read(info.filename)
+                dst.writestr(info, b'print("adios")' if info.filename == 'src/app.py' else data)
+        os.replace(tampered, archive.path)
+
+        result, = verify_chain(backup_dir, workers=2)
+        assert sorted(member for member, _ in result.corrupt) == ['README.md', 'src/app.py']
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pruebas del muestreo de espacio/inodos y la proyección de llenado.
+"""
+
+import os
+import sys
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import capacity
+from noox_cli.utils.capacity import (
+    FREE_BYTES, FREE_INODES, format_eta, linear_fit, project_exhaustion, record_samples, sample_mounts
+)
+from noox_cli.utils.mounts import MountProber, MountUsage
+
+
+def test_linear_fit():
+    """El ajuste por mínimos cuadrados recupera una recta exacta."""
+    slope, intercept = linear_fit([(0, 10), (1, 8), (2, 6)])
+    assert slope == -2
+    assert intercept == 10
+
+
+def test_projection_for_shrinking_free_space():
+    """Se proyecta el agotamiento cuando el recurso libre disminuye."""
+    hour = 3600
+    history = [[0, 1000, 500], [hour, 900, 500], [2 * hour, 800, 500]]
+
+    assert project_exhaustion(history, FREE_BYTES) == 8 * hour
+    assert project_exhaustion(history, FREE_INODES) is None
+    assert project_exhaustion(history[:2], FREE_BYTES) is None
+    assert format_eta(8 * hour) == "8 horas"
+    assert format_eta(5 * 24 * hour) == "5 días"
+
+
+def test_record_samples_throttles_and_persists(data_dir):
+    """Las muestras se guardan en disco y respetan el intervalo mínimo."""
+    record_samples([('/', 100, 10)], now=1000)
+    record_samples([('/', 90, 9)], now=1010)
+    samples = record_samples([('/', 80, None)], now=1000 + 3600)
+
+    assert samples['/'] == [[1000, 100, 10], [4600, 80, None]]
+    assert os.path.exists(os.path.join(data_dir, 'disk_samples.json'))
+
+
+def test_sample_mounts_skips_unresponsive_and_unwritable_data_dir(data_dir, tmp_path, monkeypatch):
+    """El muestreo de fondo ignora montajes sin respuesta y no falla sin directorio de datos."""
+
+    class FakeProber(MountProber):
+        def usage(self, mountpoints):
+            return {
+                '/': MountUsage('/', 100, 40, 60, inodes_free=7),
+                '/colgado': MountUsage('/colgado', responsive=False),
+                '/denegado': MountUsage('/denegado', error='sin acceso'),
+            }
+
+    original = capacity.mount_prober
+    capacity.mount_prober = FakeProber()
+    try:
+        samples = sample_mounts(['/', '/colgado', '/denegado'])
+        assert list(samples) == ['/']
+        assert samples['/'][0][1:] == [60, 7]
+
+        # Un directorio de datos imposible de crear no interrumpe al llamador
+        blocker = tmp_path / 'archivo'
+        blocker.touch()
+        monkeypatch.setenv('NOOX_DATA_DIR', str(blocker / 'datos'))
+        assert list(sample_mounts(['/'])) == ['/']
+    finally:
+        capacity.mount_prober = original
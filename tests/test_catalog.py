@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pruebas del catálogo de proyectos en caché.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import catalog
+from noox_cli.utils.catalog import ProjectCatalog, detect_type
+
+
+def _touch(path, content=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def _bump_mtime(path):
+    """Garantiza que el mtime cambie aunque el sistema de archivos tenga poca resolución."""
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+def test_detect_type_keeps_marker_order():
+    assert detect_type(['index.html', 'package.json']) == 'Node.js/React'
+    assert detect_type(['.git', 'index.php']) == 'PHP'
+    assert detect_type(['.git']) == 'Git Repository'
+    assert detect_type(['notas.txt']) == 'Desconocido'
+
+
+def test_catalog_caches_and_invalidates_by_mtime(data_dir):
+    """Los detalles se reutilizan entre instancias hasta que cambia el mtime del proyecto."""
+    with tempfile.TemporaryDirectory() as root:
+        original_scandir = catalog._scandir
+        try:
+            _touch(os.path.join(root, 'web', 'index.html'), '<html></html>')
+            _touch(os.path.join(root, 'api', 'requirements.txt'), 'rich\n')
+            _touch(os.path.join(root, 'api', 'README.md'))
+            os.makedirs(os.path.join(root, '.oculto'))
+            _touch(os.path.join(root, 'suelto.txt'))
+
+            first = ProjectCatalog(root)
+            entries = first.projects()
+            assert [e.name for e in entries] == ['api', 'web']
+            assert all(e.type is None for e in entries)
+
+            assert first.start_background_detection()
+            assert first.wait(timeout=5)
+            api, web = first.projects()
+            assert (api.type, web.type) == ('Python', 'HTML/Web')
+            assert api.main_files == ['requirements.txt', 'README.md']
+            assert first.measure(web) == len('<html></html>')
+
+            # Otra ejecución: los tipos y el tamaño salen del disco sin abrir los proyectos
+            scanned = []
+            catalog._scandir = lambda path: scanned.append(path) or original_scandir(path)
+            second = ProjectCatalog(root)
+            api, web = second.describe_all()
+            assert (api.type, web.type) == ('Python', 'HTML/Web')
+            assert second.measure(web) == len('<html></html>')
+            assert scanned == [root]
+
+            # Un cambio en el primer nivel del proyecto invalida solo ese proyecto
+            _touch(os.path.join(root, 'web', 'package.json'), '{}')
+            _bump_mtime(os.path.join(root, 'web'))
+            scanned.clear()
+            third = ProjectCatalog(root)
+            api, web = third.describe_all()
+            assert (api.type, web.type) == ('Python', 'Node.js/React')
+            assert scanned == [root, os.path.join(root, 'web')]
+
+            # La lista en memoria sigue al mtime de la raíz
+            os.makedirs(os.path.join(root, 'nuevo'))
+            _bump_mtime(root)
+            assert [e.name for e in third.projects()] == ['api', 'nuevo', 'web']
+            assert third.project_type(os.path.join(root, 'nuevo')) == 'Desconocido'
+        finally:
+            catalog._scandir = original_scandir
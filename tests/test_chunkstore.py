@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Pruebas del repositorio de backups deduplicado.
+"""
+
+import io
+import os
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.chunkstore import MAX_CHUNK, MIN_CHUNK, ChunkRepository, iter_chunks
+
+
+def _random_bytes(size: int, seed: int) -> bytes:
+    return random.Random(seed).getrandbits(size * 8).to_bytes(size, 'little')
+
+
+def _tree(root: Path):
+    return {
+        p.relative_to(root).as_posix(): (p.read_bytes(), p.stat().st_mtime_ns)
+        for p in root.rglob('*') if p.is_file()
+    }
+
+
+def test_chunks_are_content_defined():
+    """Insertar bytes al principio solo cambia los trozos cercanos."""
+    data = _random_bytes(3 * 1024 * 1024, 1)
+    chunks = list(iter_chunks(io.BytesIO(data)))
+    assert b''.join(chunks) == data
+    assert all(len(c) <= MAX_CHUNK for c in chunks)
+    assert all(len(c) >= MIN_CHUNK for c in chunks[:-1])
+
+    shifted = list(iter_chunks(io.BytesIO(b'cabecera nueva' + data)))
+    assert len(set(chunks) - set(shifted)) <= 1
+    assert list(iter_chunks(io.BytesIO(b''))) == []
+
+
+def test_backup_dedupes_restores_and_prunes():
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = Path(tmp) / 'proyectos'
+        library = _random_bytes(600 * 1024, 2)
+        for name in ('api', 'web'):
+            (projects / name / 'vendor').mkdir(parents=True)
+            (projects / name / 'vendor' / 'lib.js').write_bytes(library)
+            (projects / name / 'index.php').write_text(f'<?php echo "{name}";')
+        (projects / 'web' / 'node_modules').mkdir()
+        (projects / 'web' / 'node_modules' / 'x.js').write_text('regenerable')
+
+        repository = ChunkRepository(Path(tmp) / 'repo')
+        first = repository.backup(projects, workers=2)
+        assert first.files == 4 and first.reused == 0
+        # La librería compartida se guarda una sola vez
+        library_chunks = len(list(iter_chunks(io.BytesIO(library))))
+        assert first.new_chunks == library_chunks + 2
+        state_one = _tree(projects)
+        del state_one['web/node_modules/x.js']
+
+        # Solo lo modificado se vuelve a procesar
+        (projects / 'api' / 'index.php').write_text('<?php echo "v2";')
+        second = repository.backup(projects, workers=2)
+        assert (second.reused, second.chunked, second.new_chunks) == (3, 1, 1)
+
+        restored = Path(tmp) / 'restaurado'
+        assert repository.restore(first.snapshot.id, restored) == 4
+        assert _tree(restored) == state_one
+
+        # Purgar la primera instantánea solo libera el trozo del index.php antiguo
+        chunks_before, _ = repository.stats()
+        for invalid in (0, -1):
+            try:
+                repository.prune(keep_last=invalid)
+            except ValueError:
+                pass
+            else:
+                assert False, "conservar menos de una instantánea debería rechazarse"
+        assert len(repository.list_snapshots()) == 2
+        pruned = repository.prune(keep_last=1)
+        assert pruned.removed_snapshots == [first.snapshot.id]
+        assert pruned.removed_chunks == 1
+        assert repository.stats()[0] == chunks_before - 1
+
+        latest = Path(tmp) / 'ultima'
+        repository.restore(second.snapshot.id, latest)
+        assert (latest / 'api' / 'index.php').read_text() == '<?php echo "v2";'
+        assert (latest / 'web' / 'vendor' / 'lib.js').read_bytes() == library
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Pruebas del motor de limpieza basado en manifiesto.
+"""
+
+import os
+import sys
+import socket
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.cleanup import ErrorSample, build_manifest, execute_manifest
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def test_manifest_is_a_dry_run():
+    """Construir el manifiesto no elimina nada y registra tamaños por elemento."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'a', 'b', 'c', 'profundo.tmp'), 30)
+        _write(os.path.join(root, 'suelto.tmp'), 10)
+
+        manifest = build_manifest(root)
+
+        assert manifest.file_count == 2
+        assert manifest.total_size == 40
+        assert manifest.children['a'].size == 30
+        assert [depth for depth, _ in manifest.dirs] == [3, 2, 1]
+        assert os.path.exists(os.path.join(root, 'a', 'b', 'c', 'profundo.tmp'))
+
+
+def test_execute_removes_nested_trees_bottom_up():
+    """Los árboles anidados desaparecen por completo y la raíz se conserva."""
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(600):
+            _write(os.path.join(root, f'd{i % 3}', 'x', f'{i}.tmp'), 1)
+
+        manifest = build_manifest(root)
+        freed = []
+        result = execute_manifest(manifest, workers=4, progress_callback=freed.append)
+
+        assert result.deleted_files == 600
+        assert result.deleted_size == 600
+        assert result.deleted_dirs == 6
+        assert result.errors.count == 0
+        assert sum(freed) == 600
+        assert os.listdir(root) == []
+
+
+def test_filter_keeps_files_and_their_directories():
+    """Los archivos conservados por el filtro mantienen su directorio sin contar como error."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'keep', 'importante.log'), 5)
+        _write(os.path.join(root, 'keep', 'basura.tmp'), 7)
+
+        manifest = build_manifest(root, lambda path, st: path.endswith('.tmp'))
+        result = execute_manifest(manifest)
+
+        assert manifest.skipped_files == 1
+        assert result.deleted_files == 1
+        assert result.errors.count == 0
+        assert os.listdir(os.path.join(root, 'keep')) == ['importante.log']
+
+
+def test_sockets_and_fifos_are_never_deleted():
+    """Solo se eliminan archivos regulares y enlaces; los sockets y FIFOs se conservan."""
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'viejo.tmp'), 4)
+        os.symlink(os.path.join(root, 'viejo.tmp'), os.path.join(root, 'enlace'))
+        fifo = os.path.join(root, 'tuberia')
+        os.mkfifo(fifo)
+        os.makedirs(os.path.join(root, 'x11'))
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(os.path.join(root, 'x11', 'X0'))
+
+            manifest = build_manifest(root)
+            result = execute_manifest(manifest)
+
+            assert sorted(os.path.basename(path) for path, _, _ in manifest.files) == ['enlace', 'viejo.tmp']
+            assert manifest.skipped_files == 2
+            assert result.errors.count == 0
+            assert sorted(os.listdir(root)) == ['tuberia', 'x11']
+            assert os.listdir(os.path.join(root, 'x11')) == ['X0']
+        finally:
+            server.close()
+
+
+def test_error_sample_is_bounded():
+    """Solo se guarda una muestra de los mensajes de error."""
+    errors = ErrorSample(limit=3)
+    for i in range(100):
+        errors.add(f'/tmp/{i}', OSError('ocupado'))
+
+    assert errors.count == 100
+    assert len(errors.samples) == 3
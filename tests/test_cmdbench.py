@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas del benchmark de comandos.
+"""
+
+import os
+import sys
+import shlex
+import subprocess
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.cmdbench import (
+    CommandBenchmark, benchmark_command, compare, needs_shell, outlier_indices, parse_command
+)
+from noox_cli.utils.timings import HAS_WAIT4, RunTiming
+
+
+def _python(code: str) -> str:
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+
+
+def _fake(command: str, walls):
+    return CommandBenchmark(command=command, runs=[RunTiming(command=command, started=0, wall=w) for w in walls])
+
+
+def test_outliers_and_relative_comparison():
+    assert outlier_indices([1.0, 1.01, 0.99, 1.02, 0.98, 3.0]) == [5]
+    assert outlier_indices([1.0, 1.0, 1.0]) == []
+
+    slow = _fake('lento', [2.0, 2.2, 1.8])
+    fast = _fake('rapido', [1.0, 1.1, 0.9])
+    (first, ratio_first, _), (second, ratio, error) = compare([slow, fast])
+    assert first is fast and ratio_first == 1.0
+    assert second is slow and round(ratio, 2) == 2.0
+    assert 0 < error < 0.5
+
+
+def test_shell_only_for_unquoted_syntax():
+    assert not needs_shell('python -c "print(1)"')
+    assert not needs_shell("grep -r 'a|b*' src")
+    assert parse_command('python -c "print(1)"')[1:] == ['-c', 'print(1)']
+    assert needs_shell('ls *.py')
+    assert needs_shell('echo "$HOME"')
+    assert needs_shell('git log | head')
+
+
+def test_windows_arguments_lose_their_quotes():
+    """En Windows las comillas delimitan argumentos y no llegan al programa."""
+    args = parse_command(f'"{sys.executable}" -c "print(1)" \'a b\'', windows=True)
+    assert args == [sys.executable, '-c', 'print(1)', 'a b']
+    assert subprocess.list2cmdline(args[1:]) == '-c print(1) "a b"'
+    assert parse_command('dir | more', windows=True)[-1] == 'dir | more'
+
+
+def test_benchmark_runs_warmup_and_measures():
+    seen = []
+    result = benchmark_command(_python('x = bytearray(32 * 1024 * 1024)'), runs=3, warmup=2,
+                               on_run=lambda measured, timing: seen.append(measured))
+    assert result.error is None
+    assert seen == [False, False, True, True, True]
+    assert len(result.runs) == 3
+    assert result.min <= result.median <= result.max
+    if HAS_WAIT4:
+        assert result.max_rss >= 32 * 1024 * 1024
+        assert result.user is not None
+
+    failing = benchmark_command(_python('raise SystemExit(2)'), runs=3, warmup=0)
+    assert failing.error and not failing.runs
+    ignored = benchmark_command(_python('raise SystemExit(2)'), runs=2, warmup=0, ignore_failure=True)
+    assert ignored.error is None and len(ignored.runs) == 2
+
+    assert benchmark_command('comando-que-no-existe-noox', runs=2).error
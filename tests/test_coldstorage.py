@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Pruebas del archivo en frío de proyectos inactivos.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import coldstorage
+from noox_cli.utils.coldstorage import archive_projects, find_idle_projects, load_archived, restore_archived
+
+
+def _write(path: Path, content: str, mtime: float = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _age_tree(root: Path, mtime: float):
+    for path in [root, *root.rglob('*')]:
+        os.utime(path, (mtime, mtime), follow_symlinks=False)
+
+
+def test_idle_detection_uses_whole_tree():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        old = time.time() - 400 * 86400
+        _write(root / 'viejo' / 'index.php', '<?php', old)
+        _write(root / 'tocado' / 'index.php', '<?php', old)
+        _write(root / 'tocado' / 'src' / 'nuevo.php', '<?php // hoy')
+        _age_tree(root / 'viejo', old)
+
+        idle = find_idle_projects([root / 'viejo', root / 'tocado'], 365)
+        assert [p.name for p in idle] == ['viejo']
+        assert idle[0].file_count == 1 and idle[0].size == len('<?php')
+
+
+def test_archive_and_restore_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'proyectos'
+        cold = Path(tmp) / 'frio'
+        project = root / 'blog'
+        _write(project / 'index.php', '<?php echo 1;' * 100, 1_600_000_000)
+        _write(project / '.git' / 'HEAD', 'ref: refs/heads/main', 1_600_000_000)
+        (project / 'uploads').mkdir()
+        os.symlink('index.php', project / 'enlace.php')
+        _age_tree(project, 1_600_000_000)
+
+        idle = find_idle_projects([project], 365)
+        done = []
+        entries = archive_projects(idle, cold, level=1, on_done=lambda path, entry, error: done.append(error))
+
+        assert done == [None]
+        assert not project.exists()
+        assert [e.name for e in load_archived(cold)] == ['blog']
+        assert (cold / entries[0].archive).is_file()
+
+        target = restore_archived(entries[0], cold)
+        assert target == project.resolve()
+        assert (project / 'index.php').read_text() == '<?php echo 1;' * 100
+        assert (project / 'index.php').stat().st_mtime == 1_600_000_000
+        assert (project / 'uploads').is_dir()
+        assert os.readlink(project / 'enlace.php') == 'index.php'
+        assert load_archived(cold) == []
+        assert not (cold / entries[0].archive).exists()
+
+
+def test_failed_delete_keeps_the_archive_listed():
+    """Si el original no se borra del todo, el archivo ya consta en el manifiesto."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'proyectos' / 'tienda'
+        cold = Path(tmp) / 'frio'
+        _write(project / 'index.php', '<?php', 1_600_000_000)
+        _age_tree(project, 1_600_000_000)
+
+        def locked(path):
+            os.remove(os.path.join(path, 'index.php'))
+            raise PermissionError('archivo bloqueado')
+
+        original = coldstorage._remove_tree
+        coldstorage._remove_tree = locked
+        try:
+            done = []
+            entries = archive_projects(find_idle_projects([project], 365), cold, level=1,
+                                       on_done=lambda path, entry, error: done.append((entry, error)))
+        finally:
+            coldstorage._remove_tree = original
+
+        [(entry, error)] = done
+        assert entry is not None and error.startswith('archivado, original no borrado del todo')
+        assert entries == [entry]
+        assert [e.archive for e in load_archived(cold)] == [entry.archive]
+        assert (cold / entry.archive).is_file()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas del localizador y limpiador de cachés de desarrollo.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.devcaches import DevCache, known_caches, measure_caches, purge_caches
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def test_env_overrides_and_generic_cache(monkeypatch):
+    """Las variables de entorno mandan y la caché genérica excluye las conocidas."""
+    with tempfile.TemporaryDirectory() as root:
+        monkeypatch.setenv('PIP_CACHE_DIR', os.path.join(root, 'mi-pip'))
+        monkeypatch.setenv('XDG_CACHE_HOME', root)
+        os.makedirs(os.path.join(root, 'yarn'))
+        os.makedirs(os.path.join(root, 'otra-app'))
+
+        caches = {c.key: c for c in known_caches()}
+
+        assert caches['pip'].paths == [os.path.join(root, 'mi-pip')]
+        if sys.platform.startswith('linux'):
+            assert caches['user_cache'].paths == [os.path.join(root, 'otra-app')]
+
+
+def test_measure_and_purge_without_tool():
+    """Sin herramienta instalada la caché se vacía directamente y se mide antes/después."""
+    with tempfile.TemporaryDirectory() as root:
+        first = os.path.join(root, 'a')
+        second = os.path.join(root, 'b')
+        _write(os.path.join(first, 'x', '1.bin'), 100)
+        _write(os.path.join(second, '2.bin'), 50)
+
+        cache = DevCache('prueba', 'Prueba', [first, second, os.path.join(root, 'no-existe')])
+        measure_caches([cache])
+
+        assert cache.size == 150
+        assert cache.file_count == 2
+
+        [result] = purge_caches([cache])
+
+        assert result.method == 'directo'
+        assert result.before == 150
+        assert result.after == 0
+        assert result.freed == 150
+        assert os.path.isdir(first)
+
+
+def test_failed_native_purge_is_reported_without_deleting():
+    """Si el comando nativo falla no se borra a mano lo que la herramienta protege."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'mod', 'pkg.zip'), 100)
+        cache = DevCache('prueba', 'Prueba', [root], 'prueba',
+                         [sys.executable, '-c', 'import sys; sys.exit("permiso denegado")'],
+                         tool_path=sys.executable)
+        measure_caches([cache])
+
+        [result] = purge_caches([cache])
+
+        assert result.method == 'nativo'
+        assert result.errors == ['permiso denegado']
+        assert result.freed == 0
+        assert os.path.isfile(os.path.join(root, 'mod', 'pkg.zip'))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Pruebas del supervisor de servidores de desarrollo.
+"""
+
+import os
+import sys
+import time
+import signal
+import tempfile
+import threading
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import devservers
+from noox_cli.utils.devservers import (
+    HEALTHY, PYTHON, RESTARTING, STOPPED, RingLog, ServerSupervisor, check_http, port_is_free
+)
+
+
+def _wait_for(condition, timeout: float = 15.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def test_ring_log_keeps_last_lines():
+    log = RingLog(max_lines=3)
+    for i in range(5):
+        log.append(f"línea {i}")
+    assert log.tail() == ['línea 2', 'línea 3', 'línea 4']
+    assert log.tail(1) == ['línea 4'] and log.total == 5
+
+
+def test_server_health_restart_and_group_teardown():
+    supervisor = ServerSupervisor(health_interval=0.2)
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'web'
+        project.mkdir()
+        (project / 'index.html').write_text('<h1>hola</h1>')
+        # El servidor lanza un hijo propio: detenerlo debe terminar todo el grupo
+        port = supervisor.assign_port(18000)
+        code = ('import subprocess, sys, runpy; '
+                'child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); '
+                'print("hijo", child.pid, flush=True); '
+                f'sys.argv = ["http.server", "{port}"]; runpy.run_module("http.server", run_name="__main__")')
+        try:
+            server = supervisor.start(project, PYTHON, port, command=[sys.executable, '-c', code])
+            assert supervisor.assign_port(port) != port
+            assert _wait_for(lambda: server.state == HEALTHY)
+            assert check_http(port)[0] == 200
+            assert any(line.startswith('hijo') for line in server.log.tail())
+
+            if os.name != 'nt':
+                # Una caída se detecta y el servidor vuelve a arrancar solo
+                os.kill(server.pid, signal.SIGKILL)
+                assert _wait_for(lambda: server.state == RESTARTING)
+                assert _wait_for(lambda: server.state == HEALTHY)
+                assert server.total_restarts == 1
+
+            child_pid = int([line for line in server.log.tail() if line.startswith('hijo')][-1].split()[1])
+            assert supervisor.stop(server.name)
+            assert server.state == STOPPED
+            assert _wait_for(lambda: port_is_free(port), timeout=5)
+            if os.name != 'nt':
+                assert _wait_for(lambda: not _alive(child_pid), timeout=5)
+        finally:
+            supervisor.stop_all()
+
+
+def test_concurrent_checks_schedule_a_single_restart():
+    """El menú y el vigilante pueden ver la misma caída: solo se cuenta un reinicio."""
+    supervisor = ServerSupervisor(health_interval=60)
+    original_terminate = devservers._terminate_group
+    # Retiene a cada hilo al limpiar el grupo para que ambos coincidan en la misma caída
+    barrier = threading.Barrier(2)
+
+    def slow_terminate(process, grace=devservers.STOP_GRACE):
+        try:
+            barrier.wait(timeout=1)
+        except threading.BrokenBarrierError:
+            pass
+        original_terminate(process, grace)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            server = supervisor.start(Path(tmp), PYTHON, supervisor.assign_port(18100),
+                                      command=[sys.executable, '-c', 'pass'])
+            server.process.wait()
+            devservers._terminate_group = slow_terminate
+            threads = [threading.Thread(target=supervisor.check, args=(server,)) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert server.state == RESTARTING
+            assert (server.restarts, server.total_restarts) == (1, 1)
+        finally:
+            devservers._terminate_group = original_terminate
+            supervisor.stop_all()
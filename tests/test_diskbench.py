@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Pruebas del benchmark de disco.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.diskbench import MB, BenchmarkResult, run_disk_benchmark
+
+
+def test_benchmark_runs_and_cleans_up():
+    """El benchmark produce resultados para cada combinación y borra su archivo."""
+    with tempfile.TemporaryDirectory() as directory:
+        report = run_disk_benchmark(directory, file_size=MB, block_sizes=(64 * 1024,), max_seconds=0.2)
+
+        names = [result.name for result in report.results]
+        assert names == ['Secuencial escritura', 'Secuencial lectura', 'Aleatorio escritura', 'Aleatorio lectura']
+        assert all(result.ops > 0 and result.mb_per_second > 0 for result in report.results)
+        assert os.listdir(directory) == []
+
+
+def test_percentiles_use_nearest_rank():
+    """Los percentiles de latencia se devuelven en milisegundos."""
+    result = BenchmarkResult('seq', 'read', 4096, latencies=[i / 1000 for i in range(1, 101)])
+
+    assert result.percentile(50) == 50.0
+    assert result.percentile(99) == 99.0
+    assert result.percentile(100) == 100.0
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pruebas del cálculo de métricas de E/S de disco al estilo iostat.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.diskio import DiskCounters, PeakTracker, compute_io_stats, read_proc_diskstats
+
+
+DISKSTATS = """\
+   7       0 loop0 10 0 20 5 0 0 0 0 0 5 5 0 0 0 0
+   8       0 sda 1000 10 8000 500 2000 20 16000 1500 2 1800 2100 0 0 0 0
+"""
+
+
+def test_read_proc_diskstats_skips_loop_devices():
+    """Lee los campos de /proc/diskstats e ignora dispositivos loop."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(DISKSTATS)
+    try:
+        counters = read_proc_diskstats(f.name)
+    finally:
+        os.unlink(f.name)
+
+    assert list(counters) == ['sda']
+    sda = counters['sda']
+    assert sda.reads == 1000
+    assert sda.write_bytes == 16000 * 512
+    assert sda.in_flight == 2
+    assert sda.busy_ms == 1800
+    assert sda.weighted_ms == 2100
+
+
+def test_compute_io_stats_from_deltas():
+    """IOPS, throughput, await, cola y utilización salen de las diferencias."""
+    prev = {'sda': DiskCounters(100, 50, 1000, 2000, 100, 200, busy_ms=1000, weighted_ms=500)}
+    cur = {'sda': DiskCounters(300, 150, 5000, 10000, 300, 600, busy_ms=1500, weighted_ms=1500)}
+
+    stats = compute_io_stats(prev, cur, 2.0)
+
+    assert len(stats) == 1
+    s = stats[0]
+    assert s.read_iops == 100
+    assert s.write_iops == 50
+    assert s.read_bps == 2000
+    assert s.write_bps == 4000
+    assert s.await_ms == 600 / 300
+    assert s.queue_depth == 0.5
+    assert s.util_percent == 25.0
+
+
+def test_counter_reset_and_peaks():
+    """Un contador que retrocede no produce valores negativos y se guardan los picos."""
+    prev = {'sdb': DiskCounters(500, 0, 0, 0, 0, 0)}
+    low = {'sdb': DiskCounters(10, 0, 0, 0, 0, 0)}
+    high = {'sdb': DiskCounters(60, 0, 0, 0, 50, 0)}
+
+    tracker = PeakTracker()
+    tracker.update(compute_io_stats(prev, low, 1.0))
+    tracker.update(compute_io_stats(low, high, 1.0))
+
+    peak = tracker.peaks['sdb']
+    assert tracker.samples == 2
+    assert peak.read_iops == 50
+    assert peak.queue_depth == 0.05
+    assert peak.util_percent is None
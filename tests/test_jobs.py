@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la ejecución en lote de tests y builds.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.jobs import (
+    BUILD, FAILED, PASSED, SKIPPED, TEST, TIMED_OUT, BatchJob, BatchRunner, detect_command, prepare_jobs
+)
+
+
+def test_detect_command_from_project_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'api').mkdir()
+        (root / 'api' / 'requirements.txt').write_text('flask')
+        (root / 'api' / 'tests').mkdir()
+        (root / 'web').mkdir()
+        (root / 'web' / 'package.json').write_text(json.dumps(
+            {'scripts': {'test': 'echo "Error: no test specified" && exit 1', 'build': 'vite build'}}
+        ))
+        (root / 'vacio').mkdir()
+
+        assert detect_command(root / 'api', TEST) == [sys.executable, '-m', 'pytest']
+        assert detect_command(root / 'api', BUILD) is None
+        # El script de test que genera npm init no cuenta como test
+        assert detect_command(root / 'web', TEST) is None
+        assert detect_command(root / 'vacio', TEST) is None
+
+        # Con entorno virtual propio los tests usan su intérprete, no el de NooxCLI
+        venv_python = root / 'api' / '.venv' / ('Scripts/python.exe' if os.name == 'nt' else 'bin/python')
+        venv_python.parent.mkdir(parents=True)
+        venv_python.write_text('')
+        assert detect_command(root / 'api', TEST) == [str(venv_python), '-m', 'pytest']
+
+        jobs = prepare_jobs([root / 'api', root / 'vacio'], TEST, root / 'logs')
+        assert [job.state for job in jobs] == ['pendiente', SKIPPED]
+
+
+def test_runner_runs_concurrently_with_logs_and_timeout():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        scripts = {
+            'bien': 'import time; print("preparando"); time.sleep(0.5); print("todo ok")',
+            'mal': 'import sys, time; time.sleep(0.5); print("1 failed"); sys.exit(1)',
+            'lento': 'import time; time.sleep(30)',
+        }
+        jobs = []
+        for name, code in scripts.items():
+            (root / name).mkdir()
+            jobs.append(BatchJob(project=root / name, action=TEST, command=[sys.executable, '-c', code],
+                                 log_path=root / 'logs' / f'{name}.log'))
+
+        updates = []
+        start = time.monotonic()
+        BatchRunner(jobs, workers=3, timeout=2).run(on_update=lambda job: updates.append((job.name, job.state)))
+        elapsed = time.monotonic() - start
+
+        assert [job.state for job in jobs] == [PASSED, FAILED, TIMED_OUT]
+        assert jobs[1].returncode == 1
+        assert jobs[0].last_line() == 'todo ok'
+        assert '1 failed' in (root / 'logs' / 'mal.log').read_text()
+        assert ('bien', PASSED) in updates
+        # Los tres corren a la vez: el total lo marca el tiempo límite, no la suma
+        assert elapsed < 5
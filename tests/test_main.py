@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los subcomandos no interactivos del punto de entrada.
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli import main as entry
+
+
+def _write(path, age_hours):
+    with open(path, 'wb') as f:
+        f.write(b'x' * 10)
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+
+
+def test_limpiar_temp_runs_headless_and_keeps_sockets(data_dir):
+    """El subcomando programado funciona sin winreg y no toca sockets ni FIFOs."""
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as temp_root:
+        original_tempdir = tempfile.tempdir
+        tempfile.tempdir = temp_root
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _write(os.path.join(temp_root, 'viejo.tmp'), 48)
+            _write(os.path.join(temp_root, 'nuevo.tmp'), 0)
+            os.mkfifo(os.path.join(temp_root, 'tuberia'))
+            server.bind(os.path.join(temp_root, 'agente.sock'))
+
+            try:
+                entry.main(['limpiar-temp'])
+            except SystemExit as e:
+                code = e.code
+            else:
+                code = None
+
+            assert code == 0
+            assert sorted(os.listdir(temp_root)) == ['agente.sock', 'nuevo.tmp', 'tuberia']
+        finally:
+            server.close()
+            tempfile.tempdir = original_tempdir
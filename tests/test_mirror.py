@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Pruebas del espejo de proyectos con deltas por bloques.
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.mirror import mirror_project, patch_file
+
+
+def _random_bytes(size: int, seed: int) -> bytes:
+    return random.Random(seed).getrandbits(size * 8).to_bytes(size, 'little')
+
+
+def _tree(root: Path):
+    return {
+        p.relative_to(root).as_posix(): (p.read_bytes(), p.stat().st_mtime_ns)
+        for p in root.rglob('*') if p.is_file() and p.name != '.noox-mirror.json'
+    }
+
+
+def test_patch_rebuilds_file_from_existing_blocks():
+    with tempfile.TemporaryDirectory() as tmp:
+        old = _random_bytes(400 * 1024, 1)
+        # Inserción, borrado y modificación en distintos puntos
+        new = b'cabecera' + old[:100_000] + old[120_000:300_000] + b'parche' * 50 + old[300_000:]
+        source, target = Path(tmp) / 'nuevo.bin', Path(tmp) / 'espejo.bin'
+        source.write_bytes(new)
+        target.write_bytes(old)
+
+        literal, reused = patch_file(source, target)
+        assert target.read_bytes() == new
+        assert literal + reused == len(new)
+        assert literal < 40 * 1024
+
+
+def test_mirror_copies_changes_and_propagates_deletions():
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'proyectos' / 'web'
+        mirror = Path(tmp) / 'espejo' / 'web'
+        (project / 'src').mkdir(parents=True)
+        (project / 'src' / 'app.js').write_text('console.log(1)')
+        (project / 'old' / 'deep').mkdir(parents=True)
+        (project / 'old' / 'deep' / 'x.txt').write_text('x')
+        (project / 'node_modules').mkdir()
+        (project / 'node_modules' / 'lib.js').write_text('regenerable')
+        data = _random_bytes(300 * 1024, 2)
+        (project / 'datos.bin').write_bytes(data)
+
+        first = mirror_project(project, mirror, workers=2, delta_min_size=64 * 1024)
+        assert (first.copied, first.patched, first.deleted) == (3, 0, 0)
+        expected = _tree(project)
+        del expected['node_modules/lib.js']
+        assert _tree(mirror) == expected
+
+        assert mirror_project(project, mirror, workers=2).unchanged == 3
+
+        (project / 'datos.bin').write_bytes(data[:1000] + b'cambio' + data[1000:])
+        (project / 'src' / 'app.js').write_text('console.log(2)')
+        shutil.rmtree(project / 'old')
+        second = mirror_project(project, mirror, workers=2, delta_min_size=64 * 1024)
+        assert (second.copied, second.patched, second.deleted) == (1, 1, 1)
+        assert second.bytes_literal < 16 * 1024
+        assert not (mirror / 'old').exists()
+        expected = _tree(project)
+        del expected['node_modules/lib.js']
+        assert _tree(mirror) == expected
+
+
+def test_mirror_refuses_foreign_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / 'web'
+        project.mkdir()
+        (project / 'index.html').write_text('x')
+        foreign = Path(tmp) / 'documentos'
+        foreign.mkdir()
+        (foreign / 'tesis.docx').write_text('importante')
+        try:
+            mirror_project(project, foreign)
+        except ValueError:
+            pass
+        else:
+            assert False, "no debería sincronizar sobre un directorio con otros datos"
+        assert (foreign / 'tesis.docx').exists()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la consulta paralela de puntos de montaje con tiempo límite.
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import mounts
+from noox_cli.utils.mounts import MountProber, MountUsage
+
+
+def test_hung_mount_is_marked_unresponsive():
+    """Un montaje colgado no bloquea al resto ni se vuelve a consultar."""
+    release = threading.Event()
+    calls = []
+
+    def fake_stat(mountpoint):
+        calls.append(mountpoint)
+        if mountpoint == '/colgado':
+            release.wait(5)
+        if mountpoint == '/denegado':
+            raise PermissionError('sin acceso')
+        if mountpoint == '/roto':
+            raise ValueError('respuesta inesperada')
+        return MountUsage(mountpoint, 100, 40, 60)
+
+    original = mounts.stat_mount
+    mounts.stat_mount = fake_stat
+    try:
+        prober = MountProber(timeout=0.2, ttl=60)
+
+        started = time.monotonic()
+        first = prober.usage(['/ok', '/colgado', '/denegado', '/roto'])
+        assert time.monotonic() - started < 1.5
+
+        assert first['/ok'].responsive and first['/ok'].used == 40
+        assert not first['/colgado'].responsive
+        assert first['/denegado'].error == 'sin acceso'
+        assert first['/roto'].error == 'respuesta inesperada'
+
+        # El montaje sano sale de caché y el colgado no se relanza
+        second = prober.usage(['/ok', '/colgado'])
+        assert not second['/colgado'].responsive
+        assert calls.count('/ok') == 1
+        assert calls.count('/colgado') == 1
+
+        # Cuando el montaje se recupera, la siguiente consulta obtiene su resultado
+        release.set()
+        time.sleep(0.05)
+        third = prober.usage(['/colgado'])
+        assert third['/colgado'].responsive
+    finally:
+        release.set()
+        mounts.stat_mount = original
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice de archivos abiertos.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.cleanup import build_manifest
+from noox_cli.utils.openfiles import OpenFilesIndex, normalize_path
+
+
+def test_cleanup_skips_open_files():
+    """Los archivos en uso se conservan y se cuentan aparte."""
+    with tempfile.TemporaryDirectory() as root:
+        busy = os.path.join(root, 'ocupado.log')
+        for name in ('ocupado.log', 'libre.log'):
+            with open(os.path.join(root, name), 'wb') as f:
+                f.write(b'x' * 10)
+
+        manifest = build_manifest(root, open_files=OpenFilesIndex({normalize_path(busy)}))
+
+        assert [os.path.basename(p) for p, _, _ in manifest.files] == ['libre.log']
+        assert manifest.skipped_open == 1
+        assert manifest.skipped_size == 10
+
+
+def test_index_sees_own_open_and_deleted_files():
+    """El índice encuentra los archivos abiertos por este proceso y el espacio retenido."""
+    if not os.path.isdir('/proc/self/fd'):
+        return
+    with tempfile.TemporaryDirectory() as root:
+        open_path = os.path.join(root, 'abierto.tmp')
+        deleted_path = os.path.join(root, 'borrado.tmp')
+        with open(open_path, 'wb') as kept, open(deleted_path, 'wb') as pinned:
+            pinned.write(b'x' * 4096)
+            pinned.flush()
+            os.remove(deleted_path)
+
+            index = OpenFilesIndex.build()
+
+            assert open_path in index
+            assert deleted_path not in index
+            assert index.pinned_size([root]) == 4096
+            assert index.pinned_size([os.path.join(root, 'otro')]) == 0
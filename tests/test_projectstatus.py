@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pruebas del estado enriquecido de proyectos (git, tamaño y actividad).
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import projectstatus
+from noox_cli.utils.projectstatus import (
+    ProjectStatus, ProjectStatusCache, collect_statuses, parse_porcelain_v2
+)
+
+
+def _git(project, *args):
+    subprocess.run(
+        ['git', '-C', project, '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+        check=True, capture_output=True
+    )
+
+
+def test_parse_porcelain_v2():
+    status = ProjectStatus(path='x')
+    parse_porcelain_v2(
+        "# branch.oid abc\n# branch.head main\n# branch.upstream origin/main\n"
+        "# branch.ab +2 -5\n1 .M N... 100644 100644 100644 a b src/app.py\n? nuevo.txt\n",
+        status
+    )
+    assert (status.branch, status.ahead, status.behind, status.dirty) == ('main', 2, 5, 2)
+
+    detached = ProjectStatus(path='x')
+    parse_porcelain_v2("# branch.oid abc\n# branch.head (detached)\n", detached)
+    assert detached.branch is None and detached.ahead is None and detached.dirty == 0
+
+
+def test_collect_statuses_caches_until_git_state_changes(data_dir):
+    """El estado se reutiliza hasta que cambian el proyecto o .git/HEAD/index."""
+    if not shutil.which('git'):
+        return
+    with tempfile.TemporaryDirectory() as root:
+        original_collect = projectstatus.collect_status
+        try:
+            repo = os.path.join(root, 'repo')
+            plain = os.path.join(root, 'plano')
+            os.makedirs(plain)
+            with open(os.path.join(plain, 'datos.bin'), 'wb') as f:
+                f.write(b'x' * 100)
+            os.makedirs(repo)
+            _git(repo, 'init', '-q', '-b', 'main')
+            with open(os.path.join(repo, 'app.py'), 'w') as f:
+                f.write('print(1)\n')
+            _git(repo, 'add', 'app.py')
+            _git(repo, 'commit', '-q', '-m', 'inicial')
+            with open(os.path.join(repo, 'notas.txt'), 'w') as f:
+                f.write('pendiente\n')
+
+            repo_status, plain_status = collect_statuses([repo, plain], workers=2)
+            assert repo_status.is_git and repo_status.branch == 'main'
+            assert repo_status.dirty == 1 and repo_status.last_commit
+            assert repo_status.last_activity > 0
+            assert not plain_status.is_git and plain_status.size == 100
+
+            # Sin cambios, una caché nueva (otra ejecución) no vuelve a analizar nada
+            analyzed = []
+            projectstatus.collect_status = lambda p, t: analyzed.append(p) or original_collect(p, t)
+            collect_statuses([repo, plain], cache=ProjectStatusCache())
+            assert analyzed == []
+
+            # Preparar un commit toca .git/index: solo se vuelve a analizar ese proyecto
+            _git(repo, 'add', 'notas.txt')
+            repo_status, _ = collect_statuses([repo, plain], cache=ProjectStatusCache())
+            assert analyzed == [repo]
+            assert repo_status.dirty == 1
+
+            collect_statuses([repo, plain], refresh=True, cache=ProjectStatusCache())
+            assert analyzed == [repo, repo, plain]
+        finally:
+            projectstatus.collect_status = original_collect
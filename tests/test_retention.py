@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las políticas de retención de archivos temporales.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.openfiles import OpenFilesIndex, normalize_path
+from noox_cli.utils.retention import (
+    RetentionPolicy, load_policies, needs_run, plan_retention, record_run, unmanaged_policy
+)
+
+HOUR = 3600
+
+
+def _write(path, size, age_hours, now):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    mtime = now - age_hours * HOUR
+    os.utime(path, (mtime, mtime))
+
+
+def _names(plan):
+    return sorted(os.path.basename(path) for path, _, _ in plan.manifest.files)
+
+
+def test_min_age_and_patterns():
+    """Solo se eliminan los archivos antiguos que cumplen los patrones."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'viejo.tmp'), 10, 48, now)
+        _write(os.path.join(root, 'nuevo.tmp'), 10, 1, now)
+        _write(os.path.join(root, 'viejo.log'), 10, 48, now)
+        _write(os.path.join(root, 'cache', 'viejo.tmp'), 10, 48, now)
+
+        policy = RetentionPolicy(root, min_age_hours=24, include=['*.tmp'], exclude=['cache/*'])
+        plan = plan_retention(policy, now=now)
+
+        assert _names(plan) == ['viejo.tmp']
+        assert plan.skipped_young == 1
+        assert abs(plan.next_due - (now + 23 * HOUR)) < 1
+
+
+def test_quota_evicts_oldest_first():
+    """Con un tamaño máximo se desalojan los más antiguos hasta cumplirlo."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        for age in (10, 20, 30, 40):
+            _write(os.path.join(root, f'{age}h.tmp'), 100, age, now)
+
+        policy = RetentionPolicy(root, min_age_hours=0, max_total_size=250)
+        plan = plan_retention(policy, now=now)
+
+        assert _names(plan) == ['30h.tmp', '40h.tmp']
+        assert plan.manifest.total_size == 200
+
+
+def test_open_files_are_kept():
+    """Los archivos abiertos no se eliminan y se programa una nueva revisión."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        busy = os.path.join(root, 'ocupado.tmp')
+        _write(busy, 10, 48, now)
+        _write(os.path.join(root, 'libre.tmp'), 10, 48, now)
+
+        index = OpenFilesIndex({normalize_path(busy)})
+        plan = plan_retention(RetentionPolicy(root), index, now=now)
+
+        assert _names(plan) == ['libre.tmp']
+        assert plan.skipped_open == 1
+        assert plan.next_due is not None
+
+
+def test_precheck_skips_unchanged_directories(data_dir):
+    """Tras una ejecución no se vuelve a recorrer hasta que algo cambia."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'sub', 'a.tmp'), 10, 48, now)
+        policy = RetentionPolicy(root)
+
+        assert needs_run(policy, now)
+        record_run(plan_retention(policy, now=now))
+        assert not needs_run(policy, now)
+
+        # Un archivo nuevo en un subdirectorio cambia su mtime
+        _write(os.path.join(root, 'sub', 'b.tmp'), 10, 0, now)
+        assert needs_run(policy, now)
+
+        # Un cambio en la política también obliga a recorrer
+        record_run(plan_retention(policy, now=now))
+        assert not needs_run(policy, now)
+        assert needs_run(RetentionPolicy(root, min_age_hours=1), now)
+
+
+def test_unconfigured_directories_keep_manual_cleanup_behaviour(data_dir):
+    """Sin política guardada, la limpieza manual elimina también los archivos recientes."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'nuevo.tmp'), 10, 0, now)
+        policy, = load_policies([root], default=unmanaged_policy)
+        assert _names(plan_retention(policy, now=now + 1)) == ['nuevo.tmp']
+        assert load_policies([root])[0].min_age_hours == 24
+
+
+def test_precheck_notices_files_growing_past_the_quota(data_dir):
+    """Un archivo que crece no cambia el mtime del directorio pero sí supera el límite."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as root:
+        log = os.path.join(root, 'app.log')
+        _write(log, 100, 48, now)
+        policy = RetentionPolicy(root, max_total_size=500)
+        record_run(plan_retention(policy, now=now))
+        assert not needs_run(policy, now)
+
+        with open(log, 'ab') as f:
+            f.write(b'x' * 1000)
+        assert needs_run(policy, now)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas del escáner de directorios de una sola pasada.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.scanner import DAY, NO_EXTENSION, age_bucket, scan_directory
+
+
+def _write(path, size, age_days=0.0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+
+
+def test_totals_and_breakdowns():
+    """Totales, extensiones, antigüedad e hijos salen del mismo recorrido."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'a', 'uno.log'), 100)
+        _write(os.path.join(root, 'a', 'sub', 'dos.LOG'), 50, age_days=10)
+        _write(os.path.join(root, 'b', 'tres'), 25, age_days=400)
+        _write(os.path.join(root, 'raiz.txt'), 5)
+
+        result = scan_directory(root, by_child=True)
+
+        assert result.total_size == 180
+        assert result.file_count == 4
+        assert result.dir_count == 3
+        assert result.extensions['.log'].count == 2
+        assert result.extensions['.log'].size == 150
+        assert result.extensions[NO_EXTENSION].size == 25
+        assert result.age_buckets['< 1 día'].size == 105
+        assert result.age_buckets['7-30 días'].size == 50
+        assert result.age_buckets['> 1 año'].size == 25
+        assert result.children['a'].size == 150
+        assert result.children['b'].size == 25
+        assert [name for name, _ in result.top(result.children)] == ['a', 'b']
+
+
+def test_missing_directory_counts_error():
+    """Un directorio inexistente no lanza excepción."""
+    result = scan_directory(os.path.join(tempfile.gettempdir(), 'noox-no-existe-xyz'))
+    assert result.total_size == 0
+    assert result.error_count == 1
+
+
+def test_age_bucket_limits():
+    """Los límites de los rangos de antigüedad son exclusivos."""
+    assert age_bucket(0) == '< 1 día'
+    assert age_bucket(DAY) == '1-7 días'
+    assert age_bucket(10 * 365 * DAY) == '> 1 año'
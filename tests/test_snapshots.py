@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las instantáneas de uso de disco y su comparación.
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.scanner import scan_directory
+from noox_cli.utils.snapshots import (
+    APPEARED, GREW, SHRANK, VANISHED, Snapshot, diff_snapshots,
+    list_snapshot_paths, load_snapshot, save_snapshot, snapshot_from_scan, take_snapshot
+)
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def test_directory_sizes_are_cumulative():
+    """Cada directorio acumula el tamaño de todo su subárbol."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'a', 'b', 'grande.bin'), 2000)
+        _write(os.path.join(root, 'a', 'x.txt'), 10)
+        _write(os.path.join(root, 'y.txt'), 5)
+
+        result = scan_directory(root, by_directory=True, large_file_threshold=1000)
+
+        assert result.directories == {'': 2015, 'a': 2010, 'a/b': 2000}
+        assert result.large_files == {'a/b/grande.bin': 2000}
+
+        # La instantánea se queda con los niveles superiores
+        assert snapshot_from_scan(result, max_depth=1).dirs == {'': 2015, 'a': 2010}
+
+
+def test_diff_ranks_changes():
+    """La comparación clasifica y ordena lo que creció, disminuyó, apareció o desapareció."""
+    old = Snapshot('/datos', 0, 1000, dirs={'': 1000, 'logs': 100, 'cache': 500, 'viejo': 400},
+                   files={'cache/a.bin': 500})
+    new = Snapshot('/datos', 1, 5150, dirs={'': 5150, 'logs': 5000, 'cache': 50, 'nuevo': 100},
+                   files={'logs/app.log': 4900})
+
+    diff = diff_snapshots(old, new, limit=3)
+
+    assert [(e.path, e.status) for e in diff.dirs] == [('logs', GREW), ('', GREW), ('cache', SHRANK)]
+    assert diff.counts == {GREW: 2, SHRANK: 1, APPEARED: 1, VANISHED: 1}
+    assert [(e.path, e.status) for e in diff.files] == [('logs/app.log', APPEARED), ('cache/a.bin', VANISHED)]
+    assert diff.delta == 4150
+
+
+def test_snapshots_roundtrip_and_pruning(data_dir):
+    """Las instantáneas se guardan comprimidas y solo se conservan las más recientes."""
+    with tempfile.TemporaryDirectory() as root:
+        _write(os.path.join(root, 'sub', 'f.bin'), 50)
+        snapshot = take_snapshot(root)
+
+        for day in range(4):
+            snapshot.created = 1_700_000_000 + day * 86400
+            save_snapshot(snapshot, keep=3)
+
+        paths = list_snapshot_paths(root)
+        loaded = load_snapshot(paths[-1])
+
+        assert len(paths) == 3
+        assert loaded.dirs == {'': 50, 'sub': 50}
+        assert loaded.created == 1_700_000_000 + 3 * 86400
+
+        # Dos instantáneas en el mismo segundo no se sobrescriben
+        snapshot.created += 0.25
+        save_snapshot(snapshot, keep=10)
+        snapshot.created += 0.25
+        save_snapshot(snapshot, keep=10)
+        assert len(list_snapshot_paths(root)) == 5
+        assert load_snapshot(list_snapshot_paths(root)[-1]).created == snapshot.created
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pruebas del historial de tiempos de tests y builds.
+"""
+
+import os
+import sys
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils.timings import (
+    HAS_WAIT4, TIMEOUT, RunTiming, TimingHistory, command_label, regressions, run_measured, slowdown
+)
+
+
+def test_run_measured_reports_tree_usage():
+    # El trabajo lo hace un nieto: wait4 también cuenta a los descendientes esperados
+    child = 'x = bytearray(64 * 1024 * 1024); sum(range(3_000_000))'
+    parent = f'import subprocess, sys; sys.exit(subprocess.call([sys.executable, "-c", {child!r}]) + 3)'
+    timing = run_measured([sys.executable, '-c', parent])
+
+    assert timing.command == 'python -c ' + parent
+    assert timing.returncode == 3 and not timing.ok
+    assert timing.wall > 0
+    if HAS_WAIT4:
+        assert timing.cpu > 0
+        assert timing.max_rss >= 64 * 1024 * 1024
+
+    slow = run_measured([sys.executable, '-c', 'import time; time.sleep(30)'], timeout=0.5)
+    assert slow.interrupted == TIMEOUT
+    assert slow.wall < 5
+
+
+def test_history_flags_runs_slower_than_rolling_median(data_dir):
+    history = TimingHistory()
+    project = os.path.join(data_dir, 'web')
+    for wall, code in ((10, 0), (11, 0), (30, 1), (9, 0), (10, 0), (14, 0), (10.5, 0)):
+        history.record(project, RunTiming(command='npm test', started=0, wall=wall, returncode=code))
+
+    runs = history.commands(project)['npm test']
+    assert len(runs) == 7
+    # Las primeras no tienen referencia y la fallida no cuenta para la mediana
+    assert slowdown(runs, 2) is None
+    assert round(slowdown(runs, 5)) == 40
+    assert regressions(runs, threshold=20) == [5]
+    assert regressions(runs, threshold=50) == []
+
+
+def test_command_label_is_stable_across_platforms():
+    assert command_label([r'C:\Program Files\nodejs\npm.cmd', 'run', 'build']) == 'npm run build'
+    assert command_label(['/usr/bin/python3.11', '-m', 'pytest']) == 'python -m pytest'
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Pruebas del registro compartido de herramientas.
+"""
+
+import os
+import sys
+import stat
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from noox_cli.utils import tools
+from noox_cli.utils.tools import ToolRegistry
+
+
+def _make_tool(directory, name, version):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write(f"#!/bin/sh\necho '{name} {version}'\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def test_registry_resolves_caches_and_invalidates(data_dir, monkeypatch):
+    """Las herramientas se resuelven sin ejecutarlas y la caché de disco sigue al PATH."""
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as bin_dir:
+        monkeypatch.setenv('PATH', bin_dir)
+        original_which = tools._which
+        original_ttl = tools.NEGATIVE_TTL
+        try:
+            tool = _make_tool(bin_dir, 'mitool', '1.2.3')
+
+            registry = ToolRegistry()
+            assert registry.find('mitool') == tool
+            assert not registry.exists('no-existe')
+            assert registry.versions(['mitool', 'no-existe']) == {'mitool': 'mitool 1.2.3', 'no-existe': None}
+
+            # Una instancia nueva (otra ejecución) usa la caché de disco sin buscar en el PATH
+            tools._which = lambda name: None
+            fresh = ToolRegistry()
+            assert fresh.find('mitool') == tool
+            assert fresh.version('mitool') == 'mitool 1.2.3'
+            assert not fresh.exists('otra')
+
+            # Una herramienta no encontrada se vuelve a buscar pasado NEGATIVE_TTL
+            tools._which = lambda name: tool if name == 'otra' else None
+            assert not fresh.exists('otra')
+            tools.NEGATIVE_TTL = 0
+            assert fresh.find('otra') == tool
+
+            # Instalar algo en un directorio del PATH invalida la caché
+            tools._which = original_which
+            tools.NEGATIVE_TTL = original_ttl
+            _make_tool(bin_dir, 'otra', '0.1')
+            assert ToolRegistry().find('otra') == os.path.join(bin_dir, 'otra')
+        finally:
+            tools._which = original_which
+            tools.NEGATIVE_TTL = original_ttl